@@ -12,14 +12,9 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
 import numpy as np
-import plotly.graph_objects as go
-from matplotlib import pyplot as plt
-from plotly.subplots import make_subplots
-from scipy.stats import spearmanr
 
 from ftio.freq.helper import MyConsole
-from ftio.plot.helper import format_plot
-from ftio.plot.units import set_unit
+from ftio.util.jit_cache import kernel
 
 
 def correlation(x, y, method="pearson"):
@@ -42,6 +37,8 @@ def correlation(x, y, method="pearson"):
         return np.corrcoef(x, y)[0, 1]
 
     elif method == "spearman":
+        from scipy.stats import spearmanr
+
         rho, _ = spearmanr(x, y)
         return rho if not np.isnan(rho) else 0
 
@@ -49,28 +46,164 @@ def correlation(x, y, method="pearson"):
         raise ValueError("Unsupported method: choose 'pearson' or 'spearman'")
 
 
-def sliding_correlation(x, y, window_size, method="pearson"):
+def sliding_correlation(x, y, window_size, method="pearson", exact=False):
     """
     Compute local correlation (Pearson or Spearman) in a sliding window.
 
+    The Pearson correlation is computed in O(N) from compensated running sums (see
+    `rolling_pearson`). Spearman is approximated by the rolling Pearson correlation of
+    the ranks of the whole signals, which matches the local Spearman correlation for
+    monotonic relations, but can differ if the order of the values changes across
+    windows. Set exact to evaluate each window separately (O(N·w)).
+
     Parameters:
         x, y        : Input 1D signals (must be same length)
         window_size : Size of window in samples
         method      : 'pearson' or 'spearman'
+        exact       : If set, the correlation is recomputed for every window
 
     Returns:
         corrs       : Array of local correlation values
     """
     n = len(x)
     w = window_size
-    corrs = np.zeros(n - w + 1)
+    if exact:
+        corrs = np.zeros(n - w + 1)
+        for i in range(len(corrs)):
+            x_win = x[i : i + w]
+            y_win = y[i : i + w]
+            corrs[i] = correlation(x_win, y_win, method)
+        return corrs
+
+    if len(y) < n:
+        raise ValueError("Signals must have the same length.")
+    y = y[:n]
+    if method == "spearman":
+        x, y = average_ranks(x), average_ranks(y)
+    elif method != "pearson":
+        raise ValueError("Unsupported method: choose 'pearson' or 'spearman'")
+
+    return rolling_pearson(x, y, w)
+
+
+def average_ranks(a):
+    """
+    Ranks of the values, ties get their average rank (like scipy.stats.rankdata).
+
+    An unstable sort suffices here, as tied values get the same rank anyway.
+
+    Parameters:
+        a     : Input 1D signal
+
+    Returns:
+        ranks : Ranks starting at 1
+    """
+    a = np.asarray(a)
+    order = np.argsort(a)
+    sorted_a = a[order]
+    first = np.r_[True, sorted_a[1:] != sorted_a[:-1]]
+    group = np.cumsum(first) - 1
+    bounds = np.flatnonzero(np.r_[first, True])
+    ranks = np.empty(len(a))
+    ranks[order] = 0.5 * (bounds[group] + bounds[group + 1] + 1)
+    return ranks
+
+
+def rolling_pearson(x, y, window_size, cancellation=1e-6):
+    """
+    Compute the Pearson correlation in a sliding window in O(N).
 
-    for i in range(len(corrs)):
-        x_win = x[i : i + w]
-        y_win = y[i : i + w]
-        corrs[i] = correlation(x_win, y_win, method)
+    The window sums of x, y, x², y², and xy are the differences of two running sums
+    (the leading and the trailing edge of the window). Both are accumulated with
+    Neumaier compensation on the globally centered signals, so long signals do not
+    lose precision. If a window varies little compared to its offset, the variance
+    from the sums suffers from cancellation. Such windows are recomputed with the
+    two-pass formula, which is O(w) for these windows only. Windows where x or y is
+    constant get a correlation of 0, like in `correlation`.
 
-    return corrs
+    Parameters:
+        x, y         : Input 1D signals of the same length
+        window_size  : Size of window in samples
+        cancellation : Relative variance below which a window is recomputed
+
+    Returns:
+        corrs        : Array of local correlation values of length N - w + 1
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n, w = len(x), int(window_size)
+    if n - w + 1 <= 0:
+        return np.zeros(max(n - w + 1, 0))
+    if w < 2:
+        return np.zeros(n - w + 1)
+
+    return _rolling_pearson_kernel(x - np.mean(x), y - np.mean(y), w, cancellation)
+
+
+@kernel("(float64[::1], float64[::1], int64, float64)")
+def _neumaier_add(s, c, k, value):
+    t = s[k] + value
+    if abs(s[k]) >= abs(value):
+        c[k] += (s[k] - t) + value
+    else:
+        c[k] += (value - t) + s[k]
+    s[k] = t
+
+
+@kernel("(float64[::1], float64[::1])")
+def _window_pearson(x, y):
+    """Two-pass Pearson correlation of a window that is not constant."""
+    w = len(x)
+    mean_x, mean_y = np.sum(x) / w, np.sum(y) / w
+    var_x, var_y, cov = 0.0, 0.0, 0.0
+    for j in range(w):
+        dx, dy = x[j] - mean_x, y[j] - mean_y
+        var_x += dx * dx
+        var_y += dy * dy
+        cov += dx * dy
+    if var_x == 0 or var_y == 0:
+        return 0.0
+    return cov / np.sqrt(var_x * var_y)
+
+
+@kernel("(float64[::1], float64[::1], int64, float64)")
+def _rolling_pearson_kernel(x, y, w, cancellation):
+    n = len(x)
+    out = np.zeros(n - w + 1)
+    # running sums of x, y, x², y², xy at the leading (head) and trailing (tail)
+    # edge of the window, each with its compensation term
+    head, head_c = np.zeros(5), np.zeros(5)
+    tail, tail_c = np.zeros(5), np.zeros(5)
+    window = np.zeros(5)
+    # length of the run of equal values ending at the leading edge
+    run_x, run_y = 0, 0
+    for i in range(n):
+        run_x = run_x + 1 if i > 0 and x[i] == x[i - 1] else 1
+        run_y = run_y + 1 if i > 0 and y[i] == y[i - 1] else 1
+        _neumaier_add(head, head_c, 0, x[i])
+        _neumaier_add(head, head_c, 1, y[i])
+        _neumaier_add(head, head_c, 2, x[i] * x[i])
+        _neumaier_add(head, head_c, 3, y[i] * y[i])
+        _neumaier_add(head, head_c, 4, x[i] * y[i])
+        if i >= w:
+            j = i - w
+            _neumaier_add(tail, tail_c, 0, x[j])
+            _neumaier_add(tail, tail_c, 1, y[j])
+            _neumaier_add(tail, tail_c, 2, x[j] * x[j])
+            _neumaier_add(tail, tail_c, 3, y[j] * y[j])
+            _neumaier_add(tail, tail_c, 4, x[j] * y[j])
+        if i < w - 1 or run_x >= w or run_y >= w:
+            continue
+        for k in range(5):
+            window[k] = (head[k] - tail[k]) + (head_c[k] - tail_c[k])
+        var_x = window[2] - window[0] * window[0] / w
+        var_y = window[3] - window[1] * window[1] / w
+        if var_x <= cancellation * window[2] or var_y <= cancellation * window[3]:
+            r = _window_pearson(x[i - w + 1 : i + 1], y[i - w + 1 : i + 1])
+        else:
+            r = (window[4] - window[0] * window[1] / w) / np.sqrt(var_x * var_y)
+        out[i - w + 1] = min(1.0, max(-1.0, r))
+    return out
 
 
 def plot_correlation(
@@ -139,6 +272,10 @@ def plot_correlation_matplotlib(
     b_orig=None,
     t_orig=None,
 ):
+    from matplotlib import pyplot as plt
+
+    from ftio.plot.units import set_unit
+
     if name is None:
         name = ["Cosine", "Logical"]
     min_len = min(len(signal_1), len(signal_2), len(corrs))
@@ -231,6 +368,12 @@ def plot_correlation_plotly(
     b_orig=None,
     t_orig=None,
 ):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    from ftio.plot.helper import format_plot
+    from ftio.plot.units import set_unit
+
     if name is None:
         name = ["Cosine", "Logical"]
     min_len = min(len(signal_1), len(signal_2), len(corrs))
@@ -17,33 +17,25 @@ from __future__ import annotations
 
 # all
 import numpy as np
-from kneed import KneeLocator
 from rich.panel import Panel
 
-# find_peaks
-from scipy.signal import find_peaks
-from sklearn.cluster import DBSCAN
-
-# Isolation forest
-from sklearn.ensemble import IsolationForest
-
-# Lof
-from sklearn.neighbors import LocalOutlierFactor, NearestNeighbors
-
-from ftio.plot.anomaly_plot import plot_decision_boundaries, plot_outliers
-from ftio.plot.cepstrum_plot import plot_cepstrum
+# sklearn, kneed, scipy.signal, and the plots are imported in the functions that
+# use them, so that the default Z-score path does not pay for their import
 
 
 def outlier_detection(
-    amp: np.ndarray, freq_arr: np.ndarray, args
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int | None = None
 ) -> tuple[list[float], np.ndarray, Panel]:
     """Find the outliers in the samples
 
     Args:
-        A (list[float]): Amplitudes array
-        freq_arr (list[float]): frequency array
+        A (list[float]): Amplitudes array, either the half spectrum (bins 0 to n/2, e.g.,
+            from np.fft.rfft) or the full spectrum if n is None
+        freq_arr (list[float]): frequency array matching A
         args (object, optional): arguments containing: outlier detection method (Z-Score, DB-Scan).
         Defaults to 'Z-score'.
+        n (int, optional): number of samples of the transformed signal. Defaults to None,
+            in which case A and freq_arr contain the full spectrum.
 
     Returns:
         dominant_index (list[float]): indecies of dominant frequencies
@@ -53,19 +45,19 @@ def outlier_detection(
     methode = args.outlier
     text = ""
     if methode.lower() in ["z-score", "zscore"]:
-        dominant_index, conf, text = z_score(amp, freq_arr, args)
+        dominant_index, conf, text = z_score(amp, freq_arr, args, n)
         title = "Z-score"
     elif methode.lower() in ["dbscan", "db-scan", "db"]:
-        dominant_index, conf, text = db_scan(amp, freq_arr, args)
+        dominant_index, conf, text = db_scan(amp, freq_arr, args, n)
         title = "DB-Scan"
     elif methode.lower() in ["isolation_forest", "forest"]:
-        dominant_index, conf, text = isolation_forest(amp, freq_arr, args)
+        dominant_index, conf, text = isolation_forest(amp, freq_arr, args, n)
         title = "Isolation Forest"
     elif methode.lower() in ["local outlier factor", "lof"]:
-        dominant_index, conf, text = lof(amp, freq_arr, args)
+        dominant_index, conf, text = lof(amp, freq_arr, args, n)
         title = "Local Outlier Factor"
     elif methode.lower() in ["find peaks", "peaks", "peak"]:
-        dominant_index, conf, text = peaks(amp, freq_arr, args)
+        dominant_index, conf, text = peaks(amp, freq_arr, args, n)
         title = "Find Peaks"
     else:
         dominant_index, conf = [], np.array([])
@@ -87,11 +79,32 @@ def outlier_detection(
     return dominant_index, conf, text
 
 
+def half_spectrum(
+    amp: np.ndarray, freq_arr: np.ndarray, n: int | None = None
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Returns the bins 0 to n/2 of a spectrum. The outlier methods only consider the
+    positive frequencies, so the real-input FFT (np.fft.rfft) suffices.
+
+    Args:
+        amp (np.ndarray): half spectrum, or full spectrum if n is None
+        freq_arr (np.ndarray): frequencies matching amp
+        n (int, optional): number of samples of the transformed signal. Defaults to None.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, int]: half spectrum, its frequencies, and n
+    """
+    if n is None:
+        n = len(amp)
+        amp = amp[: n // 2 + 1]
+        freq_arr = freq_arr[: n // 2 + 1]
+    return amp, freq_arr, n
+
+
 # ?#################################
 # ? Z-score
 # ?#################################
 def z_score(
-    amp: np.ndarray, freq_arr: np.ndarray, args
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int | None = None
 ) -> tuple[list[float], np.ndarray, str]:
     """calculates the outliers using zscore
 
@@ -99,16 +112,18 @@ def z_score(
         amp (np.ndarray): amplitude or psd
         freq_arr (np.ndarray): frequencies
         args (argsparse): arguments
+        n (int, optional): number of samples, see half_spectrum. Defaults to None.
 
     Returns:
         tuple[list[float], np.ndarray, str]: [dominant frequency/ies, confidence, text]
     """
+    amp, freq_arr, n = half_spectrum(amp, freq_arr, n)
     text = "[green]Spectrum[/]: Amplitude spectrum\n"
     if args.psd:
-        amp = amp * amp / len(amp)
+        amp = amp * amp / n
         text = "[green]Spectrum[/]: Power spectrum\n"
 
-    indices = np.arange(1, int(len(amp) / 2) + 1)
+    indices = np.arange(1, int(n / 2) + 1)
     amp_tmp = np.array(2 * amp[indices])
     # norm the data
     amp_tmp = amp_tmp / amp_tmp.sum() if amp_tmp.sum() > 0 else amp_tmp
@@ -160,6 +175,9 @@ def z_score(
         text += msg
 
     if "plotly" in args.engine:
+        from ftio.plot.anomaly_plot import plot_outliers
+        from ftio.plot.cepstrum_plot import plot_cepstrum
+
         i = np.repeat(1, len(indices))
         if len(dominant_index) != 0:
             i[np.array(dominant_index) - 1] = -1
@@ -170,11 +188,76 @@ def z_score(
     return dominant_index, conf, text
 
 
+def z_score_batch(
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int
+) -> tuple[list[list[int]], np.ndarray]:
+    """calculates the outliers using zscore for several spectra at once. The
+    statistics are computed along the frequency axis of all rows together, only
+    the (few) candidates of each row are checked for harmonics in a loop.
+
+    Args:
+        amp (np.ndarray): half amplitude spectra (bins 0 to n/2, e.g., from
+            np.fft.rfft) with one row per signal
+        freq_arr (np.ndarray): frequencies of the bins 0 to n/2
+        args (argsparse): arguments
+        n (int): number of samples of the transformed signals
+
+    Returns:
+        tuple[list[list[int]], np.ndarray]: [dominant indices per row, confidence
+            with shape (rows, n/2)]
+    """
+    if args.psd:
+        amp = amp * amp / n
+
+    indices = np.arange(1, int(n / 2) + 1)
+    amp_tmp = 2 * amp[:, indices]
+    conf = np.zeros(amp_tmp.shape)
+    if amp_tmp.shape[1] == 0:
+        return [[] for _ in range(len(amp_tmp))], conf
+
+    # norm the data
+    total = amp_tmp.sum(axis=1, keepdims=True)
+    amp_tmp = np.where(total > 0, amp_tmp / np.where(total > 0, total, 1), amp_tmp)
+
+    mean = np.mean(amp_tmp, axis=1, keepdims=True)
+    std = np.std(amp_tmp, axis=1, keepdims=True)
+    z_k = np.where(std > 0, abs(amp_tmp - mean) / np.where(std > 0, std, 1), 0)
+    max_z = np.max(z_k, axis=1, keepdims=True)
+    above_tol = np.where(max_z > 0, z_k / np.where(max_z > 0, max_z, 1), 0) > args.tol
+    above_3 = z_k > 3
+    candidates = above_tol & above_3 & (max_z > 0)
+
+    # remove harmonics from the candidates
+    found = np.zeros(len(amp_tmp), dtype=bool)
+    removed = np.zeros(amp_tmp.shape, dtype=bool)
+    index = [np.array([], dtype=int)] * len(amp_tmp)
+    for row in np.flatnonzero(candidates.any(axis=1)):
+        index[row], removed_index, _ = remove_harmonics(
+            freq_arr, amp_tmp[row], indices[candidates[row]]
+        )
+        found[row] = len(index[row]) > 0
+        removed[row, np.array(removed_index, dtype=int) - 1] = True
+
+    # calculate the confidence like z_score
+    for mask in (above_tol & ~removed, above_3 & ~removed):
+        z_mask = np.where(mask, z_k, 0)
+        z_sum = z_mask.sum(axis=1, keepdims=True)
+        conf += np.where(mask, z_mask / np.where(z_sum > 0, z_sum, 1), 0)
+    conf = np.where(found[:, None], conf / 2, 0)
+
+    dominant_index = [
+        dominant(index[row], freq_arr, conf[row])[0] if found[row] else []
+        for row in range(len(amp_tmp))
+    ]
+
+    return dominant_index, conf
+
+
 # ?#################################
 # ? DB-Scan
 # ?#################################
 def db_scan(
-    amp: np.ndarray, freq_arr: np.ndarray, args
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int | None = None
 ) -> tuple[list[float], np.ndarray, str]:
     """calculates the outliers using dbscan
 
@@ -182,16 +265,22 @@ def db_scan(
         amp (np.ndarray): amplitude or psd
         freq_arr (np.ndarray): frequencies
         args (argsparse): arguments
+        n (int, optional): number of samples, see half_spectrum. Defaults to None.
 
     Returns:
         tuple[list[float], np.ndarray, str]: [dominant frequency/ies, confidence]
     """
+    from kneed import KneeLocator
+    from sklearn.cluster import DBSCAN
+    from sklearn.neighbors import NearestNeighbors
+
+    amp, freq_arr, n = half_spectrum(amp, freq_arr, n)
     text = "[green]Spectrum[/]: Amplitude spectrum\n"
     if args.psd:
-        amp = amp * amp / len(amp)
+        amp = amp * amp / n
         text = "[green]Spectrum[/]: Power spectrum\n"
 
-    indecies = np.arange(1, int(len(amp) / 2) + 1)
+    indecies = np.arange(1, int(n / 2) + 1)
     amp_tmp = np.array(2 * amp[indecies])
     freq_arr_tmp = np.array(freq_arr[indecies])
     min_pts = 2
@@ -222,7 +311,7 @@ def db_scan(
         conf = d[:, 1] / d[:, 1].max()
     else:  # find distance using knee method
         text += "Calculating eps using knee method\n"
-        observation = int(len(amp) / 5)
+        observation = int(n / 5)
         nbrs = NearestNeighbors(n_neighbors=observation).fit(d)
         # Find the k-neighbors of a point
         neigh_dist, _ = nbrs.kneighbors(d)
@@ -253,6 +342,8 @@ def db_scan(
     dominant_index = dominant_index + 1
 
     if "plotly" in args.engine:
+        from ftio.plot.anomaly_plot import plot_outliers
+
         plot_outliers(args, freq_arr, amp, indecies, conf, dominant_index, d, eps)
 
     clean_index, _, msg = remove_harmonics(
@@ -267,7 +358,7 @@ def db_scan(
 # ? Isolation Forest
 # ?#################################
 def isolation_forest(
-    amp: np.ndarray, freq_arr: np.ndarray, args
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int | None = None
 ) -> tuple[list[float], np.ndarray, str]:
     """calculates the outliers using isolation forest
 
@@ -275,16 +366,20 @@ def isolation_forest(
         amp (np.ndarray): amplitude or psd
         freq_arr (np.ndarray): frequencies
         args (argsparse): arguments
+        n (int, optional): number of samples, see half_spectrum. Defaults to None.
 
     Returns:
         tuple[list[float], np.ndarray, str]: [dominant frequency/ies, confidence]
     """
+    from sklearn.ensemble import IsolationForest
+
+    amp, freq_arr, n = half_spectrum(amp, freq_arr, n)
     text = "[green]Spectrum[/]: Amplitude spectrum\n"
     if args.psd:
-        amp = amp * amp / len(amp)
+        amp = amp * amp / n
         text = "[green]Spectrum[/]: Power spectrum\n"
 
-    indices = np.arange(1, int(len(amp) / 2) + 1)
+    indices = np.arange(1, int(n / 2) + 1)
     amp_tmp = np.array(2 * amp[indices])
     freq_arr_tmp = np.array(freq_arr[indices])
     # norm the data
@@ -301,6 +396,8 @@ def isolation_forest(
     dominant_index = model.predict(d)
 
     if "plotly" in args.engine:
+        from ftio.plot.anomaly_plot import plot_decision_boundaries, plot_outliers
+
         plot_outliers(args, freq_arr, amp, indices, conf, dominant_index, d)
         plot_decision_boundaries(model, d, conf)
 
@@ -316,7 +413,7 @@ def isolation_forest(
 # ? Odin
 # ?#################################
 def lof(
-    amp: np.ndarray, freq_arr: np.ndarray, args
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int | None = None
 ) -> tuple[list[float], np.ndarray, str]:
     """calculates the outliers using isolation lof
 
@@ -324,16 +421,20 @@ def lof(
         amp (np.ndarray): amplitude or psd
         freq_arr (np.ndarray): frequencies
         args (argsparse): arguments
+        n (int, optional): number of samples, see half_spectrum. Defaults to None.
 
     Returns:
         tuple[list[float], np.ndarray, str]: [dominant frequency/ies, confidence]
     """
+    from sklearn.neighbors import LocalOutlierFactor
+
+    amp, freq_arr, n = half_spectrum(amp, freq_arr, n)
     text = "[green]Spectrum[/]: Amplitude spectrum\n"
     if args.psd:
-        amp = amp * amp / len(amp)
+        amp = amp * amp / n
         text = "[green]Spectrum[/]: Power spectrum\n"
 
-    indices = np.arange(1, int(len(amp) / 2) + 1)
+    indices = np.arange(1, int(n / 2) + 1)
     amp_tmp = np.array(2 * amp[indices])
     freq_arr_tmp = np.array(freq_arr[indices])
 
@@ -350,6 +451,8 @@ def lof(
 
     # plot
     if "plotly" in args.engine:
+        from ftio.plot.anomaly_plot import plot_outliers
+
         plot_outliers(args, freq_arr, amp, indices, conf, dominant_index, d)
 
     clean_index, _, msg = remove_harmonics(
@@ -364,7 +467,7 @@ def lof(
 # ? find_peaks
 # ?#################################
 def peaks(
-    amp: np.ndarray, freq_arr: np.ndarray, args
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int | None = None
 ) -> tuple[list[float], np.ndarray, str]:
     """calculates the outliers using isolation lof
 
@@ -372,16 +475,20 @@ def peaks(
         amp (np.ndarray): amplitude or psd
         freq_arr (np.ndarray): frequencies
         args (argsparse): arguments
+        n (int, optional): number of samples, see half_spectrum. Defaults to None.
 
     Returns:
         tuple[list[float], np.ndarray, str]: [dominant frequency/ies, confidence]
     """
+    from scipy.signal import find_peaks
+
+    amp, freq_arr, n = half_spectrum(amp, freq_arr, n)
     text = "[green]Spectrum[/]: Amplitude spectrum\n"
     if args.psd:
-        amp = amp * amp / len(amp)
+        amp = amp * amp / n
         text = "[green]Spectrum[/]: Power spectrum\n"
 
-    indices = np.arange(1, int(len(amp) / 2) + 1)
+    indices = np.arange(1, int(n / 2) + 1)
     amp_tmp = np.array(2 * amp[indices])
     freq_arr_tmp = np.array(freq_arr[indices])
     # Normalize the data
@@ -410,6 +517,8 @@ def peaks(
 
     # plot
     if "plotly" in args.engine:
+        from ftio.plot.anomaly_plot import plot_outliers
+
         plot_outliers(args, freq_arr, amp, indices, conf, dominant_index, d)
 
     clean_index, _, msg = remove_harmonics(
@@ -420,6 +529,68 @@ def peaks(
     return dominant_index, abs(conf), text + msg + text_d
 
 
+def peaks_batch(
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int
+) -> tuple[list[list[int]], np.ndarray]:
+    """calculates the outliers using find_peaks for several spectra at once
+
+    Args:
+        amp (np.ndarray): half amplitude spectra (bins 0 to n/2, e.g., from
+            np.fft.rfft) with one row per signal
+        freq_arr (np.ndarray): frequencies of the bins 0 to n/2
+        args (argsparse): arguments
+        n (int): number of samples of the transformed signals
+
+    Returns:
+        tuple[list[list[int]], np.ndarray]: [dominant indices per row, confidence
+            with shape (rows, n/2)]
+    """
+    from scipy.signal import find_peaks
+
+    if args.psd:
+        amp = amp * amp / n
+
+    indices = np.arange(1, int(n / 2) + 1)
+    amp_tmp = 2 * amp[:, indices]
+    d = amp_tmp / amp_tmp.sum(axis=1, keepdims=True)
+    limit = args.tol * np.max(d, axis=1, initial=0)
+
+    conf = np.zeros(d.shape, dtype=int)
+    dominant_index = []
+    for row in range(len(d)):
+        # find_peaks only works on 1D arrays
+        found_peaks, _ = find_peaks(d[row], height=limit[row])
+        conf[row, found_peaks] = 1
+        clean_index, _, _ = remove_harmonics(freq_arr, amp_tmp[row], indices[found_peaks])
+        dominant_index.append(dominant(clean_index, freq_arr, conf[row])[0])
+
+    return dominant_index, conf
+
+
+def outlier_detection_batch(
+    amp: np.ndarray, freq_arr: np.ndarray, args, n: int
+) -> tuple[list[list[int]], np.ndarray]:
+    """Find the outliers in several spectra at once (see outlier_detection). Only
+    Z-score and find peaks are supported.
+
+    Args:
+        amp (np.ndarray): half amplitude spectra with one row per signal
+        freq_arr (np.ndarray): frequencies of the bins 0 to n/2
+        args (object): arguments containing the outlier detection method
+        n (int): number of samples of the transformed signals
+
+    Returns:
+        dominant_index (list[list[int]]): indices of dominant frequencies per row
+        conf (np.ndarray): confidence in the predictions per row
+    """
+    methode = args.outlier
+    if methode.lower() in ["z-score", "zscore"]:
+        return z_score_batch(amp, freq_arr, args, n)
+    if methode.lower() in ["find peaks", "peaks", "peak"]:
+        return peaks_batch(amp, freq_arr, args, n)
+    raise NotImplementedError(f"Unsupported method for batch analysis: {methode}")
+
+
 def dominant(
     dominant_index: np.ndarray, freq_arr: np.ndarray, conf: np.ndarray
 ) -> tuple[list[float], str]:
@@ -14,20 +14,135 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
 # all
 import numpy as np
 from rich.panel import Panel
 
-# find_peaks
-from scipy.stats import kurtosis
-
-# Isolation forest
-# Lof
 from ftio.analysis._correlation import correlation
 
 
+def period_segments(
+    freq: float, sampling_rate: float, n: int, phi: float, start_time: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the periods of a cosine with frequency freq and phase phi in a sampled signal.
+
+    Each period is centered around a maximum of the cosine. The first and last period
+    are clipped to the signal bounds.
+
+    Args:
+        freq (float): frequency of the cosine
+        sampling_rate (float): sampling rate of the signal
+        n (int): number of samples of the signal
+        phi (float): phase of the cosine
+        start_time (float): time of the first sample
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: index of each period and its begin
+            and end sample (exclusive)
+    """
+    period = 1 / freq
+    phase_offset = phi / (2 * np.pi * freq)
+    empty = np.array([], dtype=np.int64)
+    if n == 0:
+        return empty, empty, empty
+
+    def bounds(i: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        center_time = (i * period) - start_time - phase_offset
+        begin = np.round((center_time - 0.5 * period) * sampling_rate)
+        end = np.round((center_time + 0.5 * period) * sampling_rate)
+        return begin.astype(np.int64), end.astype(np.int64)
+
+    # the periods before the signal (end < 1) are skipped, the last one contains
+    # the end of the signal
+    first = max(0, int(np.floor((start_time + phase_offset) / period - 0.5)) - 2)
+    last = (
+        int(np.ceil(((n - 1) / sampling_rate + start_time + phase_offset) / period)) + 2
+    )
+    while True:
+        index = np.arange(first, max(first, last) + 1)
+        begin, end = bounds(index)
+        done = np.flatnonzero((end >= 1) & (end >= n - 1))
+        if len(done) > 0:
+            break
+        last = 2 * last + 1
+    stop = done[0] + 1
+    index, begin, end = index[:stop], begin[:stop], end[:stop]
+    begin, end = np.maximum(begin, 0), np.minimum(end, n)
+    valid = (end >= 1) & (begin < end)
+
+    return index[valid], begin[valid], end[valid]
+
+
+def segment_correlations(
+    x: np.ndarray, y: np.ndarray, begin: np.ndarray, end: np.ndarray
+) -> np.ndarray:
+    """
+    Pearson correlation of x and y in each segment [begin, end).
+
+    All segments are reduced at once with np.add.reduceat (two passes: segment means,
+    then the centered sums). Segments where x or y is constant get a correlation of 0,
+    like in `correlation`.
+
+    Args:
+        x (np.ndarray): first signal
+        y (np.ndarray): second signal of the same length
+        begin (np.ndarray): first sample of each segment, sorted
+        end (np.ndarray): end of each segment (exclusive), begin < end
+
+    Returns:
+        np.ndarray: correlation of each segment
+    """
+    corrs = np.zeros(len(begin))
+    if len(begin) == 0:
+        return corrs
+    if np.any(begin[1:] < end[:-1]):
+        # overlapping segments (rounding of the period bounds), evaluate one by one
+        for k, (b, e) in enumerate(zip(begin, end, strict=True)):
+            corrs[k] = correlation(x[b:e], y[b:e])
+        return corrs
+
+    # segments and the gaps between them as consecutive intervals of x[offset:]
+    offset = begin[0]
+    x = np.asarray(x[offset:], dtype=np.float64)
+    y = np.asarray(y[offset:], dtype=np.float64)
+    starts = np.empty(2 * len(begin), dtype=np.int64)
+    starts[0::2] = begin - offset
+    starts[1::2] = end - offset
+    if starts[-1] == len(x):
+        starts = starts[:-1]
+    lengths = np.diff(np.append(starts, len(x)))
+    safe_lengths = np.maximum(lengths, 1)
+
+    mean_x = np.add.reduceat(x, starts) / safe_lengths
+    mean_y = np.add.reduceat(y, starts) / safe_lengths
+    dx = x - np.repeat(mean_x, lengths)
+    dy = y - np.repeat(mean_y, lengths)
+    sxx = np.add.reduceat(dx * dx, starts)[0::2]
+    syy = np.add.reduceat(dy * dy, starts)[0::2]
+    sxy = np.add.reduceat(dx * dy, starts)[0::2]
+
+    # deviations at the level of rounding errors count as constant
+    m = lengths[0::2]
+    eps = np.finfo(np.float64).eps
+    varying = (sxx > m * (4 * eps * mean_x[0::2]) ** 2) & (
+        syy > m * (4 * eps * mean_y[0::2]) ** 2
+    )
+    corrs[varying] = sxy[varying] / np.sqrt(sxx[varying] * syy[varying])
+    return np.clip(corrs, -1, 1)
+
+
+def period_text(
+    index: np.ndarray, begin: np.ndarray, end: np.ndarray, corrs: np.ndarray
+) -> str:
+    """Lists the correlation of each period."""
+    return "".join(
+        f"[green]Period {i:3d} (indices {b:5d}:{e:5d}): "
+        f"[black]Correlation = {c:.4f}\n"
+        for i, b, e, c in zip(index, begin, end, corrs, strict=True)
+    )
+
+
 def new_periodicity_scores(
     amp: np.ndarray,
     signal: np.ndarray,
@@ -45,6 +160,8 @@ def new_periodicity_scores(
         Computes the average peak sharpness (excess kurtosis) for specified peak regions.
         Higher values indicate more peaked regions.
         """
+        from scipy.stats import kurtosis
+
         sharpness_scores = []
         for peak_idx in peak_indices_in_spectrum:
             start_idx = max(0, peak_idx - window_half_width)
@@ -111,58 +228,28 @@ def new_periodicity_scores(
         t = start_time + dt * np.arange(len(signal))
         waveform = np.cos(2 * np.pi * freq * t + phi)
 
-        period = 1 / freq
-        phase_offset = phi / (2 * np.pi * freq)
-
-        correlations = []
-        segment_lengths = []
-
-        i = 0
-        while True:
-            center_time = (i * period) - start_time - phase_offset
-            begin = round((center_time - 0.5 * period) * sampling_rate)
-            end = round((center_time + 0.5 * period) * sampling_rate)
-
-            if end < 1:
-                i += 1
-                continue
-
-            begin_clamped = max(begin, 0)
-            end_clamped = min(end, len(signal))
-
-            if begin_clamped < end_clamped:
-                correlation_result = correlation(
-                    waveform[begin_clamped:end_clamped], signal[begin_clamped:end_clamped]
-                )
-                correlations.append(correlation_result)
-                segment_lengths.append(end_clamped - begin_clamped)
-
-                text += (
-                    f"[green]Period {i:3d} (indices {begin_clamped:5d}:{end_clamped:5d}): "
-                    f"[black]Correlation = {correlation_result:.4f}\n"
-                )
-
-            if end >= len(signal) - 1:
-                break
-            i += 1
-
-        if not correlations:
+        index, begin, end = period_segments(
+            freq, sampling_rate, len(signal), phi, start_time
+        )
+        if len(index) == 0:
             text += "[red]No full periods were found in the signal.\n"
             return 0.0, text
+        correlations = segment_correlations(waveform, signal, begin, end)
 
-        full_period_samples = round(period * sampling_rate)
+        full_period_samples = round((1 / freq) * sampling_rate)
 
         # The weights are now just the ratio of the segment length to a full period length.
-        length_weights = [sl / full_period_samples for sl in segment_lengths]
-
-        for i, weight in enumerate(length_weights):
-            text += (
-                f"[blue]Weight for period {i:3d} (completeness): [black]{weight:.4f}\n"
-            )
+        length_weights = (end - begin) / full_period_samples
 
         # Calculate the weighted average using only the length weights.
         weighted_correlation = np.average(correlations, weights=length_weights)
 
+        if args.verbose:
+            text += period_text(index, begin, end, correlations)
+            text += "".join(
+                f"[blue]Weight for period {i:3d} (completeness): [black]{weight:.4f}\n"
+                for i, weight in enumerate(length_weights)
+            )
         text += f"\n[bold magenta]Final Length-Weighted Correlation: {weighted_correlation:.4f}[/bold magenta]\n"
 
         return weighted_correlation, text
@@ -176,7 +263,7 @@ def new_periodicity_scores(
         text: str = "",
     ) -> tuple[float, str]:
         """
-        The function iterates through the signal period by period, calculating the
+        The function splits the signal period by period and calculates the
         correlation for each. It then computes a final weighted average of these
         correlations.
 
@@ -193,139 +280,50 @@ def new_periodicity_scores(
         t = start_time + dt * np.arange(len(signal))
         waveform = np.cos(2 * np.pi * freq * t + phi)
 
-        period = 1 / freq
-        phase_offset = phi / (2 * np.pi * freq)
-
-        # --- Store individual results to be weighted later ---
-        correlations = []
-        segment_lengths = []
-
-        i = 0
-        while True:
-            center_time = (i * period) - start_time - phase_offset
-            begin = round((center_time - 0.5 * period) * sampling_rate)
-            end = round((center_time + 0.5 * period) * sampling_rate)
-
-            if end < 1:
-                i += 1
-                continue
-
-            # Clamp indices to be within the signal bounds
-            begin_clamped = max(begin, 0)
-            end_clamped = min(end, len(signal))  # Use len(signal) for slicing
-
-            # Calculate correlation for the valid segment
-            if begin_clamped < end_clamped:
-                correlation_result = correlation(
-                    waveform[begin_clamped:end_clamped], signal[begin_clamped:end_clamped]
-                )
-                correlations.append(correlation_result)
-                segment_lengths.append(end_clamped - begin_clamped)
-
-                text += (
-                    f"[green]Period {i:3d} (indices {begin_clamped:5d}:{end_clamped:5d}): "
-                    f"[black]Correlation = {correlation_result:.4f}\n"
-                )
-
-            if end >= len(signal) - 1:
-                break
-            i += 1
-
+        index, begin, end = period_segments(
+            freq, sampling_rate, len(signal), phi, start_time
+        )
         # --- Perform the weighting if any periods were found ---
-        if not correlations:
+        if len(index) == 0:
             text += "[red]No full periods were found in the signal.\n"
             return 0.0, text
+        correlations = segment_correlations(waveform, signal, begin, end)
 
         num_periods = len(correlations)
-        full_period_samples = round(period * sampling_rate)
+        full_period_samples = round((1 / freq) * sampling_rate)
 
         # 1. Recency weights: linear ramp from 0.3 to 1.0
         recency_weights = np.linspace(0.3, 1.0, num=num_periods)
-
-        # 2. Combine with length weights and calculate the final weighted average
-        final_weights = []
-        for i in range(num_periods):
-            # Length weight: actual segment length / full period length
-            length_weight = segment_lengths[i] / full_period_samples
-            # Final weight is the product of both factors
-            combined_weight = recency_weights[i] * length_weight
-            final_weights.append(combined_weight)
-
-            text += (
-                f"[blue]Weight for period {i:3d}: "
-                f"[black]Recency={recency_weights[i]:.2f}, Length={length_weight:.2f} -> "
-                f"Combined={combined_weight:.4f}\n"
-            )
+        # 2. Length weight: actual segment length / full period length
+        length_weights = (end - begin) / full_period_samples
+        # Final weight is the product of both factors
+        final_weights = recency_weights * length_weights
 
         # np.average handles the sum(value * weight) / sum(weight) calculation
         weighted_correlation = np.average(correlations, weights=final_weights)
 
+        if args.verbose:
+            text += period_text(index, begin, end, correlations)
+            text += "".join(
+                f"[blue]Weight for period {i:3d}: "
+                f"[black]Recency={recency:.2f}, Length={length:.2f} -> "
+                f"Combined={combined:.4f}\n"
+                for i, (recency, length, combined) in enumerate(
+                    zip(recency_weights, length_weights, final_weights, strict=True)
+                )
+            )
         text += f"\n[magenta]Final Weighted Correlation: {weighted_correlation:.4f}[/]\n"
 
         return weighted_correlation, text
 
-    def parallel_period_correlation(
-        freq: float,
-        sampling_rate: float,
-        signal: np.ndarray,
-        phi: float,
-        start_time: float,
-        workers: int,
-        text: str = "",
-    ) -> str:
-        dt = 1 / sampling_rate
-        t = start_time + dt * np.arange(len(signal))
-        waveform = np.cos(2 * np.pi * freq * t + phi)
-
-        period = 1 / freq
-        phase_offset = phi / (2 * np.pi * freq)
-
-        # Precompute all (begin, end, i) intervals
-        intervals = []
-        i = 0
-        while True:
-            center_time = (i * period) - start_time - phase_offset
-            begin = round((center_time - 0.5 * period) * sampling_rate)
-            end = round((center_time + 0.5 * period) * sampling_rate)
-            if end < 1:
-                i += 1
-                continue
-            begin = max(begin, 0)
-            end = min(end, len(signal) - 1)
-            intervals.append((begin, end, i))
-            if end >= len(signal) - 1:
-                break
-            i += 1
-
-        def compute_correlation(args):
-            b, e, idx = args
-            corr_res = correlation(waveform[b:e], signal[b:e])
-            return idx, b, e, corr_res
-
-        results = []
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = [
-                executor.submit(compute_correlation, interval) for interval in intervals
-            ]
-            for future in as_completed(futures):
-                results.append(future.result())
-
-        # Sort results by period index to keep order
-        results.sort(key=lambda x: x[0])
-
-        for idx, b, e, corr_res in results:
-            text += (
-                f"[green]Correlation for period {idx:3d} with indices {b:5d},{e:5d}: "
-                f"[black]{corr_res:.4f} \n"
-            )
-        return text
-
     text = ""
     if args.periodicity_detection:
+        # amp is the half (rfft) or the full spectrum of the signal
+        n = len(signal)
         if args.psd:
-            amp = amp * amp / len(amp)
+            amp = amp * amp / n
             # text = "[green]Spectrum[/]: Power spectrum\n"
-        indices = np.arange(1, int(len(amp) / 2) + 1)
+        indices = np.arange(1, int(n / 2) + 1)
         amp_tmp = np.array(2 * amp[indices])
         # norm the data
         amp_tmp = amp_tmp / amp_tmp.sum() if amp_tmp.sum() > 0 else amp_tmp
@@ -391,7 +389,6 @@ def new_periodicity_scores(
                         strict=False,
                     )
                 ):
-                    print(dominant_freq)
                     score, new_text = weighted_ind_period_correlation(
                         dominant_freq, sampling_freq, signal, phi, start_time
                     )
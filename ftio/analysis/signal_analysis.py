@@ -9,7 +9,7 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
-import numpy as np
+from ftio.analysis._correlation import rolling_pearson
 
 
 def sliding_correlation(x, y, window_size):
@@ -23,14 +23,4 @@ def sliding_correlation(x, y, window_size):
     Returns:
         corrs: Array of local correlations
     """
-    n = len(x)
-    w = window_size
-    corrs = np.zeros(n - w + 1)
-    for i in range(len(corrs)):
-        x_win = x[i : i + w]
-        y_win = y[i : i + w]
-        if np.std(x_win) == 0 or np.std(y_win) == 0:
-            corrs[i] = 0
-        else:
-            corrs[i] = np.corrcoef(x_win, y_win)[0, 1]
-    return corrs
+    return rolling_pearson(x, y[: len(x)], window_size)
@@ -2,8 +2,12 @@
 This file provides a multiprocessing-safe queue implementation for managing file paths,
 ensuring that files are processed exactly once across multiple worker processes.
 
-The FileQueue class uses shared memory data structures to enable safe concurrent access
-and includes methods for adding, retrieving, and marking files as processed or failed.
+The FileQueue class keeps the items in an SQLite table (WAL mode) indexed by path, so
+adding, checking, and removing an item is a single indexed statement instead of a scan
+of a Manager list. The state transitions (pending -> copying -> done or failed) are
+atomic across processes. The table lives in a file: worker processes open their own
+connection to it, and with a persistent file (--file_queue) an interrupted stage-out
+resumes without recopying the items that were already copied.
 
 Author: Ahmad Tarraf
 Copyright (c) 2024-2026 TU Darmstadt, Germany
@@ -15,10 +19,40 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
-from multiprocessing import Manager
+from __future__ import annotations
+
+import atexit
+import contextlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
 
 from ftio.api.gekkoFs.gekko_helper import get_modification_time
 
+PENDING = "pending"
+COPYING = "copying"
+DONE = "done"
+FAILED = "failed"
+# states of items that are in the queue
+ACTIVE = (PENDING, COPYING)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    path TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    mtime REAL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state);
+CREATE TABLE IF NOT EXISTS ignored (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
 
 class FileQueue:
     """
@@ -26,18 +60,59 @@ class FileQueue:
     is processed exactly once across multiple worker processes.
 
     Files are only added if their folder is not already in the queue.
+
+    Args:
+        path: SQLite file of the queue. Defaults to a temporary file that is removed
+            when the creating process exits. The file is created on first use.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, path: str = "") -> None:
         """
-        Initialize the FileQueue with shared memory data structures.
+        Initialize the FileQueue. No file is opened until the queue is used.
         """
-        m = Manager()
-        self._queue = m.list()  # Files/folders to process
-        self._ignore = m.list()  # List of (timestamp, filename) tuples
-        self._lock = m.Lock()
+        self._temporary = not path
+        if self._temporary:
+            path = os.path.join(
+                tempfile.gettempdir(), f"ftio_file_queue_{os.getpid()}_{id(self)}.sqlite"
+            )
+            atexit.register(self._remove, os.getpid())
+        self.path = path
+        self._pid = None
+        self._db = None
+        self._lock = threading.Lock()
+
+    def open(self, path: str = "") -> None:
+        """
+        Switch to the queue at path and release the items of processes that no longer
+        run (e.g., of an interrupted stage-out) so that they are submitted again. Items
+        that were copied stay done.
+
+        Args:
+            path: SQLite file of the queue. Defaults to the current file.
+        """
+        if path and os.path.abspath(path) != os.path.abspath(self.path):
+            self._remove(os.getpid())
+            self.path = path
+            self._temporary = False
+            self._pid = None
+        with self._lock:
+            db = self._connect()
+            pids = [
+                pid
+                for (pid,) in db.execute(
+                    "SELECT DISTINCT pid FROM items WHERE state IN (?, ?)", ACTIVE
+                )
+                if not _is_running(pid)
+            ]
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                db.executemany(
+                    "UPDATE items SET state = ?, updated = ? "
+                    "WHERE pid = ? AND state IN (?, ?)",
+                    [(FAILED, time.time(), pid, *ACTIVE) for pid in pids],
+                )
 
-    def put(self, item: str) -> None:
+    def put(self, item: str) -> bool:
         """
         Add a file or folder to the queue.
 
@@ -46,27 +121,58 @@ class FileQueue:
 
         Args:
             item: The file or folder path to queue.
+
+        Returns:
+            True if the item was added, False if it (or its folder) is already queued.
         """
         with self._lock:
-            if "." in item:  # simple file check: has an extension
-                folder = item.rsplit("/", 1)[0] if "/" in item else ""
-                if folder not in self._queue and item not in self._queue:
-                    self._queue.append(item)
-            else:  # folder
-                if item not in self._queue:
-                    self._queue.append(item)
+            db = self._connect()
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                if "." in item:  # simple file check: has an extension
+                    folder = item.rsplit("/", 1)[0] if "/" in item else ""
+                    if self._active(db, folder):
+                        return False
+                cursor = db.execute(
+                    "INSERT INTO items (path, state, pid, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET state = excluded.state, "
+                    "pid = excluded.pid, mtime = NULL, updated = excluded.updated "
+                    "WHERE state NOT IN (?, ?)",
+                    (item, PENDING, os.getpid(), time.time(), *ACTIVE),
+                )
+                return cursor.rowcount == 1
 
     def get_next(self) -> str | None:
         """
-        Get the next item (file or folder) to process.
+        Get the next item (file or folder) to process and mark it as copying.
 
         Returns:
             A path string if available, otherwise None.
         """
         with self._lock:
-            if self._queue:
-                return self._queue.pop(0)
-            return None
+            db = self._connect()
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                rows = db.execute(
+                    "UPDATE items SET state = ?, pid = ?, updated = ? WHERE path = "
+                    "(SELECT path FROM items WHERE state = ? ORDER BY rowid LIMIT 1) "
+                    "RETURNING path",
+                    (COPYING, os.getpid(), time.time(), PENDING),
+                ).fetchall()
+        return rows[0][0] if rows else None
+
+    def mark_copying(self, item: str, mtime: float | None = None) -> bool:
+        """
+        Mark a queued item as being copied by this process.
+
+        Args:
+            item: The path that is copied.
+            mtime: Modification time of the copied item, used by `is_done`.
+
+        Returns:
+            True if the item was pending.
+        """
+        return self._transition(item, COPYING, (PENDING,), mtime)
 
     def mark_done(self, item: str) -> None:
         """
@@ -75,9 +181,7 @@ class FileQueue:
         Args:
             item: The path to mark as done.
         """
-        with self._lock:
-            if item in self._queue:
-                self._queue.remove(item)
+        self._transition(item, DONE, ACTIVE)
 
     def mark_failed(self, item: str) -> None:
         """
@@ -86,9 +190,7 @@ class FileQueue:
         Args:
             item: The path to mark as failed.
         """
-        with self._lock:
-            if item in self._queue:
-                self._queue.remove(item)
+        self._transition(item, FAILED, ACTIVE)
 
     def in_progress(self, item: str) -> bool:
         """
@@ -101,7 +203,31 @@ class FileQueue:
             True if the item exists in the queue, otherwise False.
         """
         with self._lock:
-            return item in self._queue
+            return self._active(self._connect(), item)
+
+    def is_done(self, args, item: str) -> bool:
+        """
+        Check if an item was already copied and has not been modified since, e.g., if
+        a stage-out was interrupted before the source was removed.
+
+        Args:
+            args: Parsed command line arguments (for the modification time).
+            item: The path to check.
+
+        Returns:
+            True if the same version of the item was copied.
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT mtime FROM items WHERE path = ? AND state = ?", (item, DONE)
+                )
+                .fetchone()
+            )
+        if row is None or row[0] is None:
+            return False
+        return get_modification_time(args, item) == row[0]
 
     def put_ignore(self, args, item: str):
         """
@@ -109,7 +235,13 @@ class FileQueue:
         """
         timestamp = get_modification_time(args, item)
         with self._lock:
-            self._ignore.append((timestamp, item))
+            db = self._connect()
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                db.execute(
+                    "INSERT OR REPLACE INTO ignored (path, mtime) VALUES (?, ?)",
+                    (item, timestamp),
+                )
 
     def is_ignored(self, args, itempath: str) -> bool:
         """
@@ -120,16 +252,19 @@ class FileQueue:
         """
         with self._lock:
             # Step 1: quick check if file name exists in ignore list
-            itemname = [fname for _, fname in self._ignore]
-            if itempath not in itemname:
-                return False
+            row = (
+                self._connect()
+                .execute("SELECT mtime FROM ignored WHERE path = ?", (itempath,))
+                .fetchone()
+            )
+        if row is None:
+            return False
 
         # Step 2: only now get the timestamp (expensive operation)
         timestamp = get_modification_time(args, itempath)
 
         # Step 3: check full (timestamp, filepath) pair
-        with self._lock:
-            return (timestamp, itempath) in self._ignore
+        return timestamp == row[0]
 
     def __len__(self) -> int:
         """
@@ -138,7 +273,12 @@ class FileQueue:
         Returns:
             The number of items in the queue.
         """
-        return len(self._queue)
+        with self._lock:
+            return (
+                self._connect()
+                .execute("SELECT COUNT(*) FROM items WHERE state IN (?, ?)", ACTIVE)
+                .fetchone()[0]
+            )
 
     def __str__(self) -> str:
         """
@@ -147,4 +287,67 @@ class FileQueue:
         Returns:
             A string representation of the queue contents.
         """
-        return f"FileQueue(queue size={len(self._queue)}, contents={list(self._queue)})"
+        with self._lock:
+            contents = [
+                path
+                for (path,) in self._connect().execute(
+                    "SELECT path FROM items WHERE state IN (?, ?) ORDER BY rowid", ACTIVE
+                )
+            ]
+        return f"FileQueue(queue size={len(contents)}, contents={contents})"
+
+    def _connect(self) -> sqlite3.Connection:
+        # a connection must not cross a fork, each process opens its own
+        if self._pid != os.getpid():
+            db = sqlite3.connect(
+                self.path, timeout=60, isolation_level=None, check_same_thread=False
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._db, self._pid = db, os.getpid()
+        return self._db
+
+    def _active(self, db: sqlite3.Connection, item: str) -> bool:
+        return (
+            db.execute(
+                "SELECT 1 FROM items WHERE path = ? AND state IN (?, ?)", (item, *ACTIVE)
+            ).fetchone()
+            is not None
+        )
+
+    def _transition(
+        self, item: str, state: str, states: tuple, mtime: float | None = None
+    ) -> bool:
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                cursor = db.execute(
+                    "UPDATE items SET state = ?, pid = ?, mtime = COALESCE(?, mtime), "
+                    f"updated = ? WHERE path = ? AND state IN ({','.join('?' * len(states))})",
+                    (state, os.getpid(), mtime, time.time(), item, *states),
+                )
+            return cursor.rowcount == 1
+
+    def _remove(self, pid: int) -> None:
+        # only the creating process removes its temporary queue
+        if not self._temporary or os.getpid() != pid:
+            return
+        if self._pid == pid:
+            self._db.close()
+        for suffix in ("", "-wal", "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.path + suffix)
+
+
+def _is_running(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,245 @@
+"""
+This module provides the event-driven flush scheduler of the data stager. The scheduler
+blocks on the trigger queue until either a new prediction arrives or the earliest flush
+deadline in its timer heap is due, so it uses no CPU while idle and fires a flush at its
+deadline instead of at the next poll.
+
+The strategies (--strategy) of the stage-out are:
+    - flush: flush in the predicted gap after the current I/O phase.
+    - job_end: flush when the remaining job time (--job_time) no longer fits the
+      predicted I/O.
+    - buffer_size: flush when the next predicted phase would exceed --buffer_size. The
+      buffer occupancy is the sum of the bytes written since the last flush, taken
+      from the request sizes in the GekkoFS messages.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import queue
+import sys
+import time
+from collections.abc import Callable
+from multiprocessing import Queue
+
+import numpy as np
+
+from ftio.api.gekkoFs.jit.logger import Logger
+
+TRIGGER_LOGGER = Logger(prefix="trigger", stream=sys.stdout).get()
+
+
+class FlushScheduler:
+    """
+    Schedules the flushes of the GekkoFS buffer from the predictions in `sync_trigger`.
+
+    Flush deadlines are kept in a timer heap. `run` waits on the trigger queue with a
+    timeout that ends at the earliest deadline.
+
+    Args:
+        sync_trigger: Queue with the predictions of the predictor. None stops `run`.
+        args: Parsed command line arguments of the data stager.
+        flush: Called with the prediction that triggered a flush and whether the
+            flush must finish before the scheduler continues.
+        clock: Wall clock, the predictions are timestamped with time.time().
+    """
+
+    def __init__(
+        self,
+        sync_trigger: Queue,
+        args: argparse.Namespace,
+        flush: Callable[[dict, bool], None],
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.sync_trigger = sync_trigger
+        self.args = args
+        self.flush = flush
+        self.clock = clock
+        # (deadline, sequence, prediction), the sequence keeps equal deadlines in order
+        self.timers = []
+        self._sequence = itertools.count()
+        # predictions that arrived while a forced flush was pending (skip)
+        self._held = []
+        # bytes written to the buffer since the last flush
+        self.occupancy = 0
+        self.skipped = 0
+        self.cancel_counter = 0
+        self.not_in_time = 0
+        if "flush" in args.strategy:
+            self._on_prediction = self._avoid_interference
+        elif "job_end" in args.strategy:
+            self._on_prediction = self._job_end
+        elif "buffer_size" in args.strategy:
+            self._on_prediction = self._buffer_size
+        else:
+            raise ValueError("Unknown strategy")
+
+    def run(self) -> None:
+        """
+        Handles the predictions and fires the flushes until None is received.
+        """
+        while True:
+            try:
+                prediction = self.sync_trigger.get(timeout=self.timeout())
+            except queue.Empty:
+                prediction = {}
+            if prediction is None:
+                return
+            self.fire_due()
+            if prediction:
+                self.on_prediction(prediction)
+
+    def timeout(self) -> float | None:
+        """
+        Time until the earliest deadline.
+
+        Returns:
+            The seconds until the next flush is due, or None if no flush is pending.
+        """
+        if not self.timers:
+            return None
+        return max(self.timers[0][0] - self.clock(), 0.0)
+
+    def schedule(self, deadline: float, prediction: dict) -> None:
+        """
+        Adds a flush at the wall clock time `deadline`.
+
+        Args:
+            deadline: Time at which the flush is due.
+            prediction: The prediction the flush belongs to.
+        """
+        heapq.heappush(self.timers, (deadline, next(self._sequence), prediction))
+
+    def fire_due(self) -> None:
+        """
+        Fires the flushes that are due.
+        """
+        while self.timers and self.timers[0][0] <= self.clock():
+            _, _, prediction = heapq.heappop(self.timers)
+            self._fire(prediction)
+
+    def on_prediction(self, prediction: dict) -> None:
+        """
+        Handles a new prediction according to the strategy.
+
+        Args:
+            prediction: The prediction from the predictor.
+        """
+        self._on_prediction(prediction, self.clock())
+
+    def _fire(self, prediction: dict) -> None:
+        if "flush" in self.args.strategy:
+            if prediction["probability"] > 0.5:
+                self._flush(prediction)
+                self.skipped = 0
+                self.cancel_counter = 0
+            held, self._held = self._held, []
+            for prediction in held:
+                self.on_prediction(prediction)
+        else:
+            self._flush(prediction)
+
+    def _flush(self, prediction: dict, wait: bool = False) -> None:
+        self.occupancy = 0
+        self.flush(prediction, wait)
+
+    def _avoid_interference(self, prediction: dict, now: float) -> None:
+        # if set to skip, the pending flush is skipped if a new prediction is available
+        # if set to cancel, the new prediction is canceled
+        # if empty, a flush is triggered with each prediction
+        handle_new_prediction = self.args.handle_new_prediction
+        if self.timers and handle_new_prediction:
+            if "skip" in handle_new_prediction:
+                self.skipped += 1
+                # if skipped more than 2, force flushing
+                if self.skipped >= 2:
+                    TRIGGER_LOGGER.warning(
+                        f"Too many skips, staging data out in {self.timeout():.3f} s"
+                    )
+                    self._held.append(prediction)
+                    return
+                TRIGGER_LOGGER.warning(
+                    f"Skipping, new prediction ready (skipped: {self.skipped})"
+                )
+                self.timers.clear()
+            else:
+                self.cancel_counter += 1
+                TRIGGER_LOGGER.warning(
+                    f"Canceled incoming prediction {self.cancel_counter}"
+                )
+                return
+
+        if np.isnan(prediction["freq"]):
+            return
+
+        # flush in the middle of the gap after the current phase
+        target_time = prediction["t_end"] + 1 / (prediction["freq"] * 2)
+        # t_flush contains the overhead of ftio + when the data was flushed from gekko
+        gkfs_elapsed_time = prediction["t_flush"] + now - prediction["t_wait"]
+        remaining_time = target_time - gkfs_elapsed_time
+        trigger_print(
+            f"Probability   : {prediction['probability'] * 100:.0f}%\n"
+            f"Elapsed time  : {gkfs_elapsed_time:.3f} s\n"
+            f"Target time   : {target_time:.3f} s\n"
+            f"--> trigger in {remaining_time:.3f} s",
+            src=prediction["source"],
+        )
+        if remaining_time > 0:
+            self.schedule(now + remaining_time, prediction)
+            return
+
+        self.not_in_time += 1
+        if self.not_in_time == 3:
+            TRIGGER_LOGGER.warning("Not in time 3 times, triggering flush")
+            self._flush(prediction, wait=True)
+            self.not_in_time = 0
+        else:
+            TRIGGER_LOGGER.warning("Skipping, not in time")
+
+    def _job_end(self, prediction: dict, now: float) -> None:
+        if np.isnan(prediction["freq"]):
+            return
+
+        deadline = self.args.job_time
+        gkfs_elapsed_time = prediction["t_flush"] + now - prediction["t_wait"]
+        next_flush_time = prediction["t_end"] + 1 / (prediction["freq"] * 2)
+        n_phases = (prediction["t_end"] - prediction["t_start"]) * prediction["freq"]
+        avr_time_per_phase = gkfs_elapsed_time / n_phases if n_phases > 0 else 0.0
+        # 1) is there enough time left to flush, and 2) does the next phase fit?
+        remaining_time = min(
+            0.8 * deadline - (gkfs_elapsed_time + next_flush_time),
+            deadline - (gkfs_elapsed_time + avr_time_per_phase),
+        )
+        # the latest prediction replaces the pending flush
+        self.timers.clear()
+        if remaining_time <= 0:
+            self._flush(prediction)
+        else:
+            self.schedule(now + remaining_time, prediction)
+
+    def _buffer_size(self, prediction: dict, now: float) -> None:
+        self.occupancy += prediction.get("bytes", 0)
+        if np.isnan(prediction["freq"]):
+            return
+
+        n_phases = (prediction["t_end"] - prediction["t_start"]) * prediction["freq"]
+        avr_bytes = int(prediction["total_bytes"] / n_phases) if n_phases > 0 else 0
+        if avr_bytes + self.occupancy > self.args.buffer_size:
+            self._flush(prediction)
+
+
+def trigger_print(text: str, src: str = "") -> None:
+    prefix = f"[{src}] " if src else ""
+    for line in text.splitlines():
+        TRIGGER_LOGGER.info(f"{prefix}{line}")
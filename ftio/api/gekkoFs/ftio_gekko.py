@@ -22,7 +22,7 @@ from ftio.freq.helper import MyConsole
 from ftio.freq.prediction import Prediction
 from ftio.multiprocessing.async_process import handle_in_process
 from ftio.parse.args import parse_args
-from ftio.parse.bandwidth import overlap
+from ftio.parse.bandwidth import fold_series, overlap
 from ftio.plot.helper import format_plot
 from ftio.plot.units import set_unit
 from ftio.prediction.helper import dump_json
@@ -33,22 +33,21 @@ CONSOLE.set(True)
 
 
 def run(
-    files_or_msgs: list, argv=None, b_app=None, t_app=None
-) -> tuple[Prediction, argparse.Namespace, float]:  # "0.01"] ):
+    files_or_msgs: list, argv=None, app_buffer=None
+) -> tuple[Prediction, argparse.Namespace, float, int]:  # "0.01"] ):
     """Executes ftio on a list of files_or_msgs.
 
     Args:
         files_or_msgs (list): list with msgpack msg or json files
         argv: command line arguments for ftio
-        b_app: app level bandwidth
-        t_app: app level timestamps
+        app_buffer (SharedRingBuffer): app level bandwidth and timestamps
+
+    Returns:
+        tuple: the prediction, the parsed arguments, the flush time of the data, and
+            the bytes of the requests in files_or_msgs
     """
 
     # parse args
-    if t_app is None:
-        t_app = []
-    if b_app is None:
-        b_app = []
     if argv is None:
         argv = ["-e", "plotly", "-f", "100"]
     args = parse_args(argv, "ftio")
@@ -101,21 +100,13 @@ def run(
         f"Total transferred in this burst: {bytes_total:.0f} bytes ({bytes_total/1e9:.3f} GB)"
     )
 
-    # # 5) Extend for ZMQ
+    # 5) overlap with app bandwidth so far (ZMQ)
     if "ZMQ" in ext.upper():
-        # extend data
-        b_app.extend(b)
-        t_app.extend(t)
-        b = np.array(b_app[:])
-        t = np.array(t_app[:])
-        # print(f"App Bandwidth: {b_app}")
-        # print(f"App Time: {t_app}")
-        # 5) overlap with app bandwdith so far
-        # b, t = overlap_two_series(b_app[:], t_app[:], b, t)
-        # t_app = t.tolist()
-        # b_app = b.tolist()
-        # print(f"App Bandwidth: {b_app}")
-        # print(f"App Time: {t_app}")
+        if app_buffer is not None:
+            # only the app series after the start of this batch is rewritten
+            app_buffer.update(lambda b_app, t_app: fold(b_app, t_app, b, t))
+            # consistent copy, as a concurrent prediction may rewrite the newest points
+            b, t = app_buffer.snapshot(copy=True)
 
     else:
         b = np.array(list(b))
@@ -157,7 +148,13 @@ def run(
     analysis_figures.show()
     process.join()
 
-    return prediction, args, data_rank["t_flush"]
+    return prediction, args, data_rank["t_flush"], int(np.sum(data_rank["req_size"]))
+
+
+def fold(b_app, t_app, b, t) -> tuple[int, tuple[np.ndarray, np.ndarray]]:
+    """Folds a batch into the app series, see SharedRingBuffer.update."""
+    start, b_out, t_out = fold_series(b_app, t_app, b, t)
+    return start, (b_out, t_out)
 
 
 if __name__ == "__main__":
@@ -36,7 +36,7 @@ class JitSettings:
         self.strategy = "flush"  # options are "flush", "job_end", and "buffer_size"
         self.job_time = 0  # time in seconds required for strategy "job_end"
         self.buffer_size = 0  # Size in bytes required for strategy "buffer_size"
-        self.flush_call = "cp"  # decide if compress (tar) or copy (cp)
+        self.flush_call = "cp"  # decide if compress (tar) or copy (cp or copy_range)
 
         # flags
         ##############
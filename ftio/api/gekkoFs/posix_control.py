@@ -5,6 +5,12 @@ The module leverages GekkoFS-specific environment variables and commands to mana
 efficiently. It also includes mechanisms for monitoring file modification times and ensuring
 compatibility with GekkoFS libraries.
 
+Files are flushed with cp (flush_using_cp), tar (flush_using_tar), or the copy engine of
+this module (flush_using_copy_range). The copy engine runs in a process with the GekkoFS
+preload. It preallocates the destination with fallocate and lets the kernel move the
+data with copy_file_range (or sendfile), so the data is not copied through user space.
+File systems without these calls fall back to pread/pwrite.
+
 Author: Ahmad Tarraf
 Copyright (c) 2024-2026 TU Darmstadt, Germany
 Version: v0.0.9
@@ -16,12 +22,15 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
 import argparse
-import math
-import mmap
+import ctypes
+import ctypes.util
+import errno
+import functools
 import os
 import re
 import sys
 import time
+from collections.abc import Callable
 from concurrent.futures import (
     ProcessPoolExecutor,
     ThreadPoolExecutor,
@@ -37,6 +46,21 @@ TRIGGER_LOGGER = Logger(prefix="trigger", stream=sys.stdout).get()
 
 files_in_progress = FileQueue()
 
+# copy engine (flush call copy_range)
+COPY_CHUNK = 64 * 1024 * 1024
+COPY_WORKERS = 4
+PWRITE_BUFFER = 8 * 1024 * 1024
+# errors of copy_file_range and sendfile on file systems that do not support them. A
+# GekkoFS preload that does not intercept the call passes its internal fd to the
+# kernel, which fails with EBADF.
+UNSUPPORTED_ERRNO = {
+    errno.ENOSYS,
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.EINVAL,
+    errno.EBADF,
+}
+
 
 def format_size(n_bytes: int) -> str:
     for unit in ("B", "KB", "MB", "GB", "TB"):
@@ -86,6 +110,8 @@ def move_files_os(
         triggered_by (str): Who initiated the flush — "ftio" (predictor) or "post_app".
     """
     TRIGGER_LOGGER.info("Moving files")
+    # resumes the queue of an interrupted stage-out (--file_queue)
+    files_in_progress.open(getattr(args, "file_queue", ""))
     args.ld_preload = (args.ld_preload or "").replace("libc_", "")
     if not os.path.exists(args.stage_out_path):
         os.makedirs(args.stage_out_path)
@@ -119,7 +145,9 @@ def move_files_os(
         f" from {args.gkfs_mntdir} → {args.stage_out_path}"
     )
 
-    if "cp" in args.flush_call:
+    if args.flush_call == "copy_range":
+        flush_using_copy_range(args, items_to_submit, period, triggered_by)
+    elif "cp" in args.flush_call:
         flush_using_cp(args, items_to_submit, period, triggered_by)
     else:  # flush using tar
         flush_using_tar(args, items_to_submit, triggered_by)
@@ -157,6 +185,7 @@ def flush_using_cp(
     items_to_submit: list[str],
     period: float,
     triggered_by: str = "ftio",
+    copy_call: Callable[[str, str, bool], str] | None = None,
 ):
     """
     Submits file processing tasks to a ProcessPoolExecutor and tracks progress, ensuring no
@@ -166,23 +195,31 @@ def flush_using_cp(
         items_to_submit (list[str]): List of items (file paths) that need to be processed.
         period (float): Time interval in seconds between task executions.
         triggered_by (str): Who initiated the flush — "ftio" or "post_app".
+        copy_call (Callable, optional): Builds the copy command of an item, see
+            cp_call. Defaults to cp_call.
     Returns:
         None
     """
+    if copy_call is None:
+        copy_call = cp_call
     # Step 3: Submit tasks to the executor ((only move the files if they are not
     # already in progress
     futures: dict = {}
     num_workers = args.parallel_move_threads
     with ProcessPoolExecutor(max_workers=num_workers) as executor:
         for idx, item in enumerate(items_to_submit):
-            # check that the item is not in progress and not  not in the ignored list
-            if not files_in_progress.in_progress(
-                item
-            ) and not files_in_progress.is_ignored(args, item):
-                files_in_progress.put(item)
-                futures[executor.submit(move_item, args, item, period, triggered_by)] = (
-                    idx
+            # skip ignored items and items copied before an interruption
+            if files_in_progress.is_ignored(args, item) or files_in_progress.is_done(
+                args, item
+            ):
+                if args.debug:
+                    TRIGGER_LOGGER.debug(f"Skipping {item}")
+            # put is atomic, so concurrent flushes do not move the same item
+            elif files_in_progress.put(item):
+                future = executor.submit(
+                    move_item, args, item, period, triggered_by, copy_call
                 )
+                futures[future] = idx
                 if args.debug:
                     TRIGGER_LOGGER.debug(f"Moving {item}")
             else:
@@ -202,12 +239,31 @@ def flush_using_cp(
             except Exception as e:
                 index = futures[future]
                 TRIGGER_LOGGER.error(f"{items_to_submit[index]} had an error: {e}")
-                files_in_progress.mark_done(items_to_submit[index])
+                files_in_progress.mark_failed(items_to_submit[index])
             remaining = len(files_in_progress)
             if remaining:
                 TRIGGER_LOGGER.info(f"{remaining} item(s) still in the queue")
 
 
+def flush_using_copy_range(
+    args: argparse.Namespace,
+    items_to_submit: list[str],
+    period: float,
+    triggered_by: str = "ftio",
+):
+    """
+    Flushes the items like flush_using_cp, but each item is copied by the copy engine of
+    this module (copy_item) in a preloaded process instead of cp.
+
+    Args:
+        args (argparse.Namespace): Command-line arguments namespace.
+        items_to_submit (list[str]): List of items (file paths) that need to be processed.
+        period (float): Time interval in seconds between task executions.
+        triggered_by (str): Who initiated the flush — "ftio" or "post_app".
+    """
+    flush_using_cp(args, items_to_submit, period, triggered_by, copy_range_call)
+
+
 def get_items_to_submit(files: list, args: argparse.Namespace, mode: str = "files"):
     """
     Determine which items (files or folders) should be submitted based on
@@ -283,6 +339,7 @@ def move_item(
     item: str,
     period: float = 0,
     triggered_by: str = "ftio",
+    copy_call: Callable[[str, str, bool], str] | None = None,
 ) -> None:
     """
     Stages out a single file if it matches the regex and meets modification time criteria.
@@ -292,9 +349,8 @@ def move_item(
         item (str): Name of the file to stage out.
         period (float): Expected I/O period used to derive mtime threshold.
         triggered_by (str): Who initiated the flush — "ftio" or "post_app".
+        copy_call (Callable, optional): Builds the copy command. Defaults to cp_call.
     """
-    fast = False  # fast copy still has an error with the preload
-
     # threshold = period / 2  # the IO took half the time
     threshold = 0  # already considered in calculation of flush time
     threshold = max(threshold, 5)
@@ -308,11 +364,8 @@ def move_item(
             f" (last modified {modification_time:.3f} s ago > threshold {threshold} s)"
         )
         os.makedirs(os.path.dirname(dst), exist_ok=True)
-        if fast:
-            # Todo: add mode for folder. However this currenlty not used
-            fast_chunk_copy_file(args, item, threads=4)
-        else:
-            copy_file_and_unlink(args, item, triggered_by)
+        files_in_progress.mark_copying(item, item_time)
+        copy_file_and_unlink(args, item, triggered_by, copy_call)
     else:
         TRIGGER_LOGGER.warning(
             f"Skipping {item}: too new (last modified {modification_time:.3f} s ago < threshold {threshold} s)"
@@ -321,7 +374,10 @@ def move_item(
 
 
 def copy_file_and_unlink(
-    args: argparse.Namespace, item: str, triggered_by: str = "ftio"
+    args: argparse.Namespace,
+    item: str,
+    triggered_by: str = "ftio",
+    copy_call: Callable[[str, str, bool], str] | None = None,
 ) -> None:
     """
     Copies a file or folder to the stage-out path and removes it from the source.
@@ -330,31 +386,31 @@ def copy_file_and_unlink(
         args (argparse.Namespace): Parsed command line arguments.
         item (str): Name of the file or folder to copy and remove.
         triggered_by (str): Who initiated the flush — "ftio" or "post_app".
+        copy_call (Callable, optional): Builds the copy command. Defaults to cp_call.
     """
+    if copy_call is None:
+        copy_call = cp_call
     flush_log = getattr(args, "flush_log", "")
-    # Preserve intermediate directories: copy into the parent of the intended
-    # destination so that e.g. .../checkpoints/epoch10 lands at
+    # Preserve intermediate directories: e.g. .../checkpoints/epoch10 lands at
     # stage_out_path/checkpoints/epoch10, not stage_out_path/epoch10.
     dst = item.replace(args.gkfs_mntdir, args.stage_out_path)
-    dst_parent = os.path.dirname(dst)
     try:
         preloaded_call(args, f"test -d {item}")
         is_dir = True
     except Exception:
         is_dir = False
+    cp_cmd = copy_call(item, dst, is_dir)
     if is_dir:
-        # -L: dereference symlinks so the destination holds real data, not
-        # dangling links after the source is unlinked.
-        cp_cmd = f"cp -rL {item} {dst_parent}"
         remove_cmd = f"find {item} -type f -exec unlink {{}} \\;"
     else:
-        cp_cmd = f"cp -L {item} {dst_parent}"
         remove_cmd = f"unlink {item}"
 
     TRIGGER_LOGGER.info(f"Copying {item} to {dst}")
     start = time.time()
     preloaded_call(args, cp_cmd)
     copy_time = time.time() - start
+    # a restart does not copy the item again, even if removing it fails
+    files_in_progress.mark_done(item)
     TRIGGER_LOGGER.info(f"Finished copying {item} ({copy_time:.3f} s)")
 
     start = time.time()
@@ -379,6 +435,41 @@ def copy_file_and_unlink(
     _write_flush_log(flush_log, item, dst, triggered_by, copy_time, delete_time)
 
 
+def cp_call(item: str, dst: str, is_dir: bool) -> str:
+    """
+    Builds the cp command that copies an item to dst.
+
+    Args:
+        item (str): File or folder to copy.
+        dst (str): Destination of the item.
+        is_dir (bool): Whether the item is a folder.
+
+    Returns:
+        str: Shell command.
+    """
+    # copy into the parent of the intended destination. -L: dereference symlinks so
+    # the destination holds real data, not dangling links after the source is unlinked.
+    if is_dir:
+        return f"cp -rL {item} {os.path.dirname(dst)}"
+    return f"cp -L {item} {os.path.dirname(dst)}"
+
+
+def copy_range_call(item: str, dst: str, is_dir: bool) -> str:
+    """
+    Builds the command that copies an item to dst with the copy engine (copy_item).
+    The engine follows symlinks like cp -L and handles files and folders.
+
+    Args:
+        item (str): File or folder to copy.
+        dst (str): Destination of the item.
+        is_dir (bool): Whether the item is a folder.
+
+    Returns:
+        str: Shell command.
+    """
+    return f"{sys.executable} -m ftio.api.gekkoFs.posix_control {item} {dst}"
+
+
 def delete_items(args: argparse.Namespace, items: list[str]) -> None:
     """
     Deletes a list of files or folders from the source.
@@ -453,32 +544,6 @@ def get_files(args: argparse.Namespace) -> list[str]:
         return []
 
 
-def write_chunk(
-    mmapped_file: mmap.mmap,
-    dst: str,
-    start: int,
-    end: int,
-    ld_preload: str = "",
-) -> None:
-    """
-    Writes a chunk of the file to the destination using memory mapping.
-
-    Args:
-        mmapped_file (mmap.mmap): Memory-mapped file object.
-        dst (str): Destination file path.
-        start (int): Start byte of the chunk.
-        end (int): End byte of the chunk.
-        ld_preload (str, optional): LD_PRELOAD environment variable. Defaults to None.
-    """
-    # Ensure the LD_PRELOAD is set in the thread environment
-    if ld_preload:
-        os.environ["LD_PRELOAD"] = str(ld_preload)
-
-    with open(dst, "r+b") as fdst:
-        fdst.seek(start)
-        fdst.write(mmapped_file[start:end])
-
-
 def copy_metadata(src: str, dst: str, ld_preload: str = None) -> None:
     """
     Copies metadata (permissions and timestamps) from the source to the destination file.
@@ -502,54 +567,168 @@ def copy_metadata(src: str, dst: str, ld_preload: str = None) -> None:
     os.chmod(dst, stat_info.st_mode)  # File permissions
 
 
-def fast_chunk_copy_file(
-    args: argparse.Namespace, file_name: str, threads: int = 4
-) -> None:
+def copy_item(src: str, dst: str, workers: int = COPY_WORKERS) -> None:
     """
-    Copies a single file in parallel using multiple threads.
+    Copies a file or a folder (recursively) to dst with copy_file. Like cp -rL,
+    symlinks are followed.
 
     Args:
-        args (argparse.Namespace): Parsed command line arguments.
-        file_name (str): Name of the file to copy.
-        threads (int, optional): Number of threads to use. Defaults to 4.
+        src (str): Source file or folder.
+        dst (str): Destination path of the item.
+        workers (int, optional): Threads per file. Defaults to COPY_WORKERS.
     """
-    src = file_name
-    dst = f"{args.stage_out_path}/{file_name}"  # Corrected dst path
-    os.environ["LIBGKFS_HOSTS_FILE"] = str(args.host_file)
-    os.environ["LD_PRELOAD"] = str(args.ld_preload) if args.ld_preload else ""
-
-    # Get file size using open() to avoid potential issues with os.path.getsize()
-    with open(src, "rb") as fsrc:
-        fsrc.seek(0, os.SEEK_END)
-        file_size = fsrc.tell()  # This retrieves the file size
-
-    # Memory-mapped file for reading (this will use LD_PRELOAD)
-    with open(src, "rb") as fsrc:
-        mmapped_file = mmap.mmap(fsrc.fileno(), 0, access=mmap.ACCESS_READ)
-
-    # Create an empty file at destination with the same size
-    with open(dst, "wb") as fdst:
-        fdst.write(b"\0" * file_size)
-
-    # Split file into chunks for each thread
-    chunk_size = math.ceil(file_size / threads)
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        futures = []
-        for i in range(threads):
-            start = i * chunk_size
-            end = min((i + 1) * chunk_size, file_size)
-            futures.append(
-                executor.submit(
-                    write_chunk, mmapped_file, dst, start, end, args.ld_preload
-                )
-            )
+    if not os.path.isdir(src):
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        copy_file(src, dst, workers)
+        return
+    for root, _, files in os.walk(src, followlinks=True):
+        target = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+        os.makedirs(target, exist_ok=True)
+        for name in files:
+            copy_file(os.path.join(root, name), os.path.join(target, name), workers)
+
+
+def copy_file(
+    src: str, dst: str, workers: int = COPY_WORKERS, chunk_size: int = COPY_CHUNK
+) -> str:
+    """
+    Copies a single file without moving the data through user space.
+
+    The destination is opened once and preallocated with fallocate, so no zeros are
+    written. The chunks are copied at their offsets with copy_file_range by up to
+    `workers` threads that share both file descriptors. If the file system does not
+    support copy_file_range, sendfile copies the file in a single pass, as it writes at
+    the file position. Without both, the chunks are copied with os.pread and os.pwrite.
+
+    Args:
+        src (str): Source file.
+        dst (str): Destination file.
+        workers (int, optional): Number of threads. Defaults to COPY_WORKERS.
+        chunk_size (int, optional): Bytes per chunk. Defaults to COPY_CHUNK.
+
+    Returns:
+        str: Method used: "copy_file_range", "sendfile", or "pwrite".
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            preallocate(dst_fd, size)
+            chunks = [
+                (offset, min(chunk_size, size - offset))
+                for offset in range(0, size, chunk_size)
+            ]
+            method = _copy_chunks(src_fd, dst_fd, size, chunks, workers)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    copy_metadata(src, dst)
+    return method
 
-        # Wait for all threads to finish
+
+def preallocate(fd: int, size: int) -> None:
+    """
+    Reserves the blocks of a file with fallocate(2) and sets its size. Unlike
+    os.posix_fallocate, this never falls back to writing zeros: file systems without
+    fallocate get a sparse file of the final size.
+
+    Args:
+        fd (int): File descriptor opened for writing.
+        size (int): Size of the file in bytes.
+    """
+    fallocate = _fallocate()
+    if size > 0 and fallocate is not None and fallocate(fd, 0, 0, size) == 0:
+        return
+    os.ftruncate(fd, size)
+
+
+@functools.cache
+def _fallocate():
+    """Returns the fallocate function of libc, or None if it is not available."""
+    libc_name = ctypes.util.find_library("c")
+    if libc_name is None:
+        return None
+    libc = ctypes.CDLL(libc_name, use_errno=True)
+    fallocate = getattr(libc, "fallocate64", None) or getattr(libc, "fallocate", None)
+    if fallocate is not None:
+        fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        fallocate.restype = ctypes.c_int
+    return fallocate
+
+
+def _copy_chunks(
+    src_fd: int, dst_fd: int, size: int, chunks: list[tuple[int, int]], workers: int
+) -> str:
+    if hasattr(os, "copy_file_range"):
+        # the first chunk shows whether the file systems support copy_file_range
+        try:
+            for offset, count in chunks[:1]:
+                _copy_range(src_fd, dst_fd, offset, count)
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNO:
+                raise
+        else:
+            _run_chunks(_copy_range, src_fd, dst_fd, chunks[1:], workers)
+            return "copy_file_range"
+    if hasattr(os, "sendfile"):
+        try:
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            _send_range(src_fd, dst_fd, 0, size)
+            return "sendfile"
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNO:
+                raise
+    _run_chunks(_pwrite_range, src_fd, dst_fd, chunks, workers)
+    return "pwrite"
+
+
+def _run_chunks(
+    func: Callable, src_fd: int, dst_fd: int, chunks: list[tuple[int, int]], workers: int
+) -> None:
+    if workers <= 1 or len(chunks) <= 1:
+        for offset, count in chunks:
+            func(src_fd, dst_fd, offset, count)
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        futures = [
+            executor.submit(func, src_fd, dst_fd, offset, count)
+            for offset, count in chunks
+        ]
         for future in futures:
             future.result()
 
-    # Copy metadata using os.utime and os.chmod (these system calls will be affected by LD_PRELOAD)
-    copy_metadata(src, dst, args.ld_preload)
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, count: int) -> None:
+    end = offset + count
+    while offset < end:
+        copied = os.copy_file_range(src_fd, dst_fd, end - offset, offset, offset)
+        if copied == 0:  # the source got shorter
+            break
+        offset += copied
+
+
+def _send_range(src_fd: int, dst_fd: int, offset: int, count: int) -> None:
+    end = offset + count
+    while offset < end:
+        sent = os.sendfile(dst_fd, src_fd, offset, end - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def _pwrite_range(src_fd: int, dst_fd: int, offset: int, count: int) -> None:
+    end = offset + count
+    while offset < end:
+        data = os.pread(src_fd, min(end - offset, PWRITE_BUFFER), offset)
+        if not data:
+            break
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(dst_fd, view, offset)
+            view = view[written:]
+            offset += written
 
 
 def jit_move(settings: JitSettings) -> None:
@@ -667,9 +846,10 @@ def jit_move(settings: JitSettings) -> None:
     parser.add_argument(
         "--flush_call",
         type=str,
-        choices=["cp", "tar"],
+        choices=["cp", "tar", "copy_range"],
         default="cp",
-        help="Flushing method: 'cp' to copy files or 'tar' to compress them.",
+        help="Flushing method: 'cp' to copy files, 'tar' to compress them, or "
+        "'copy_range' to copy them with copy_file_range (see posix_control).",
     )
 
     parser.add_argument(
@@ -678,6 +858,13 @@ def jit_move(settings: JitSettings) -> None:
         default=None,
         help="single node to flush with srun if fuse is set",
     )
+    parser.add_argument(
+        "--file_queue",
+        type=str,
+        default="",
+        help="SQLite file of the stage-out queue. An interrupted stage-out resumes "
+        "from it without copying the same files again. Defaults to a temporary file.",
+    )
     parser.add_argument(
         "--flush_log",
         type=str,
@@ -690,3 +877,8 @@ def jit_move(settings: JitSettings) -> None:
 
     if not settings.dry_run:
         move_files_os(parsed_args, triggered_by="post_app")
+
+
+if __name__ == "__main__":
+    # copy engine of copy_range_call, runs with the GekkoFS preload
+    copy_item(sys.argv[1], sys.argv[2])
@@ -16,6 +16,7 @@ from rich.console import Console
 import ftio.prediction.monitor as pm
 from ftio.api.gekkoFs.ftio_gekko import run
 from ftio.multiprocessing.async_process import handle_in_process
+from ftio.parse.args import parse_args
 from ftio.prediction.helper import export_extrap, get_dominant, print_data
 from ftio.prediction.online_analysis import (
     display_result,
@@ -51,7 +52,9 @@ def main(args: list[str] = None) -> None:
     matched_files = glob.glob(path)
 
     # Init
-    shared_resources = SharedResources()
+    shared_resources = SharedResources(
+        app_max_capacity=parse_args(args, "predictor").app_max_capacity
+    )
     procs = []
 
     # Init: Monitor a file
@@ -113,7 +116,7 @@ def prediction_process(
         raise RuntimeError("Error, number of buffers does not match number of files")
 
     # Perform prediction
-    prediction, parsed_args, _ = run(matched_files, args)
+    prediction, parsed_args, _, _ = run(matched_files, args)
 
     # get data
     freq = get_dominant(prediction)  # just get a single dominant value
@@ -131,7 +134,8 @@ def prediction_process(
         shared_resources.data.append(shared_resources.queue.get())
 
     _ = find_probability(shared_resources.data, counter=shared_resources.count.value)
-    shared_resources.count.value += 1
+    with shared_resources.lock:
+        shared_resources.count.value += 1
 
 
 if __name__ == "__main__":
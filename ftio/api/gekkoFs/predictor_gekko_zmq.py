@@ -77,7 +77,7 @@ def main(args: list[str] = sys.argv[1:]) -> None:
     poller.register(socket, zmq.POLLIN)
 
     # # Init
-    shared_resources = SharedResources()
+    shared_resources = SharedResources(app_max_capacity=data_stager_args.app_max_capacity)
 
     # for Cargo trigger process:
     trigger = handle_in_process(
@@ -156,15 +156,14 @@ def prediction_zmq_process(
     args.extend(["-ts", f"{shared_resources.start_time.value:.2f}"])
 
     # Perform prediction
-    prediction, parsed_args, t_flush = run(
-        msg, args, shared_resources.b_app, shared_resources.t_app
+    prediction, parsed_args, t_flush, n_bytes = run(
+        msg, args, shared_resources.app_buffer
     )
     shared_resources.t_flush.append(t_flush)
 
     # plot
-    plot_bar_with_rich(
-        shared_resources.t_app, shared_resources.b_app, width_percentage=0.8
-    )
+    b_app, t_app = shared_resources.app_buffer.snapshot(copy=True)
+    plot_bar_with_rich(t_app, b_app, width_percentage=0.8)
 
     # get data
     freq, conf = get_dominant_and_conf(prediction)  # just get a single dominant value
@@ -213,12 +212,15 @@ def prediction_zmq_process(
             "conf": conf,
             "probability": probability,
             "total_bytes": total_bytes,
+            # bytes written by this batch, i.e., added to the GekkoFS buffer
+            "bytes": n_bytes,
             "source": f"#{shared_resources.count.value}",
         }
     )
 
     console.print(f"[purple][PREDICTOR] (#{shared_resources.count.value}):[/] Ended")
-    shared_resources.count.value += 1  # proc-safe, as manager already handles this
+    with shared_resources.lock:
+        shared_resources.count.value += 1
 
 
 if __name__ == "__main__":
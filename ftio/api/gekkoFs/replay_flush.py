@@ -0,0 +1,582 @@
+"""
+This module replays a GekkoFS message stream offline through the ZMQ predictor
+(ftio_gekko.run) and the flush strategies of the data stager (FlushScheduler), and
+simulates the burst buffer and the parallel file system (PFS) to compare the strategies
+without a GekkoFS deployment.
+
+The stream is either recorded (msgpack files with one GekkoFS message each, as read by
+predictor_gekko) or synthetic (periodic write phases). Messages are grouped into batches
+like receive_messages: a batch ends when no message follows within --window seconds,
+and its prediction is available at that time. The scheduler runs on the application
+time of the stream, so a replay is deterministic. Only the prediction overhead is the
+measured wall time of the predictor. As in the predictor, ftio_gekko.run writes
+bandwidth.json to the working directory.
+
+Simulation model:
+    - The data of a request enters the burst buffer at its end time.
+    - A flush stages out all buffered data at the PFS bandwidth. Flushes are served in
+      order, and data written during a flush stays for the next one.
+    - At the end of the application the remaining data is staged out (post_app).
+    - While a flush reads from the burst buffer, the application writes that exceed the
+      burst buffer bandwidth are delayed.
+
+Usage:
+    replay_flush [--files 'write*.msgpack'] [--strategies flush job_end buffer_size] -- [ftio args]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import glob
+import io
+import logging
+import sys
+import time
+from dataclasses import dataclass
+
+import msgpack
+import numpy as np
+
+from ftio.api.gekkoFs.flush_scheduler import TRIGGER_LOGGER, FlushScheduler
+from ftio.api.gekkoFs.ftio_gekko import run
+from ftio.api.gekkoFs.parse_gekko import parse
+from ftio.multiprocessing.shared_ring_buffer import SharedRingBuffer
+from ftio.parse.bandwidth import overlap
+from ftio.prediction.helper import get_dominant_and_conf
+from ftio.prediction.probability_analysis import find_probability
+
+STRATEGIES = ["flush", "job_end", "buffer_size"]
+
+
+@dataclass
+class Requests:
+    """Write requests of the stream, sorted by their end time."""
+
+    t_start: np.ndarray
+    t_end: np.ndarray
+    size: np.ndarray
+
+
+@dataclass
+class Result:
+    """Metrics of one strategy, see `simulate`."""
+
+    strategy: str
+    flushes: int
+    interference: float
+    delay: float
+    latency: float
+    max_latency: float
+    peak_occupancy: float
+    drain_time: float
+    overhead: float
+
+
+def synthetic_stream(
+    ranks: int = 4,
+    phases: int = 20,
+    period: float = 10.0,
+    phase_time: float = 2.0,
+    phase_bytes: float = 1e9,
+    requests: int = 10,
+    interval: float = 1.0,
+    jitter: float = 0.0,
+    seed: int = 0,
+) -> list[tuple[float, bytes]]:
+    """
+    Generates the GekkoFS messages of an application with periodic write phases.
+
+    Each rank writes `phase_bytes` in `requests` requests per phase. Every `interval`
+    seconds, each rank sends a message with the requests that ended in the interval.
+
+    Args:
+        ranks: Number of ranks.
+        phases: Number of write phases.
+        period: Time between the start of two phases in seconds.
+        phase_time: Duration of a phase in seconds.
+        phase_bytes: Bytes per rank and phase.
+        requests: Requests per rank and phase.
+        interval: Time between two messages of a rank in seconds.
+        jitter: Standard deviation of the phase start in seconds.
+        seed: Seed of the jitter.
+
+    Returns:
+        The messages and their send time in seconds, sorted by time.
+    """
+    rng = np.random.default_rng(seed)
+    starts = np.arange(phases) * period + np.abs(rng.normal(0, jitter, phases))
+    duration = phase_time / requests
+    messages = []
+    for rank in range(ranks):
+        t_s = (starts[:, None] + np.arange(requests) * duration).ravel()
+        t_e = t_s + duration
+        size = np.full(len(t_s), int(phase_bytes / requests))
+        slot = np.ceil(t_e / interval).astype(np.int64)
+        for s in np.unique(slot):
+            mask = slot == s
+            t = float(s * interval)
+            messages.append((t, gekko_message(t, rank, t_s[mask], t_e[mask], size[mask])))
+    messages.sort(key=lambda x: x[0])
+    return messages
+
+
+def gekko_message(
+    t_flush: float, pid: int, t_start: np.ndarray, t_end: np.ndarray, size: np.ndarray
+) -> bytes:
+    """
+    Packs write requests into a GekkoFS message (see parse_gekko.assign).
+
+    Args:
+        t_flush: Time the message is sent in seconds.
+        pid: Process id of the rank.
+        t_start: Start time of the requests in seconds.
+        t_end: End time of the requests in seconds.
+        size: Size of the requests in bytes.
+
+    Returns:
+        The message.
+    """
+    fields = [
+        int(t_flush * 1e6),
+        "replay",
+        pid,
+        "w",
+        (np.asarray(t_start) * 1e6).astype(np.int64).tolist(),
+        (np.asarray(t_end) * 1e6).astype(np.int64).tolist(),
+        np.asarray(size, dtype=np.int64).tolist(),
+        len(size),
+        int(np.sum(size)),
+    ]
+    return b"".join(msgpack.packb(field) for field in fields)
+
+
+def recorded_stream(pattern: str) -> list[tuple[float, bytes]]:
+    """
+    Reads recorded GekkoFS messages, one message per msgpack file.
+
+    Args:
+        pattern: Glob pattern of the files.
+
+    Returns:
+        The messages and their send time (flush_t) in seconds, sorted by time.
+    """
+    messages = []
+    for file in sorted(glob.glob(pattern)):
+        with open(file, "rb") as f:
+            msg = f.read()
+        t_flush = next(iter(msgpack.Unpacker(io.BytesIO(msg))))
+        if isinstance(t_flush, dict):
+            t_flush = t_flush["flush_t"]
+        messages.append((t_flush * 1e-6, msg))
+    messages.sort(key=lambda x: x[0])
+    return messages
+
+
+def batches(
+    messages: list[tuple[float, bytes]], window: float = 1.0
+) -> list[tuple[float, list[bytes]]]:
+    """
+    Groups the messages into the batches of receive_messages.
+
+    Args:
+        messages: Messages and their send time, sorted by time.
+        window: Quiet time in seconds that ends a batch.
+
+    Returns:
+        The batches and the time at which they are complete.
+    """
+    out = []
+    for t, msg in messages:
+        if out and t - out[-1][0] <= window:
+            out[-1][0] = t
+            out[-1][1].append(msg)
+        else:
+            out.append([t, [msg]])
+    return [(t + window, msgs) for t, msgs in out]
+
+
+def write_requests(messages: list[tuple[float, bytes]], io_type: str = "w") -> Requests:
+    """
+    Extracts the write requests of the messages.
+
+    Args:
+        messages: Messages and their send time.
+        io_type: I/O type of the requests, see parse_gekko.
+
+    Returns:
+        The requests sorted by their end time.
+    """
+    t_s, t_e, size = [], [], []
+    for _, msg in messages:
+        data, _ = parse(msg, _empty_rank_data(), io_type=io_type)
+        if data["avg_throughput"]:
+            t_s.extend(data["t_start"])
+            t_e.extend(data["t_end"])
+            size.extend(data["req_size"])
+    order = np.argsort(t_e, kind="stable")
+    return Requests(
+        np.asarray(t_s, dtype=float)[order],
+        np.asarray(t_e, dtype=float)[order],
+        np.asarray(size, dtype=float)[order],
+    )
+
+
+def predict(
+    batch_list: list[tuple[float, list[bytes]]],
+    ftio_args: list[str],
+    verbose: bool = False,
+) -> tuple[list[dict], np.ndarray]:
+    """
+    Runs the predictor of predictor_gekko_zmq on each batch.
+
+    Args:
+        batch_list: Batches and the time at which they are complete.
+        ftio_args: Arguments of ftio.
+        verbose: Print the output of ftio.
+
+    Returns:
+        The messages of the predictor to the trigger, with the batch time as t_wait
+        and t_flush, and the wall time of each prediction in seconds.
+    """
+    app_buffer = SharedRingBuffer(columns=2)
+    data = []
+    predictions = []
+    overhead = []
+    try:
+        for count, (t_batch, msgs) in enumerate(batch_list):
+            tik = time.perf_counter()
+            with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+                prediction, _, _, n_bytes = run(msgs, list(ftio_args), app_buffer)
+                freq, conf = get_dominant_and_conf(prediction)
+                data.append(
+                    {
+                        "phase": count,
+                        "dominant_freq": prediction.dominant_freq,
+                        "conf": prediction.conf,
+                        "amp": prediction.amp,
+                        "phi": prediction.phi,
+                        "t_start": prediction.t_start,
+                        "t_end": prediction.t_end,
+                        "total_bytes": prediction.total_bytes,
+                        "ranks": prediction.ranks,
+                        "freq": prediction.freq,
+                    }
+                )
+                probability = -1
+                for p in find_probability(data, counter=count):
+                    if p.get_freq_prob(freq):
+                        probability = p.p_freq_given_periodic
+                        break
+            overhead.append(time.perf_counter() - tik)
+            predictions.append(
+                {
+                    "t_wait": t_batch,
+                    "t_end": prediction.t_end,
+                    "t_start": prediction.t_start,
+                    "t_flush": t_batch,
+                    "freq": freq,
+                    "conf": conf,
+                    "probability": probability,
+                    "total_bytes": 0 if np.isnan(freq) else prediction.total_bytes,
+                    "bytes": n_bytes,
+                    "source": f"#{count}",
+                }
+            )
+    finally:
+        app_buffer.close()
+    return predictions, np.asarray(overhead)
+
+
+def schedule(
+    predictions: list[dict], args: argparse.Namespace, t_app_end: float
+) -> list[float]:
+    """
+    Runs the FlushScheduler on the predictions with the application time as clock.
+
+    Args:
+        predictions: Messages of the predictor, sorted by t_wait.
+        args: Arguments of the scheduler (strategy, handle_new_prediction, job_time,
+            buffer_size).
+        t_app_end: End of the application. Later flushes are not triggered.
+
+    Returns:
+        The times of the flushes.
+    """
+    now = [0.0]
+    flushes = []
+    scheduler = FlushScheduler(
+        None, args, lambda prediction, wait: flushes.append(float(now[0])), lambda: now[0]
+    )
+
+    def advance(t: float) -> None:
+        while scheduler.timers and scheduler.timers[0][0] <= t:
+            now[0] = scheduler.timers[0][0]
+            scheduler.fire_due()
+        now[0] = t
+
+    for prediction in predictions:
+        if prediction["t_wait"] > t_app_end:
+            break
+        advance(prediction["t_wait"])
+        scheduler.on_prediction(prediction)
+    advance(t_app_end)
+    return flushes
+
+
+def simulate(
+    requests: Requests,
+    flushes: list[float],
+    pfs_bandwidth: float,
+    bb_bandwidth: float,
+) -> dict:
+    """
+    Simulates the burst buffer for the flushes, see the model in the module docstring.
+
+    Args:
+        requests: Write requests of the application.
+        flushes: Times of the flushes.
+        pfs_bandwidth: Bandwidth of the PFS in B/s.
+        bb_bandwidth: Bandwidth of the burst buffer in B/s.
+
+    Returns:
+        - interference: flush time during application I/O in seconds
+        - delay: delay of the application writes in seconds
+        - latency, max_latency: mean (per byte) and maximum time from the write of the
+          data to the end of its stage-out in seconds
+        - peak_occupancy: maximum of the buffered data in bytes
+        - drain_time: time from the end of the application until all data is staged
+          out in seconds
+    """
+    t_app_end = float(requests.t_end[-1])
+    written = np.cumsum(requests.size)
+    # serve the flushes in order, the post_app stage-out last
+    starts, ends, drained = [], [], []
+    t_free, n_drained = 0.0, 0.0
+    for t in [*sorted(flushes), t_app_end]:
+        start = max(t, t_free)
+        n = np.searchsorted(requests.t_end, start, side="right")
+        total = written[n - 1] if n else 0.0
+        if total > n_drained or t == t_app_end:
+            t_free = start + (total - n_drained) / pfs_bandwidth
+            starts.append(start)
+            ends.append(t_free)
+            drained.append(total)
+            n_drained = total
+    starts, ends, drained = np.array(starts), np.array(ends), np.array(drained)
+
+    # a request is staged out by the first flush that starts after its end
+    latency = ends[np.searchsorted(starts, requests.t_end)] - requests.t_end
+    # buffered data after each write, the data of a flush leaves during the flush
+    j = np.searchsorted(starts, requests.t_end, side="right") - 1
+    before = np.concatenate(([0.0], drained))[j]
+    progress = np.clip(
+        (requests.t_end - starts[j]) / np.maximum(ends[j] - starts[j], 1e-12), 0, 1
+    )
+    flushed = np.where(j >= 0, before + progress * (drained[j] - before), 0.0)
+
+    # interference of the flushes (except post_app) with the application writes
+    duration = np.maximum(requests.t_end - requests.t_start, 1e-6)
+    b_app, t_app = overlap(requests.size / duration, requests.t_start, requests.t_end)
+    b_app, t_app = np.asarray(b_app), np.asarray(t_app)
+    drain_time = ends[-1] - t_app_end
+    starts, ends = starts[:-1], ends[:-1]
+    grid = np.unique(np.concatenate((t_app, starts, ends)))
+    dt = np.diff(grid)
+    i = np.searchsorted(t_app, grid[:-1], side="right") - 1
+    b = np.where(i >= 0, b_app[i], 0.0)
+    f = np.searchsorted(starts, grid[:-1], side="right") - 1
+    flushing = (f >= 0) & (grid[:-1] < np.append(ends, 0.0)[f])
+    excess = np.maximum(b + pfs_bandwidth - bb_bandwidth, 0) * flushing
+    return {
+        "interference": float(np.sum(dt * (flushing & (b > 0)))),
+        "delay": float(np.sum(excess * dt) / bb_bandwidth),
+        "latency": float(np.sum(latency * requests.size) / np.sum(requests.size)),
+        "max_latency": float(np.max(latency)),
+        "peak_occupancy": float(np.max(written - flushed)),
+        "drain_time": float(drain_time),
+    }
+
+
+def replay(
+    messages: list[tuple[float, bytes]],
+    args: argparse.Namespace,
+    ftio_args: list[str],
+) -> list[Result]:
+    """
+    Replays the messages for each strategy in args.strategies.
+
+    Args:
+        messages: Messages and their send time, sorted by time.
+        args: Parsed arguments of the replay, see `parse_args_replay`.
+        ftio_args: Arguments of ftio.
+
+    Returns:
+        The metrics of each strategy and of post_app (stage-out at the end only).
+    """
+    requests = write_requests(messages)
+    t_app_end = float(requests.t_end[-1])
+    predictions, overhead = predict(
+        batches(messages, args.window), ftio_args, args.verbose
+    )
+    scheduler_args = argparse.Namespace(
+        handle_new_prediction=args.handle_new_prediction,
+        job_time=args.job_time or 1.2 * t_app_end,
+        buffer_size=args.buffer_size or np.sum(requests.size) / 4,
+    )
+    level = TRIGGER_LOGGER.level
+    if not args.verbose:
+        TRIGGER_LOGGER.setLevel(logging.ERROR)
+    try:
+        results = []
+        for strategy in ["post_app", *args.strategies]:
+            flushes = []
+            if strategy != "post_app":
+                scheduler_args.strategy = strategy
+                flushes = schedule(predictions, scheduler_args, t_app_end)
+            metrics = simulate(requests, flushes, args.pfs_bandwidth, args.bb_bandwidth)
+            results.append(
+                Result(
+                    strategy, len(flushes), overhead=float(np.sum(overhead)), **metrics
+                )
+            )
+    finally:
+        TRIGGER_LOGGER.setLevel(level)
+    return results
+
+
+def print_results(results: list[Result]) -> None:
+    """Prints the metrics of the strategies as a table."""
+    print(
+        f"{'strategy':>12} {'flushes':>8} {'interf. [s]':>12} {'delay [s]':>10} "
+        f"{'latency [s]':>12} {'max lat. [s]':>13} {'peak [GB]':>10} {'drain [s]':>10} "
+        f"{'overhead [s]':>13}"
+    )
+    for r in results:
+        print(
+            f"{r.strategy:>12} {r.flushes:>8} {r.interference:>12.2f} {r.delay:>10.3f} "
+            f"{r.latency:>12.2f} {r.max_latency:>13.2f} {r.peak_occupancy / 1e9:>10.2f} "
+            f"{r.drain_time:>10.2f} {r.overhead:>13.3f}"
+        )
+
+
+def parse_args_replay(args: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """
+    Parses the arguments of the replay. Arguments after '--' are passed to ftio.
+
+    Args:
+        args: Command line arguments.
+
+    Returns:
+        The parsed arguments and the arguments of ftio.
+    """
+    ftio_args = ["-e", "no", "--zmq"]
+    if "--" in args:
+        ftio_args = args[args.index("--") + 1 :] + ftio_args
+        args = args[: args.index("--")]
+    parser = argparse.ArgumentParser(
+        description="Replays a GekkoFS message stream through the predictor and the "
+        "flush strategies",
+        prog="replay_flush",
+        epilog="Use '--' to separate the replay arguments from the ftio arguments.",
+    )
+    parser.add_argument(
+        "--files",
+        type=str,
+        default="",
+        help="Glob pattern of recorded GekkoFS messages (one msgpack message per "
+        "file). Defaults to a synthetic stream.",
+    )
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument(
+        "--handle_new_prediction", choices={"skip", "cancel", ""}, default="cancel"
+    )
+    parser.add_argument(
+        "--job_time",
+        type=float,
+        default=0,
+        help="Job time of job_end in seconds. Defaults to 1.2 times the application time.",
+    )
+    parser.add_argument(
+        "--buffer_size",
+        type=float,
+        default=0,
+        help="Buffer size of buffer_size in bytes. Defaults to a quarter of the data.",
+    )
+    parser.add_argument(
+        "--pfs_bandwidth", type=float, default=1e9, help="PFS bandwidth in B/s"
+    )
+    parser.add_argument(
+        "--bb_bandwidth", type=float, default=4e9, help="Burst buffer bandwidth in B/s"
+    )
+    parser.add_argument(
+        "--window", type=float, default=1.0, help="Quiet time that ends a batch in s"
+    )
+    # synthetic stream
+    parser.add_argument("--ranks", type=int, default=4)
+    parser.add_argument("--phases", type=int, default=20)
+    parser.add_argument("--period", type=float, default=10.0)
+    parser.add_argument("--phase_time", type=float, default=2.0)
+    parser.add_argument("--phase_bytes", type=float, default=1e9, help="per rank")
+    parser.add_argument("--requests", type=int, default=10, help="per rank and phase")
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Time between two messages of a rank"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="store_true", default=False)
+    return parser.parse_args(args), ftio_args
+
+
+def main(args: list[str] = sys.argv[1:]) -> None:
+    """
+    Replays a recorded or synthetic GekkoFS message stream and prints the metrics of
+    the flush strategies.
+
+    Args:
+        args: Command line arguments, see `parse_args_replay`.
+    """
+    args, ftio_args = parse_args_replay(args)
+    if args.files:
+        messages = recorded_stream(args.files)
+    else:
+        messages = synthetic_stream(
+            args.ranks,
+            args.phases,
+            args.period,
+            args.phase_time,
+            args.phase_bytes,
+            args.requests,
+            args.interval,
+            args.jitter,
+            args.seed,
+        )
+    print_results(replay(messages, args, ftio_args))
+
+
+def _empty_rank_data() -> dict:
+    return {
+        "avg_throughput": [],
+        "t_end": [],
+        "t_start": [],
+        "hostname": "",
+        "pid": 0,
+        "io_type": "",
+        "req_size": [],
+        "total_bytes": 0,
+        "total_iops": 0,
+        "t_flush": 0.0,
+    }
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
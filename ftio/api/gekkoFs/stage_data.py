@@ -16,27 +16,20 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 import argparse
 import os
 import sys
-import time
 from concurrent.futures import ProcessPoolExecutor
 from multiprocessing import Queue
 
-import numpy as np
-
-from ftio.api.gekkoFs.gekko_helper import preloaded_call
-from ftio.api.gekkoFs.jit.logger import Logger
+from ftio.api.gekkoFs.flush_scheduler import (
+    TRIGGER_LOGGER,
+    FlushScheduler,
+    trigger_print,
+)
 from ftio.api.gekkoFs.posix_control import move_files_os
 from ftio.freq.helper import MyConsole
 from ftio.parse.args import parse_args
 
 CONSOLE = MyConsole()
 CONSOLE.set(True)
-TRIGGER_LOGGER = Logger(prefix="trigger", stream=sys.stdout).get()
-
-
-def trigger_print(text: str, src: str = "") -> None:
-    prefix = f"[{src}] " if src else ""
-    for line in text.splitlines():
-        TRIGGER_LOGGER.info(f"{prefix}{line}")
 
 
 def _stage_files_safe(args: argparse.Namespace, latest_prediction: dict) -> None:
@@ -95,185 +88,25 @@ def trigger_flush(sync_trigger: Queue, args: argparse.Namespace) -> None:
     """
     Sends cargo calls by extracting predictions from `sync_trigger` and examining them.
 
-    Args:
-        sync_trigger (Queue): A queue from multiprocessing.Manager containing predictions.
-        args (Namespace): Parsed command line arguments.
-    """
-    if "flush" in args.strategy:
-        strategy_avoid_interference(sync_trigger, args)
-    elif "job_end" in args.strategy or "buffer_size" in args.strategy:
-        pass
-    else:
-        raise ValueError("Unknown strategy")
-
-
-def strategy_job_end(sync_trigger: Queue, args: argparse.Namespace) -> None:
-    with ProcessPoolExecutor(max_workers=2) as executor:
-        while True:
-            try:
-                if not sync_trigger.empty():
-                    latest_prediction = sync_trigger.get()
-                    deadline = args.job_time
-                    if not np.isnan(latest_prediction["freq"]):
-                        t = time.time() - latest_prediction["t_wait"]
-                        gkfs_elapsed_time = latest_prediction["t_flush"] + t
-                        next_flush_time = latest_prediction["t_end"] + 1 / (
-                            latest_prediction["freq"] * 2
-                        )
-                        # 1) do we have enough time to flush?
-                        remaining_time = 0.8 * deadline - (
-                            gkfs_elapsed_time + next_flush_time
-                        )
-                        # 2)
-                        t_s = latest_prediction["t_start"]
-                        t_e = latest_prediction["t_end"]
-                        n_phases = (t_e - t_s) * latest_prediction["freq"]
-                        avr_time_per_phase = gkfs_elapsed_time / n_phases
-
-                        if (
-                            remaining_time <= 0
-                            or gkfs_elapsed_time + avr_time_per_phase > deadline
-                        ):
-                            _ = executor.submit(
-                                _stage_files_safe, args, latest_prediction
-                            )
-                time.sleep(0.01)
-            except KeyboardInterrupt:
-                exit()
-
-
-def strategy_buffer_size(sync_trigger: Queue, args: argparse.Namespace) -> None:
-    with ProcessPoolExecutor(max_workers=2) as executor:
-        while True:
-            try:
-                if not sync_trigger.empty():
-                    latest_prediction = sync_trigger.get()
-                    size_call = f"du -sb {args.gkfs_mntdir}/*"
-                    output = preloaded_call(args, size_call)
-                    buffer_occupation = sum(
-                        int(line.split()[0]) for line in output.splitlines()
-                    )
-                    if not np.isnan(latest_prediction["freq"]):
-                        total_size = latest_prediction["total_bytes"]
-                        t_s = latest_prediction["t_start"]
-                        t_e = latest_prediction["t_end"]
-                        n_phases = (t_e - t_s) * latest_prediction["freq"]
-                        avr_bytes = int(total_size / float(n_phases))
-                        if avr_bytes + buffer_occupation > args.buffer_size:
-                            _ = executor.submit(
-                                _stage_files_safe, args, latest_prediction
-                            )
-                time.sleep(0.01)
-            except KeyboardInterrupt:
-                exit()
-
-
-def strategy_avoid_interference(sync_trigger: Queue, args: argparse.Namespace) -> None:
-    """
-    Sends cargo calls by extracting predictions from `sync_trigger` and examining them.
+    The FlushScheduler blocks on `sync_trigger` until a prediction arrives or a flush
+    is due, see flush_scheduler.py for the strategies.
 
     Args:
         sync_trigger (Queue): A queue from multiprocessing.Manager containing predictions.
         args (Namespace): Parsed command line arguments.
     """
-
-    # if set to skip, the trigger will skip the latest_prediction if a new one is available
-    # if set to cancel, the latest latest_prediction is canceled
-    # if empty, cargo is triggered with each latest_prediction
-    # change_detection = ""
-    # change_detection = "skip"
-    # adaptive = "cancel"
-    handle_new_prediction = args.handle_new_prediction
-    not_in_time = 0
-    skipped = 0
-    cancel_counter = 0
     with ProcessPoolExecutor(max_workers=5) as executor:
-        while True:
-            try:
-                if not sync_trigger.empty():
-                    latest_prediction = sync_trigger.get()
-                    t = time.time() - latest_prediction["t_wait"]  # time waiting so far
-                    # CONSOLE.print(f"[bold green][Trigger] queue wait time = {t:.3f} s[/]\n")
-                    if not np.isnan(latest_prediction["freq"]):
-                        # ? 1) Find estimated number of phases and skip in case less than 1
-                        # n_phases = (latest_prediction['t_end']- latest_prediction['t_start'])*latest_prediction['freq']
-                        # if n_phases <= 1:
-                        #     CONSOLE.print(f"[bold green][Trigger] Skipping this latest_prediction[/]\n")
-                        #     continue
-
-                        # ? 2) Time analysis to find the right instance when to send the data
-                        target_time = latest_prediction["t_end"] + 1 / (
-                            latest_prediction["freq"] * 2
-                        )
-                        gkfs_elapsed_time = (
-                            latest_prediction["t_flush"] + t
-                        )  # t is the waiting time in this function. t_flush contains the overhead of ftio + when the data was flushed from gekko
-                        remaining_time = target_time - gkfs_elapsed_time
-                        trigger_print(
-                            f"Probability   : {latest_prediction['probability'] * 100:.0f}%\n"
-                            f"Elapsed time  : {gkfs_elapsed_time:.3f} s\n"
-                            f"Target time   : {target_time:.3f} s\n"
-                            f"--> trigger in {remaining_time:.3f} s",
-                            src=latest_prediction["source"],
-                        )
-                        if remaining_time > 0:
-                            countdown = time.time() + remaining_time
-                            # wait till the time elapses:
-                            while time.time() < countdown:
-                                # ? 3) While waiting, cancel new latest_prediction is available
-                                condition = True
-                                if handle_new_prediction:
-                                    if not sync_trigger.empty():
-                                        if "skip" in handle_new_prediction:
-                                            skipped += 1
-                                            condition = False
-                                            # if skipped more than 2, force flushing
-                                            if skipped >= 2:
-                                                if not condition:
-                                                    condition = True  # continue waiting until the time ends
-                                                    TRIGGER_LOGGER.warning(
-                                                        f"Too many skips, staging data out in {time.time() < countdown} s"
-                                                    )
-                                            else:
-                                                TRIGGER_LOGGER.warning(
-                                                    f"Skipping, new prediction ready (skipped: {skipped})"
-                                                )
-                                                break  # no need to wait
-                                    else:
-                                        # remove the new latest_prediction from the queue
-                                        _ = sync_trigger.get()
-                                        # used only for counting
-                                        cancel_counter += 1
-                                        TRIGGER_LOGGER.warning(
-                                            f"Canceled incoming prediction {cancel_counter}"
-                                        )
-                                time.sleep(0.01)
-
-                            if condition and latest_prediction["probability"] > 0.5:
-                                _ = executor.submit(
-                                    _stage_files_safe, args, latest_prediction
-                                )
-                                # stage_files(args, latest_prediction)
-                                skipped = 0
-                                cancel_counter = 0
-                            else:
-                                # TODO: skip only of the predictions overlap
-                                pass
-
-                        else:
-                            not_in_time += 1
-                            if not_in_time == 3:
-                                TRIGGER_LOGGER.warning(
-                                    "Not in time 3 times, triggering flush"
-                                )
-                                _stage_files_safe(args, latest_prediction)
-                                not_in_time = 0
-                            else:
-                                TRIGGER_LOGGER.warning("Skipping, not in time")
-
-                time.sleep(0.01)
-            except KeyboardInterrupt:
-                exit()
+
+        def flush(latest_prediction: dict, wait: bool) -> None:
+            if wait:
+                _stage_files_safe(args, latest_prediction)
+            else:
+                _ = executor.submit(_stage_files_safe, args, latest_prediction)
+
+        try:
+            FlushScheduler(sync_trigger, args, flush).run()
+        except KeyboardInterrupt:
+            exit()
 
 
 def move_files_cargo(args: argparse.Namespace, period: float = 0) -> None:
@@ -450,9 +283,10 @@ def parse_args_data_stager(
     parser.add_argument(
         "--flush_call",
         type=str,
-        choices=["cp", "tar"],
+        choices=["cp", "tar", "copy_range"],
         default="cp",
-        help="Flushing method: 'cp' to copy files or 'tar' to compress them.",
+        help="Flushing method: 'cp' to copy files, 'tar' to compress them, or "
+        "'copy_range' to copy them with copy_file_range (see posix_control).",
     )
 
     parser.add_argument(
@@ -470,6 +304,13 @@ def parse_args_data_stager(
         "JIT creates this file just before launching the application so that "
         "I/O from pre-application calls does not trigger early predictions.",
     )
+    parser.add_argument(
+        "--file_queue",
+        type=str,
+        default="",
+        help="SQLite file of the stage-out queue. An interrupted stage-out resumes "
+        "from it without copying the same files again. Defaults to a temporary file.",
+    )
     parser.add_argument(
         "--flush_log",
         dest="flush_log",
@@ -36,7 +36,11 @@ from ftio.api.metric_proxy.proxy_cluster import dbscan, optics
 from ftio.api.metric_proxy.req import MetricProxy
 from ftio.freq.helper import MyConsole
 from ftio.prediction.helper import print_data
-from ftio.prediction.tasks import ftio_metric_task, ftio_metric_task_save
+from ftio.prediction.tasks import (
+    ftio_metric_batch,
+    ftio_metric_task,
+    ftio_metric_task_save,
+)
 
 
 def parse_args():
@@ -90,6 +94,12 @@ def parse_args():
         default=False,
         help="parallel or not",
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        default=False,
+        help="analyzes all metrics at once with a single vectorized FFT instead of one process per metric",
+    )
     parser.add_argument(
         "-S",
         "--sample_freq_proxy",
@@ -151,6 +161,7 @@ def main(args: argparse.Namespace = parse_args()) -> None:
 
     console.print(
         "[blue]\nSettings:\n---------[/]\n"
+        f"[blue]- batch: {args.batch}[/]\n"
         f"[blue]- parallel: {not args.disable_parallel}[/]\n"
         f"[blue]- future: {not pools}[/]\n"
         f"[blue]- proxy: {args.proxy}[/]\n\n"
@@ -183,7 +194,9 @@ def main(args: argparse.Namespace = parse_args()) -> None:
             exit(0)
         ftio_metric_task(args.metric, array, ftio_args, ranks, True)
     else:
-        if not args.disable_parallel:
+        if args.batch:
+            data = execute_batch(metrics, ftio_args, ranks, show)
+        elif not args.disable_parallel:
             data = execute_parallel(metrics, ftio_args, ranks, show, pools)
         else:
             data = execute(metrics, ftio_args, ranks, show)
@@ -253,6 +266,17 @@ def execute_parallel(
     return data
 
 
+def execute_batch(metrics: dict, argv: list, ranks: int, show: bool = False):
+    console = MyConsole()
+    console.set(True)
+    start = time.time()
+    data = ftio_metric_batch(metrics, argv, ranks, show)
+    console.print(
+        f"[green]Processed {len(metrics)} metrics in one batch:[/] {time.time()-start:.3f} s"
+    )
+    return data
+
+
 def execute(metrics: dict, argv: list, ranks: int, show: bool):
     data = []
     save = True
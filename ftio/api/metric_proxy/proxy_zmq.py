@@ -22,7 +22,11 @@ import numpy as np
 import zmq
 from rich.console import Console
 
-from ftio.api.metric_proxy.parallel_proxy import execute, execute_parallel
+from ftio.api.metric_proxy.parallel_proxy import (
+    execute,
+    execute_batch,
+    execute_parallel,
+)
 from ftio.api.metric_proxy.parse_proxy import filter_metrics
 from ftio.freq.helper import MyConsole
 
@@ -68,6 +72,7 @@ def handle_request(msg: bytes) -> bytes:
         argv.extend(["-e", "no"])
 
         disable_parallel = req.get("disable_parallel", False)
+        batch = req.get("batch", False)
 
         ranks = 32
 
@@ -76,7 +81,9 @@ def handle_request(msg: bytes) -> bytes:
 
     try:
         t = time.process_time()
-        if disable_parallel:
+        if batch:
+            data = execute_batch(metrics, argv, ranks)
+        elif disable_parallel:
             data = execute(metrics, argv, ranks, False)
         else:
             data = execute_parallel(metrics, argv, ranks)
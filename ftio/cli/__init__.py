@@ -14,7 +14,21 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
-from ftio.cli.ftio_core import core, main
-from ftio.cli.predictor import main as predictor_main
+import importlib
 
 __all__ = ["core", "main", "predictor_main"]
+
+# the entry points are imported on first access, so running one CLI (or importing
+# ftio.cli.ftio_core in a prediction process) does not load the other one
+_LAZY = {
+    "core": ("ftio.cli.ftio_core", "core"),
+    "main": ("ftio.cli.ftio_core", "main"),
+    "predictor_main": ("ftio.cli.predictor", "main"),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        module, attr = _LAZY[name]
+        return getattr(importlib.import_module(module), attr)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
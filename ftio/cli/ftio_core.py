@@ -27,11 +27,12 @@ import numpy as np
 
 from ftio.freq._analysis_figures import AnalysisFigures
 from ftio.freq._dft_workflow import ftio_dft
-from ftio.freq._stft_workflow import ftio_stft
-from ftio.freq._wavelet_cont_workflow import ftio_wavelet_cont
-from ftio.freq._wavelet_disc_workflow import ftio_wavelet_disc
 from ftio.freq.autocorrelation import find_autocorrelation
-from ftio.freq.helper import MyConsole, append_messages
+from ftio.freq.helper import (
+    MyConsole,
+    append_messages,
+    append_messages_incremental,
+)
 from ftio.freq.prediction import Prediction
 from ftio.freq.time_window import data_in_time_window
 from ftio.parse.extract import get_time_behavior_and_args
@@ -73,7 +74,10 @@ def main(
 
     # Handle shared resource
     if shared_resource is not None:
-        data = append_messages(data, shared_resource)
+        if args.incremental and "dft" in args.transformation:
+            data = append_messages_incremental(data, shared_resource, args)
+        else:
+            data = append_messages(data, shared_resource)
 
     list_analysis_figures = []
     list_predictions = []
@@ -168,26 +172,43 @@ def freq_analysis(args: Namespace, data: dict) -> tuple[Prediction, AnalysisFigu
     total_bytes = data.get("total_bytes", 0)
     ranks = data.get("ranks", 0)
 
+    engine = data.get("incremental")
+
     #! Extract relevant data
-    bandwidth, time_b, text = data_in_time_window(
-        args, bandwidth, time_b, total_bytes, ranks
-    )
+    if engine is not None:
+        bandwidth, time_b = engine.b_sampled, engine.t_sampled
+        total_bytes = engine.total_bytes
+        text = (
+            f"Ranks: [cyan]{ranks}[/]\n"
+            f"[green]Incremental window: {engine.t_start:.2f} -- {engine.t_last:.2f}[/] s\n"
+            f"Total bytes: [cyan]{total_bytes:.2e} bytes[/]\n"
+        )
+    else:
+        bandwidth, time_b, text = data_in_time_window(
+            args, bandwidth, time_b, total_bytes, ranks
+        )
 
     #! Perform transformation
     if "dft" in args.transformation:
         prediction, analysis_figures = ftio_dft(
-            args, bandwidth, time_b, total_bytes, ranks, text
+            args, bandwidth, time_b, total_bytes, ranks, text, engine
         )
 
     elif "wave_disc" in args.transformation or "dwt" in args.transformation:
+        from ftio.freq._wavelet_disc_workflow import ftio_wavelet_disc
+
         prediction, analysis_figures = ftio_wavelet_disc(
             args, bandwidth, time_b, ranks, total_bytes
         )
 
     elif "wave_cont" in args.transformation or "cwt" in args.transformation:
+        from ftio.freq._wavelet_cont_workflow import ftio_wavelet_cont
+
         prediction, analysis_figures = ftio_wavelet_cont(args, bandwidth, time_b, ranks)
 
     elif "stft" in args.transformation and "astft" not in args.transformation:
+        from ftio.freq._stft_workflow import ftio_stft
+
         prediction, analysis_figures = ftio_stft(
             args, bandwidth, time_b, total_bytes, ranks, text
         )
@@ -231,6 +252,11 @@ def freq_analysis(args: Namespace, data: dict) -> tuple[Prediction, AnalysisFigu
 
 
 def run():
+    if len(sys.argv) > 1 and sys.argv[1] == "warmup":
+        from ftio.cli.warmup import main as warmup
+
+        warmup(sys.argv[2:])
+        return
     _ = main(sys.argv)
 
 
@@ -16,10 +16,9 @@ from __future__ import annotations
 import sys
 
 from ftio.gui.socket_logger import init_socket_logger
+from ftio.parse.args import parse_args
 from ftio.parse.helper import print_info
-from ftio.prediction.pools import predictor_with_pools
 from ftio.prediction.processes import predictor_with_processes
-from ftio.prediction.processes_zmq import predictor_with_processes_zmq
 from ftio.prediction.shared_resources import SharedResources
 
 
@@ -31,7 +30,7 @@ def main(args: list[str] = sys.argv) -> None:
     """
     # Init
     print_info("Predictor", False)
-    shared_resources = SharedResources()
+    shared_resources = SharedResources(app_max_capacity=parse_args(args).app_max_capacity)
     mode = "procs"  # "procs" or "pool"
 
     # Initialize GUI socket logger if --gui flag is present
@@ -42,10 +41,14 @@ def main(args: list[str] = sys.argv) -> None:
 
     if "pool" in mode.lower():
         # prediction with a Pool of process and a callback mechanism
+        from ftio.prediction.pools import predictor_with_pools
+
         predictor_with_pools(shared_resources, args)
     else:
         if any("zmq" in x for x in args):
             # prediction with Processes of process and a callback mechanism + zmq
+            from ftio.prediction.processes_zmq import predictor_with_processes_zmq
+
             predictor_with_processes_zmq(
                 shared_resources,
                 args,
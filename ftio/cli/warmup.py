@@ -0,0 +1,74 @@
+"""
+`ftio warmup`: compiles all numba kernels into the cache ahead of time.
+
+Run it once after the installation or at the start of a job (with the same
+FTIO_CACHE_DIR as the later runs), so the first prediction loads the kernels from
+the cache instead of compiling them.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from ftio.freq.helper import MyConsole
+from ftio.util.jit_cache import CACHE_ENV, cache_dir, compile_kernels, set_cache_dir
+
+
+def main(argv: list[str] = sys.argv[1:]) -> None:
+    """Compiles the kernels and prints the time per kernel signature.
+
+    Args:
+        argv (list[str]): arguments without the program name
+    """
+    parser = argparse.ArgumentParser(
+        prog="ftio warmup",
+        description="Compiles the numba kernels of FTIO into the cache.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=str,
+        default=os.environ.get(CACHE_ENV, ""),
+        help=f"Directory of the numba cache. Defaults to ${CACHE_ENV} if set, "
+        "otherwise numba's default location.",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Only print a summary."
+    )
+    args = parser.parse_args(argv)
+
+    console = MyConsole(verbose=not args.quiet)
+    if args.cache_dir:
+        set_cache_dir(args.cache_dir)
+    tik = time.perf_counter()
+    results = compile_kernels()
+    for r in results:
+        state = "loaded from cache" if r.cached else "compiled"
+        console.print(
+            f"  '-> [cyan]{r.name}[/] {r.signature}: {state} in {r.seconds:.3f} s"
+        )
+
+    n_cached = sum(r.cached for r in results)
+    console.info(
+        f"[green]Warmup finished:[/] {len(results) - n_cached} compiled, {n_cached} loaded "
+        f"from cache in {time.perf_counter() - tik:.3f} s "
+        f"(cache: {cache_dir() or 'numba default'})"
+    )
+    if args.cache_dir and os.environ.get(CACHE_ENV) != cache_dir():
+        console.info(f"Use the cache with: export {CACHE_ENV}={cache_dir()}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -20,7 +20,7 @@ from scipy.fft import fft, ifft
 from scipy.signal import hilbert
 from vmdpy import VMD
 
-from ftio.analysis._correlation import correlation
+from ftio.analysis._correlation import correlation, rolling_pearson
 from ftio.analysis.anomaly_detection import z_score
 from ftio.freq._astft import simple_astft
 from ftio.freq.denoise import tfpf_wvd
@@ -259,10 +259,9 @@ def imf_select_windowed(signal, t, u_per, fs, overlap=0.5):
         ind, start, flag = 0, 0, False
         skip = int(est_per * overlap)
         max_len = min(len(imf), len(signal))
+        corrs = rolling_pearson(signal[:max_len], imf[:max_len], win_size)
         while ind + win_size < max_len:
-            sig_win = signal[ind : ind + win_size].astype(float)
-            imf_win = imf[ind : ind + win_size].astype(float)
-            corr = correlation(sig_win, imf_win, method="pearson")
+            corr = corrs[ind]
             if corr > 0.65 and not flag:
                 start, flag = ind, True
             elif corr <= 0.65 and flag:
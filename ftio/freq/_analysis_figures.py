@@ -11,12 +11,8 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 
 from argparse import Namespace
 
-import matplotlib.figure  # to check type
-import matplotlib.pyplot as plt
 import numpy as np
 
-from ftio.freq.freq_html import create_html
-
 
 class AnalysisFigures:
     def __init__(
@@ -157,6 +153,9 @@ class AnalysisFigures:
         if condition is None:
             condition = any(x in self.args.engine for x in ["mat", "plot"])
         if condition and "mat" in self.args.engine:
+            import matplotlib.figure  # to check type
+            import matplotlib.pyplot as plt
+
             figs_to_show = []
             for fig in fig_list:
                 # Matplotlib clears the figure after show()
@@ -171,6 +170,8 @@ class AnalysisFigures:
             if figs_to_show:
                 plt.show()
         elif condition:
+            from ftio.freq.freq_html import create_html
+
             conf = {"toImageButtonOptions": {"format": "png", "scale": 4}}
             create_html(fig_list, self.args.render, conf, name)
 
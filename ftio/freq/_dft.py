@@ -11,9 +11,14 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
-import matplotlib.pyplot as plt
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 #!################
@@ -32,27 +37,21 @@ def compute_dft_spectrum(b: np.ndarray, fs: float):
     - phi: np.ndarray, phases of the frequency components.
     - freqs: np.ndarray, corresponding frequency bins.
     """
-    # Compute DFT of the signal
-    X = dft(b)
-    n = len(X)
+    # Compute DFT of the signal, only the positive frequencies (half of the DFT result)
+    X = rdft(b)
+    n = len(b)
 
     # Calculate the amplitude (magnitude) of the frequency components
     amp = np.abs(X)
+    amp[
+        1:
+    ] *= 2  # Double the amplitude for the positive frequencies (except the DC component)
 
     # Calculate the phase (angle) of the frequency components
     phi = np.angle(X)
 
     # Compute the frequencies
-    freqs = fs * np.arange(0, n) / n
-
-    # Only keep the positive frequencies (half of the DFT result)
-    indices = np.arange(0, int(len(amp) / 2) + 1)
-    amp = amp[indices]  # Keep the amplitude
-    amp[
-        1:
-    ] *= 2  # Double the amplitude for the positive frequencies (except the DC component)
-    phi = phi[indices]  # Keep the corresponding phase values
-    freqs = freqs[indices]
+    freqs = fs * np.arange(0, len(X)) / n
 
     return (
         amp,
@@ -78,6 +77,53 @@ def dft(b: np.ndarray) -> np.ndarray:
     return numpy_dft(b)
 
 
+def rdft(b: np.ndarray, n: int | None = None) -> np.ndarray:
+    """
+    Wrapper function to compute the DFT of a real signal. As the spectrum is
+    symmetric, only the bins 0 to n/2 are computed (see full_spectrum).
+
+    Parameters:
+    - b: np.ndarray, real input signal in the time domain.
+    - n: int, optional length of the transform. The signal is zero-padded if n is
+      larger than len(b). Defaults to len(b).
+
+    Returns:
+    - np.ndarray, bins 0 to n/2 of the DFT of the input signal.
+    """
+    return np.fft.rfft(b, n)
+
+
+def mirror_index(n: int) -> np.ndarray:
+    """
+    Indices of the half spectrum that mirror the bins n/2+1 to n-1 (X[k] = conj(X[n-k])).
+
+    Parameters:
+    - n: int, number of samples of the transformed signal.
+
+    Returns:
+    - np.ndarray, the indices n-k for k = n/2+1, ..., n-1.
+    """
+    return n - np.arange(n // 2 + 1, n)
+
+
+def full_spectrum(X: np.ndarray, n: int, shift: complex = 1) -> np.ndarray:
+    """
+    Expands a half spectrum (from rdft) to the layout of the full spectrum (from dft).
+    Only needed for plotting.
+
+    Parameters:
+    - X: np.ndarray, bins 0 to n/2 of the DFT.
+    - n: int, number of samples of the transformed signal.
+    - shift: complex, factor of the mirrored bins. If X was multiplied by
+      exp(-2j*pi*f_k*t_0), pass exp(-2j*pi*fs*t_0) so that the full spectrum matches
+      dft(b) multiplied by the same phase correction.
+
+    Returns:
+    - np.ndarray, the full spectrum with n bins.
+    """
+    return np.concatenate([X, np.conj(X[mirror_index(n)]) * shift])
+
+
 #! 1) Custom implementation
 def dft_fast(b: np.ndarray) -> np.ndarray:
     """
@@ -147,8 +193,8 @@ def precision_dft(
     """calculates the precision of the dft
 
     Args:
-        amp (np.ndarray): amplitude array from DFT
-        phi (np.ndarray): phase array from DFT
+        amp (np.ndarray): amplitude array from DFT (half or full spectrum)
+        phi (np.ndarray): phase array from DFT (half or full spectrum)
         dominant_index (np.ndarray): index/indices of dominant frequency/frequencies
         b_sampled (np.ndarray): discretized bandwidth
         t_disc (np.ndarray): discretized time (constant step size). Start at t_0
@@ -162,11 +208,14 @@ def precision_dft(
     showplot = False
     text = ""
     if showplot and ("mat" in plt_engine or "plotly" in plt_engine):
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(10, 5))
-    dc_offset = np.zeros(len(amp))
+    n = len(b_sampled)
+    dc_offset = np.zeros(n)
     for index in dominant_index:
-        x = dc_offset + 2 * (1 / len(amp)) * amp[index] * np.cos(
-            2 * np.pi * np.arange(0, len(amp)) * (index) / (len(amp)) + phi[index]
+        x = dc_offset + 2 * (1 / n) * amp[index] * np.cos(
+            2 * np.pi * np.arange(0, n) * (index) / n + phi[index]
         )
         x[x < 0] = 0
         x_2 = x.copy()
@@ -219,14 +268,26 @@ def prepare_plot_dft(
         b_sampled: An array of sampled bandwidth values.
         ranks: The number of ranks.
 
+    The spectrum (freq_arr, conf, amp, phi) can be the half spectrum (bins 0 to n/2),
+    which is mirrored to the n bins of b_sampled.
+
     Returns:
         tuple[list[pd.DataFrame], list[pd.DataFrame]]: A tuple containing two lists of DataFrames:
             - The first list contains a DataFrame with amplitude (A), phase (phi), sampled bandwidth (b_sampled), ranks, frequency (freq),
             period (T), and confidence (conf) values.
             - The second list contains a DataFrame with the dominant frequency, its index (k), its confidence, and the ranks.
     """
+    import pandas as pd
+
     df0 = []
     df1 = []
+    n = len(b_sampled)
+    if len(amp) < n:
+        index = mirror_index(n)
+        freq_arr = freq_arr[1] * np.arange(0, n) if n > 1 else freq_arr
+        conf = np.concatenate([conf, conf[index]])
+        amp = np.concatenate([amp, amp[index]])
+        phi = np.concatenate([phi, -phi[index]])
 
     df0.append(
         pd.DataFrame(
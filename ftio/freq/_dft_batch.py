@@ -0,0 +1,190 @@
+"""
+Batch DFT workflow: analyzes many signals (e.g., the metrics of a metric proxy trace)
+with a single vectorized FFT instead of one `core` call per signal.
+
+Signals are discretized like in `ftio_dft`. Signals that end up on the same grid
+(same start time, sampling frequency, and number of samples) are stacked into a
+matrix that is transformed with one `np.fft.rfft` call, followed by the outlier
+detection vectorized along the signal axis. For a common time base (the usual case
+for metric proxy traces), all signals form a single group. The results match
+`ftio_dft` per signal up to floating point rounding.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import time
+from argparse import Namespace
+
+import numpy as np
+
+from ftio.analysis.anomaly_detection import outlier_detection_batch
+from ftio.freq.discretize import _sample_fast
+from ftio.freq.helper import MyConsole
+from ftio.freq.prediction import Prediction
+from ftio.freq.time_window import data_in_time_window
+
+
+def batch_supported(args: Namespace) -> bool:
+    """Checks if the arguments can be handled by `ftio_dft_batch`. Everything that
+    needs the single signal (filters, autocorrelation, periodicity detection,
+    Fourier fit, plots, ...) goes through `core` instead.
+
+    Args:
+        args (Namespace): parsed arguments
+
+    Returns:
+        bool: True if the batch workflow applies
+    """
+    return (
+        args.transformation == "dft"
+        and args.outlier.lower() in ["z-score", "zscore", "find peaks", "peaks", "peak"]
+        and not args.filter_type
+        and not args.autocorrelation
+        and not args.machine_learning
+        and not args.periodicity_detection
+        and not args.fourier_fit
+        and not getattr(args, "burst_width", False)
+        and not any(x in args.engine for x in ["mat", "plot"])
+    )
+
+
+def sampling_grid(t: np.ndarray, args: Namespace) -> tuple[float, int]:
+    """Sampling frequency and number of samples as chosen by `sample_data`.
+
+    Args:
+        t (np.ndarray): time stamps of the signal
+        args (Namespace): parsed arguments containing freq and memory_limit
+
+    Returns:
+        tuple[float, int]: sampling frequency and number of samples
+    """
+    duration = t[-1] - t[0]
+    freq = args.freq
+    if freq == -1:
+        delta = np.diff(t)
+        delta = delta[delta > 0]
+        freq = 2 / delta.min() if len(delta) > 0 else 0
+        n = int(np.floor(duration * freq))
+        limit_n = int(args.memory_limit * 1000**3 // np.dtype(np.float64).itemsize)
+        if limit_n < n:
+            n = limit_n
+            freq = n / duration if duration > 0 else 10
+    else:
+        n = int(np.floor(duration * freq))
+
+    return freq, n
+
+
+def ftio_dft_batch(
+    args: Namespace,
+    signals: np.ndarray | list[tuple[np.ndarray, np.ndarray]],
+    time_stamps: np.ndarray | None = None,
+    total_bytes: int | list[int] = 0,
+    ranks: int = 1,
+) -> list[Prediction | None]:
+    """
+    Performs the DFT workflow (discretization, DFT, and outlier detection) on many
+    signals at once.
+
+    Args:
+        args (Namespace): parsed arguments (see `batch_supported` for the supported ones).
+        signals (np.ndarray | list[tuple[np.ndarray, np.ndarray]]): Either a 2D array with
+            one bandwidth signal per row sharing `time_stamps`, or a list of
+            (bandwidth, time) pairs.
+        time_stamps (np.ndarray, optional): Time points of the rows if `signals` is a 2D
+            array. Defaults to None.
+        total_bytes (int | list[int], optional): Total bytes of all or of each signal.
+            Defaults to 0.
+        ranks (int, optional): The number of ranks. Defaults to 1.
+
+    Returns:
+        list[Prediction | None]: One prediction per signal, None if the signal has too
+            few samples to be analyzed.
+    """
+    console = MyConsole(verbose=args.verbose)
+    tik = time.time()
+    if time_stamps is not None:
+        signals = [(b, time_stamps) for b in np.atleast_2d(signals)]
+    if np.isscalar(total_bytes):
+        total_bytes = [total_bytes] * len(signals)
+
+    #! Group the signals according to their sampling grid
+    predictions = [None] * len(signals)
+    groups = {}
+    for i, (bandwidth, time_b) in enumerate(signals):
+        bandwidth = np.asarray(bandwidth, dtype=np.float64)
+        time_b = np.asarray(time_b, dtype=np.float64)
+        if len(time_b) < 2:
+            continue
+        bandwidth, time_b, _ = data_in_time_window(
+            args, bandwidth, time_b, total_bytes[i], ranks
+        )
+        if len(time_b) < 2:
+            continue
+        freq, n = sampling_grid(time_b, args)
+        if n <= 0:
+            continue
+        groups.setdefault((time_b[0], freq, n), []).append((i, bandwidth, time_b))
+
+    #! One FFT and outlier detection per group
+    for (t_0, freq, n), members in groups.items():
+        b_sampled = np.empty((len(members), n))
+        for row, (_, bandwidth, time_b) in zip(b_sampled, members, strict=True):
+            _sample_fast(bandwidth, time_b, freq, n, row)
+
+        frequencies = freq * np.arange(0, n // 2 + 1) / n
+        X = np.fft.rfft(b_sampled, axis=1)
+        # Correct phase offset due to start time t0
+        X *= np.exp(-2j * np.pi * frequencies * t_0)
+        amp = abs(X)
+        phi = np.arctan2(X.imag, X.real)
+        dominant_index, conf = outlier_detection_batch(amp, frequencies, args, n)
+        # confidence of bin k is conf[k-1], the DC offset is ignored
+        conf = np.hstack((np.full((len(conf), 1), np.inf), conf))
+
+        n_top = int(np.ceil(n / 2))
+        if args.n_freq > 0:
+            top_candidates = np.argsort(-amp[:, :n_top], axis=1)
+            top_candidates = top_candidates[:, : int(min(n_top, args.n_freq))]
+
+        for row, (i, _, time_b) in enumerate(members):
+            index = dominant_index[row]
+            prediction = Prediction(
+                args.transformation,
+                time_b[0],
+                time_b[-1],
+                total_bytes[i],
+                freq,
+                ranks,
+                n,
+            )
+            prediction.dominant_freq = frequencies[index]
+            prediction.conf = conf[row, index]
+            prediction.amp = amp[row, index]
+            prediction.phi = phi[row, index]
+            if args.n_freq > 0:
+                top = top_candidates[row]
+                prediction.top_freqs = {
+                    "freq": frequencies[top],
+                    "conf": conf[row, top],
+                    "periodicity": conf[row, top],
+                    "amp": amp[row, top],
+                    "phi": phi[row, top],
+                }
+            predictions[i] = prediction
+
+    console.print(
+        f"[cyan]{args.transformation.upper()} + {args.outlier} batch of "
+        f"{len(signals)} signals ({len(groups)} grids) finished:[/] {time.time() - tik:.3f} s"
+    )
+
+    return predictions
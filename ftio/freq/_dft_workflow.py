@@ -11,8 +11,11 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+from __future__ import annotations
+
 import time
 from argparse import Namespace
+from typing import TYPE_CHECKING
 
 import numpy as np
 from rich.console import Group
@@ -21,13 +24,13 @@ from rich.panel import Panel
 from ftio.analysis.anomaly_detection import outlier_detection
 from ftio.analysis.periodicity_analysis import new_periodicity_scores
 from ftio.freq._analysis_figures import AnalysisFigures
-from ftio.freq._dft import dft
-from ftio.freq._filter import filter_signal
-from ftio.freq._fourier_fit import fourier_fit
+from ftio.freq._dft import full_spectrum, mirror_index, rdft
 from ftio.freq.discretize import sample_data
 from ftio.freq.helper import MyConsole
 from ftio.freq.prediction import Prediction
-from ftio.plot.plot_dft import plot_dft
+
+if TYPE_CHECKING:
+    from ftio.freq._incremental_dft import IncrementalDFT
 
 
 def ftio_dft(
@@ -37,6 +40,7 @@ def ftio_dft(
     total_bytes: int = 0,
     ranks: int = 1,
     text: str = "",
+    engine: IncrementalDFT | None = None,
 ) -> tuple[Prediction, AnalysisFigures]:
     """
     Performs a Discrete Fourier Transform (DFT) on the sampled bandwidth data, finds the dominant frequency, followed by outlier
@@ -49,6 +53,9 @@ def ftio_dft(
         total_bytes (int, optional): Total number of bytes transferred (default = 0).
         ranks (int, optional): The number of ranks (default = 1).
         text (str, optional): Additional text for output. Defaults to "".
+        engine (IncrementalDFT, optional): Incremental DFT state of the online predictor. If
+            set, `bandwidth` and `time_stamps` are the already sampled window and the spectrum
+            is taken from the engine. Defaults to None.
 
     Returns:
         tuple:
@@ -63,11 +70,16 @@ def ftio_dft(
     #!  Sample the bandwidth evenly spaced in time
     tik = time.time()
     console.print("[cyan]Executing:[/] Discretization\n")
-    b_sampled, args.freq = sample_data(bandwidth, time_stamps, args)
+    if engine is None:
+        b_sampled, args.freq = sample_data(bandwidth, time_stamps, args)
+    else:
+        b_sampled, args.freq = bandwidth, engine.freq
     console.print(f"\n[cyan]Discretization finished:[/] {time.time() - tik:.3f} s")
 
     #! Apply filter if specified
     if args.filter_type:
+        from ftio.freq._filter import filter_signal
+
         b_sampled = filter_signal(args, b_sampled, analysis_figures)
 
     #!  Perform DFT
@@ -80,9 +92,20 @@ def ftio_dft(
         console.print(
             f"[cyan]Executing:[/] {args.transformation.upper()} + {args.outlier} + {args.periodicity_detection}\n"
         )
+    # the signal is real, so only the bins 0 to n/2 of the spectrum are computed
     n = len(b_sampled)
-    frequencies = args.freq * np.arange(0, n) / n
-    X = dft(b_sampled)
+    frequencies = args.freq * np.arange(0, n // 2 + 1) / n
+    spectrum = None
+    if engine is not None and not args.filter_type:
+        # the engine keeps the spectrum of the unfiltered window
+        X = engine.spectrum()
+    elif args.autocorrelation:
+        # the zero-padded spectrum is reused by the autocorrelation, its even bins
+        # are the DFT of b_sampled
+        spectrum = rdft(b_sampled, 2 * n)
+        X = spectrum[::2]
+    else:
+        X = rdft(b_sampled)
     X = X * np.exp(
         -2j * np.pi * frequencies * time_stamps[0]
     )  # Correct phase offset due to start time t0
@@ -92,16 +115,10 @@ def ftio_dft(
     # welch(bandwidth,freq)
 
     #!  Find the dominant frequency
-    dominant_index, conf[1 : int(n / 2) + 1], outlier_text = outlier_detection(
-        amp, frequencies, args
-    )
+    dominant_index, conf[1:], outlier_text = outlier_detection(amp, frequencies, args, n)
 
     #  Ignore DC offset
     conf[0] = np.inf
-    if n % 2 == 0:
-        conf[int(n / 2) + 1 :] = np.flip(conf[1 : int(n / 2)])
-    else:
-        conf[int(n / 2) + 1 :] = np.flip(conf[1 : int(n / 2) + 1])
 
     #! Assign data
     prediction.dominant_freq = frequencies[dominant_index]
@@ -133,31 +150,56 @@ def ftio_dft(
     periodicity_score = new_periodicity_scores(amp, b_sampled, prediction, args)
 
     t_sampled = time_stamps[0] + np.arange(0, n) * 1 / args.freq
+    #! DTW of the top components against their reconstruction if set
+    dtw_score = ""
+    if getattr(args, "dtw", False) and n > 1:
+        from ftio.freq.dtw import dtw_components, dtw_text
+
+        # the DC offset is ignored, it only shifts all signals
+        arr = amp[1 : int(np.ceil(n / 2))]
+        top = 1 + np.argsort(-arr)[0 : int(args.n_freq) if args.n_freq > 0 else 3]
+        result = dtw_components(
+            frequencies[top],
+            amp[top],
+            phi[top],
+            n,
+            t_sampled,
+            args.freq,
+            getattr(args, "dtw_window", 0.1),
+        )
+        dtw_score = dtw_text(result)
     #! Fourier fit if set
     if args.fourier_fit:
+        from ftio.freq._fourier_fit import fourier_fit
+
         fourier_fit(args, prediction, analysis_figures, b_sampled, t_sampled)
 
     #! Set plot parameters and plot
     if any(x in args.engine for x in ["mat", "plot"]):
         console.print(f"Generating {args.transformation.upper()} Plot\n")
+        # the plots use the layout of the full spectrum
+        X = full_spectrum(X, n, np.exp(-2j * np.pi * args.freq * time_stamps[0]))
         analysis_figures += AnalysisFigures(
             args,
             bandwidth,
             time_stamps,
             b_sampled,
             t_sampled,
-            frequencies,
-            amp,
-            phi,
-            conf,
+            args.freq * np.arange(0, n) / n,
+            abs(X),
+            np.arctan2(X.imag, X.real),
+            np.concatenate([conf, conf[mirror_index(n)]]),
             ranks,
         )
         if not args.autocorrelation:
+            from ftio.plot.plot_dft import plot_dft
+
             plot_dft(args, prediction, analysis_figures)
         console.print(" --- Done --- \n")
 
     if args.autocorrelation or args.machine_learning:
         prediction.b_sampled = b_sampled
+        prediction.spectrum = spectrum
 
     if getattr(args, "burst_width", False):
         from ftio.freq.duty_cycle import estimate_burst_widths
@@ -177,7 +219,7 @@ def ftio_dft(
 
     precision_text = ""
     # precision_text = precision_dft(amp, phi, dominant_index, b_sampled, t_sampled, frequencies, args.engine)
-    text = Group(text, outlier_text, periodicity_score, precision_text[:-1])
+    text = Group(text, outlier_text, periodicity_score, dtw_score, precision_text[:-1])
 
     console.print(
         Panel.fit(
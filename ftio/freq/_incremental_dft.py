@@ -0,0 +1,347 @@
+"""
+Incremental DFT engine for the online predictor.
+
+Instead of re-discretizing and re-transforming the whole accumulated history on
+every prediction, the engine keeps the discretized signal and the spectrum of the
+current time window between predictions:
+- New bandwidth steps are discretized onto the existing sampling grid, so a batch
+  costs time proportional to the new samples.
+- The window start (set by the window adaptation / change point detection) only
+  moves a view over the sampled buffer. Samples before the window are dropped, and
+  the window holds at most `max_samples` samples, so a window that keeps growing
+  starts to slide once it reaches that length.
+- If the window slides by d samples while keeping its length N, the spectrum is
+  updated with the sliding DFT in O(d*N/2), otherwise it is recomputed from the
+  sampled buffer.
+
+In the predictor, the samples and the spectrum are kept in shared memory
+(SharedRingBuffer), so only the scalar state of the engine is pickled between
+predictions.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+from argparse import Namespace
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ftio.freq.discretize import find_lowest_time_change
+
+if TYPE_CHECKING:
+    from ftio.multiprocessing.shared_ring_buffer import SharedRingBuffer
+
+
+class IncrementalDFT:
+    """
+    Keeps the sampled bandwidth and the DFT of the current window between predictions.
+
+    Attributes:
+        freq (float): Sampling frequency. Fixed once the first batch was appended.
+        t0 (float): Time of the first sample in the buffer.
+        t_last (float): Last time stamp received so far.
+        start (int): Index of the first sample in the current window.
+        first (int): Index of the oldest sample kept in the buffer.
+        n (int): Number of samples appended so far (index after the newest sample).
+        max_samples (int | None): Maximal number of samples in the window. None
+            does not limit the window.
+        samples (SharedRingBuffer | None): Shared buffer (one column) holding the
+            samples. None keeps them in a local array.
+        spectra (SharedRingBuffer | None): Shared buffer (real and imaginary column)
+            holding the spectrum of the last window. None keeps it only locally.
+    """
+
+    # number of sliding updates before the spectrum is recomputed to avoid drift
+    REFRESH = 64
+
+    def __init__(
+        self,
+        freq: float = 10,
+        memory_limit: float = 0.5,
+        samples: SharedRingBuffer | None = None,
+        spectra: SharedRingBuffer | None = None,
+        max_samples: int | None = None,
+    ):
+        self.freq = freq
+        self.memory_limit = memory_limit * 1000**3
+        self.max_samples = max_samples
+        self.t0 = np.nan
+        self.t_last = np.nan
+        self.t_next = np.nan
+        self.b_last = 0.0
+        self.start = 0
+        self.first = 0
+        self.n = 0
+        self.samples = samples
+        self.spectra = spectra
+        self._local = np.empty(0)
+        # index of the sample held in _local[0]
+        self._base = 0
+        self._spectrum = None
+        self._spectrum_window = (0, 0)
+        self._slides = 0
+
+    @property
+    def _buffer(self) -> np.ndarray:
+        """Kept samples, starting with the one at index `first`."""
+        if self.samples is None:
+            return self._local[self.first - self._base : self.n - self._base]
+        return self.samples.snapshot()[0][: self.n - self.first]
+
+    @property
+    def b_sampled(self) -> np.ndarray:
+        """Samples of the current window (view on the buffer)."""
+        return self._buffer[self.start - self.first :]
+
+    @property
+    def t_start(self) -> float:
+        """Time of the first sample in the current window."""
+        return self.t0 + self.start / self.freq
+
+    @property
+    def t_sampled(self) -> np.ndarray:
+        """Time stamps of the samples in the current window."""
+        return self.t_start + np.arange(0, self.n - self.start) / self.freq
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes transferred in the current window."""
+        return int(np.sum(self.b_sampled) / self.freq)
+
+    def append(self, b: np.ndarray, t: np.ndarray) -> int:
+        """Discretizes new bandwidth steps and appends them to the buffer.
+
+        Only sample instants after the last emitted one are sampled. Steps that
+        lie before them (e.g., a file that was read again from the beginning) are
+        thus ignored. The last step is kept open until the next batch arrives.
+
+        Args:
+            b (np.ndarray): Bandwidth values of the new steps.
+            t (np.ndarray): Time stamps of the new steps.
+
+        Returns:
+            int: Number of appended samples.
+        """
+        b = np.asarray(b, dtype=np.float64)
+        t = np.asarray(t, dtype=np.float64)
+        if len(t) == 0:
+            return 0
+
+        if self.n == 0 and np.isnan(self.t_next):
+            if self.freq == -1:
+                t_rec = find_lowest_time_change(t)
+                self.freq = 2 / t_rec if np.isfinite(t_rec) else 10
+            self.t0 = t[0]
+            self.t_next = t[0]
+        else:
+            # carry the open step from the previous batch
+            t = np.concatenate(([self.t_last], t))
+            b = np.concatenate(([self.b_last], b))
+            order = np.argsort(t, kind="stable")
+            t, b = t[order], b[order]
+
+        self.t_last = t[-1]
+        self.b_last = b[-1]
+        if self.t_next >= self.t_last:
+            return 0
+
+        step = 1 / self.freq
+        m = int(np.ceil((self.t_last - self.t_next) * self.freq)) + 1
+        t_steps = np.full(m, step)
+        t_steps[0] = self.t_next
+        np.cumsum(t_steps, out=t_steps)
+        t_steps = t_steps[t_steps < self.t_last]
+        m = len(t_steps)
+        if m == 0:
+            return 0
+
+        if self.n - self.first + m > self.memory_limit // 8:
+            raise MemoryError(
+                f"Incremental DFT buffer exceeds the memory limit "
+                f"({self.memory_limit / 1000**3:.3e} GB)"
+            )
+        index = np.searchsorted(t, t_steps, side="right") - 1
+        if self.samples is None:
+            self._reserve(m)
+            offset = self.n - self._base
+            np.take(b, index, out=self._local[offset : offset + m])
+        else:
+            # samples after n (left by an interrupted prediction) are replaced
+            values = b[index]
+            kept = self.n - self.first
+            self.samples.update(lambda x: (min(kept, len(x)), (values,)))
+        self.n += m
+        self.t_next = t_steps[-1] + step
+        return m
+
+    def set_window(self, t_start: float | None = None) -> None:
+        """Moves the start of the window and drops the samples before it. Moving
+        it backwards stops at the oldest kept sample.
+
+        Args:
+            t_start (float, optional): Start time of the window. None or 0
+                selects all kept samples.
+        """
+        start = self.first
+        if t_start and self.n > 0:
+            start = int(np.ceil((t_start - self.t0) * self.freq - 1e-9))
+            start = min(max(start, self.first), self.n - 1)
+        if self.max_samples is not None:
+            start = max(start, self.n - self.max_samples)
+        self.start = start
+        self._discard()
+
+    def spectrum(self) -> np.ndarray:
+        """Half spectrum (rfft) of the current window.
+
+        Returns:
+            np.ndarray: rfft of `b_sampled`
+        """
+        window = (self.start, self.n)
+        N = self.n - self.start
+        old_start, old_n = self._spectrum_window
+        d = self.start - old_start
+        if self._spectrum is None:
+            self._load_spectrum()
+        if self._spectrum is not None and window == self._spectrum_window:
+            return self._spectrum
+
+        if (
+            self._spectrum is not None
+            and d > 0
+            and old_start >= self.first
+            and old_n - old_start == N
+            and self._slides < self.REFRESH
+            and d <= 4 * np.log2(max(N, 2))
+        ):
+            self._spectrum = self._slide(self._spectrum, old_start, N, d)
+            self._slides += 1
+        else:
+            self._spectrum = np.fft.rfft(self.b_sampled)
+            self._slides = 0
+
+        self._spectrum_window = window
+        self._store_spectrum()
+        self._discard()
+        return self._spectrum
+
+    def _slide(self, X: np.ndarray, old_start: int, N: int, d: int) -> np.ndarray:
+        """Sliding DFT: shifts the window of length N by d samples.
+
+        X'_k = w^(-k*d) * (X_k + sum_j (x[s+N+j] - x[s+j]) * w^(k*j)), w = exp(-2i*pi/N)
+        """
+        k = np.arange(len(X))
+        w = np.exp(-2j * np.pi * k / N)
+        buffer = self._buffer
+        old_start -= self.first
+        diff = (
+            buffer[old_start + N : old_start + N + d] - buffer[old_start : old_start + d]
+        )
+        X = X.copy()
+        w_j = np.ones(len(X), dtype=complex)
+        for value in diff:
+            X += value * w_j
+            w_j *= w
+        return X * np.exp(2j * np.pi * k * d / N)
+
+    def _load_spectrum(self) -> None:
+        """Takes the spectrum from the shared buffer if it belongs to the stored window.
+
+        The first item holds the window (start, n), the spectrum follows.
+        """
+        if self.spectra is None or len(self.spectra) == 0:
+            return
+        real, imag = self.spectra.snapshot()
+        if (int(real[0]), int(imag[0])) == self._spectrum_window:
+            self._spectrum = real[1:] + 1j * imag[1:]
+
+    def _store_spectrum(self) -> None:
+        """Replaces the spectrum in the shared buffer, see _load_spectrum."""
+        if self.spectra is None:
+            return
+        start, n = self._spectrum_window
+        real = np.concatenate(([start], self._spectrum.real))
+        imag = np.concatenate(([n], self._spectrum.imag))
+        self.spectra.update(lambda *_: (0, (real, imag)))
+
+    def _discard(self) -> None:
+        """Drops the samples before the window. The samples of the last spectrum
+        are kept, as the sliding DFT needs them."""
+        first = self.start
+        if self._spectrum_window[1] > 0:
+            first = min(first, self._spectrum_window[0])
+        if first <= self.first:
+            return
+        if self.samples is not None:
+            self.samples.discard(first - self.first)
+        self.first = first
+
+    def _reserve(self, m: int) -> None:
+        """Makes room for m more samples in the local buffer. On reallocation, the
+        dropped samples are released and the kept ones grow geometrically."""
+        if self.n + m - self._base <= len(self._local):
+            return
+        kept = self.n - self.first
+        buffer = np.empty(max(kept + m, 2 * kept, 1024))
+        buffer[:kept] = self._buffer
+        self._local = buffer
+        self._base = self.first
+
+    def __getstate__(self) -> dict:
+        """Only pickles the used part of the local buffer. With shared buffers, only
+        the scalar state is pickled, they are attached again by
+        update_incremental_dft."""
+        state = self.__dict__.copy()
+        state["_local"] = self._buffer
+        state["_base"] = self.first
+        if self.samples is not None:
+            state["_local"] = np.empty(0)
+            state["_spectrum"] = None
+        state["samples"], state["spectra"] = None, None
+        return state
+
+
+def update_incremental_dft(
+    engine: IncrementalDFT | None,
+    b: np.ndarray,
+    t: np.ndarray,
+    args: Namespace,
+    samples: SharedRingBuffer | None = None,
+    spectra: SharedRingBuffer | None = None,
+) -> IncrementalDFT:
+    """Appends a new batch to the engine (created if None) and sets the window
+    according to args.ts.
+
+    Args:
+        engine (IncrementalDFT | None): state from the previous prediction
+        b (np.ndarray): bandwidth of the new batch
+        t (np.ndarray): time stamps of the new batch
+        args (Namespace): parsed arguments (freq, memory_limit, ts)
+        samples (SharedRingBuffer, optional): shared buffer of the samples
+        spectra (SharedRingBuffer, optional): shared buffer of the spectrum
+
+    Returns:
+        IncrementalDFT: the updated engine
+    """
+    if engine is None:
+        engine = IncrementalDFT(
+            args.freq,
+            args.memory_limit,
+            samples,
+            spectra,
+            getattr(args, "incremental_max_samples", None),
+        )
+    elif samples is not None:
+        engine.samples, engine.spectra = samples, spectra
+    engine.append(b, t)
+    engine.set_window(args.ts)
+    return engine
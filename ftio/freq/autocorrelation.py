@@ -19,14 +19,12 @@ from argparse import Namespace
 
 import numpy as np
 from rich.panel import Panel
-from scipy.signal import find_peaks
 
 # from rich.padding import Padding
 import ftio.freq.discretize as dis
 from ftio.freq._analysis_figures import AnalysisFigures
 from ftio.freq.helper import MyConsole
 from ftio.freq.prediction import Prediction
-from ftio.plot.plot_autocorrelation import plot_autocorr_results
 
 
 def find_autocorrelation(
@@ -102,11 +100,15 @@ def find_autocorrelation(
                 console.print(f"[purple]End time: {time_stamps[-1]:.2f}")
 
             # sample the bandwidth
-            b_sampled, freq = dis.sample_data(
-                bandwidth, time_stamps, args.freq, args.verbose
-            )
-
-        res = find_fd_autocorrelation(args, b_sampled, freq, analysis_figures)
+            b_sampled, freq = dis.sample_data(bandwidth, time_stamps, args)
+
+        res = find_fd_autocorrelation(
+            args,
+            b_sampled,
+            freq,
+            analysis_figures,
+            prediction_freq_analysis.get("spectrum"),
+        )
 
         # save the results
         prediction.dominant_freq = (
@@ -187,6 +189,7 @@ def find_fd_autocorrelation(
     b_sampled: np.ndarray,
     freq: float,
     analysis_figures: AnalysisFigures,
+    spectrum: np.ndarray | None = None,
 ) -> dict:
     """
     Computes the autocorrelation of a sampled signal, detects peaks, and calculates periodicity and confidence
@@ -197,15 +200,22 @@ def find_fd_autocorrelation(
         b_sampled (np.ndarray): The sampled input signal.
         freq (float): The frequency at which the signal is sampled.
         analysis_figures (AnalysisFigures): Data and plot figures.
+        spectrum (np.ndarray, optional): zero-padded spectrum of b_sampled from the DFT
+            (see autocorrelation). Defaults to None.
 
     Returns:
         dict: A dictionary containing the autocorrelation, peak locations, weights,
                 calculated periodicity, and confidence level.
     """
-    # Compute autocorrelation of the sampled signal
-    acorr = autocorrelation(b_sampled)
+    # Compute autocorrelation of the sampled signal up to the largest plausible period
+    max_lag = None
+    if getattr(args, "max_lag", 0) > 0:
+        max_lag = int(np.ceil(args.max_lag * freq))
+    acorr = autocorrelation(b_sampled, max_lag, spectrum)
 
     # Finding peak locations and calculating the average time differences between them
+    from scipy.signal import find_peaks
+
     peaks, prop = find_peaks(acorr, height=0.15)
     candidates = np.diff(peaks) / freq
     weights = np.diff(prop["peak_heights"])
@@ -253,6 +263,8 @@ def find_fd_autocorrelation(
 
     # plot
     if any(x in args.engine for x in ["mat", "plot"]):
+        from ftio.plot.plot_autocorrelation import plot_autocorr_results
+
         console.print("Generating Autocorrelation Plot\n")
         fig = plot_autocorr_results(args, acorr, peaks, outliers, len(candidates) > 0)
         analysis_figures.add_figure([fig], "Autocorrelation")
@@ -269,29 +281,50 @@ def find_fd_autocorrelation(
     }
 
 
-def autocorrelation(arr: np.ndarray) -> np.ndarray:
+def autocorrelation(
+    arr: np.ndarray, max_lag: int | None = None, spectrum: np.ndarray | None = None
+) -> np.ndarray:
     """
     Computes the autocorrelation of a given array.
 
+    The autocorrelation is calculated in O(N log N) as the inverse FFT of the power
+    spectrum (Wiener-Khinchin). The signal is zero-padded to at least N + max_lag
+    samples (the next fast FFT length), so the result equals the linear
+    autocorrelation np.correlate(arr - mean, arr - mean, "full")[N-1:] / var / N.
+
     Args:
         arr (np.ndarray): Input array for which to compute the autocorrelation.
+        max_lag (int, optional): Largest lag in samples. Defaults to None (all lags).
+        spectrum (np.ndarray, optional): np.fft.rfft(arr, 2 * N), e.g., from the DFT
+            (see ftio_dft). If set, no further forward FFT is needed. Defaults to None.
 
     Returns:
-        np.ndarray: Autocorrelation values.
+        np.ndarray: Autocorrelation values for the lags 0 to max_lag.
     """
-    # Scipy autocorrelation
-    # lags = range(int(freq*len(arr)))
-    # acorr = sm.tsa.acf(arr, nlags = len(lags)-1)
-    #! numpy autocorrelation
-    # # Mean
+    import scipy.fft as sp_fft
+
+    n = len(arr)
+    max_lag = n - 1 if max_lag is None else int(min(max(max_lag, 0), n - 1))
+    # Mean
     mean = np.mean(arr)
     # Variance
     var = np.var(arr)
-    # Normalized data
-    ndata = arr - mean
+    if spectrum is not None and len(spectrum) == n + 1:
+        # remove the mean in the frequency domain: X'[j] = X[j] - mean * R[j], where R is
+        # the DFT of n ones zero-padded to 2n (R[0] = n, R[j] = 0 for even j > 0)
+        n_fft = 2 * n
+        j = np.arange(1, n + 1, 2)
+        spectrum = spectrum.copy()
+        spectrum[0] -= mean * n
+        spectrum[j] -= mean * 2 / (1 - np.exp(-1j * np.pi * j / n))
+    else:
+        # Normalized data, zero-padded to avoid the circular wrap around
+        n_fft = sp_fft.next_fast_len(n + max_lag, real=True)
+        spectrum = sp_fft.rfft(arr - mean, n_fft)
     # Calculate autocorrelation:
-    acorr = np.correlate(ndata, ndata, "full")[len(ndata) - 1 :]
-    acorr = acorr / var / len(ndata)
+    power = spectrum.real**2 + spectrum.imag**2
+    acorr = sp_fft.irfft(power, n_fft)[: max_lag + 1]
+    acorr = acorr / var / n
 
     return acorr
 
@@ -16,16 +16,20 @@ from __future__ import annotations
 from argparse import Namespace
 
 import numpy as np
-from numba import jit
 from rich.panel import Panel
 
 from ftio.freq.helper import MyConsole
+from ftio.util.jit_cache import RO_ARRAY, kernel
+
+# Number of samples that are discretized at once by the fast backend
+CHUNK_SIZE = 1 << 22
 
 
 def sample_data(
     b: np.ndarray,
     t: np.ndarray,
     args: Namespace = None,
+    out: np.ndarray | None = None,
 ) -> tuple[np.ndarray, float]:
     """
     Samples the data at equal time steps  according to the specified frequency.
@@ -40,6 +44,12 @@ def sample_data(
             - verbose (bool, optional): Flag to indicate if information about the sampling
                 process, including the time window, frequency step, and abstraction error is
                 printed
+            - discretization (str, optional): Sampling backend. Either "fast" (default,
+                chunked searchsorted / JIT) or "loop" (reference Python loop). Both
+                produce identical samples.
+        out (np.ndarray, optional): Preallocated (or memory-mapped) float64 buffer of at
+            least N elements in which the samples are written. Defaults to None, which
+            allocates a new array.
 
     Returns:
         tuple: A tuple containing:
@@ -87,6 +97,8 @@ def sample_data(
         N = int(np.floor((t[-1] - t[0]) * freq))
 
     text += f"Expected samples: {N}\n"
+    if out is not None and len(out) < N:
+        raise ValueError(f"Output buffer too small: {len(out)} < {N} samples")
 
     if N <= 0:
         raise RuntimeError(
@@ -95,25 +107,14 @@ def sample_data(
         )
 
     #  sample the data with the recommended frequency
-    # t_sampled = np.zeros(N) #t[0]+np.arange(N)*1/freq
-    b_sampled = np.zeros(N)
-    n = len(t)
-    counter = 0
-    n_old = 0
-    t_step = t[0]
-    # error   = 0
-    # errorStep   = 0
-    for _ in range(0, N):
-        for i in range(min(n_old, n - 1), n):
-            if (t_step >= t[i]) and (t_step < t[i + 1]) if i < n - 1 else True:
-                n_old = i  # no need to iterate over entire array
-                b_sampled[counter] = b[i]
-                counter = counter + 1
-                break
-        t_step = t_step + 1 / freq
+    method = getattr(args, "discretization", "fast") if args is not None else "fast"
+    if method == "loop":
+        b_sampled = _sample_loop(b, t, freq, N, out)
+    else:
+        b_sampled = _sample_fast(b, t, freq, N, out)
 
     #! Abstraction error
-    v_a = np.sum(np.abs(b_sampled * np.repeat(1 / freq, len(b_sampled))))
+    v_a = np.sum(np.abs(b_sampled)) / freq
     # Ensure lengths match for v_0 calculation
     min_len = min(len(b), len(t))
     b_sub = b[:min_len]
@@ -143,6 +144,116 @@ def sample_data(
     return b_sampled, freq
 
 
+def _sample_loop(
+    b: np.ndarray, t: np.ndarray, freq: float, N: int, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Reference discretization: walks all N samples with a Python loop.
+
+    Args:
+        b (np.ndarray): Bandwidth values.
+        t (np.ndarray): Time points corresponding to the bandwidth values.
+        freq (float): Sampling frequency.
+        N (int): Number of samples.
+        out (np.ndarray, optional): Buffer to write the samples in.
+
+    Returns:
+        np.ndarray: Uniform sampled bandwidth values.
+    """
+    b_sampled = np.zeros(N) if out is None else out[:N]
+    n = len(t)
+    counter = 0
+    n_old = 0
+    t_step = t[0]
+    for _ in range(0, N):
+        for i in range(min(n_old, n - 1), n):
+            if (t_step >= t[i]) and (t_step < t[i + 1]) if i < n - 1 else True:
+                n_old = i  # no need to iterate over entire array
+                b_sampled[counter] = b[i]
+                counter = counter + 1
+                break
+        t_step = t_step + 1 / freq
+
+    return b_sampled
+
+
+def _sample_fast(
+    b: np.ndarray,
+    t: np.ndarray,
+    freq: float,
+    N: int,
+    out: np.ndarray | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> np.ndarray:
+    """Discretization in O(N log n) that matches `_sample_loop` bit by bit.
+
+    The sample instants are accumulated sequentially (as in the loop) chunk by
+    chunk, and the step that holds each instant is found with a binary search.
+    Thus, only O(chunk_size) temporary memory is needed, and the samples are
+    streamed into `out`. Non-monotonic time stamps fall back to the JIT
+    compiled version of the loop.
+
+    Args:
+        b (np.ndarray): Bandwidth values.
+        t (np.ndarray): Time points corresponding to the bandwidth values.
+        freq (float): Sampling frequency.
+        N (int): Number of samples.
+        out (np.ndarray, optional): Buffer to write the samples in.
+        chunk_size (int, optional): Number of samples processed at once.
+
+    Returns:
+        np.ndarray: Uniform sampled bandwidth values.
+    """
+    b = np.asarray(b, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+    b_sampled = np.empty(N) if out is None else out[:N]
+    if len(t) > 1 and np.any(t[1:] < t[:-1]):
+        _sample_steps_jit(b, t, 1 / freq, b_sampled)
+        return b_sampled
+
+    last = len(t) - 1
+    step = 1 / freq
+    t_step = t[0]
+    for start in range(0, N, chunk_size):
+        stop = min(start + chunk_size, N)
+        # same accumulation order as t_step = t_step + 1/freq
+        t_steps = np.full(stop - start, step)
+        t_steps[0] = t_step
+        np.cumsum(t_steps, out=t_steps)
+        index = np.searchsorted(t, t_steps, side="right") - 1
+        np.minimum(index, last, out=index)
+        np.take(b, index, out=b_sampled[start:stop])
+        t_step = t_steps[-1] + step
+
+    return b_sampled
+
+
+@kernel(
+    "(float64[::1], float64[::1], float64, float64[::1])",
+    f"({RO_ARRAY}, {RO_ARRAY}, float64, float64[::1])",
+)
+def _sample_steps_jit(
+    b: np.ndarray, t: np.ndarray, step: float, b_sampled: np.ndarray
+) -> None:
+    """JIT compiled version of the loop in `_sample_loop`.
+
+    Args:
+        b (np.ndarray): Bandwidth values.
+        t (np.ndarray): Time points corresponding to the bandwidth values.
+        step (float): Sampling interval (1/freq).
+        b_sampled (np.ndarray): Output buffer; its length defines the number of samples.
+    """
+    n = len(t)
+    n_old = 0
+    t_step = t[0]
+    for k in range(len(b_sampled)):
+        i = min(n_old, n - 1)
+        while i < n - 1 and not (t[i] <= t_step < t[i + 1]):
+            i += 1
+        n_old = i
+        b_sampled[k] = b[i]
+        t_step = t_step + step
+
+
 def sample_data_same_size(
     b: np.ndarray, t: np.ndarray, freq=-1, n_bins=-1
 ) -> tuple[np.ndarray, np.ndarray]:
@@ -187,7 +298,7 @@ def sample_data_same_size(
     return b_sampled, t
 
 
-@jit(nopython=True, cache=True)
+@kernel("(float64[::1],)", f"({RO_ARRAY},)")
 def find_lowest_time_change(t: np.ndarray) -> float:
     """finds the lowest time change
 
@@ -1,9 +1,11 @@
 """
 Module for Dynamic Time Warping (DTW) calculations.
 
-This module provides functionality for computing DTW distances using either
-a NumPy-based implementation or FastDTW (if available). It also supports
-multi-threaded DTW evaluation for improved performance.
+This module provides a compiled (numba) DTW engine that keeps only two rows of the
+cost matrix (O(min(n, m)) memory) and optionally restricts the warping path to a
+Sakoe–Chiba band. Several candidates (e.g., the top-k dominant components) are
+evaluated against a reference signal in one batched call that runs in parallel
+outside the GIL. FastDTW is still used by `fdtw` if it is installed.
 
 Author: Ahmad Tarraf
 Copyright (c) 2024-2026 TU Darmstadt, Germany
@@ -15,51 +17,173 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+from __future__ import annotations
+
 import importlib.util
-from threading import Thread
+from dataclasses import dataclass, field
 
 import numpy as np
+from numba import prange
 from scipy.spatial.distance import euclidean
 
+from ftio.util.jit_cache import kernel
+
 # Check if fastdtw is available
 FASTDTW_AVAILABLE: bool = importlib.util.find_spec("fastdtw") is not None
 if FASTDTW_AVAILABLE:
     from fastdtw import fastdtw
 
 
-def fill_dtw_cost_matrix(s1: np.ndarray, s2: np.ndarray) -> tuple:
+@dataclass
+class DTWResult:
+    """DTW distances of several candidates to a reference signal.
+
+    Attributes:
+        freqs (np.ndarray): frequency of each candidate
+        distances (np.ndarray): DTW distance of each candidate to the reference
+        window (int): Sakoe–Chiba band in samples that was used (-1 for none)
     """
-    Compute the DTW distance between two sequences using a cost matrix.
+
+    freqs: np.ndarray = field(default_factory=lambda: np.array([]))
+    distances: np.ndarray = field(default_factory=lambda: np.array([]))
+    window: int = -1
+
+    @property
+    def best(self) -> int:
+        """Index of the candidate closest to the reference (-1 if empty)."""
+        return int(np.argmin(self.distances)) if len(self.distances) > 0 else -1
+
+    def to_dict(self) -> dict:
+        return {
+            "freqs": self.freqs,
+            "distances": self.distances,
+            "window": self.window,
+        }
+
+
+def band_width(n: int, m: int, window: float | None = None) -> int:
+    """Converts a Sakoe–Chiba band given as a fraction of the signal length to samples.
+
+    The band is widened to |n - m| if needed, as otherwise the end of both sequences
+    cannot be reached.
+
+    Args:
+        n (int): length of the first sequence
+        m (int): length of the second sequence
+        window (float | None, optional): band as fraction of max(n, m). None or a value
+            <= 0 disables the band. Defaults to None.
+
+    Returns:
+        int: half width of the band in samples, -1 if unconstrained
+    """
+    if window is None or window <= 0:
+        return -1
+    return max(int(np.ceil(window * max(n, m))), abs(n - m))
+
+
+@kernel("(float64[::1], float64[::1], int64)")
+def _dtw_kernel(s1, s2, window):
+    """DTW distance with the absolute difference as cost, using two rows of length
+    min(n, m) + 1. Cells outside the band |i - j| <= window stay infinite."""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    n, m = len(s1), len(s2)
+    if window < 0:
+        window = n
+    prev = np.full(m + 1, np.inf)
+    curr = np.full(m + 1, np.inf)
+    prev[0] = 0.0
+    for i in range(1, n + 1):
+        lo = max(1, i - window)
+        hi = min(m, i + window)
+        curr[lo - 1] = np.inf
+        if hi < m:
+            curr[hi + 1] = np.inf
+        for j in range(lo, hi + 1):
+            best = prev[j - 1]
+            if prev[j] < best:
+                best = prev[j]
+            if curr[j - 1] < best:
+                best = curr[j - 1]
+            curr[j] = abs(s1[i - 1] - s2[j - 1]) + best
+        prev, curr = curr, prev
+    return prev[m]
+
+
+@kernel("(float64[:, ::1], float64[::1], int64)", parallel=True)
+def _dtw_batch_kernel(candidates, reference, window):
+    out = np.empty(candidates.shape[0])
+    for k in prange(candidates.shape[0]):
+        out[k] = _dtw_kernel(candidates[k], reference, window)
+    return out
+
+
+def dtw_distance(s1: np.ndarray, s2: np.ndarray, window: float | None = None) -> float:
+    """
+    Compute the DTW distance between two sequences with the compiled engine.
 
     Args:
         s1 (np.ndarray): First sequence.
         s2 (np.ndarray): Second sequence.
+        window (float | None, optional): Sakoe–Chiba band as fraction of the sequence
+            length, None disables the band. Defaults to None.
 
     Returns:
-        tuple: The DTW distance and None (for compatibility with FastDTW return type).
+        float: The DTW distance.
+    """
+    s1 = np.ascontiguousarray(s1, dtype=np.float64)
+    s2 = np.ascontiguousarray(s2, dtype=np.float64)
+    if len(s1) == 0 or len(s2) == 0:
+        return np.inf
+    return float(_dtw_kernel(s1, s2, band_width(len(s1), len(s2), window)))
+
+
+def dtw_batch(
+    candidates: np.ndarray,
+    reference: np.ndarray,
+    freqs: np.ndarray | None = None,
+    window: float | None = None,
+) -> DTWResult:
     """
-    l_s_1, l_s_2 = len(s1), len(s2)
-    # Initialize the cost matrix
-    cost_matrix = np.full((l_s_1 + 1, l_s_2 + 1), np.inf)
-    cost_matrix[0, 0] = 0  # Starting point
+    Compute the DTW distances of several candidates to a reference in one parallel call.
 
-    # Fill the cost matrix
-    for i in range(1, l_s_1 + 1):
-        for j in range(1, l_s_2 + 1):
-            cost = abs(s1[i - 1] - s2[j - 1])  # Euclidean distance
-            # Take the minimum of three previous entries (top, left, diagonal)
-            cost_matrix[i, j] = cost + min(
-                cost_matrix[i - 1, j],  # from top
-                cost_matrix[i, j - 1],  # from left
-                cost_matrix[i - 1, j - 1],  # diagonal
-            )
+    Args:
+        candidates (np.ndarray): 2D array with one candidate signal per row.
+        reference (np.ndarray): Reference signal.
+        freqs (np.ndarray, optional): Frequency of each candidate. Defaults to None.
+        window (float | None, optional): Sakoe–Chiba band as fraction of the sequence
+            length, None disables the band. Defaults to None.
 
-    return cost_matrix[-1, -1], None
+    Returns:
+        DTWResult: The distances of all candidates.
+    """
+    candidates = np.ascontiguousarray(np.atleast_2d(candidates), dtype=np.float64)
+    reference = np.ascontiguousarray(reference, dtype=np.float64)
+    freqs = np.full(len(candidates), np.nan) if freqs is None else np.asarray(freqs)
+    band = band_width(candidates.shape[1], len(reference), window)
+    if candidates.size == 0 or len(reference) == 0:
+        return DTWResult(freqs, np.full(len(candidates), np.inf), band)
+    return DTWResult(freqs, _dtw_batch_kernel(candidates, reference, band), band)
+
+
+def fill_dtw_cost_matrix(s1: np.ndarray, s2: np.ndarray) -> tuple:
+    """
+    Compute the exact DTW distance between two sequences.
+
+    Args:
+        s1 (np.ndarray): First sequence.
+        s2 (np.ndarray): Second sequence.
+
+    Returns:
+        tuple: The DTW distance and None (for compatibility with FastDTW return type).
+    """
+    return dtw_distance(s1, s2), None
 
 
 def fdtw(s1: np.ndarray, s2: np.ndarray) -> tuple:
     """
-    Compute the DTW distance using FastDTW if available, otherwise fallback to a basic implementation.
+    Compute the DTW distance using FastDTW if available, otherwise fallback to the
+    compiled implementation.
 
     Args:
         s1 (np.ndarray): First sequence.
@@ -74,63 +198,82 @@ def fdtw(s1: np.ndarray, s2: np.ndarray) -> tuple:
         return fill_dtw_cost_matrix(s1, s2)
 
 
-def evaluate_dtw(discret_arr, original_discret_signal, freq):
+def component_signals(
+    freqs: np.ndarray,
+    amp: np.ndarray,
+    phi: np.ndarray,
+    n: int,
+    t: np.ndarray,
+    fs: float = 0,
+) -> np.ndarray:
     """
-    Evaluate the DTW distance between a discretized signal and its original.
+    Reconstruct the cosine waves of DFT components in the time domain.
 
     Args:
-        discret_arr (array-like): The discretized signal.
-        original_discret_signal (array-like): The original discretized signal.
-        freq (float): The frequency associated with the signal.
+        freqs (np.ndarray): Frequencies of the components.
+        amp (np.ndarray): Absolute values of the (half) spectrum at these frequencies.
+        phi (np.ndarray): Phases at these frequencies.
+        n (int): Number of samples the DFT was calculated on.
+        t (np.ndarray): Time stamps to evaluate the waves at.
+        fs (float, optional): Sampling frequency, used to detect the Nyquist bin.
+            Defaults to 0.
 
-    Prints:
-        The computed DTW distance.
+    Returns:
+        np.ndarray: 2D array with one wave per row.
     """
-    dtw_k1, _ = fdtw(discret_arr, original_discret_signal)
-    print(f"    '-> \033[1;32mfreq {freq:.2f} Hz\033[1;0m --> dtw: {dtw_k1}")
+    freqs = np.asarray(freqs)
+    # all bins except DC and Nyquist appear twice in the full spectrum
+    nyquist = n % 2 == 0 and fs > 0
+    scale = np.where((freqs == 0) | (nyquist & np.isclose(freqs, fs / 2)), 1, 2)
+    return (scale * np.asarray(amp) / n)[:, None] * np.cos(
+        2 * np.pi * freqs[:, None] * t[None, :] + np.asarray(phi)[:, None]
+    )
 
 
-def threaded_dtw(
-    sum_all_components, df, dominant_X1, dominant_k1, dominant_X2, dominant_k2
-):
+def dtw_components(
+    freqs: np.ndarray,
+    amp: np.ndarray,
+    phi: np.ndarray,
+    n: int,
+    t: np.ndarray,
+    fs: float = 0,
+    window: float | None = None,
+) -> DTWResult:
     """
-    Compute DTW distances for dominant components in parallel using threads.
+    Evaluates each dominant component against the signal reconstructed from all of
+    them (the original threaded DTW evaluation, as a single batched call).
 
     Args:
-        sum_all_components (array-like): The summed signal components.
-        df: DataFrame-like object containing frequency information.
-        dominant_X1 (array-like): First dominant component.
-        dominant_k1 (int): Index of the first dominant component in `df`.
-        dominant_X2 (array-like): Second dominant component.
-        dominant_k2 (int): Index of the second dominant component in `df`.
+        freqs (np.ndarray): Frequencies of the components.
+        amp (np.ndarray): Absolute values of the (half) spectrum at these frequencies.
+        phi (np.ndarray): Phases at these frequencies.
+        n (int): Number of samples the DFT was calculated on.
+        t (np.ndarray): Time stamps of the sampled signal.
+        fs (float, optional): Sampling frequency. Defaults to 0.
+        window (float | None, optional): Sakoe–Chiba band as fraction of the signal
+            length, None disables the band. Defaults to None.
 
     Returns:
-        list: List of active threads.
+        DTWResult: The distance of each component to the reconstructed signal.
     """
-    threads = []
-    print("    '-> \033[1;35mCalculating DTW\033[1;0m")
-    threads.append(
-        Thread(
-            target=evaluate_dtw,
-            args=(
-                dominant_X1,
-                sum_all_components,
-                df.iloc[dominant_k1]["freq"],
-            ),
-        )
-    )
-    threads.append(
-        Thread(
-            target=evaluate_dtw,
-            args=(
-                dominant_X2,
-                sum_all_components,
-                df.iloc[dominant_k2]["freq"],
-            ),
-        )
-    )
+    waves = component_signals(freqs, amp, phi, n, t, fs)
+    return dtw_batch(waves, waves.sum(axis=0), freqs, window)
+
+
+def dtw_text(result: DTWResult) -> str:
+    """Formats a DTWResult for the DFT panel.
 
-    for thread in threads:
-        thread.start()
+    Args:
+        result (DTWResult): result of `dtw_components`
 
-    return threads
+    Returns:
+        str: one line per candidate, the closest one is highlighted
+    """
+    band = "no band" if result.window < 0 else f"band of {result.window} samples"
+    text = f"[cyan underline]DTW to the reconstructed signal ({band}):[/]\n"
+    for i, (freq, distance) in enumerate(
+        zip(result.freqs, result.distances, strict=True)
+    ):
+        style = "green bold" if i == result.best else "white"
+        text += f"  '-> [{style}]freq {freq:.3e} Hz[/] --> dtw: {distance:.3e}\n"
+    return text
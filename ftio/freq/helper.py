@@ -91,8 +91,50 @@ def append_messages(data: dict, shared_resources: SharedResources) -> dict:
         if "bandwidth" in sim:
             b = sim["bandwidth"] if "bandwidth" in sim else np.array([])
             t = sim["time"] if "time" in sim else np.array([])
-            shared_resources.b_app.extend(b)
-            shared_resources.t_app.extend(t)
-            sim["bandwidth"] = np.array(shared_resources.b_app[:])
-            sim["time"] = np.array(shared_resources.t_app[:])
+            shared_resources.app_buffer.append(b, t)
+            # copy, as other processes may evict or update the items during the
+            # prediction (see --app_max_capacity)
+            sim["bandwidth"], sim["time"] = shared_resources.app_buffer.snapshot(
+                copy=True
+            )
+    return data
+
+
+def append_messages_incremental(
+    data: dict, shared_resources: SharedResources, args
+) -> dict:
+    """Folds the new messages into the incremental DFT state instead of appending
+    them to the complete history (see --incremental).
+
+    The samples and the spectrum stay in shared memory, only the scalar state of the
+    engine is passed through the Manager. As for append_messages, all sims are folded
+    into one state.
+
+    Args:
+        data (dict): parsed data of the new messages
+        shared_resources (SharedResources): shared resources among processes
+        args (Namespace): parsed arguments
+
+    Returns:
+        dict: data where each sim holds the updated engine under "incremental"
+    """
+    from ftio.freq._incremental_dft import update_incremental_dft
+
+    with shared_resources.spectral_lock:
+        engine = shared_resources.spectral_state.get("engine")
+        for sim in data:
+            if "bandwidth" in sim:
+                engine = update_incremental_dft(
+                    engine,
+                    sim["bandwidth"],
+                    sim["time"] if "time" in sim else np.array([]),
+                    args,
+                    shared_resources.spectral_samples,
+                    shared_resources.spectral_spectrum,
+                )
+                sim["incremental"] = engine
+        if engine is not None:
+            # computed under the lock, so the shared spectrum has a single writer
+            engine.spectrum()
+            shared_resources.spectral_state["engine"] = engine
     return data
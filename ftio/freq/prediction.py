@@ -62,6 +62,7 @@ class Prediction:
         self._ranges = np.array([])
         self._metric = ""
         self._b_sampled = np.array([])
+        self._spectrum = None
         self._burst_widths = np.array([])
         self._burst_t_starts = np.array([])
 
@@ -264,6 +265,16 @@ class Prediction:
             raise TypeError("b_sampled must be a list or numpy array")
         self._b_sampled = value
 
+    @property
+    def spectrum(self):
+        return self._spectrum
+
+    @spectrum.setter
+    def spectrum(self, value):
+        if value is not None and not isinstance(value, np.ndarray):
+            raise TypeError("spectrum must be a numpy array or None")
+        self._spectrum = value
+
     @property
     def burst_widths(self) -> np.ndarray:
         return self._burst_widths
@@ -0,0 +1,345 @@
+"""
+Shared-memory ring buffer for the histories that the predictor keeps between
+predictions.
+
+The buffer lives in `multiprocessing.shared_memory` so that prediction processes can
+read the history as zero-copy NumPy views instead of pickling a Manager list on every
+prediction. Appends are lock-free for a single writer: the values are written first
+and the head counter is published afterwards. Writers that move the head backwards
+or replace the data segment (`update`, growth) work like a seqlock: the generation
+counter is odd while they write, and readers retry until they saw an even, unchanged
+generation. Each value is written twice (at position i and i + capacity), so any
+window of up to `capacity` items is contiguous in memory. Once full, the buffer either
+grows (doubling up to `max_capacity`) or evicts the oldest items. Items that are no
+longer needed can be dropped from the front with `discard`, so they do not count
+towards the capacity.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+from collections.abc import Callable
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Header layout (int64): head, capacity, generation, columns, first (items before it were
+# discarded), followed by the data segment name
+_HEAD, _CAPACITY, _GENERATION, _COLUMNS, _FIRST = range(5)
+_NAME_OFFSET = 5 * 8
+_NAME_SIZE = 96
+
+
+class SharedRingBuffer:
+    """
+    Growable ring buffer with `columns` float64 columns in shared memory.
+
+    Args:
+        columns (int, optional): Number of columns (e.g., bandwidth and time). Defaults to 2.
+        capacity (int, optional): Initial capacity in items. Defaults to 2**16.
+        max_capacity (int | None, optional): Capacity after which the oldest items are
+            evicted instead of growing the buffer. None grows without bound. Defaults to None.
+        lock (optional): Lock to serialize several writers (e.g., a Manager Lock).
+            Readers never lock. Defaults to None (single writer).
+    """
+
+    def __init__(
+        self,
+        columns: int = 2,
+        capacity: int = 1 << 16,
+        max_capacity: int | None = None,
+        lock=None,
+    ):
+        if max_capacity is not None:
+            capacity = min(capacity, max_capacity)
+        self.max_capacity = max_capacity
+        self.lock = lock
+        self._owner = True
+        self._header_shm = shared_memory.SharedMemory(
+            create=True, size=_NAME_OFFSET + _NAME_SIZE
+        )
+        self._header = np.ndarray((5,), dtype=np.int64, buffer=self._header_shm.buf)
+        self._header[:] = 0
+        self._header[_COLUMNS] = columns
+        self._data_shm, self._data = None, None
+        self._stale = []
+        self._generation = -1
+        self._publish(self._create_data(columns, capacity), capacity)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._stored(int(self._header[_HEAD]))
+
+    @property
+    def capacity(self) -> int:
+        return int(self._header[_CAPACITY])
+
+    @property
+    def total_appended(self) -> int:
+        """Number of items appended so far, including evicted ones."""
+        return int(self._header[_HEAD])
+
+    def append(self, *values) -> None:
+        """Appends items to the buffer, one array per column.
+
+        Args:
+            *values (array-like): Column values of equal length (e.g., bandwidth, time).
+        """
+        if self.lock is not None:
+            with self.lock:
+                self._append(values)
+        else:
+            self._append(values)
+
+    def snapshot(
+        self, last: int | None = None, copy: bool = False
+    ) -> tuple[np.ndarray, ...]:
+        """Returns the last items as zero-copy read-only views, one per column.
+
+        The views stay valid until `capacity - last` further items are appended, or
+        until `update` rewrites them. A copy is taken while no writer modifies the
+        items, so it is consistent even if other processes append or update.
+
+        Args:
+            last (int, optional): Number of items. Defaults to all stored items.
+            copy (bool, optional): Return copies instead of views. Defaults to False.
+
+        Returns:
+            tuple[np.ndarray, ...]: one view (or copy) per column
+        """
+        while True:
+            generation = int(self._header[_GENERATION])
+            if generation % 2:  # writer is updating or growing the buffer
+                os.sched_yield()
+                continue
+            self._sync()
+            head = int(self._header[_HEAD])
+            capacity = self.capacity
+            n = self._stored(head) if last is None else min(last, self._stored(head))
+            start = (head - n) % capacity
+            views = tuple(
+                self._data[c, start : start + n] for c in range(len(self._data))
+            )
+            if copy:
+                views = tuple(np.array(view) for view in views)
+                # appends that wrapped around overwrote the oldest copied items
+                if int(self._header[_HEAD]) - head + n > capacity:
+                    continue
+            if int(self._header[_GENERATION]) == generation:
+                break
+        if not copy:
+            for view in views:
+                view.flags.writeable = False
+        return views
+
+    def update(self, func: Callable) -> None:
+        """Replaces the newest items (read-modify-write under the lock).
+
+        func receives the stored items as read-only views, one per column, and returns
+        the index of the first item to replace and the new values of the replaced
+        items (one array per column). The items before the index are kept. Views of
+        the replaced items returned by `snapshot` change, use `snapshot(copy=True)`
+        for a consistent copy.
+
+        Args:
+            func (Callable): (*columns) -> (start, values)
+        """
+        if self.lock is not None:
+            with self.lock:
+                self._update(func)
+        else:
+            self._update(func)
+
+    def discard(self, k: int) -> None:
+        """Drops the k oldest items. The data is not moved, so views returned by
+        `snapshot` stay valid as for an eviction.
+
+        Args:
+            k (int): Number of items to drop. At most all stored items are dropped.
+        """
+        if k <= 0:
+            return
+        if self.lock is not None:
+            with self.lock:
+                self._discard(k)
+        else:
+            self._discard(k)
+
+    def clear(self) -> None:
+        """Drops all items."""
+        self._header[_HEAD] = 0
+        self._header[_FIRST] = 0
+
+    def close(self) -> None:
+        """Detaches from the shared memory. The owner also releases it.
+        Views returned by `snapshot` must not be used afterwards."""
+        if self._owner:
+            self._sync()
+        self._data, self._header = None, None
+        for shm in (*self._stale, self._data_shm, self._header_shm):
+            if shm is None:
+                continue
+            try:
+                shm.close()
+                if self._owner:
+                    shm.unlink()
+            except (BufferError, FileNotFoundError):
+                pass
+        self._data_shm, self._header_shm, self._stale = None, None, []
+
+    # ------------------------------------------------------------------
+    # Pickling: only the name of the header is passed to other processes
+    # ------------------------------------------------------------------
+    def __getstate__(self) -> dict:
+        return {
+            "name": self._header_shm.name,
+            "max_capacity": self.max_capacity,
+            "lock": self.lock,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.max_capacity = state["max_capacity"]
+        self.lock = state["lock"]
+        self._owner = False
+        self._header_shm = shared_memory.SharedMemory(name=state["name"])
+        self._header = np.ndarray((5,), dtype=np.int64, buffer=self._header_shm.buf)
+        self._data_shm, self._data = None, None
+        self._stale = []
+        self._generation = -1
+        self._sync()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _append(self, values) -> None:
+        self._sync()
+        columns = len(self._data)
+        if len(values) != columns:
+            raise ValueError(f"Expected {columns} columns, got {len(values)}")
+        arr = np.asarray(values, dtype=np.float64).reshape(columns, -1)
+        k = arr.shape[1]
+        if k == 0:
+            return
+        head = int(self._header[_HEAD])
+        needed = self._stored(head) + k
+        if needed > self.capacity and (
+            self.max_capacity is None or self.capacity < self.max_capacity
+        ):
+            self._grow(needed)
+
+        capacity = self.capacity
+        if k > capacity:  # only the newest items survive
+            arr = arr[:, -capacity:]
+            head += k - capacity
+            k = capacity
+        index = (head + np.arange(k)) % capacity
+        self._data[:, index] = arr
+        self._data[:, index + capacity] = arr
+        # publish after the data is written
+        self._header[_HEAD] = head + k
+
+    def _discard(self, k: int) -> None:
+        head = int(self._header[_HEAD])
+        self._header[_FIRST] = head - max(self._stored(head) - k, 0)
+
+    def _update(self, func: Callable) -> None:
+        self._sync()
+        head = int(self._header[_HEAD])
+        n = self._stored(head)
+        start = (head - n) % self.capacity
+        views = tuple(self._data[c, start : start + n] for c in range(len(self._data)))
+        for view in views:
+            view.flags.writeable = False
+        index, values = func(*views)
+        # odd while the head is lowered and the replaced items are written
+        self._header[_GENERATION] += 1
+        try:
+            # drop the replaced items, the kept ones stay in place
+            self._header[_HEAD] = head - (n - index)
+            self._append(values)
+        finally:
+            self._header[_GENERATION] += 1
+
+    def _stored(self, head: int) -> int:
+        """Number of stored items for the given head (without discarded or evicted ones)."""
+        return max(min(head - int(self._header[_FIRST]), self.capacity), 0)
+
+    def _grow(self, needed: int) -> None:
+        old_capacity = self.capacity
+        capacity = max(2 * old_capacity, needed)
+        if self.max_capacity is not None:
+            capacity = min(capacity, self.max_capacity)
+        head = int(self._header[_HEAD])
+        n = self._stored(head)
+        start = (head - n) % old_capacity
+        columns = len(self._data)
+        data_shm = self._create_data(columns, capacity)
+        data = np.ndarray((columns, 2 * capacity), dtype=np.float64, buffer=data_shm.buf)
+        index = (head - n + np.arange(n)) % capacity
+        items = self._data[:, start : start + n]
+        data[:, index] = items
+        data[:, index + capacity] = items
+        del data, items
+        old_shm = self._data_shm
+        self._publish(data_shm, capacity)
+        # readers that still map the old segment keep a valid (stale) mapping
+        with contextlib.suppress(FileNotFoundError):
+            old_shm.unlink()
+
+    def _create_data(self, columns: int, capacity: int) -> shared_memory.SharedMemory:
+        return shared_memory.SharedMemory(create=True, size=columns * 2 * capacity * 8)
+
+    def _publish(self, data_shm: shared_memory.SharedMemory, capacity: int) -> None:
+        name = data_shm.name.encode()
+        if len(name) > _NAME_SIZE:
+            raise ValueError(f"Shared memory name too long: {data_shm.name}")
+        # odd: update in progress (already odd if called during `update`)
+        nested = bool(self._header[_GENERATION] % 2)
+        if not nested:
+            self._header[_GENERATION] += 1
+        buf = self._header_shm.buf
+        buf[_NAME_OFFSET : _NAME_OFFSET + _NAME_SIZE] = name.ljust(_NAME_SIZE, b"\0")
+        self._header[_CAPACITY] = capacity
+        if not nested:
+            self._header[_GENERATION] += 1
+        self._attach(data_shm, int(self._header[_GENERATION]))
+
+    def _sync(self) -> None:
+        """Attaches to the current data segment if it changed (grown by another process)."""
+        generation = int(self._header[_GENERATION])
+        if generation == self._generation or generation % 2:
+            return
+        raw = bytes(self._header_shm.buf[_NAME_OFFSET : _NAME_OFFSET + _NAME_SIZE])
+        name = raw.rstrip(b"\0").decode()
+        if self._data_shm is not None and self._data_shm.name.lstrip("/") == name.lstrip(
+            "/"
+        ):
+            self._generation = generation
+            return
+        self._attach(shared_memory.SharedMemory(name=name), generation)
+
+    def _attach(self, data_shm: shared_memory.SharedMemory, generation: int) -> None:
+        old_shm = self._data_shm
+        columns = int(self._header[_COLUMNS])
+        capacity = int(self._header[_CAPACITY])
+        self._data_shm = data_shm
+        self._data = np.ndarray(
+            (columns, 2 * capacity), dtype=np.float64, buffer=data_shm.buf
+        )
+        self._generation = generation
+        if old_shm is not None and old_shm is not data_shm:
+            # views handed out by snapshot may still point to the old segment,
+            # so it is only unmapped on close()
+            self._stale.append(old_shm)
@@ -143,6 +143,35 @@ Full documentation:
             default=0.5,
             help="Memory limit in GB during discretization in case `freq` is passed with -1. Default is 0.5 GB.",
         )
+        parser.add_argument(
+            "--discretization",
+            dest="discretization",
+            choices=["fast", "loop"],
+            type=str,
+            help="discretization backend: fast (default, chunked O(N log n) searchsorted with a JIT fallback for unsorted time stamps) or loop (reference Python loop). Both produce identical samples",
+        )
+        parser.set_defaults(discretization="fast")
+        parser.add_argument(
+            "--cache-dir",
+            dest="cache_dir",
+            type=str,
+            help="directory of the cache for parsed traces (default: $XDG_CACHE_HOME/ftio or ~/.cache/ftio). Entries are keyed by the path, size, and modification time of the trace files and the parsing arguments (mode, --sum/--avr/--ind, --custom_file, --dxt_mode, --limit). Only used by ftio for trace files, not by the predictor",
+        )
+        parser.set_defaults(cache_dir="")
+        parser.add_argument(
+            "--no-cache",
+            dest="cache",
+            action="store_false",
+            help="always parse the traces and do not read or write the cache",
+        )
+        parser.set_defaults(cache=True)
+        parser.add_argument(
+            "--cache-size",
+            dest="cache_size",
+            type=float,
+            default=2.0,
+            help="maximal size of the cache for parsed traces in GB (default: 2). The least recently used entries are removed when it is exceeded",
+        )
         parser.add_argument(
             "-ts",
             "--ts",
@@ -222,9 +251,16 @@ Full documentation:
             "-d",
             "--dtw",
             action="store_true",
-            help="performs dynamic time warping on the top 3 frequencies (highest contribution) calculated using the DFT if set (default=False)",
+            help="performs dynamic time warping on the top 3 frequencies (highest contribution, or n_freq if set) calculated using the DFT if set (default=False)",
         )
         parser.set_defaults(dtw=False)
+        parser.add_argument(
+            "--dtw-window",
+            dest="dtw_window",
+            type=float,
+            help="Sakoe-Chiba band of the DTW (-d) as a fraction of the signal length. 0 computes the unconstrained DTW (default=0.1)",
+        )
+        parser.set_defaults(dtw_window=0.1)
         parser.add_argument(
             "-re",
             "--reconstruction",
@@ -264,6 +300,13 @@ Full documentation:
             help="if set, autocorrelation is calculated in addition to DFT. The results are merged to a single prediction at the end",
         )
         parser.set_defaults(autocorrelation=False)
+        parser.add_argument(
+            "--max-lag",
+            dest="max_lag",
+            type=float,
+            help="largest period in seconds considered by the autocorrelation (-au). Limits the computed lags. By default (0), all lags are computed",
+        )
+        parser.set_defaults(max_lag=0)
         parser.add_argument(
             "-ml",
             "--machine_learning",
@@ -348,6 +391,14 @@ Full documentation:
             help="zmq port for communicating dominant frequency",
         )
         parser.set_defaults(zmq_port_reply="5556")
+        parser.add_argument(
+            "--zmq_window",
+            dest="zmq_window",
+            type=float,
+            help="ZMQ predictor only: quiet time in ms after the last received message "
+            "that closes a batch and triggers the prediction (default: 100).",
+        )
+        parser.set_defaults(zmq_window=100.0)
         # filter arguments
         parser.add_argument(
             "--filter_type",
@@ -403,6 +454,86 @@ Full documentation:
         )
         parser.set_defaults(debounce=False)
 
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=0,
+            help=(
+                "ZMQ predictor only: number of persistent, pre-warmed prediction worker "
+                "processes that consume the received batches from a bounded queue. "
+                "Default: 0 (a new process per batch, see --debounce)."
+            ),
+        )
+        parser.add_argument(
+            "--queue_depth",
+            dest="queue_depth",
+            type=int,
+            default=4,
+            help="maximal number of pending batches for --workers (default: 4).",
+        )
+        parser.add_argument(
+            "--backpressure",
+            dest="backpressure",
+            choices=["coalesce", "drop", "block"],
+            default="coalesce",
+            help=(
+                "policy for --workers if the queue is full: 'coalesce' merges all pending "
+                "batches into one (default), 'drop' discards the oldest pending batch, "
+                "'block' waits until a worker is free."
+            ),
+        )
+        parser.add_argument(
+            "--tail",
+            dest="tail",
+            action="store_true",
+            help=(
+                "File predictor only (JSONL or MessagePack): read only the bytes appended "
+                "to the monitored file since the last prediction and merge them into the "
+                "records read so far, instead of parsing the whole file every time. "
+                "Default: off."
+            ),
+        )
+        parser.set_defaults(tail=False)
+
+        parser.add_argument(
+            "--incremental",
+            dest="incremental",
+            action="store_true",
+            help=(
+                "Online prediction only (dft): keep the discretized signal and its "
+                "spectrum between predictions instead of re-discretizing and "
+                "re-transforming the complete history. New batches are only sampled "
+                "once, window changes move a view over the sampled buffer, and windows "
+                "that slide with a constant length are updated with a sliding DFT. "
+                "Default: off."
+            ),
+        )
+        parser.set_defaults(incremental=False)
+        parser.add_argument(
+            "--incremental_max_samples",
+            dest="incremental_max_samples",
+            type=int,
+            default=1 << 20,
+            help=(
+                "With --incremental: maximal number of samples in the window. Older "
+                "samples are dropped, so a window that keeps growing slides once it "
+                "reaches this length and its spectrum is updated with the sliding DFT. "
+                "Default: 1048576 (about 29 hours at 10 Hz)."
+            ),
+        )
+        parser.add_argument(
+            "--app_max_capacity",
+            dest="app_max_capacity",
+            type=int,
+            default=None,
+            help=(
+                "Predictor only: maximal number of application-level bandwidth samples "
+                "kept in shared memory. Once reached, the oldest samples are evicted. "
+                "Default: None (the history grows without bound)."
+            ),
+        )
+
         parser.add_argument(
             "-bw",
             "--burst_width",
@@ -601,6 +732,13 @@ Full documentation:
         help="max ranks to consider when reading a folder",
     )
     parser.set_defaults(limit=-1)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="number of processes used to load several files or a folder (default: 1). 0 uses all cores",
+    )
+    parser.set_defaults(jobs=1)
 
     args = parser.parse_args(argv)
 
@@ -9,8 +9,12 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+from __future__ import annotations
+
 import numpy as np
-from numba import jit
+from numba import get_num_threads, prange
+
+from ftio.util.jit_cache import RO_ARRAY, kernel
 
 
 class Bandwidth:
@@ -31,8 +35,11 @@ class Bandwidth:
         self.b_overlap_sum = []
         self.b_overlap_avr = []
         self.t_overlap = []
+        # number of concurrent phases (requests for ind) after each overlap event
+        self.n_overlap = []
         self.b_overlap_ind = []
         self.t_overlap_ind = []
+        self.n_overlap_ind = []
         # Rank level
         self.b_rank_sum = []
         self.b_rank_avr = []
@@ -44,14 +51,14 @@ class Bandwidth:
         self.t_ind_e = []
 
         # Application level metrics
-        # if "n_overlap" in b:
-        # 	self.n_overlap.extend(b["n_overlap"])
+        if "n_overlap" in b:
+            self.n_overlap = extend(self.n_overlap, b["n_overlap"])
         if "b_overlap_sum" in b:
-            self.b_overlap_sum.extend(b["b_overlap_sum"])
+            self.b_overlap_sum = extend(self.b_overlap_sum, b["b_overlap_sum"])
         if "b_overlap_avr" in b:
-            self.b_overlap_avr.extend(b["b_overlap_avr"])
+            self.b_overlap_avr = extend(self.b_overlap_avr, b["b_overlap_avr"])
         if "t_overlap" in b:
-            self.t_overlap.extend(b["t_overlap"])
+            self.t_overlap = extend(self.t_overlap, b["t_overlap"])
         else:
             if "b_overlap_sum" in b:
                 self.t_overlap.extend(np.zeros(len(b["b_overlap_sum"])))
@@ -78,19 +85,20 @@ class Bandwidth:
         if args.avr or args.sum:
             # 1) assign rank level metric
             if args.sum and "b_rank_sum" in b:
-                self.b_rank_sum.extend(b["b_rank_sum"])
+                self.b_rank_sum = extend(self.b_rank_sum, b["b_rank_sum"])
 
             if args.avr and "b_rank_avr" in b:
-                self.b_rank_avr.extend(b["b_rank_avr"])
+                self.b_rank_avr = extend(self.b_rank_avr, b["b_rank_avr"])
 
             if "t_rank_s" in b:
-                self.t_rank_s.extend(b["t_rank_s"])
-                if "t_rank_e" in b and b["t_rank_e"]:
-                    self.t_rank_e.extend(b["t_rank_e"])
+                self.t_rank_s = extend(self.t_rank_s, b["t_rank_s"])
+                # len() instead of truthiness, as streamed traces pass arrays
+                if "t_rank_e" in b and len(b["t_rank_e"]):
+                    self.t_rank_e = extend(self.t_rank_e, b["t_rank_e"])
                 else:
-                    if b["t_rank_s"]:
-                        self.t_rank_e.extend(b["t_rank_s"][1:])
-                        self.t_rank_e.append(b["t_rank_s"][-1])
+                    if len(b["t_rank_s"]):
+                        self.t_rank_e = extend(self.t_rank_e, b["t_rank_s"][1:])
+                        self.t_rank_e = extend(self.t_rank_e, b["t_rank_s"][-1:])
                         b["t_rank_e"] = self.t_rank_e
                     else:
                         pass
@@ -102,45 +110,52 @@ class Bandwidth:
                     self.t_rank_s.extend(np.zeros(len(b["b_rank_avr"])))
                     self.t_rank_e.extend(np.zeros(len(b["b_rank_avr"])))
 
-            # 2) Calculate bandwidth overlapping at rank level
+            # 2) Calculate bandwidth overlapping at rank level. The avr and sum
+            # channels are computed in one pass on a shared time axis
+            channels = []
             if (
                 "t_rank_s" in b
                 and "b_rank_avr" in b
                 and "b_overlap_avr" not in b
                 and args.avr
             ):
-                self.b_overlap_avr, self.t_overlap = overlap(
-                    b["b_rank_avr"], b["t_rank_s"], b["t_rank_e"]
-                )
+                channels.append("avr")
             if (
                 "t_rank_s" in b
                 and "b_rank_sum" in b
                 and "b_overlap_sum" not in b
                 and args.sum
             ):
-                self.b_overlap_sum, self.t_overlap = overlap(
-                    b["b_rank_sum"], b["t_rank_s"], b["t_rank_e"]
+                channels.append("sum")
+            if channels:
+                b_out, self.n_overlap, t_out = overlap_multi(
+                    [b[f"b_rank_{c}"] for c in channels], b["t_rank_s"], b["t_rank_e"]
                 )
+                # kept as arrays, a list would box every event
+                self.t_overlap = t_out
+                for c, b_channel in zip(channels, b_out, strict=True):
+                    setattr(self, f"b_overlap_{c}", b_channel)
 
         # overlapping thread level
         if args.ind:
             # Thread level metrics
             if "b_ind" in b:
-                self.b_ind.extend(b["b_ind"])
+                self.b_ind = extend(self.b_ind, b["b_ind"])
                 #! overlap ind
-                self.b_overlap_ind, self.t_overlap_ind = overlap(
-                    b["b_ind"], b["t_ind_s"], b["t_ind_e"]
+                b_out, self.n_overlap_ind, self.t_overlap_ind = overlap_multi(
+                    [b["b_ind"]], b["t_ind_s"], b["t_ind_e"]
                 )
+                self.b_overlap_ind = b_out[0]
 
             if "t_ind_s" in b:
-                self.t_ind_s.extend(b["t_ind_s"])
+                self.t_ind_s = extend(self.t_ind_s, b["t_ind_s"])
 
             if "t_ind_e" in b:
-                self.t_ind_e.extend(b["t_ind_e"])
+                self.t_ind_e = extend(self.t_ind_e, b["t_ind_e"])
 
-        self.app_ind = max(self.b_overlap_ind) if self.b_overlap_ind else -1
-        self.app_avr = max(self.b_overlap_avr) if self.b_overlap_avr else -1
-        self.app_sum = max(self.b_overlap_sum) if self.b_overlap_sum else -1
+        self.app_ind = np.max(self.b_overlap_ind) if len(self.b_overlap_ind) else -1
+        self.app_avr = np.max(self.b_overlap_avr) if len(self.b_overlap_avr) else -1
+        self.app_sum = np.max(self.b_overlap_sum) if len(self.b_overlap_sum) else -1
 
         # statistics:
         self.weighted_harmonic_mean = self.assign(b, "weighted_harmonic_mean")
@@ -171,27 +186,171 @@ class Bandwidth:
             return -1
 
 
+def extend(values: list, new) -> list | np.ndarray:
+    """Appends new to values. Arrays (e.g., decoded msgpack columns) stay arrays, as
+    extending a list would box every element.
+
+    Args:
+        values (list): values so far
+        new (array-like): values to append
+
+    Returns:
+        list | np.ndarray: values with new appended
+    """
+    if isinstance(new, np.ndarray):
+        if len(values) == 0:
+            return new
+        return np.concatenate((np.asarray(values, dtype=np.float64), new))
+    if isinstance(values, np.ndarray):
+        return np.concatenate((values, np.asarray(new, dtype=np.float64)))
+    values.extend(new)
+    return values
+
+
 #! ----------------------- I/O analysis ------------------------------
 # **********************************************************************
 # *                       1. Overlap
 # **********************************************************************
 
 
+# above this number of requests, the merge of the start and end events is parallel
+PARALLEL_THRESHOLD = 10_000_000
+
+
 def overlap(b, t_s, t_e):
-    t_s = np.array(t_s)
-    t_e = np.array(t_e)
-    b = np.array(b)
+    b_overlap, _, t_overlap = overlap_multi([b], t_s, t_e)
+    return list(b_overlap[0]), list(t_overlap)
+
+
+def overlap_multi(
+    channels: list, t_s, t_e, parallel: bool | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Overlaps several bandwidth channels (e.g., sum and avr) of the same requests in
+    one pass. The start and end events are sorted once and all channels share the
+    resulting time axis. Each channel is identical to `overlap` of that channel.
+
+    Args:
+        channels (list): bandwidth per request for each channel
+        t_s (array-like): start time of the requests
+        t_e (array-like): end time of the requests
+        parallel (bool, optional): use the parallel merge. Defaults to None, which
+            selects it above PARALLEL_THRESHOLD requests if several threads are available.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - overlapped bandwidth with shape (channels, 2 * requests)
+            - number of concurrent requests after each event
+            - time of each event
+    """
+    t_s = np.asarray(t_s, dtype=np.float64)
+    t_e = np.asarray(t_e, dtype=np.float64)
+    b = np.asarray(channels, dtype=np.float64).reshape(len(channels), -1)
     id_s = np.argsort(t_s)
     id_e = np.argsort(t_e)
+    if parallel is None:
+        parallel = len(t_s) >= PARALLEL_THRESHOLD and get_num_threads() > 1
     try:
-        b_overlap, t_overlap = overlap_core(b, t_s, t_e, id_s, id_e)
+        if parallel:
+            return overlap_merge_parallel(b, t_s, t_e, id_s, id_e)
+        return overlap_multi_core(b, t_s, t_e, id_s, id_e)
     except Exception:
-        b_overlap, t_overlap = overlap_core_safe(b, t_s, t_e, id_s, id_e)
+        pos_s, pos_e = overlap_positions(t_s[id_s], t_e[id_e])
+        return overlap_scatter(b, t_s, t_e, id_s, id_e, pos_s, pos_e)
 
-    return list(b_overlap), list(t_overlap)
 
+@kernel(
+    "(float64[:, ::1], float64[::1], float64[::1], int64[::1], int64[::1])",
+    f"(float64[:, ::1], {RO_ARRAY}, {RO_ARRAY}, int64[::1], int64[::1])",
+)
+def overlap_multi_core(b, t_s, t_e, id_s, id_e):
+    """Sequential merge of the start and end events (same order as overlap_core)."""
+    agg_phases = len(t_s)
+    n_channels = b.shape[0]
+    b_out = np.zeros((n_channels, 2 * agg_phases))
+    n_out = np.zeros(2 * agg_phases, dtype=np.int64)
+    t_out = np.zeros(2 * agg_phases)
+    b_tmp = np.zeros(n_channels)
+    n_tmp = 0
+    k_s = 0
+    k_e = 0
+    counter = 0
+    while k_s < agg_phases or k_e < agg_phases:
+        if k_s == agg_phases or (k_e < agg_phases and t_e[id_e[k_e]] < t_s[id_s[k_s]]):
+            for c in range(n_channels):
+                b_tmp[c] = b_tmp[c] - b[c, id_e[k_e]]
+            t_out[counter] = t_e[id_e[k_e]]
+            n_tmp -= 1
+            k_e += 1
+        else:
+            for c in range(n_channels):
+                b_tmp[c] = b_tmp[c] + b[c, id_s[k_s]]
+            t_out[counter] = t_s[id_s[k_s]]
+            n_tmp += 1
+            k_s += 1
+        b_out[:, counter] = b_tmp
+        n_out[counter] = n_tmp
+        counter += 1
 
-@jit(nopython=True, cache=True)
+    return b_out, n_out, t_out
+
+
+def overlap_positions(t_s_sorted, t_e_sorted):
+    """Position of each sorted start and end event in the merged event sequence.
+    An end event precedes a start event only if it is strictly earlier."""
+    index = np.arange(len(t_s_sorted))
+    pos_s = index + np.searchsorted(t_e_sorted, t_s_sorted, side="left")
+    pos_e = index + np.searchsorted(t_s_sorted, t_e_sorted, side="right")
+    return pos_s, pos_e
+
+
+@kernel(
+    "(float64[:, ::1], float64[::1], float64[::1], int64[::1], int64[::1])",
+    f"(float64[:, ::1], {RO_ARRAY}, {RO_ARRAY}, int64[::1], int64[::1])",
+    parallel=True,
+)
+def overlap_merge_parallel(b, t_s, t_e, id_s, id_e):
+    """Parallel merge: each event computes its merged position with a binary search
+    in the other sorted sequence and is placed there. The cumulative sum then adds
+    the events in the same order as the sequential merge."""
+    n = len(t_s)
+    n_channels = b.shape[0]
+    t_s_sorted = t_s[id_s]
+    t_e_sorted = t_e[id_e]
+    delta = np.zeros((n_channels, 2 * n))
+    count = np.zeros(2 * n, dtype=np.int64)
+    t_out = np.zeros(2 * n)
+    for i in prange(n):
+        pos_s = i + np.searchsorted(t_e_sorted, t_s_sorted[i], side="left")
+        pos_e = i + np.searchsorted(t_s_sorted, t_e_sorted[i], side="right")
+        t_out[pos_s] = t_s_sorted[i]
+        t_out[pos_e] = t_e_sorted[i]
+        count[pos_s] = 1
+        count[pos_e] = -1
+        for c in range(n_channels):
+            delta[c, pos_s] = b[c, id_s[i]]
+            delta[c, pos_e] = -b[c, id_e[i]]
+    b_out = np.empty_like(delta)
+    for c in prange(n_channels):
+        b_out[c] = np.cumsum(delta[c])
+    return b_out, np.cumsum(count), t_out
+
+
+def overlap_scatter(b, t_s, t_e, id_s, id_e, pos_s, pos_e):
+    """NumPy fallback of overlap_merge_parallel."""
+    n_events = 2 * len(t_s)
+    delta = np.zeros((b.shape[0], n_events))
+    delta[:, pos_s] = b[:, id_s]
+    delta[:, pos_e] = -b[:, id_e]
+    count = np.zeros(n_events, dtype=np.int64)
+    count[pos_s] = 1
+    count[pos_e] = -1
+    t_out = np.zeros(n_events)
+    t_out[pos_s] = t_s[id_s]
+    t_out[pos_e] = t_e[id_e]
+    return np.cumsum(delta, axis=1), np.cumsum(count), t_out
+
+
+@kernel("(float64[::1], float64[::1], float64[::1], int64[::1], int64[::1])")
 def overlap_core(b, t_s, t_e, id_s, id_e):
     agg_phases = len(t_s)
 
@@ -291,7 +450,7 @@ def overlap_two_series_safe(b1, t1, b2, t2):
     return np.array(b_out), np.array(t_out)
 
 
-@jit(nopython=True, cache=True)
+@kernel("(float64[::1], float64[::1], float64[::1], float64[::1])")
 def overlap_two_series_jit_impl(b1, t1, b2, t2):
     n1 = len(b1)
     n2 = len(b2)
@@ -330,6 +489,61 @@ def overlap_two_series_jit_impl(b1, t1, b2, t2):
     return b_out[:counter], t_out[:counter]
 
 
+# **********************************************************************
+# *                       3. Incremental series overlap
+# **********************************************************************
+# levels below this fraction of the largest level are rounding residues of zero
+ZERO_LEVEL = 1e-9
+
+
+def fold_series(b_app, t_app, b, t) -> tuple[int, np.ndarray, np.ndarray]:
+    """Adds the step function (b, t) (e.g., the overlap of a new batch of requests)
+    to the step function (b_app, t_app) sorted by time. Only the points from the last
+    point at or before t[0] onward change, so a batch that arrives in time order costs
+    O(log n) for the search plus the length of the changed suffix.
+
+    Args:
+        b_app (array-like): app level bandwidth so far (value from the time point on)
+        t_app (array-like): sorted time points of b_app
+        b (array-like): bandwidth of the new step function
+        t (array-like): sorted time points of b
+
+    Returns:
+        tuple[int, np.ndarray, np.ndarray]: index of the first changed point of the app
+            series, and the compacted bandwidth and time points that replace it
+    """
+    b, t = compact_series(
+        np.asarray(b, dtype=np.float64), np.asarray(t, dtype=np.float64)
+    )
+    if len(t) == 0:
+        return len(t_app), b, t
+    start = max(int(np.searchsorted(t_app, t[0], side="right")) - 1, 0)
+    b_out, t_out = overlap_two_series(b_app[start:], t_app[start:], b, t)
+    b_out, t_out = compact_series(b_out, t_out)
+    return start, b_out, t_out
+
+
+def compact_series(b: np.ndarray, t: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Removes the redundant points of a step function: of several points at the same
+    time only the last one is kept, and points that do not change the value are
+    dropped. Values that are rounding residues of zero are set to zero.
+
+    Args:
+        b (np.ndarray): value from the time point on
+        t (np.ndarray): sorted time points
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: compacted values and time points
+    """
+    if len(t) == 0:
+        return b, t
+    last = np.append(t[1:] != t[:-1], True)
+    b, t = b[last], t[last]
+    b[np.abs(b) <= ZERO_LEVEL * np.max(np.abs(b))] = 0
+    changed = np.concatenate(([True], b[1:] != b[:-1]))
+    return b[changed], t[changed]
+
+
 def merge_overlaps(b, t):
     """
     Wrapper: tries JIT version, falls back to safe version if error occurs.
@@ -368,7 +582,7 @@ def merge_overlaps_safe(b, t):
 
 
 # Numba JIT version
-@jit(nopython=True, cache=True)
+@kernel("(float64[::1], float64[::1])")
 def merge_overlaps_jit(b, t):
     """Merge overlapping timestamps by summing b values (numba-accelerated)."""
     n = len(b)
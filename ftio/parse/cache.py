@@ -0,0 +1,253 @@
+"""
+On-disk cache for parsed traces (--cache-dir / --no-cache).
+
+Parsing large JSON/JSONL/msgpack/Darshan/Recorder traces dominates the runtime when
+ftio is executed several times on the same trace (e.g., to compare transformations,
+outlier methods, sampling frequencies, or time windows). The extracted application
+level time behavior (t_overlap, b_overlap_avr) is therefore stored per run as a raw
+`.npy` file, which is memory mapped on a cache hit (zero copy, copy-on-write).
+
+An entry is keyed by the absolute input paths, their size and modification time, and
+the arguments that influence parsing (mode, sum/avr/ind, custom file, DXT mode,
+limit). Arguments that are adjusted while parsing (e.g., the mode or the sampling
+frequency from a Darshan heatmap) are stored with the entry and restored on a hit.
+The cache is limited to --cache-size GB: after storing an entry, the least recently
+used entries are removed until the limit holds.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from argparse import Namespace
+
+import numpy as np
+
+from ftio import __version__
+
+# arguments that change the parsed data
+KEY_ARGS = ("mode", "sum", "avr", "ind", "custom_file", "dxt_mode", "limit", "source")
+# arguments that the parsers may adjust and that are restored on a cache hit
+ADJUSTED_ARGS = ("mode", "source", "freq")
+# default of --cache-size in GB
+DEFAULT_SIZE = 2.0
+
+
+def default_cache_dir() -> str:
+    """Returns the default cache directory ($XDG_CACHE_HOME/ftio or ~/.cache/ftio).
+
+    Returns:
+        str: path to the cache directory
+    """
+    base = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base, "ftio")
+
+
+def cache_enabled(args: Namespace, prog_name: str) -> bool:
+    """Checks if the cache applies. Online predictions (files that are still
+    appended to, or ZMQ messages) are never cached.
+
+    Args:
+        args (Namespace): parsed arguments
+        prog_name (str): name of the executed program
+
+    Returns:
+        bool: True if the cache should be used
+    """
+    return (
+        getattr(args, "cache", False)
+        and "ftio" in prog_name.lower()
+        and "predictor" not in prog_name.lower()
+        and not getattr(args, "zmq", False)
+    )
+
+
+def input_paths(args: Namespace) -> list[str]:
+    """Returns the input paths like Scales.load_setup, where files[0] is the program.
+
+    Args:
+        args (Namespace): parsed arguments
+
+    Returns:
+        list[str]: paths to files or folders
+    """
+    if not isinstance(args.files, list):
+        return [str(args.files)]
+    return [str(f) for f in args.files[1:]] if len(args.files) > 1 else ["."]
+
+
+def _stat_entries(path: str) -> list:
+    """Size and mtime of a file or of all files inside a folder."""
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return [[os.path.abspath(path), stat.st_size, stat.st_mtime_ns]]
+    entries = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in ("io_results", "exported_images"))
+        for file in sorted(files):
+            if file in ("scale.jsonl", ".call.txt"):
+                continue
+            stat = os.stat(os.path.join(root, file))
+            entries.append(
+                [
+                    os.path.abspath(os.path.join(root, file)),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ]
+            )
+    return entries
+
+
+def cache_key(args: Namespace) -> str | None:
+    """Computes the cache key of the inputs and parsing arguments.
+
+    Args:
+        args (Namespace): parsed arguments
+
+    Returns:
+        str | None: hex digest or None if an input does not exist
+    """
+    paths = input_paths(args)
+    if not all(os.path.exists(p) for p in paths):
+        return None
+    key = {
+        "version": __version__,
+        "inputs": [_stat_entries(p) for p in paths],
+        "args": {k: getattr(args, k, None) for k in KEY_ARGS},
+    }
+    # an explicitly passed custom file also changes the parsing
+    if getattr(args, "custom_file", "") and os.path.isfile(args.custom_file):
+        key["custom"] = _stat_entries(args.custom_file)
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def load(cache_dir: str, key: str, args: Namespace) -> list[dict] | None:
+    """Loads a cached time behavior and restores the adjusted arguments.
+
+    Args:
+        cache_dir (str): cache directory
+        key (str): key from `cache_key`
+        args (Namespace): parsed arguments, adjusted in place on a hit
+
+    Returns:
+        list[dict] | None: time behavior as returned by get_time_behavior or None on a miss
+    """
+    entry = os.path.join(cache_dir, key)
+    try:
+        with open(os.path.join(entry, "meta.json")) as f:
+            meta = json.load(f)
+        data = []
+        for i, run in enumerate(meta["runs"]):
+            # copy-on-write, so later in-place modifications never reach the file
+            arr = np.load(os.path.join(entry, f"run_{i}.npy"), mmap_mode="c")
+            data.append(
+                {
+                    "time": arr[0],
+                    "bandwidth": arr[1],
+                    "total_bytes": run["total_bytes"],
+                    "ranks": run["ranks"],
+                }
+            )
+    except (OSError, ValueError, KeyError):
+        return None
+    # mark as recently used for the pruning
+    with contextlib.suppress(OSError):
+        os.utime(entry)
+    for k, v in meta["args"].items():
+        setattr(args, k, v)
+    return data
+
+
+def store(
+    cache_dir: str, key: str, data: list[dict], args: Namespace, initial_args: Namespace
+) -> None:
+    """Stores the time behavior atomically and prunes the cache to --cache-size.
+    Failures are ignored, as the cache is only an optimization.
+
+    Args:
+        cache_dir (str): cache directory
+        key (str): key from `cache_key`
+        data (list[dict]): time behavior as returned by get_time_behavior
+        args (Namespace): arguments after parsing
+        initial_args (Namespace): arguments before parsing, only the arguments the
+            parsers adjusted are stored
+    """
+    entry = os.path.join(cache_dir, key)
+    tmp = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp_")
+        runs = []
+        for i, run in enumerate(data):
+            arr = np.vstack(
+                (
+                    np.asarray(run["time"], dtype=np.float64),
+                    np.asarray(run["bandwidth"], dtype=np.float64),
+                )
+            )
+            np.save(os.path.join(tmp, f"run_{i}.npy"), arr)
+            runs.append(
+                {"total_bytes": int(run["total_bytes"]), "ranks": int(run["ranks"])}
+            )
+        adjusted = {
+            k: getattr(args, k)
+            for k in ADJUSTED_ARGS
+            if hasattr(args, k) and getattr(args, k) != getattr(initial_args, k, None)
+        }
+        meta = {"runs": runs, "args": adjusted}
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        max_size = getattr(args, "cache_size", DEFAULT_SIZE) * 1000**3
+        if _entry_size(tmp) > max_size:
+            return
+        os.replace(tmp, entry)
+        tmp = None
+        prune(cache_dir, max_size)
+    except OSError:
+        pass
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def prune(cache_dir: str, max_size: float) -> None:
+    """Removes the least recently used entries until the cache holds at most
+    max_size bytes.
+
+    Args:
+        cache_dir (str): cache directory
+        max_size (float): maximal size of all entries in bytes
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith(".tmp_") or not os.path.isdir(path):
+            continue
+        with contextlib.suppress(OSError):
+            entries.append((os.stat(path).st_mtime, _entry_size(path), path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def _entry_size(path: str) -> int:
+    """Size of the files of an entry in bytes."""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
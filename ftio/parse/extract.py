@@ -14,6 +14,10 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 import numpy as np
 import pandas as pd
 
+from ftio.freq.helper import MyConsole
+from ftio.parse import cache
+from ftio.parse.args import parse_args
+from ftio.parse.cache import cache_enabled, cache_key, default_cache_dir
 from ftio.parse.scales import Scales
 
 # from ftio.freq.helper import get_mode
@@ -62,6 +66,20 @@ def get_time_behavior_and_args(cmd_input: list[str], msgs=None):
             - data: The extracted time behavior data.
             - args: The extracted arguments.
     """
+    #! Load the data from the cache if possible
+    initial_args = parse_args(cmd_input)
+    use_cache = cache_enabled(initial_args, cmd_input[0])
+    if use_cache:
+        cache_dir = initial_args.cache_dir or default_cache_dir()
+        key = cache_key(initial_args)
+        if key is not None:
+            data = cache.load(cache_dir, key, initial_args)
+            if data is not None:
+                MyConsole(initial_args.verbose).print(
+                    f"[cyan]Loaded parsed trace from cache:[/] {cache_dir}/{key}"
+                )
+                return data, initial_args
+
     #! Parse the data
     data = Scales(cmd_input, msgs)
     #! extract the arguments
@@ -77,6 +95,8 @@ def get_time_behavior_and_args(cmd_input: list[str], msgs=None):
 
     #! extract the fields bandwidth, time, total_bytes, and ranks from the file/msg
     data = get_time_behavior(df)
+    if use_cache and key is not None:
+        cache.store(cache_dir, key, data, args, initial_args)
 
     return data, args
 
@@ -3,6 +3,12 @@ Parses messagpack object to a format similar to jsonl
 This function can be also executed as a standalone. Just call:
 > python3 msgpack_reader.py FILE
 
+The phase records of a TMIO object (a list of [bytes, t_start, t_end_act, t_end_req,
+T_sum, T_avr, B_sum, B_avr, n_op] per phase) are not unpacked into Python lists.
+`decode` counts them from the array header and fills them with a numba kernel
+directly into preallocated float64 columns, which are kept as arrays by Sample and
+Bandwidth.
+
 Returns:
     list[dict]: _description_
 
@@ -18,9 +24,18 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 
 from __future__ import annotations
 
+import mmap
 import sys
 
 import msgpack
+import numpy as np
+
+from ftio.util.jit_cache import RO_BYTES, kernel
+
+# decoded fields of a phase record (n_op is not used)
+PHASE_FIELDS = 8
+# header of an array with the 13 metrics that precede the phase records
+METRICS_HEADER = b"\x9d"
 
 
 def get_type(arr: list[str]) -> str:
@@ -79,6 +94,12 @@ def assign_metrics(arr: list, bandwidth: dict) -> dict:
 
 
 def assign_bandwidth(arr: list, io_type: str) -> list[dict]:
+    if isinstance(arr[13], np.ndarray):
+        # columns filled by decode, the rows are views without copies
+        t_start, t_end_act, t_end_req, T_sum, T_avr, B_sum, B_avr = arr[13][1:8]
+        return bandwidth_dicts(
+            t_start, t_end_act, t_end_req, T_sum, T_avr, B_sum, B_avr, io_type
+        )
     # data = []
     t_start = []
     t_end_act = []
@@ -99,6 +120,14 @@ def assign_bandwidth(arr: list, io_type: str) -> list[dict]:
                 B_sum.append(i[6])  # Bytes/s
                 B_avr.append(i[7])  # Bytes/s
             # n_op.append(i[8])
+    return bandwidth_dicts(
+        t_start, t_end_act, t_end_req, T_sum, T_avr, B_sum, B_avr, io_type
+    )
+
+
+def bandwidth_dicts(
+    t_start, t_end_act, t_end_req, T_sum, T_avr, B_sum, B_avr, io_type: str
+) -> list[dict]:
     if "async" in io_type:
         return [
             {
@@ -150,7 +179,7 @@ def convert_to_iotime(arr: list) -> list:
 
 
 def extract(file: str) -> list[dict]:
-    """Extracts the data stored in Darshan file
+    """Extracts the data stored in a MessagePack file
 
     Args:
         file (str): file name
@@ -159,25 +188,249 @@ def extract(file: str) -> list[dict]:
         list[dict]: file content
     """
     data = []
-    # Open the MessagePack binary file for reading
     with open(file, "rb") as in_file:
-        # Read the binary data
-        binary_data = in_file.read()
-
-    data = extract_data(binary_data, data)
+        if not in_file.seek(0, 2):
+            return data
+        # the file is memory mapped instead of read, the columns are the only copy
+        with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            items, _ = decode(buffer)
+    for item in items:
+        data.extend(convert_to_class(item, get_type(item)))
     return data
 
 
 def extract_data(binary_data, data):
     # Deserialize the MessagePack data into the class instances
-    unpacker = msgpack.Unpacker()
-    unpacker.feed(binary_data)
-    for item in unpacker:
+    items, _ = decode(binary_data)
+    for item in items:
         io_type = get_type(item)
         data.extend(convert_to_class(item, io_type))
     return data
 
 
+def decode(buffer) -> tuple[list, int]:
+    """Decodes the complete MessagePack objects at the start of buffer.
+
+    TMIO objects ([type, 12 metrics, phase records]) are returned as a list whose last
+    element is a float64 array of shape (PHASE_FIELDS, phases), where row j holds
+    field j of each phase record. Other objects are unpacked as usual.
+
+    Args:
+        buffer (bytes-like): MessagePack stream, may end inside an object
+
+    Returns:
+        tuple[list, int]: decoded objects and the number of bytes they occupy
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    items = []
+    pos = 0
+    while pos < len(raw):
+        end = skip_object(raw, pos)
+        if end < 0:
+            break
+        items.append(decode_object(raw, pos, end))
+        pos = end
+    del raw  # releases the buffer (a memory map can only be closed without views)
+    return items, pos
+
+
+def decode_object(raw: np.ndarray, pos: int, end: int):
+    """Decodes the object in raw[pos:end], see `decode`."""
+    length, start = array_header(raw, pos)
+    if length == 14:
+        metrics_end = start
+        for _ in range(13):
+            metrics_end = skip_object(raw, metrics_end)
+        phases, phases_start = array_header(raw, metrics_end)
+        if phases >= 0:
+            columns = np.empty((PHASE_FIELDS, phases))
+            if fill_phases(raw, phases_start, columns) == end:
+                metrics = METRICS_HEADER + raw[start:metrics_end].tobytes()
+                return msgpack.unpackb(metrics) + [columns]
+    # other objects and phase records with non-numeric fields
+    return msgpack.unpackb(raw[pos:end].tobytes())
+
+
+def array_header(raw: np.ndarray, pos: int) -> tuple[int, int]:
+    """Length of the array starting at pos and position of its first element.
+
+    Returns:
+        tuple[int, int]: length (-1 if it is not an array) and position
+    """
+    b = raw[pos]
+    if 0x90 <= b <= 0x9F:
+        return int(b & 0x0F), pos + 1
+    if b == 0xDC:
+        return int(read_uint(raw, pos + 1, 2)), pos + 3
+    if b == 0xDD:
+        return int(read_uint(raw, pos + 1, 4)), pos + 5
+    return -1, pos
+
+
+@kernel("(uint8[::1], int64, int64)", f"({RO_BYTES}, int64, int64)")
+def read_uint(raw, pos, size):
+    """Reads a big-endian unsigned integer of size bytes."""
+    value = np.uint64(0)
+    for i in range(size):
+        value = (value << np.uint64(8)) | np.uint64(raw[pos + i])
+    return value
+
+
+@kernel("(uint8[::1], int64)", f"({RO_BYTES}, int64)")
+def skip_object(raw, pos):
+    """Position after the MessagePack object starting at pos.
+
+    Returns:
+        int: end position, or -1 if the object is incomplete or invalid
+    """
+    n = len(raw)
+    pending = 1
+    while pending > 0:
+        if pos >= n:
+            return -1
+        b = raw[pos]
+        pending -= 1
+        pos += 1
+        if b <= 0x7F or b >= 0xE0 or b == 0xC0 or b == 0xC2 or b == 0xC3:
+            continue
+        if b <= 0x8F:
+            pending += 2 * (b & 0x0F)
+        elif b <= 0x9F:
+            pending += b & 0x0F
+        elif b <= 0xBF:
+            pos += b & 0x1F
+        elif b == 0xC1:
+            return -1
+        else:
+            # lengths of the following size bytes, the payload, and the elements
+            size = 0
+            payload = 0
+            elements = 0
+            if b == 0xC4 or b == 0xD9:
+                size = 1
+            elif b == 0xC5 or b == 0xDA:
+                size = 2
+            elif b == 0xC6 or b == 0xDB:
+                size = 4
+            elif b == 0xC7:
+                size, payload = 1, 1
+            elif b == 0xC8:
+                size, payload = 2, 1
+            elif b == 0xC9:
+                size, payload = 4, 1
+            elif b == 0xCA:
+                payload = 4
+            elif b == 0xCB:
+                payload = 8
+            elif b == 0xCC or b == 0xD0:
+                payload = 1
+            elif b == 0xCD or b == 0xD1:
+                payload = 2
+            elif b == 0xCE or b == 0xD2:
+                payload = 4
+            elif b == 0xCF or b == 0xD3:
+                payload = 8
+            elif b <= 0xD8:
+                payload = 1 + (1 << (b - 0xD4))
+            elif b == 0xDC:
+                size, elements = 2, 1
+            elif b == 0xDD:
+                size, elements = 4, 1
+            elif b == 0xDE:
+                size, elements = 2, 2
+            else:
+                size, elements = 4, 2
+            if pos + size > n:
+                return -1
+            length = np.int64(read_uint(raw, pos, size)) if size else 0
+            pos += size
+            if elements:
+                pending += elements * length
+            else:
+                pos += payload + length
+    return pos if pos <= n else -1
+
+
+@kernel(
+    "(uint8[::1], int64, float64[:, ::1])",
+    f"({RO_BYTES}, int64, float64[:, ::1])",
+)
+def fill_phases(raw, pos, columns):
+    """Decodes columns.shape[1] numeric records starting at pos into the columns.
+    Fields beyond columns.shape[0] are skipped, missing fields are NaN.
+
+    Returns:
+        int: position after the records, or -1 if a field is not a number
+    """
+    n = len(raw)
+    n_fields = columns.shape[0]
+    # reinterprets the bits of floats
+    bits64 = np.zeros(1, dtype=np.uint64)
+    float64 = bits64.view(np.float64)
+    bits32 = np.zeros(1, dtype=np.uint32)
+    float32 = bits32.view(np.float32)
+    for i in range(columns.shape[1]):
+        if pos >= n:
+            return -1
+        b = raw[pos]
+        if 0x90 <= b <= 0x9F:
+            length = np.int64(b & 0x0F)
+            pos += 1
+        elif b == 0xDC and pos + 3 <= n:
+            length = np.int64(read_uint(raw, pos + 1, 2))
+            pos += 3
+        else:
+            return -1
+        for j in range(length):
+            if j >= n_fields:
+                pos = skip_object(raw, pos)
+                if pos < 0:
+                    return -1
+                continue
+            if pos >= n:
+                return -1
+            b = raw[pos]
+            pos += 1
+            if b <= 0x7F:
+                value = float(b)
+            elif b >= 0xE0:
+                value = float(np.int64(b) - 256)
+            elif b == 0xC0:
+                value = np.nan
+            else:
+                if b == 0xCA or b == 0xCE or b == 0xD2:
+                    size = 4
+                elif b == 0xCB or b == 0xCF or b == 0xD3:
+                    size = 8
+                elif b == 0xCC or b == 0xD0:
+                    size = 1
+                elif b == 0xCD or b == 0xD1:
+                    size = 2
+                else:
+                    return -1
+                if pos + size > n:
+                    return -1
+                u = read_uint(raw, pos, size)
+                pos += size
+                if b == 0xCB:
+                    bits64[0] = u
+                    value = float64[0]
+                elif b == 0xCA:
+                    bits32[0] = np.uint32(u)
+                    value = float(float32[0])
+                elif b >= 0xD0:
+                    # two's complement of the signed integers
+                    value = float(
+                        np.int64(u << np.uint64(64 - 8 * size)) >> (64 - 8 * size)
+                    )
+                else:
+                    value = float(u)
+            columns[j, i] = value
+        for j in range(length, n_fields):
+            columns[j, i] = np.nan
+    return pos
+
+
 def main(args) -> None:
     """Pass variables and call main_core. The extraction of the traces
     and the parsing of the arguments is done in this function.
@@ -9,9 +9,8 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
-import jsonlines
-
 from ftio.parse.simrun import Simrun
+from ftio.parse.stream_reader import read_stream
 
 
 class ParseJsonl:
@@ -29,7 +28,7 @@ class ParseJsonl:
             Simrun: Simrun object
         """
         file = self.path
-        with jsonlines.open(file, "r") as jsonl_f:
-            data = list(jsonl_f)
+        # records are merged while reading, the file is never loaded as a whole
+        data = read_stream(file)
 
         return Simrun(data, "jsonl", file, args, index)
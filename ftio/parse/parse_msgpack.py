@@ -9,8 +9,8 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
-from ftio.parse.msgpack_reader import extract
 from ftio.parse.simrun import Simrun
+from ftio.parse.stream_reader import read_stream
 
 
 class ParseMsgpack:
@@ -28,6 +28,7 @@ class ParseMsgpack:
             Simrun: Simrun object
         """
         file = self.path
-        data = extract(file)
+        # records are merged while reading, the file is never loaded as a whole
+        data = read_stream(file)
 
         return Simrun(data, "msgpack", file, args, index)
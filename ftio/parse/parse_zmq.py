@@ -38,12 +38,13 @@ class ParseZmq:
         if self.msgs is None:
             self.msgs = get_msgs_zmq(args)
 
+        # the messages are parsed as one msgpack stream
+        buffer = self.msgs[0] if len(self.msgs) == 1 else b"".join(self.msgs)
         if "direct" in args.zmq_source:
-            for msg in self.msgs:
-                dataframe, ranks = extract(msg, args)
+            dataframe, ranks = extract(buffer, args)
             return Simrun(dataframe, "txt", str(ranks), args, index)
         elif "tmio" in args.zmq_source.lower():
-            data = extract_data(self.msgs[0], [])
+            data = extract_data(buffer, [])
             return Simrun(data, "msgpack", "0", args, index)
         else:
             pass
@@ -526,7 +526,7 @@ class Print:
                         art = getattr(value.bandwidth, var[10:])
                     else:
                         art = getattr(value, var)
-                    if isinstance(art, list):
+                    if isinstance(art, (list, np.ndarray)):
                         self.file.write("DATA ")
                         for i, _ in enumerate(art):
                             self.file.write(f"{art[i]:e}")
@@ -543,7 +543,7 @@ class Print:
                     else:
                         art = getattr(value, var)
                         art = -1 if np.isnan(art) else art
-                    if isinstance(art, list):
+                    if isinstance(art, (list, np.ndarray)):
                         for j, _ in enumerate(art):
                             if j == 0 and self.args.scale:
                                 metric, order = scale_metric(metric, art[j])
@@ -575,7 +575,7 @@ class Print:
                 except AttributeError:
                     return False
 
-            return not (isinstance(art, list) and not art)
+            return not (isinstance(art, (list, np.ndarray)) and len(art) == 0)
 
     def print_points(self):
         for run in self.data.s:
@@ -1,7 +1,12 @@
 """
 Parses recorder object to simrun
 This function can be also executed as a standalone. Just call:
-> python3 darshan_reader.py FILE
+> python3 recorder_reader.py FOLDER
+
+The rank files (one text file per rank, one call per line) are scanned by a numba
+kernel in a single pass, which extracts the start time, end time, and size of the
+read and write calls into arrays. Several rank files are processed in parallel with
+--jobs. Lines the kernel cannot convert exactly are parsed in Python.
 
 Returns:
     list[dict]: _description_
@@ -16,15 +21,28 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+from __future__ import annotations
+
+import multiprocessing
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ftio.util.jit_cache import RO_BYTES, kernel
+
+# columns of a call: start time, end time, bytes, is write
+COLUMNS = ("t_s", "t_e", "bytes", "write")
+# exact powers of ten, a decimal with up to 15 digits is converted without rounding
+POW10 = np.array([10.0**i for i in range(23)])
 
 
 def extract(path, args) -> tuple[dict, int]:
-    """exrtracts Darshan file and generates dictionary with relevent keys
+    """exrtracts Recorder folder and generates dictionary with relevent keys
 
     Args:
-        path (str): filename
+        path (str): folder name
         args (Argparse): optional arguments
 
     Returns:
@@ -33,94 +51,284 @@ def extract(path, args) -> tuple[dict, int]:
             2. number of ranks
     """
     data, ranks = extract_data(path, args)
-    write, read = extract_recorder(data, ranks)
-    data = {"read_sync": read, "write_sync": write}
+    write, read = extract_recorder(data, ranks, getattr(args, "ind", False))
+    # Recorder traces contain no time metrics, Time assigns NaN to the missing fields
+    data = {"read_sync": read, "write_sync": write, "io_time": {}}
     return data, ranks
 
 
-def extract_data(path: str, args) -> tuple[list, int]:
-    """Extract relevent fields from all recorder files
+def extract_data(path: str, args) -> tuple[dict[str, np.ndarray], int]:
+    """Extract the read and write calls from all recorder files
 
     Args:
-        path (str): path of file
-        args (Argparse): _description_
+        path (str): path of the folder
+        args (Argparse): optional arguments, --jobs processes parse the rank files
 
     Returns:
-        tuple[list, int]:
-        1. list of data contating read and write information
+        tuple[dict[str, np.ndarray], int]:
+        1. columns of the calls of all ranks (see COLUMNS)
         2. number of ranks
     """
-    data = []
+    files = []
     rank = 0
-    for root, _, files in os.walk(path):
-        for file in sorted(files, key=len):
-            file = os.path.join(root, file)
-            with open(file) as f:
-                current_file = f.readlines()
-            # data.extend([k for k in f if 'MPI_File_w' in k or 'MPI_File_r' in k])
-            data.extend([k for k in current_file if " write " in k or " read " in k])
-        rank = max([int(x.replace(".txt", "")) for x in files]) + 1
+    for root, _, names in os.walk(path):
+        files = [os.path.join(root, name) for name in sorted(names, key=len)]
+        rank = max([int(x.replace(".txt", "")) for x in names]) + 1
         break  # no recursive walk
-    return data, rank
+
+    jobs = getattr(args, "jobs", 1)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(files))
+    # a folder loaded in a worker of Scales is not parallelized again
+    if jobs > 1 and multiprocessing.parent_process() is None:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            parts = list(
+                executor.map(
+                    parse_rank_file, files, chunksize=max(1, len(files) // (4 * jobs))
+                )
+            )
+    else:
+        parts = [parse_rank_file(file) for file in files]
+
+    if not parts:
+        return {c: np.empty(0) for c in COLUMNS}, rank
+    return {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS}, rank
+
+
+def parse_rank_file(file: str) -> dict[str, np.ndarray]:
+    """Extracts the read and write calls of a single rank file.
+
+    A call is a line containing the word read or write, e.g.,
+    "0.105 0.106 0 write ( 3 0x7ffd 4096 )": the first two fields are the start and
+    end time and the last argument is the size in bytes.
+
+    Args:
+        file (str): rank file
+
+    Returns:
+        dict[str, np.ndarray]: columns of the calls (see COLUMNS)
+    """
+    with open(file, "rb") as f:
+        raw = np.frombuffer(f.read(), dtype=np.uint8)
+    n_lines = int(np.count_nonzero(raw == ord("\n"))) + 1
+    t_s = np.empty(n_lines)
+    t_e = np.empty(n_lines)
+    size = np.empty(n_lines)
+    write = np.empty(n_lines, dtype=np.bool_)
+    bounds = np.empty((n_lines, 2), dtype=np.int64)
+    exact = np.empty(n_lines, dtype=np.bool_)
+    n = scan_calls(raw, t_s, t_e, size, write, bounds, exact)
+
+    # lines with other number formats are converted as before
+    for i in np.flatnonzero(~exact[:n]):
+        line = raw[bounds[i, 0] : bounds[i, 1]].tobytes().decode()
+        t_s[i], t_e[i], size[i] = parse_line(line)
+    return {
+        "t_s": t_s[:n].copy(),
+        "t_e": t_e[:n].copy(),
+        "bytes": size[:n].copy(),
+        "write": write[:n].copy(),
+    }
 
 
-def extract_recorder(data: list, ranks: int) -> tuple[dict, dict]:
+def parse_line(line: str) -> tuple[float, float, int]:
+    """Python fallback of scan_calls for a single line.
+
+    Returns:
+        tuple[float, float, int]: start time, end time, and bytes
+    """
+    s_line = line.find(" ")
+    t_start = float(line[:s_line])
+    t_end = float(line[s_line + 1 : s_line + line[s_line + 1 :].find(" ") + 1])
+    # ? For MPI oly
+    # b  = line.rfind('%p')
+    # b = int(line[b+3: b+3+line[b+3:].find(' ')])
+    # ? write
+    b_part = line.rfind(")")
+    b_part = int(line[line[: b_part - 1].rfind(" ") + 1 : b_part - 1])
+    return t_start, t_end, b_part
+
+
+@kernel(
+    "(uint8[::1], int64, int64)",
+    f"({RO_BYTES}, int64, int64)",
+)
+def parse_decimal(raw, start, end):
+    """Converts raw[start:end] (e.g., -1.25e-3) to a float.
+
+    Returns:
+        tuple[float, bool]: value and whether the conversion is exact (False for
+            other formats or more than 15 digits)
+    """
+    i = start
+    sign = 1.0
+    if i < end and (raw[i] == ord("-") or raw[i] == ord("+")):
+        sign = -1.0 if raw[i] == ord("-") else 1.0
+        i += 1
+    mantissa = 0
+    digits = 0
+    scale = 0
+    dot = False
+    seen = False
+    while i < end:
+        c = raw[i]
+        if ord("0") <= c <= ord("9"):
+            # leading zeros do not count
+            if mantissa or c != ord("0"):
+                digits += 1
+            if digits > 15:
+                return 0.0, False
+            mantissa = mantissa * 10 + (c - ord("0"))
+            seen = True
+            if dot:
+                scale -= 1
+        elif c == ord(".") and not dot:
+            dot = True
+        else:
+            break
+        i += 1
+    if not seen:
+        return 0.0, False
+    if i < end and (raw[i] == ord("e") or raw[i] == ord("E")):
+        i += 1
+        exp_sign = 1
+        if i < end and (raw[i] == ord("-") or raw[i] == ord("+")):
+            exp_sign = -1 if raw[i] == ord("-") else 1
+            i += 1
+        if i == end:
+            return 0.0, False
+        exponent = 0
+        while i < end and ord("0") <= raw[i] <= ord("9") and exponent < 1000:
+            exponent = exponent * 10 + (raw[i] - ord("0"))
+            i += 1
+        scale += exp_sign * exponent
+    if i != end or scale < -22 or scale > 22:
+        return 0.0, False
+    if scale < 0:
+        return sign * (mantissa / POW10[-scale]), True
+    return sign * (mantissa * POW10[scale]), True
+
+
+@kernel(
+    "(uint8[::1], float64[::1], float64[::1], float64[::1], boolean[::1], "
+    "int64[:, ::1], boolean[::1])",
+    f"({RO_BYTES}, float64[::1], float64[::1], float64[::1], boolean[::1], "
+    "int64[:, ::1], boolean[::1])",
+)
+def scan_calls(raw, t_s, t_e, size, write, bounds, exact):
+    """Finds the lines that contain the word read or write (surrounded by spaces)
+    and converts their start time, end time, and size. A line is a write if it
+    contains "write" anywhere, otherwise a read.
+
+    Returns:
+        int: number of calls. bounds holds the start and end of each line, exact
+            is False if the line has to be converted by parse_line
+    """
+    n = len(raw)
+    count = 0
+    start = 0
+    while start < n:
+        end = start
+        while end < n and raw[end] != ord("\n"):
+            end += 1
+        has_write = False
+        token = False
+        close = -1
+        for i in range(start, end):
+            c = raw[i]
+            if c == ord(")"):
+                close = i
+            elif c == ord("w") and i + 5 <= end:
+                if (
+                    raw[i + 1] == ord("r")
+                    and raw[i + 2] == ord("i")
+                    and raw[i + 3] == ord("t")
+                    and raw[i + 4] == ord("e")
+                ):
+                    has_write = True
+                    if i > start and raw[i - 1] == ord(" ") and i + 5 < end:
+                        token = token or raw[i + 5] == ord(" ")
+            elif (
+                c == ord("r")
+                and i + 4 < end
+                and i > start
+                and raw[i - 1] == ord(" ")
+                and raw[i + 1] == ord("e")
+                and raw[i + 2] == ord("a")
+                and raw[i + 3] == ord("d")
+                and raw[i + 4] == ord(" ")
+            ):
+                token = True
+        if token:
+            bounds[count, 0] = start
+            bounds[count, 1] = end
+            write[count] = has_write
+            ok = close > start + 1 and raw[close - 1] == ord(" ")
+            # first and second field
+            first = start
+            while first < end and raw[first] != ord(" "):
+                first += 1
+            second = first + 1
+            while second < end and raw[second] != ord(" "):
+                second += 1
+            ok = ok and second < end
+            if ok:
+                value_s, ok_s = parse_decimal(raw, start, first)
+                value_e, ok_e = parse_decimal(raw, first + 1, second)
+                t_s[count] = value_s
+                t_e[count] = value_e
+                ok = ok_s and ok_e
+            # argument before " )"
+            if ok:
+                b_start = close - 1
+                while b_start > start and raw[b_start - 1] != ord(" "):
+                    b_start -= 1
+                n_bytes = 0
+                ok = b_start < close - 1 and close - 1 - b_start <= 18
+                for i in range(b_start, close - 1):
+                    c = raw[i]
+                    if c < ord("0") or c > ord("9"):
+                        ok = False
+                        break
+                    n_bytes = n_bytes * 10 + (c - ord("0"))
+                size[count] = n_bytes
+            exact[count] = ok
+            count += 1
+        start = end + 1
+    return count
+
+
+def extract_recorder(data: dict, ranks: int, ind: bool = False) -> tuple[dict, dict]:
     """Extract recorder traces
 
     Args:
-        data (array): simulation data
+        data (dict): columns of the calls, see extract_data
+        ranks (int): number of ranks
+        ind (bool, optional): also assigns the calls as individual requests (b_ind,
+            t_ind_s, t_ind_e) for the request level overlap (--ind). Defaults to False.
 
     Returns:
         w,r: returns two dicts containing the data
     """
-    # FIXME: This needs to ne b_ind t_ind_s and t_ind_e, however required ind overlaping alorithm in bandiwdth.py
-    write = {
-        "number_of_ranks": ranks,
-        "bandwidth": {
-            "b_rank_sum": [],
-            "b_rank_avr": [],
-            "t_rank_s": [],
-            "t_rank_e": [],
-        },
-    }
-    read = {
-        "number_of_ranks": ranks,
-        "bandwidth": {
-            "b_rank_sum": [],
-            "b_rank_avr": [],
-            "t_rank_s": [],
-            "t_rank_e": [],
-        },
-    }
-    for line in data:
-        if "write" in line or "read" in line:
-            s_line = line.find(" ")
-            t_start = float(line[:s_line])
-            t_end = float(line[s_line + 1 : s_line + line[s_line + 1 :].find(" ") + 1])
-            # ? For MPI oly
-            # b  = line.rfind('%p')
-            # b = int(line[b+3: b+3+line[b+3:].find(' ')])
-            # ? write
-            b_part = line.rfind(")")
-            b_part = int(line[line[: b_part - 1].rfind(" ") + 1 : b_part - 1])
-
-            b_part = b_part / (t_end - t_start) if t_end - t_start != 0 else 0  # B/s
-            # ? Assign
-            if "write" in line:
-                write["bandwidth"]["t_rank_s"].append(t_start)
-                write["bandwidth"]["t_rank_e"].append(t_end)
-                write["bandwidth"]["b_rank_avr"].append(b_part)
-                write["bandwidth"]["b_rank_sum"].append(b_part)
-            elif "read" in line:
-                read["bandwidth"]["t_rank_s"].append(t_start)
-                read["bandwidth"]["t_rank_e"].append(t_end)
-                read["bandwidth"]["b_rank_avr"].append(b_part)
-                read["bandwidth"]["b_rank_sum"].append(b_part)
-
-    if not read["bandwidth"]["t_rank_s"]:
-        read = {"bandwidth": []}
-    if not write["bandwidth"]["t_rank_s"]:
-        write = {"bandwidth": []}
+    duration = data["t_e"] - data["t_s"]
+    b_part = np.divide(
+        data["bytes"], duration, out=np.zeros_like(duration), where=duration != 0
+    )  # B/s
+    out = []
+    for mask in (data["write"], ~data["write"]):
+        if not mask.any():
+            out.append({"bandwidth": []})
+            continue
+        b = b_part[mask]
+        t_s = data["t_s"][mask]
+        t_e = data["t_e"][mask]
+        bandwidth = {"b_rank_sum": b, "b_rank_avr": b, "t_rank_s": t_s, "t_rank_e": t_e}
+        if ind:
+            # every call is a request
+            bandwidth.update({"b_ind": b, "t_ind_s": t_s, "t_ind_e": t_e})
+        out.append({"number_of_ranks": ranks, "bandwidth": bandwidth})
+    write, read = out
     return write, read
 
 
@@ -14,6 +14,8 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+import numpy as np
+
 from ftio.parse.bandwidth import Bandwidth
 
 
@@ -44,6 +46,7 @@ class Sample:
         name_rank = ["b_rank_sum", "b_rank_avr", "t_rank_s", "t_rank_e"]
         name_ind_ovr = ["b_overlap_ind", "t_overlap_ind"]
         name_ind = ["b_ind", "t_ind_s", "t_ind_e"]
+        counts = ["n_overlap", "n_overlap_ind"]
 
         # add phase statistics
         for attr, value in self.__dict__.items():
@@ -52,7 +55,7 @@ class Sample:
                 data0.append(value)
 
         # statistics:
-        name_tmp = common + name_rank_ovr + name_rank + name_ind_ovr + name_ind
+        name_tmp = common + name_rank_ovr + name_rank + name_ind_ovr + name_ind + counts
         for attr, value in self.bandwidth.__dict__.items():
             if attr not in name_tmp:
                 name0.append(attr)
@@ -91,12 +94,14 @@ class Sample:
     def find_data(self, name, common):
         # remove empty:
         for i in name:
-            if not getattr(self.bandwidth, i):
+            if len(getattr(self.bandwidth, i)) == 0:
                 name.remove(i)
 
         # add phase info
         data = [getattr(self.bandwidth, s) for s in name]
         length = len(data[-1])
         name = name + common
-        data.extend([[self.number_of_ranks] * length, [self.file_index] * length])
+        data.extend(
+            [np.full(length, self.number_of_ranks), np.full(length, self.file_index)]
+        )
         return name, data
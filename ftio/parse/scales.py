@@ -13,21 +13,24 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 
 import datetime
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import pandas as pd
 from rich.console import Console
 
 from ftio.parse.args import parse_args
+from ftio.parse.bandwidth import Bandwidth
+from ftio.parse.cache import ADJUSTED_ARGS
 from ftio.parse.helper import match_mode, print_info
 from ftio.parse.parse_custom import ParseCustom
-from ftio.parse.parse_darshan import ParseDarshan
 from ftio.parse.parse_json import ParseJson
 from ftio.parse.parse_jsonl import ParseJsonl
 from ftio.parse.parse_msgpack import ParseMsgpack
-from ftio.parse.parse_recorder import ParseRecorder
 from ftio.parse.parse_txt import ParseTxt
-from ftio.parse.parse_zmq import ParseZmq
+from ftio.parse.sample import Sample
+from ftio.parse.simrun import Simrun
+from ftio.parse.stream_reader import FileTail
 
 
 class Scales:
@@ -54,8 +57,14 @@ class Scales:
         self.args = parse_args(argv)
 
         if "zmq" in self.args and self.args.zmq:
+            from ftio.parse.parse_zmq import ParseZmq
+
             self.s.append(ParseZmq(self.msg).to_simrun(self.args, 0))
             self.n = 1
+        elif isinstance(self.msg, FileTail):
+            # records read incrementally by the file predictor (--tail)
+            self.s.append(self.msg.to_simrun(self.args, 0))
+            self.n = 1
         else:
             self.load_setup()
 
@@ -75,6 +84,8 @@ class Scales:
 
         # Mapping from directory to run_index
         dir_to_index = {}
+        # (path, file_index, is_recorder_folder) in the order of loading
+        tasks = []
 
         for path in self.paths:
             #! load folders
@@ -87,8 +98,7 @@ class Scales:
                     dir_to_index[path] = len(dir_to_index)
                     self.names.append(os.path.basename(path))
 
-                run = ParseRecorder(path).to_simrun(self.args, dir_to_index[path])
-                self.s.append(run)
+                tasks.append((path, dir_to_index[path], True))
 
             # Folder
             elif os.path.isdir(path):
@@ -137,7 +147,7 @@ class Scales:
                                 self.names.append(os.path.basename(root))
 
                             console.print(f"[cyan]Current file:[/] {file}")
-                            self.load_file(file_path, dir_to_index[root])
+                            tasks.append((file_path, dir_to_index[root], False))
 
             # Compare Several files
             elif (
@@ -151,7 +161,7 @@ class Scales:
                     self.names.append(path)
 
                 console.print(f"[cyan]Current file:[/] {path}")
-                self.load_file(path, dir_to_index[parent_dir])
+                tasks.append((path, dir_to_index[parent_dir], False))
 
             # Single file
             else:
@@ -162,33 +172,69 @@ class Scales:
 
                 if "predictor" not in self.prog_name.lower():
                     console.print(f"[cyan]Current file:[/] {path}\n")
-                self.load_file(path, dir_to_index[parent_dir])
+                tasks.append((path, dir_to_index[parent_dir], False))
 
+        self.load_files(tasks)
         # print('--------------------------------------------\n')
         self.n = len(self.s)
 
-    def load_file(self, file_path: str, file_index=0) -> None:
-        """Load file content into an Simrun object
+    def load_files(self, tasks: list[tuple[str, int, bool]]) -> None:
+        """Loads files and Recorder folders, in parallel if --jobs is not 1. The
+        runs are appended in the order of the tasks, independent of which worker
+        finishes first.
+
+        The parsers may adjust the arguments (e.g., the mode if it is not in the
+        trace), which changes how the following files are parsed. The workers parse
+        with the initial arguments, so once an earlier file adjusted them, the
+        remaining files are parsed again in order, which gives the same runs as
+        --jobs 1.
 
         Args:
-            file_path (str): filename + absolute path
+            tasks (list[tuple[str, int, bool]]): path, file index, and whether the
+                path is a Recorder folder
         """
-        check_open(file_path, self.prog_name)
-        if self.args.custom_file:
-            run = ParseCustom(file_path).to_simrun(self.args, file_index)
-        elif ".json" in file_path[-5:]:
-            run = ParseJson(file_path).to_simrun(self.args, file_index)
-        elif ".jsonl" in file_path[-6:]:
-            run = ParseJsonl(file_path).to_simrun(self.args, file_index)
-        elif "darshan" in file_path[-10:]:
-            run = ParseDarshan(file_path).to_simrun(self.args, file_index)
-        elif "msgpack" in file_path[-10:]:
-            run = ParseMsgpack(file_path).to_simrun(self.args, file_index)
-        elif "txt" in file_path[-10:]:
-            run = ParseTxt(file_path).to_simrun(self.args, file_index)
-        else:
-            raise TypeError("")
-        self.s.append(run)
+        for path, _, recorder in tasks:
+            if not recorder:
+                check_open(path, self.prog_name)
+
+        jobs = getattr(self.args, "jobs", 1)
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        jobs = min(jobs, len(tasks))
+        if jobs <= 1:
+            for task in tasks:
+                self.s.append(self._load_task(task))
+            return
+
+        Console().print(f"[cyan]Loading {len(tasks)} inputs with {jobs} processes[/]")
+        chunksize = max(1, len(tasks) // (4 * jobs))
+        initial = {k: getattr(self.args, k, None) for k in ADJUSTED_ARGS}
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(
+                _parse_columns,
+                tasks,
+                [self.args] * len(tasks),
+                chunksize=chunksize,
+            )
+            for task, (columns, adjusted) in zip(tasks, results, strict=True):
+                if any(getattr(self.args, k, None) != v for k, v in initial.items()):
+                    # an earlier file adjusted the arguments the worker parsed with
+                    self.s.append(self._load_task(task))
+                    continue
+                # apply argument adjustments of the parsers in order, as a
+                # sequential load would
+                for key, value in adjusted.items():
+                    setattr(self.args, key, value)
+                self.s.append(_from_columns(columns))
+
+    def _load_task(self, task: tuple[str, int, bool]) -> Simrun:
+        """Parses a file or Recorder folder with the current arguments."""
+        path, file_index, recorder = task
+        if recorder:
+            from ftio.parse.parse_recorder import ParseRecorder
+
+            return ParseRecorder(path).to_simrun(self.args, file_index)
+        return parse_file(path, self.args, file_index)
 
     def save_call(self, argv):
         """save the call as a hidden file"""
@@ -371,6 +417,104 @@ class Scales:
         return df0
 
 
+def parse_file(file_path: str, args, file_index=0) -> Simrun:
+    """Parses a single file depending on its extension
+
+    Args:
+        file_path (str): filename + absolute path
+        args (argparse): command line arguments
+        file_index (int, optional): file index. Defaults to 0.
+
+    Returns:
+        Simrun: Simrun object
+    """
+    if args.custom_file:
+        return ParseCustom(file_path).to_simrun(args, file_index)
+    elif ".json" in file_path[-5:]:
+        return ParseJson(file_path).to_simrun(args, file_index)
+    elif ".jsonl" in file_path[-6:]:
+        return ParseJsonl(file_path).to_simrun(args, file_index)
+    elif "darshan" in file_path[-10:]:
+        from ftio.parse.parse_darshan import ParseDarshan
+
+        return ParseDarshan(file_path).to_simrun(args, file_index)
+    elif "msgpack" in file_path[-10:]:
+        return ParseMsgpack(file_path).to_simrun(args, file_index)
+    elif "txt" in file_path[-10:]:
+        return ParseTxt(file_path).to_simrun(args, file_index)
+    else:
+        raise TypeError("")
+
+
+def _parse_columns(task: tuple[str, int, bool], args) -> tuple[dict, dict]:
+    """Worker of Scales.load_files. Parses a file or Recorder folder and returns the
+    run as plain columns (see `_to_columns`), which are much cheaper to send back
+    than a Simrun holding lists of Python floats.
+
+    Args:
+        task (tuple[str, int, bool]): path, file index, and Recorder flag
+        args (argparse): command line arguments
+
+    Returns:
+        tuple[dict, dict]: the columns of the run and the arguments adjusted by the parser
+    """
+    path, file_index, recorder = task
+    initial = {k: getattr(args, k, None) for k in ADJUSTED_ARGS}
+    if recorder:
+        from ftio.parse.parse_recorder import ParseRecorder
+
+        run = ParseRecorder(path).to_simrun(args, file_index)
+    else:
+        run = parse_file(path, args, file_index)
+    adjusted = {
+        k: getattr(args, k) for k in ADJUSTED_ARGS if getattr(args, k, None) != initial[k]
+    }
+    return _to_columns(run), adjusted
+
+
+def _to_columns(run: Simrun) -> dict:
+    """Splits a run into plain values. The bandwidth series become float arrays
+    (arrays returned by the parsers are kept as they are), the statistics and the
+    remaining attributes are passed unchanged.
+
+    Args:
+        run (Simrun): parsed run
+
+    Returns:
+        dict: attributes of the run (samples as dicts of their attributes, with the
+            bandwidth as dict of columns) and the names of the samples
+    """
+    columns = {"attributes": {}, "samples": []}
+    for attr, value in run.__dict__.items():
+        if not isinstance(value, Sample):
+            columns["attributes"][attr] = value
+            continue
+        bandwidth = {}
+        for key, series in value.bandwidth.__dict__.items():
+            if isinstance(series, list) and series:
+                arr = np.asarray(series)
+                if arr.dtype.kind in "fiu":
+                    series = arr.astype(np.float64, copy=False)
+            bandwidth[key] = series
+        columns["attributes"][attr] = {**value.__dict__, "bandwidth": bandwidth}
+        columns["samples"].append(attr)
+    return columns
+
+
+def _from_columns(columns: dict) -> Simrun:
+    """Builds the Simrun of `_to_columns` without parsing or copying the columns again."""
+    run = Simrun.__new__(Simrun)
+    run.__dict__.update(columns["attributes"])
+    for attr in columns["samples"]:
+        sample = Sample.__new__(Sample)
+        sample.__dict__.update(getattr(run, attr))
+        bandwidth = Bandwidth.__new__(Bandwidth)
+        bandwidth.__dict__.update(sample.bandwidth)
+        sample.bandwidth = bandwidth
+        setattr(run, attr, sample)
+    return run
+
+
 def check_open(file: str, name: str = "") -> None:
     """Checks that the file is accessible
 
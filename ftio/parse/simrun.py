@@ -14,6 +14,8 @@ from __future__ import annotations
 import re
 import statistics as st
 
+import numpy as np
+
 from ftio.parse.helper import match_mode
 from ftio.parse.percent import Percent
 from ftio.parse.sample import Sample
@@ -272,7 +274,10 @@ class Simrun:
                     data_array2, list(data_array2[0].keys())
                 )
             else:
-                if isinstance(data_array[0][field], list):
+                if isinstance(data_array[0][field], np.ndarray):
+                    # decoded msgpack columns
+                    my_dict[field] = np.concatenate([x[field] for x in data_array])
+                elif isinstance(data_array[0][field], list):
                     my_dict[field] = []
                     for i, _ in enumerate(data_array):
                         my_dict[field].extend(data_array[i][field])
@@ -0,0 +1,288 @@
+"""
+Streaming reader for JSONL and MessagePack traces.
+
+The records are read in chunks and merged one at a time into growable float64
+arrays, so the trace is never held in memory as a whole (neither as text nor as a
+list of parsed records). The merge follows `Simrun.merge_fields`: lists are
+concatenated, while scalar metrics are summed (total), maximized (max, number),
+minimized (min), or averaged (arithmetic_mean).
+
+`FileTail` remembers the byte offset of the last complete record, so a file that is
+still being written (e.g., the file monitored by the predictor with --tail) is only
+read from the appended bytes on the next call.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+
+import numpy as np
+
+from ftio.parse.msgpack_reader import convert_to_class, decode, get_type
+from ftio.parse.simrun import Simrun
+
+CHUNK_SIZE = 1 << 20
+
+
+class GrowableArray:
+    """float64 array with amortized O(1) appends (capacity doubling)."""
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.empty(max(capacity, 1), dtype=np.float64)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def extend(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = self._n + len(values)
+        if n > len(self._data):
+            data = np.empty(max(n, 2 * len(self._data)), dtype=np.float64)
+            data[: self._n] = self._data[: self._n]
+            self._data = data
+        self._data[self._n : n] = values
+        self._n = n
+
+    @property
+    def array(self) -> np.ndarray:
+        """View of the stored values (stays valid after further appends)."""
+        return self._data[: self._n]
+
+
+def _merge_rule(field: str) -> str:
+    """Rule of Simrun.merge_fields for a scalar metric ("" if it is dropped)."""
+    if any(x in field for x in ["total", "_t_"]):
+        return "sum"
+    if any(x in field for x in ["max", "number"]):
+        return "max"
+    if "min" in field:
+        return "min"
+    if "arithmetic_mean" in field:
+        return "mean"
+    return ""
+
+
+class _MergedField:
+    """Merged value of a scalar metric."""
+
+    def __init__(self, rule: str, value):
+        self.rule = rule
+        self.value = value
+        self.count = 1
+
+    def extend(self, value) -> None:
+        if self.rule == "max":
+            self.value = max(self.value, value)
+        elif self.rule == "min":
+            self.value = min(self.value, value)
+        else:
+            self.value += value
+        self.count += 1
+
+    def result(self):
+        return self.value / self.count if self.rule == "mean" else self.value
+
+
+def _copy_dicts(values: dict) -> dict:
+    return {k: _copy_dicts(v) if isinstance(v, dict) else v for k, v in values.items()}
+
+
+class StreamMerger:
+    """Merges records of the form {mode: {metrics}} one at a time.
+
+    A mode that occurs only once is kept as is (like Simrun.merge_parts), further
+    records of the same mode are merged into growable arrays.
+    """
+
+    def __init__(self):
+        self._first = {}
+        self._merged = {}
+
+    def add(self, record: dict) -> None:
+        """Merges a single record.
+
+        Args:
+            record (dict): record, e.g., {"write_sync": {...}}
+        """
+        for mode, values in record.items():
+            if mode in self._merged:
+                self._merge(self._merged[mode], values)
+            elif mode in self._first:
+                self._merged[mode] = self._init(self._first.pop(mode))
+                self._merge(self._merged[mode], values)
+            else:
+                self._first[mode] = values
+
+    def result(self) -> list[dict]:
+        """Returns the merged records as list of {mode: metrics} as used by Simrun.
+
+        Returns:
+            list[dict]: one entry per mode
+        """
+        # copy the dicts, as the parser may add fields (e.g., t_rank_e) to them
+        out = [{mode: _copy_dicts(values)} for mode, values in self._first.items()]
+        out.extend({mode: self._result(state)} for mode, state in self._merged.items())
+        return out
+
+    def _init(self, values: dict) -> dict:
+        state = {}
+        for field, value in values.items():
+            if isinstance(value, dict):
+                state[field] = self._init(value)
+            elif isinstance(value, (list, np.ndarray)):
+                state[field] = GrowableArray(max(2 * len(value), 1024))
+                state[field].extend(value)
+            elif _merge_rule(field):
+                state[field] = _MergedField(_merge_rule(field), value)
+        return state
+
+    def _merge(self, state: dict, values: dict) -> None:
+        for field, merged in state.items():
+            if field not in values:
+                continue
+            if isinstance(merged, dict):
+                self._merge(merged, values[field])
+            else:
+                merged.extend(values[field])
+
+    def _result(self, state: dict) -> dict:
+        out = {}
+        for field, merged in state.items():
+            if isinstance(merged, dict):
+                out[field] = self._result(merged)
+            elif isinstance(merged, GrowableArray):
+                out[field] = merged.array
+            else:
+                out[field] = merged.result()
+        return out
+
+
+class FileTail:
+    """Incrementally reads a JSONL or MessagePack trace from the last read offset.
+
+    If the file is replaced or truncated, it is read again from the start.
+
+    Args:
+        path (str): path to the trace
+        chunk_size (int, optional): bytes read at once. Defaults to 1 MiB.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE):
+        self.path = path[:-1] if path[-1] == "/" else path
+        self.ext = "msgpack" if "msgpack" in self.path[-10:] else "jsonl"
+        self.chunk_size = chunk_size
+        self.n_records = 0
+        self._reset(None)
+
+    def _reset(self, inode) -> None:
+        self.offset = 0
+        self._inode = inode
+        self._partial = b""
+        self.merger = StreamMerger()
+
+    def records(self) -> Iterator[dict]:
+        """Yields the records appended since the last call.
+
+        Yields:
+            dict: a single record, e.g., {"write_sync": {...}}
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self.offset:
+            self._reset(stat.st_ino)
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            # a record larger than the chunk is completed with reads of growing size
+            while chunk := f.read(max(self.chunk_size, len(self._partial))):
+                self.offset += len(chunk)
+                if self.ext == "msgpack":
+                    yield from self._msgpack_records(chunk)
+                else:
+                    yield from self._jsonl_records(chunk)
+        # a last line without a newline is complete if it parses
+        if self.ext == "jsonl" and self._partial.strip():
+            try:
+                record = json.loads(self._partial)
+            except ValueError:
+                return
+            self._partial = b""
+            self.n_records += 1
+            yield record
+
+    def read(self) -> int:
+        """Merges the records appended since the last call.
+
+        Returns:
+            int: number of new records
+        """
+        n = self.n_records
+        for record in self.records():
+            self.merger.add(record)
+        return self.n_records - n
+
+    def data(self) -> list[dict]:
+        """Returns the merged records read so far.
+
+        Returns:
+            list[dict]: one entry per mode, see StreamMerger.result
+        """
+        return self.merger.result()
+
+    def to_simrun(self, args, index=0) -> Simrun:
+        """Convert the records read so far to a Simrun class
+
+        Args:
+            args (argparse): command line arguments
+            index: file index in case several files are passed
+        Returns:
+            Simrun: Simrun object
+        """
+        return Simrun(self.data(), self.ext, self.path, args, index)
+
+    def _jsonl_records(self, chunk: bytes) -> Iterator[dict]:
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                self.n_records += 1
+                yield json.loads(line)
+
+    def _msgpack_records(self, chunk: bytes) -> Iterator[dict]:
+        buffer = self._partial + chunk if self._partial else chunk
+        items, end = decode(buffer)
+        self._partial = buffer[end:]
+        for item in items:
+            entries = convert_to_class(item, get_type(item))
+            for entry in entries or []:
+                self.n_records += 1
+                yield entry
+
+
+def read_stream(path: str, chunk_size: int = CHUNK_SIZE) -> list[dict]:
+    """Reads and merges a JSONL or MessagePack trace in a streaming fashion.
+
+    Args:
+        path (str): path to the trace
+        chunk_size (int, optional): bytes read at once. Defaults to 1 MiB.
+
+    Returns:
+        list[dict]: one entry per mode, see StreamMerger.result
+    """
+    tail = FileTail(path, chunk_size)
+    tail.read()
+    return tail.data()
@@ -10,6 +10,7 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
 import time
+from collections import deque
 
 import msgpack
 from rich.console import Console
@@ -22,8 +23,13 @@ def extract(msgs, args: list) -> tuple[dict, int]:
     start = time.time()
     mode, io_data, io_time = init_data(args)
 
-    # unpack data
-    unpacked_data = msgpack.unpackb(msgs)
+    # unpack data: msgs may contain several messages, the last one is used
+    unpacker = msgpack.Unpacker(max_buffer_size=0)
+    unpacker.feed(msgs)
+    last = deque(unpacker, maxlen=1)
+    if not last:
+        raise ValueError("Received ZMQ batch contains no msgpack message")
+    unpacked_data = last[0]
 
     # Access the data
     if "ranks" in unpacked_data:
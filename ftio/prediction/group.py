@@ -14,7 +14,6 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 from __future__ import annotations
 
 import numpy as np
-from sklearn.cluster import DBSCAN
 
 from ftio.prediction.helper import get_dominant
 
@@ -99,6 +98,8 @@ def group_dbscan(data: list[dict]) -> tuple[list[dict], int]:
             groups = 0
             out[0]["group"] = groups
         else:
+            from sklearn.cluster import DBSCAN
+
             X = np.column_stack((freq, freq))
             model = DBSCAN(eps=tol, min_samples=2).fit(X)
             groups = max(model.labels_)
@@ -19,6 +19,7 @@ from time import sleep
 from rich.console import Console
 
 from ftio.multiprocessing.async_process import join_procs
+from ftio.prediction.watcher import FileWatcher, file_state
 
 CONSOLE = Console()
 
@@ -44,6 +45,39 @@ def monitor(name: str, _cached_stamp: str, procs: list = None) -> tuple[str, lis
 
 
 #! Method 1
+# seconds to wait for an event before the stamps are compared anyway (e.g., writes
+# from other nodes on a parallel file system are not reported by inotify)
+WAIT_TIMEOUT = 1.0
+_WATCHERS: dict[tuple[str, ...], FileWatcher] = {}
+
+
+def get_watcher(names: list[str]) -> FileWatcher:
+    """Returns the watcher of the files, created on the first call.
+
+    Args:
+        names (list[str]): files to watch
+
+    Returns:
+        FileWatcher: watcher (inotify or stat polling)
+    """
+    key = tuple(names)
+    if key not in _WATCHERS:
+        _WATCHERS[key] = FileWatcher(list(names))
+    return _WATCHERS[key]
+
+
+def file_stamp(name: str) -> str:
+    """Stamp of a file, which changes when the file is modified or replaced.
+
+    Args:
+        name (str): filename
+
+    Returns:
+        str: inode, size, and modification time
+    """
+    return str(file_state(name))
+
+
 def monitor_stat(name: str, _cached_stamp: str, procs: list) -> tuple[str, list]:
     """Monitors a file for changes
 
@@ -56,23 +90,25 @@ def monitor_stat(name: str, _cached_stamp: str, procs: list) -> tuple[str, list]
         str: _description_
     """
     if _cached_stamp == "":
-        stream = os.popen(f"stat -c %z {name} 2>&1")
-        stamp = stream.read()
-        CONSOLE.print(f"[purple][PREDICTOR][/] Monitoring file {name}")
+        stamp = file_stamp(name)
+        w = get_watcher([name])
+        CONSOLE.print(f"[purple][PREDICTOR][/] Monitoring file {name} ({w.backend})")
         CONSOLE.print(f"[purple][PREDICTOR][/] Stamp is {stamp}")
         return stamp, procs
     else:
-        sleep(1)
+        w = get_watcher([name])
+        # the first check does not block, in case the file changed in the meantime
+        timeout = 0
         while True:
             procs = join_procs(procs)
-            stream = os.popen(f"stat -c %z {name} 2>&1")
-            stamp = stream.read()
+            w.wait(timeout)
+            stamp = file_stamp(name)
             if stamp != _cached_stamp:
                 CONSOLE.print(
                     f"[purple][PREDICTOR][/][green bold] Stamp changed[/] to {stamp}"
                 )
-                sleep(0.2)
                 return stamp, procs
+            timeout = WAIT_TIMEOUT
 
 
 def monitor_list(
@@ -95,39 +131,44 @@ def monitor_list(
     if not _cached_stamp:
         stamp = {}
         for i in name:
-            stream = os.popen(f"stat -c %z {i} 2>&1")
-            file_stamp = stream.read()
-            stamp[i] = file_stamp
+            stamp[i] = file_stamp(i)
             CONSOLE.print(
                 f"[purple][PREDICTOR][/] Monitoring file {name.index(i)}/{n_buffers} {i}"
                 f"[purple][PREDICTOR][/] Stamp is {stamp[i]}"
             )
+        get_watcher(name)
         return stamp, procs
     else:
-        sleep(1)
-        seen = []
-        counter = n_buffers
+        w = get_watcher(name)
+        files = {os.path.abspath(i): i for i in _cached_stamp}
+        # check all files once, afterwards only the ones reported by the watcher
+        candidates = list(_cached_stamp)
+        changed = set()
+        timeout = 0
         while True:
             procs = join_procs(procs)
-            for _, i in enumerate(_cached_stamp):
-                stream = os.popen(f"stat -c %z {i} 2>&1")
-                file_stamp = stream.read()
-                if file_stamp != _cached_stamp[i] and _cached_stamp[i] not in seen:
-                    counter = counter - 1
-                    seen.append(_cached_stamp[i])
+            for i in candidates:
+                if i in changed or i not in _cached_stamp:
+                    continue
+                file_stamp_i = file_stamp(i)
+                if file_stamp_i != _cached_stamp[i]:
+                    changed.add(i)
                     CONSOLE.print(
-                        f"[purple][PREDICTOR][/][green bold] Stamp changed[/] to {file_stamp}"
-                        f"[purple][PREDICTOR][/] {n_buffers - counter}/{n_buffers} files changed"
+                        f"[purple][PREDICTOR][/][green bold] Stamp changed[/] to {file_stamp_i}"
+                        f"[purple][PREDICTOR][/] {len(changed)}/{n_buffers} files changed"
                     )
 
-            if counter == 0:
+            if len(changed) >= n_buffers:
                 for i in name:
-                    stream = os.popen(f"stat -c %z {i} 2>&1")
-                    file_stamp = stream.read()
-                    _cached_stamp[i] = file_stamp
+                    _cached_stamp[i] = file_stamp(i)
                 return _cached_stamp, procs
 
-            sleep(0.2)
+            changes = w.wait(timeout)
+            timeout = WAIT_TIMEOUT
+            if changes:
+                candidates = [files.get(c.path, c.path) for c in changes]
+            else:
+                candidates = list(_cached_stamp)
 
 
 #! Method 2
@@ -38,6 +38,7 @@ from ftio.prediction.change_detection.pagehinkley import (
 )
 from ftio.prediction.helper import get_dominant
 from ftio.prediction.shared_resources import SharedResources
+from ftio.util.jit_cache import cache_stats
 
 
 def _automaton_step(
@@ -124,7 +125,11 @@ def ftio_process(shared_resources: SharedResources, args: Namespace, msgs=None)
     args.extend(["-e", "no"])
     args.extend(["-ts", f"{shared_resources.start_time.value:.2f}"])
     # perform prediction
+    cache_before = cache_stats()
+    tik = time.time()
     prediction_list, parsed_args = ftio_core.main(args, msgs, shared_resources)
+    if pred_id == 0:
+        console.print(first_prediction_text(time.time() - tik, cache_before))
     if not prediction_list:
         log_to_gui_and_console(
             gui_enabled,
@@ -207,6 +212,27 @@ def ftio_process(shared_resources: SharedResources, args: Namespace, msgs=None)
     # shared_resources.count.value += 1
 
 
+def first_prediction_text(duration: float, cache_before: tuple[int, int]) -> str:
+    """Reports if the numba kernels of the first prediction were compiled (cold) or
+    loaded from the cache (warm, e.g., after `ftio warmup`).
+
+    Args:
+        duration (float): runtime of the prediction in seconds
+        cache_before (tuple[int, int]): cache_stats() before the prediction
+
+    Returns:
+        str: text to print
+    """
+    hits, misses = (
+        now - before for now, before in zip(cache_stats(), cache_before, strict=True)
+    )
+    if misses > 0:
+        state = f"cold compile ({misses} kernels compiled, {hits} loaded from cache)"
+    else:
+        state = f"warm ({hits} kernels loaded from cache)"
+    return f"[purple][PREDICTOR] (#0):[/] First prediction took {duration:.3f} s: {state}"
+
+
 def window_adaptation(
     args: Namespace,
     prediction: Prediction,
@@ -401,7 +427,8 @@ def window_adaptation(
     text += f"[purple][PREDICTOR] (#{prediction_count}):[/] Ended"
 
     # set change time
-    shared_resources.start_time.value = t_s
+    with shared_resources.lock:
+        shared_resources.start_time.value = t_s
     return text, change_detected, change_point_info
 
 
@@ -413,7 +440,8 @@ def save_data(prediction: Prediction, shared_resources) -> None:
         shared_resources (SharedResources): shared resources among processes
     """
     # safe total transferred bytes
-    shared_resources.aggregated_bytes.value += prediction.total_bytes
+    with shared_resources.lock:
+        shared_resources.aggregated_bytes.value += prediction.total_bytes
 
     # save data
     shared_resources.queue.put(
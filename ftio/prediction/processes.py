@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import ftio.prediction.monitor as pm
 from ftio.multiprocessing.async_process import handle_in_process
+from ftio.parse.stream_reader import FileTail
 from ftio.prediction.helper import export_extrap, print_data
 from ftio.prediction.online_analysis import ftio_process
 from ftio.prediction.probability_analysis import find_probability
@@ -39,12 +40,17 @@ def predictor_with_processes(shared_resources, args):
       lost.  This also eliminates concurrent writes to the unprotected Value
       fields in SharedResources (count, hits, aggregated_bytes).
 
+    With ``--tail``, the monitor process reads only the bytes appended to the
+    file since the last trigger and hands the merged records to the prediction
+    (see :class:`ftio.parse.stream_reader.FileTail`).
+
     Args:
         shared_resources (SharedResources): shared resources among processes
         args (list[str]): additional arguments passed to ftio
     """
     filename = args[1]
     debounce = "--debounce" in args
+    tail = FileTail(filename) if "--tail" in args else None
 
     procs = []
     # Init: capture the initial stamp
@@ -57,7 +63,7 @@ def predictor_with_processes(shared_resources, args):
                 # stamp is already stale — the debounce re-trigger path).
                 stamp, _ = pm.monitor(filename, stamp)
                 proc = handle_in_process(
-                    prediction_process, args=(shared_resources, args)
+                    prediction_process, args=(shared_resources, args, read_tail(tail))
                 )
                 # Wait for the prediction to finish before accepting the next
                 # trigger, keeping shared state access strictly serial.
@@ -68,7 +74,10 @@ def predictor_with_processes(shared_resources, args):
                 # without waiting for previous ones to finish.
                 stamp, procs = pm.monitor(filename, stamp, procs)
                 procs.append(
-                    handle_in_process(prediction_process, args=(shared_resources, args))
+                    handle_in_process(
+                        prediction_process,
+                        args=(shared_resources, args, read_tail(tail)),
+                    )
                 )
     except KeyboardInterrupt:
         print_data(shared_resources.data)
@@ -77,6 +86,20 @@ def predictor_with_processes(shared_resources, args):
         print("-- done -- ")
 
 
+def read_tail(tail: FileTail | None) -> FileTail | None:
+    """Reads the appended records of the monitored file, if --tail is set.
+
+    Args:
+        tail (FileTail | None): tail of the monitored file
+
+    Returns:
+        FileTail | None: the tail, passed to the prediction instead of ZMQ messages
+    """
+    if tail is not None:
+        tail.read()
+    return tail
+
+
 def _export_phase_automaton(shared_resources) -> None:
     """Export the phase automaton to JSON if it was built during this run."""
     aut = shared_resources.online_detection.get("pa_automaton", None)
@@ -95,11 +118,12 @@ def prediction_process(shared_resources, args: list[str], msgs=None) -> None:
     Args:
         shared_resources (SharedResources): shared resources among processes
         args (list[str]): additional arguments passed to ftio.py
-        msg: zmq message
+        msgs: zmq messages or the FileTail of the monitored file (--tail)
     """
     ftio_process(shared_resources, args, msgs)
     while not shared_resources.queue.empty():
         shared_resources.data.append(shared_resources.queue.get())
 
     _ = find_probability(shared_resources.data, counter=shared_resources.count.value)
-    shared_resources.count.value += 1
+    with shared_resources.lock:
+        shared_resources.count.value += 1
@@ -17,12 +17,15 @@ import struct
 import subprocess
 
 import zmq
+import zmq.asyncio
 
 from ftio.freq.helper import MyConsole
 from ftio.multiprocessing.async_process import handle_in_process, join_procs
 from ftio.parse.args import parse_args
 from ftio.prediction.helper import export_extrap, get_dominant_and_conf, print_data
 from ftio.prediction.processes import prediction_process
+from ftio.prediction.worker_pool import PredictionWorkerPool
+from ftio.prediction.zmq_ingest import ZmqIngest
 
 CONSOLE = MyConsole()
 CONSOLE.set(True)
@@ -35,7 +38,8 @@ def predictor_with_processes_zmq(
 ) -> None:
     """Monitors a ZMQ socket and runs predictions whenever messages arrive.
 
-    Two modes are supported, selected by the ``--debounce`` flag in *args*:
+    Three modes are supported, selected by the ``--debounce`` and ``--workers``
+    flags in *args*:
 
     * **Default (parallel)** — original behaviour: a new prediction process is
       spawned for every batch of received messages regardless of whether a
@@ -46,6 +50,14 @@ def predictor_with_processes_zmq(
       that messages that accumulated during the prediction are not silently
       dropped — they trigger a follow-up prediction right away.
 
+    * **Worker pool (--workers N)** — N persistent, pre-warmed processes consume
+      the batches from a bounded queue (``--queue_depth``). If the queue is full,
+      ``--backpressure`` coalesces, drops, or blocks (see
+      :mod:`ftio.prediction.worker_pool`).
+
+    The messages are received in batches by :class:`ftio.prediction.zmq_ingest.ZmqIngest`,
+    which closes a batch after ``--zmq_window`` ms without new messages.
+
     Args:
         shared_resources (SharedResources): shared resources among processes
         args (list[str]): additional arguments passed to ftio
@@ -56,19 +68,28 @@ def predictor_with_processes_zmq(
     addr = tmp_args.zmq_address
     port_in = tmp_args.zmq_port
     debounce = getattr(tmp_args, "debounce", False)
+    pool = None
+    if getattr(tmp_args, "workers", 0) > 0:
+        pool = PredictionWorkerPool(
+            prediction_process,
+            shared_resources,
+            args,
+            tmp_args.workers,
+            tmp_args.queue_depth,
+            tmp_args.backpressure,
+        )
 
     # bind the socket
-    socket_in = setup_socket(addr, port_in, zmq.PULL)
+    ingest = ZmqIngest(
+        setup_socket(addr, port_in, zmq.PULL, context=zmq.asyncio.Context()),
+        tmp_args.zmq_window,
+    )
     socket_out = None
 
     if return_data:
         port_out = tmp_args.zmq_port_reply
         socket_out = setup_socket(addr, port_out, zmq.PUSH, False)
 
-    # can be extended to listen to multiple sockets
-    poller = zmq.Poller()
-    poller.register(socket_in, zmq.POLLIN)
-
     if "-zmq" not in args:
         args.extend(["--zmq"])
 
@@ -76,11 +97,18 @@ def predictor_with_processes_zmq(
         with CONSOLE.status("[green]started\n", spinner="arrow3") as status:
             while True:
                 pre_num_procs = len(procs)
-                if not debounce:
+                finished = 0
+                if pool is not None:
+                    finished = pool.poll()
+                elif not debounce:
                     # Original behaviour: reap finished procs, then wait for msgs.
                     procs = join_procs(procs)
 
-                if return_data and socket_out and pre_num_procs > len(procs):
+                if (
+                    return_data
+                    and socket_out
+                    and (pre_num_procs > len(procs) or finished)
+                ):
                     CONSOLE.print("[cyan]Returning Results[/]")
                     data = get_dominant_and_conf(shared_resources.data[-1])
                     CONSOLE.print(f"[cyan]Sending Frequency:{data[0]}[/]")
@@ -89,7 +117,7 @@ def predictor_with_processes_zmq(
                     socket_out.send(packet)
 
                 # get messages
-                msgs, ranks = receive_messages(socket_in, poller)
+                msgs, ranks = ingest.receive()
 
                 if not msgs:
                     CONSOLE.print("[red]No messages[/]")
@@ -97,7 +125,9 @@ def predictor_with_processes_zmq(
                 CONSOLE.print(f"[cyan]Got message from {ranks}:[/]")
                 status.update("")
 
-                if debounce:
+                if pool is not None:
+                    pool.submit(msgs)
+                elif debounce:
                     # Serial: run one prediction and wait before the next poll.
                     proc = handle_in_process(
                         prediction_process, args=(shared_resources, args, msgs)
@@ -110,14 +140,26 @@ def predictor_with_processes_zmq(
                         )
                     )
     except KeyboardInterrupt:
+        if pool is not None:
+            pool.shutdown(timeout=5)
+            CONSOLE.print(pool.stats())
         print_data(shared_resources.data)
         export_extrap(shared_resources.data)
         print("-- done -- ")
-
-
-def setup_socket(addr: str, port: str, socket_type=zmq.PULL, bind: bool = True):
-    """Bind the ZMQ socket, retrying with a corrected IP if necessary."""
-    context = zmq.Context()
+    finally:
+        ingest.close()
+
+
+def setup_socket(
+    addr: str,
+    port: str,
+    socket_type=zmq.PULL,
+    bind: bool = True,
+    context: zmq.Context | None = None,
+):
+    """Bind the ZMQ socket, retrying with a corrected IP if necessary. Pass a
+    zmq.asyncio.Context to get an asyncio socket."""
+    context = zmq.Context() if context is None else context
     socket = context.socket(socket_type)
     if not bind and addr == "*":
         addr = "127.0.0.1"
@@ -159,56 +201,27 @@ def setup_socket(addr: str, port: str, socket_type=zmq.PULL, bind: bool = True):
     return socket
 
 
-def receive_messages(socket, poller):
-    """Polls for and receives messages from the socket, returning a list of messages and count."""
+def receive_messages(socket, poller, window: float = 1000) -> tuple[list[bytes], int]:
+    """Receives all messages until the socket was quiet for window ms (synchronous
+    version for callers that need one bytes object per message, see ZmqIngest).
+
+    Args:
+        socket (zmq.Socket): socket to receive from
+        poller (zmq.Poller): poller the socket is registered with
+        window (float, optional): quiet time in ms that ends the batch. Defaults to 1000.
+
+    Returns:
+        tuple[list[bytes], int]: messages and their number
+    """
     msgs = []
-    ranks = 0
-    # start = time.time()
-    socks = dict(poller.poll(1000))
-    # 1) just a single msg
-    # msg = socket.recv(zmq.NOBLOCK)
-
-    # 2) Loop and accept messages from both channels, acting accordingly
-    # if socks:
-    #     if socks.get(socket) == zmq.POLLIN:
-    #         print(f"got message ",{socket.recv(zmq.NOBLOCK)})
-    # else:
-    #     print("No message received")
-    #     continue
-
-    # 3) Loop and accept messages from both channels, acting accordingly
-    while socks:
-        if socks.get(socket) == zmq.POLLIN:
-            msgs.append(socket.recv(zmq.NOBLOCK))
-            # CONSOLE.print(f"[cyan]Got message {ranks}:[/] {msg}")
-            ranks += 1
-        # if time.time() - start > 0.5:
-        #     break
-        socks = dict(poller.poll(1000))
-
-    return msgs, ranks
-
-
-#
-# def receive_messages(socket, poller, timeout=1000):
-#     """Receive all pending messages from a ZMQ socket safely, including large messages."""
-#     msgs = []
-#     ranks = 0
-#
-#     while True:
-#         socks = dict(poller.poll(timeout))
-#         if socket not in socks or socks[socket] != zmq.POLLIN:
-#             break  # no more messages ready
-#
-#         try:
-#             msg = socket.recv(zmq.NOBLOCK)  # or recv_multipart() if needed
-#             msgs.append(msg)
-#             ranks += 1
-#         except zmq.Again:
-#             break  # no more messages currently available
-#
-#         # After first poll, switch to non-blocking poll to empty the queue
-#         timeout = 0
-#
-#     return msgs, ranks
-#
+    socks = dict(poller.poll(window))
+    while socks.get(socket) == zmq.POLLIN:
+        # drain all pending messages before polling again
+        while True:
+            try:
+                msgs.append(socket.recv(zmq.NOBLOCK))
+            except zmq.Again:
+                break
+        socks = dict(poller.poll(window))
+
+    return msgs, len(msgs)
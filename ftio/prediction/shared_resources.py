@@ -9,12 +9,24 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+from __future__ import annotations
+
 from multiprocessing import Manager
 
+from ftio.multiprocessing.shared_ring_buffer import SharedRingBuffer
+
 
 class SharedResources:
-    def __init__(self):
-        """Initialize the manager and shared resources."""
+    def __init__(self, app_capacity: int = 1 << 16, app_max_capacity: int | None = None):
+        """Initialize the manager and shared resources.
+
+        Args:
+            app_capacity (int, optional): initial capacity of the app-level bandwidth buffer.
+            app_max_capacity (int, optional): capacity after which the oldest app-level
+                samples are evicted. Defaults to None (grows without bound).
+        """
+        self.app_capacity = app_capacity
+        self.app_max_capacity = app_max_capacity
         self.manager = Manager()
         self._init_shared_resources()
 
@@ -32,9 +44,15 @@ class SharedResources:
         self.start_time = self.manager.Value("d", 0.0)
         # Number of predictions
         self.count = self.manager.Value("i", 0)
-        # Bandwidth and time appended between predictions
-        self.b_app = self.manager.list()
-        self.t_app = self.manager.list()
+        # Serializes the read-modify-write updates of the values above among workers
+        self.lock = self.manager.Lock()
+        # Bandwidth and time appended between predictions (shared memory, columns: b, t)
+        self.app_buffer = SharedRingBuffer(
+            columns=2,
+            capacity=self.app_capacity,
+            max_capacity=self.app_max_capacity,
+            lock=self.manager.Lock(),
+        )
         # For triggering cargo
         self.sync_trigger = self.manager.Queue()
         # saves when the data is received from gkfs
@@ -43,9 +61,17 @@ class SharedResources:
         # Change point detection shared state
         self.online_detection = self.manager.dict()
 
+        # State of the incremental DFT (--incremental). The samples and the spectrum
+        # are in shared memory, the scalar state of the engine in the dict
+        self.spectral_state = self.manager.dict()
+        self.spectral_lock = self.manager.Lock()
+        self.spectral_samples = SharedRingBuffer(columns=1, capacity=self.app_capacity)
+        self.spectral_spectrum = SharedRingBuffer(columns=2, capacity=self.app_capacity)
+
     def restart(self):
         """Restart the manager and reinitialize shared resources."""
         print("Shutting down existing Manager...")
+        self._close_buffers()
         self.manager.shutdown()
 
         print("Starting new Manager...")
@@ -55,4 +81,11 @@ class SharedResources:
     def shutdown(self):
         """Shutdown the manager."""
         print("Shutting down Manager...")
+        self._close_buffers()
         self.manager.shutdown()
+
+    def _close_buffers(self):
+        """Release the shared-memory buffers."""
+        self.app_buffer.close()
+        self.spectral_samples.close()
+        self.spectral_spectrum.close()
@@ -12,6 +12,7 @@ https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 import numpy as np
 
 from ftio.cli.ftio_core import core
+from ftio.freq._dft_batch import batch_supported, ftio_dft_batch
 
 # from ftio.prediction.helper import get_dominant
 # from ftio.plot.freq_plot import convert_and_plot
@@ -80,6 +81,17 @@ def ftio_metric_task_save(
     show: bool = False,
 ) -> None:
     prediction = ftio_metric_task(metric, arrays, argv, ranks, show)
+    save_prediction(data, metric, prediction)
+
+
+def save_prediction(data, metric: str, prediction) -> None:
+    """appends the prediction of a metric to data (see ftio_metric_task_save)
+
+    Args:
+        data (list): list to append the prediction to
+        metric (str): Name of metric
+        prediction (Prediction): prediction of the metric
+    """
     # freq = get_dominant(prediction) #just get a single dominant value
     names = []
     if prediction.top_freqs:
@@ -128,3 +140,45 @@ def ftio_metric_task_save(
     # data.append(prediction)
     else:
         CONSOLE.info(f"\n[yellow underline]Warning: {metric} returned {prediction}[/]")
+
+
+def ftio_metric_batch(
+    metrics: dict,
+    argv: list,
+    ranks: int = 0,
+    show: bool = False,
+) -> list[dict]:
+    """generate FTIO predictions for all metrics at once (see ftio_dft_batch).
+    Falls back to ftio_metric_task_save per metric if the arguments are not
+    supported by the batch workflow.
+
+    Args:
+        metrics (dict): metric name -> 2D np array containing the bandwidth and time
+        argv (list): List of args for ftio
+        ranks (int): Number of ranks
+        show (bool): show the prediction results
+
+    Returns:
+        list[dict]: predictions as appended by ftio_metric_task_save
+    """
+    data = []
+    args = parse_args(argv, "ftio")
+    if not batch_supported(args):
+        for metric, arrays in metrics.items():
+            ftio_metric_task_save(data, metric, arrays, argv, ranks, show)
+        return data
+
+    names = [metric for metric, arrays in metrics.items() if len(arrays[0]) > 1]
+    predictions = ftio_dft_batch(
+        args, [(metrics[m][0], metrics[m][1]) for m in names], ranks=ranks
+    )
+    for metric, prediction in zip(names, predictions, strict=True):
+        if prediction is None:
+            CONSOLE.info(f"\n[yellow underline]Warning: {metric} has too few samples[/]")
+            continue
+        if show:
+            CONSOLE.info(f"\n[green underline]Metric: {metric}[/]")
+            display_prediction(args, prediction)
+        save_prediction(data, metric, prediction)
+
+    return data
@@ -22,7 +22,6 @@ from rich.panel import Panel
 from ftio.freq._analysis_figures import AnalysisFigures
 from ftio.freq.helper import MyConsole
 from ftio.freq.prediction import Prediction
-from ftio.plot.plot_dft import plot_dft
 
 CONSOLE = MyConsole()
 
@@ -69,6 +68,8 @@ def merge_predictions(
         CONSOLE.print(f"\n[cyan]Merging finished:[/] {time.time() - tik:.3f} s")
 
         if any(x in args.engine for x in ["mat", "plot"]):
+            from ftio.plot.plot_dft import plot_dft
+
             analysis_figures.args = args
             plot_dft(args, pred_merged, analysis_figures)
 
@@ -0,0 +1,291 @@
+"""
+Event-driven file watcher for the predictor.
+
+The watcher blocks on inotify events (Linux, via ctypes) instead of spawning `stat`
+subprocesses in a loop. The parent directories of the files are watched, so a
+single watch covers thousands of per-rank files in the same folder, and files that
+are replaced (e.g., written to a temporary file and renamed) are noticed as well.
+If inotify is not available, the files are polled with os.stat inside the process.
+
+Bursts of writes are coalesced into one trigger: after the first event, the watcher
+waits until the files were quiet for `debounce` seconds (at most `max_delay`). Each
+trigger reports the changed files together with the appended byte range, so a
+parser only needs to read the new data (see FileTail in ftio.parse.stream_reader).
+
+Note that inotify does not see writes from other nodes on a parallel file system.
+Callers should therefore use a timeout and compare the file stamps afterwards
+(as monitor in ftio.prediction.monitor does).
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from dataclasses import dataclass
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT = struct.Struct("iIII")
+
+DEBOUNCE = 0.1
+POLL_INTERVAL = 0.2
+
+
+@dataclass
+class FileChange:
+    """A changed file and the byte range [start, end) that was appended.
+
+    If the file was truncated or replaced, start is 0 and the whole file is new.
+    """
+
+    path: str
+    start: int
+    end: int
+    truncated: bool = False
+
+
+def file_state(path: str) -> tuple[int, int, int] | None:
+    """Inode, size, and modification time of a file (None if it does not exist).
+
+    Args:
+        path (str): path to the file
+
+    Returns:
+        tuple[int, int, int] | None: (st_ino, st_size, st_mtime_ns)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class Inotify:
+    """Minimal ctypes binding of inotify(7).
+
+    Raises:
+        OSError: if inotify is not available
+    """
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not supported")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        """Watches a directory (or file).
+
+        Args:
+            path (str): path to watch
+            mask (int, optional): inotify events. Defaults to WATCH_MASK.
+
+        Returns:
+            int: watch descriptor
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.watches[wd] = path
+        return wd
+
+    def read(self, timeout: float | None) -> list[tuple[str, int]] | None:
+        """Waits for events.
+
+        Args:
+            timeout (float | None): seconds to wait, None blocks
+
+        Returns:
+            list[tuple[str, int]] | None: (path, mask) of each event, or None on timeout
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        try:
+            buffer = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + EVENT.size <= len(buffer):
+            wd, mask, _, length = EVENT.unpack_from(buffer, offset)
+            offset += EVENT.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+            directory = self.watches.get(wd, "")
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            events.append((path, mask))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileWatcher:
+    """Watches a list of files and reports the coalesced changes.
+
+    Args:
+        paths (list[str]): files to watch
+        backend (str, optional): "inotify", "poll", or "auto" (inotify if available).
+            Defaults to "auto".
+        debounce (float, optional): quiet time in seconds that ends a burst of writes.
+            Defaults to 0.1.
+        max_delay (float, optional): maximal time in seconds a trigger is delayed by a
+            continuous burst. Defaults to 1.
+        interval (float, optional): interval of the stat polling. Defaults to 0.2.
+    """
+
+    def __init__(
+        self,
+        paths: list[str],
+        backend: str = "auto",
+        debounce: float = DEBOUNCE,
+        max_delay: float = 1.0,
+        interval: float = POLL_INTERVAL,
+    ):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.interval = interval
+        self.states = {p: file_state(p) for p in self.paths}
+        self._inotify = None
+        if backend in ("auto", "inotify"):
+            try:
+                self._inotify = Inotify()
+                for directory in sorted({os.path.dirname(p) for p in self.paths}):
+                    self._inotify.add_watch(directory)
+            except OSError:
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+                if backend == "inotify":
+                    raise
+        self.backend = "inotify" if self._inotify is not None else "poll"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def wait(self, timeout: float | None = None) -> list[FileChange]:
+        """Blocks until the watched files change and the burst of writes settled.
+
+        Args:
+            timeout (float | None, optional): seconds to wait for the first change,
+                None blocks. Defaults to None.
+
+        Returns:
+            list[FileChange]: changed files, empty on timeout
+        """
+        if self._inotify is not None:
+            candidates = self._wait_inotify(timeout)
+        else:
+            candidates = self._wait_poll(timeout)
+        return self._changes(candidates)
+
+    def _wait_inotify(self, timeout: float | None) -> set[str]:
+        watched = set(self.paths)
+        candidates = set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not candidates:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            events = self._inotify.read(remaining)
+            if events is None:
+                return candidates
+            candidates |= self._filter(events, watched)
+
+        # coalesce the burst until the files are quiet
+        end = time.monotonic() + self.max_delay
+        while time.monotonic() < end:
+            events = self._inotify.read(self.debounce)
+            if events is None:
+                break
+            candidates |= self._filter(events, watched)
+        return candidates
+
+    def _filter(self, events: list[tuple[str, int]], watched: set[str]) -> set[str]:
+        if any(mask & IN_Q_OVERFLOW for _, mask in events):
+            # events were lost, check all files
+            return watched
+        return {path for path, _ in events if path in watched}
+
+    def _wait_poll(self, timeout: float | None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            candidates = self._stale()
+            if candidates or (deadline is not None and time.monotonic() >= deadline):
+                break
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+        if not candidates:
+            return candidates
+
+        # coalesce the burst until the files are quiet
+        end = time.monotonic() + self.max_delay
+        seen = {p: file_state(p) for p in candidates}
+        while time.monotonic() < end:
+            time.sleep(self.debounce)
+            current = {p: file_state(p) for p in self.paths}
+            changed = {
+                p for p, state in current.items() if state != seen.get(p, self.states[p])
+            }
+            if not changed:
+                break
+            candidates |= changed
+            seen.update({p: current[p] for p in changed})
+        return candidates
+
+    def _stale(self) -> set[str]:
+        return {p for p in self.paths if file_state(p) != self.states[p]}
+
+    def _changes(self, candidates: set[str]) -> list[FileChange]:
+        changes = []
+        for path in sorted(candidates):
+            old, new = self.states[path], file_state(path)
+            if old == new:
+                continue
+            self.states[path] = new
+            if new is None:
+                continue
+            if old is not None and old[0] == new[0] and new[1] >= old[1]:
+                changes.append(FileChange(path, old[1], new[1]))
+            else:
+                changes.append(FileChange(path, 0, new[1], True))
+        return changes
@@ -0,0 +1,301 @@
+"""
+Persistent pool of warm prediction workers for the ZMQ predictor (--workers).
+
+Instead of forking a new process per received batch (which re-imports numba, sklearn,
+and scipy and re-warms the JIT caches), a fixed number of long-lived workers consume
+the batches from a bounded queue. If the queue is full, a backpressure policy decides
+what happens to the new batch:
+- coalesce: merge all pending batches and the new one into a single batch
+- drop: drop the oldest pending batch
+- block: wait until a worker takes a batch
+
+Each finished batch reports the latency of its stages (queue wait, prediction, total),
+which are aggregated by the pool. A prediction that raises (including SystemExit from
+an exit() in the analysis) is reported as a failed batch, and workers that died
+anyway are restarted.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import queue
+import time
+from collections.abc import Callable
+from multiprocessing import Process, Queue
+
+import numpy as np
+
+from ftio.freq.helper import MyConsole
+
+BACKPRESSURE = ("coalesce", "drop", "block")
+STAGES = ("queue", "predict", "total")
+# a full multiprocessing queue may still be flushing to its pipe, so a
+# non-blocking get right after queue.Full can miss the pending items
+DRAIN_TIMEOUT = 0.05
+
+CONSOLE = MyConsole()
+CONSOLE.set(True)
+
+
+def warmup(args: list[str]) -> float:
+    """Imports the analysis stack and runs FTIO once on a synthetic signal, so the
+    numba kernels are compiled before the first real prediction.
+
+    Args:
+        args (list[str]): arguments passed to ftio
+
+    Returns:
+        float: warmup time in seconds
+    """
+    tik = time.time()
+    from ftio.cli.ftio_core import core
+    from ftio.parse.args import parse_args
+
+    try:
+        parsed_args = parse_args(args)
+        parsed_args.engine = "no"
+        parsed_args.verbose = False
+        parsed_args.ts = parsed_args.te = None
+        t = np.arange(0, 20, 0.5)
+        b = np.where(np.sin(2 * np.pi * t / 4) > 0, 1e6, 0.0)
+        core({"time": t, "bandwidth": b, "total_bytes": 0, "ranks": 1}, parsed_args)
+    except Exception as e:  # warmup is best effort
+        CONSOLE.print(f"[yellow]Worker warmup failed: {e}[/]")
+    return time.time() - tik
+
+
+def worker_loop(
+    function: Callable, shared_resources, args: list[str], tasks: Queue, results: Queue
+) -> None:
+    """Loop of a single worker: takes batches until a None sentinel arrives.
+
+    Args:
+        function (Callable): prediction function called with (shared_resources, args, msgs)
+        shared_resources (SharedResources): shared resources among processes
+        args (list[str]): arguments passed to ftio
+        tasks (Queue): queue with (t_submit, msgs, n_batches) tuples
+        results (Queue): queue for the per-stage latencies
+    """
+    results.put({"warmup": warmup(args)})
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        t_submit, msgs, n_batches = task
+        t_start = time.time()
+        try:
+            # copy, as the prediction extends the argument list
+            function(shared_resources, list(args), msgs)
+            error = ""
+        except BaseException as e:
+            # the worker outlives the batch, so exit() only fails this prediction
+            error = f"{type(e).__name__}: {e}"
+        t_end = time.time()
+        results.put(
+            {
+                "queue": t_start - t_submit,
+                "predict": t_end - t_start,
+                "total": t_end - t_submit,
+                "batches": n_batches,
+                "error": error,
+            }
+        )
+
+
+class PredictionWorkerPool:
+    """
+    Pool of persistent prediction workers with a bounded queue.
+
+    Args:
+        function (Callable): prediction function called with (shared_resources, args, msgs)
+        shared_resources (SharedResources): shared resources among processes
+        args (list[str]): arguments passed to ftio
+        workers (int, optional): number of worker processes. Defaults to 1.
+        queue_depth (int, optional): maximal number of pending batches. Defaults to 4.
+        backpressure (str, optional): policy if the queue is full: coalesce, drop,
+            or block. Defaults to "coalesce".
+    """
+
+    def __init__(
+        self,
+        function: Callable,
+        shared_resources,
+        args: list[str],
+        workers: int = 1,
+        queue_depth: int = 4,
+        backpressure: str = "coalesce",
+    ):
+        if backpressure not in BACKPRESSURE:
+            raise ValueError(
+                f"Unknown backpressure policy {backpressure}, use one of {BACKPRESSURE}"
+            )
+        self.backpressure = backpressure
+        self._target_args = (function, shared_resources, args)
+        self._closing = False
+        self.tasks = Queue(maxsize=max(queue_depth, 1))
+        self.results = Queue()
+        self.dropped = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.restarted = 0
+        self.warmup = []
+        self.latency = {stage: [] for stage in STAGES}
+        self.procs = [self._start_worker() for _ in range(max(workers, 1))]
+
+    def submit(self, msgs: list) -> None:
+        """Submits a batch of messages according to the backpressure policy.
+
+        Args:
+            msgs (list): received ZMQ messages
+        """
+        task = (time.time(), msgs, 1)
+        self._restart_dead()
+        if self.backpressure == "block":
+            self._put(task)
+            return
+        try:
+            self.tasks.put_nowait(task)
+            return
+        except queue.Full:
+            pass
+
+        if self.backpressure == "drop":
+            try:
+                self.tasks.get(timeout=DRAIN_TIMEOUT)
+                self.dropped += 1
+            except queue.Empty:
+                pass
+        else:
+            # coalesce: the oldest submit time is kept for the queue latency
+            pending = []
+            while True:
+                try:
+                    pending.append(self.tasks.get(timeout=DRAIN_TIMEOUT))
+                except queue.Empty:
+                    break
+            if pending:
+                self.coalesced += len(pending)
+                msgs = [m for p in pending for m in p[1]] + list(msgs)
+                task = (
+                    pending[0][0],
+                    msgs,
+                    sum(p[2] for p in pending) + 1,
+                )
+        self._put(task)
+
+    def poll(self) -> int:
+        """Collects the metrics of finished batches without blocking.
+
+        Returns:
+            int: number of batches that finished since the last call
+        """
+        self._restart_dead()
+        finished = 0
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if "warmup" in result:
+                self.warmup.append(result["warmup"])
+                continue
+            finished += 1
+            for stage in STAGES:
+                self.latency[stage].append(result[stage])
+            if result["error"]:
+                CONSOLE.print(f"[red]Prediction failed: {result['error']}[/]")
+        self.completed += finished
+        return finished
+
+    def stats(self) -> str:
+        """Summary of the per-stage latencies.
+
+        Returns:
+            str: text to print
+        """
+        self.poll()
+        text = (
+            f"[cyan]Worker pool:[/] {len(self.procs)} workers, {self.completed} predictions, "
+            f"{self.coalesced} coalesced, {self.dropped} dropped batches, "
+            f"{self.restarted} worker restarts\n"
+        )
+        if self.warmup:
+            text += f"[cyan]Warmup:[/] {np.mean(self.warmup):.3f} s (mean)\n"
+        for stage in STAGES:
+            values = np.array(self.latency[stage])
+            if len(values) > 0:
+                text += (
+                    f"[cyan]{stage}:[/] mean {values.mean():.3f} s, "
+                    f"p95 {np.percentile(values, 95):.3f} s, max {values.max():.3f} s\n"
+                )
+        return text[:-1]
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stops the workers after the pending batches are processed.
+
+        Workers that are still alive after the timeout are terminated.
+
+        Args:
+            timeout (float, optional): seconds to wait for the pending batches and
+                each worker. Defaults to None (wait until all are processed).
+        """
+        self._closing = True
+        for _ in self.procs:
+            try:
+                # the queue is bounded, so the sentinel can wait behind pending batches
+                self.tasks.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for proc in self.procs:
+            # a worker only exits once its results are flushed, so keep reading them
+            deadline = None if timeout is None else time.time() + timeout
+            while proc.is_alive() and (deadline is None or time.time() < deadline):
+                self.poll()
+                proc.join(DRAIN_TIMEOUT)
+        for proc in self.procs:
+            if proc.is_alive():
+                CONSOLE.print(f"[yellow]Terminating worker {proc.pid}[/]")
+                proc.terminate()
+                proc.join()
+        self.poll()
+
+    def _start_worker(self) -> Process:
+        proc = Process(
+            target=worker_loop,
+            args=(*self._target_args, self.tasks, self.results),
+            daemon=True,
+        )
+        proc.start()
+        return proc
+
+    def _restart_dead(self) -> None:
+        """Replaces workers that died (e.g., killed or crashed in native code)."""
+        if self._closing:
+            return
+        for i, proc in enumerate(self.procs):
+            if not proc.is_alive():
+                CONSOLE.print(
+                    f"[yellow]Worker {proc.pid} died (exit code {proc.exitcode}), "
+                    "restarting it[/]"
+                )
+                proc.join()
+                self.procs[i] = self._start_worker()
+                self.restarted += 1
+
+    def _put(self, task: tuple) -> None:
+        """Blocks until the task is queued, restarting dead workers meanwhile, so
+        the queue does not stay full forever."""
+        while True:
+            try:
+                self.tasks.put(task, timeout=DRAIN_TIMEOUT)
+                return
+            except queue.Full:
+                self._restart_dead()
@@ -0,0 +1,137 @@
+"""
+Asynchronous ZMQ ingestion front end for the predictor.
+
+The messages of the ranks arrive in bursts. `ZmqIngest` waits for the first frame of a
+burst with zmq.asyncio and then drains all pending frames at once without copying
+them (copy=False). The batch is closed once no new frame arrived for `window`
+milliseconds (or at the latest after `max_delay` seconds of a continuous stream).
+All frames of a batch are then copied once into a single contiguous buffer, which the
+msgpack parser consumes as a stream.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import zmq
+import zmq.asyncio
+
+# quiet time in ms that closes a batch
+WINDOW = 100.0
+# maximal time in s a continuous stream delays a batch
+MAX_DELAY = 1.0
+
+
+def join_frames(frames: list) -> bytearray:
+    """Copies frames (zmq.Frame or bytes-like) into one contiguous buffer.
+
+    Args:
+        frames (list): received frames
+
+    Returns:
+        bytearray: concatenated content of the frames
+    """
+    buffers = [f.buffer if isinstance(f, zmq.Frame) else memoryview(f) for f in frames]
+    out = bytearray(sum(b.nbytes for b in buffers))
+    view = memoryview(out)
+    offset = 0
+    for b in buffers:
+        view[offset : offset + b.nbytes] = b.cast("B")
+        offset += b.nbytes
+    return out
+
+
+class ZmqIngest:
+    """Receives batches of messages from an asyncio ZMQ socket.
+
+    Args:
+        socket (zmq.asyncio.Socket): bound or connected socket, see `setup_socket`
+        window (float, optional): quiet time in ms that closes a batch. 0 only drains
+            the frames that are already pending. Defaults to 100.
+        max_delay (float, optional): maximal time in s a continuous stream of frames
+            delays the batch. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        socket: zmq.asyncio.Socket,
+        window: float = WINDOW,
+        max_delay: float = MAX_DELAY,
+    ):
+        self.socket = socket
+        self.window = max(window, 0) / 1000
+        self.max_delay = max_delay
+        self.loop = asyncio.new_event_loop()
+
+    def receive(self, timeout: float | None = 1.0) -> tuple[list[bytearray], int]:
+        """Blocks until a batch was received.
+
+        Args:
+            timeout (float | None, optional): seconds to wait for the first frame, None
+                blocks. Defaults to 1.
+
+        Returns:
+            tuple[list[bytearray], int]: the batch as a list with one contiguous buffer
+                (empty on timeout) and the number of received messages
+        """
+        frames = self.loop.run_until_complete(self.batch(timeout))
+        if not frames:
+            return [], 0
+        return [join_frames(frames)], len(frames)
+
+    async def batch(self, timeout: float | None = 1.0) -> list[zmq.Frame]:
+        """Receives the frames of one batch.
+
+        Args:
+            timeout (float | None, optional): seconds to wait for the first frame, None
+                blocks. Defaults to 1.
+
+        Returns:
+            list[zmq.Frame]: received frames, empty on timeout
+        """
+        try:
+            frames = [await asyncio.wait_for(self.socket.recv(copy=False), timeout)]
+        except TimeoutError:
+            return []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while True:
+            frames.extend(await self.drain())
+            remaining = deadline - loop.time()
+            if self.window <= 0 or remaining <= 0:
+                break
+            try:
+                frames.append(
+                    await asyncio.wait_for(
+                        self.socket.recv(copy=False), min(self.window, remaining)
+                    )
+                )
+            except TimeoutError:
+                break
+        return frames
+
+    async def drain(self) -> list[zmq.Frame]:
+        """Receives all frames that are already pending without waiting.
+
+        Returns:
+            list[zmq.Frame]: pending frames
+        """
+        frames = []
+        while True:
+            try:
+                frames.append(await self.socket.recv(zmq.NOBLOCK, copy=False))
+            except zmq.Again:
+                return frames
+
+    def close(self) -> None:
+        self.socket.close(linger=0)
+        self.loop.close()
@@ -0,0 +1,198 @@
+"""
+Registry and on-disk cache of the numba kernels.
+
+Kernels are declared with `kernel`, which wraps numba.jit(nopython=True, cache=True)
+and records explicit signatures for the types the kernel is called with (C-contiguous
+float64/int64 arrays, read-only ones for trace columns). The signatures are not passed
+to numba.jit, as this would compile every kernel at import time and reject other
+types. Instead, `compile_kernels` (`ftio warmup`) compiles them into the cache ahead
+of time, so the first prediction loads the machine code instead of compiling it.
+Calls with other types still compile on demand.
+
+The cache directory is set with the environment variable FTIO_CACHE_DIR (or numba's
+NUMBA_CACHE_DIR). By default, numba stores the cache next to the sources or in the
+home directory, which is lost in containers with a read-only installation or a fresh
+home directory.
+
+The parallel kernels use numba's workqueue threading layer unless NUMBA_THREADING_LAYER
+is set. ftio forks worker processes (e.g., the stage-out and the predictions), and a
+process that forked after starting the TBB layer hangs at exit.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: v0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from numba import config, jit
+from numba.core import sigutils
+from numba.core.dispatcher import Dispatcher
+
+CACHE_ENV = "FTIO_CACHE_DIR"
+# 1D float64 array taken from a DataFrame (read-only with pandas copy-on-write)
+RO_ARRAY = "Array(float64, 1, 'C', readonly=True)"
+# raw bytes of a trace (read-only if memory mapped or read from a file)
+RO_BYTES = "Array(uint8, 1, 'C', readonly=True)"
+# fork-safe threading layer, selected before the first parallel kernel runs
+if config.THREADING_LAYER == "default":
+    config.THREADING_LAYER = "workqueue"
+# modules that declare kernels, imported by `load_kernels`
+KERNEL_MODULES = (
+    "ftio.parse.bandwidth",
+    "ftio.parse.msgpack_reader",
+    "ftio.parse.recorder_reader",
+    "ftio.freq.discretize",
+    "ftio.freq.dtw",
+    "ftio.analysis._correlation",
+)
+
+
+@dataclass
+class Kernel:
+    """A numba kernel and its explicit signatures.
+
+    Attributes:
+        name (str): module and function name
+        dispatcher (Dispatcher): the compiled function
+        signatures (tuple[str, ...]): argument types compiled by the warmup
+    """
+
+    name: str
+    dispatcher: Dispatcher
+    signatures: tuple[str, ...]
+
+
+@dataclass
+class CompileResult:
+    """Outcome of compiling one signature of a kernel.
+
+    Attributes:
+        name (str): module and function name
+        signature (str): argument types
+        seconds (float): time to compile or load the signature
+        cached (bool): True if the machine code was loaded from the cache
+    """
+
+    name: str
+    signature: str
+    seconds: float
+    cached: bool
+
+
+KERNELS: dict[str, Kernel] = {}
+
+
+def kernel(*signatures: str, parallel: bool = False) -> Callable:
+    """Decorator that compiles a function with numba.jit(nopython=True, cache=True)
+    and registers it for the warmup.
+
+    Args:
+        *signatures (str): argument types, e.g., "(float64[::1], int64)"
+        parallel (bool, optional): enables prange. Defaults to False.
+
+    Returns:
+        Callable: decorator returning the numba dispatcher
+    """
+
+    def decorator(func: Callable) -> Dispatcher:
+        dispatcher = jit(nopython=True, parallel=parallel, cache=True)(func)
+        name = f"{func.__module__}.{func.__name__}"
+        KERNELS[name] = Kernel(name, dispatcher, signatures)
+        return dispatcher
+
+    return decorator
+
+
+def set_cache_dir(path: str) -> str:
+    """Stores the numba cache of all kernels in path (also for kernels that are
+    already registered and for child processes).
+
+    Args:
+        path (str): cache directory, created if needed
+
+    Returns:
+        str: absolute path of the cache directory
+    """
+    path = os.path.abspath(os.path.expanduser(path))
+    os.makedirs(path, exist_ok=True)
+    os.environ["NUMBA_CACHE_DIR"] = path
+    config.CACHE_DIR = path
+    for k in KERNELS.values():
+        k.dispatcher.enable_caching()
+    return path
+
+
+def cache_dir() -> str:
+    """Directory of the numba cache.
+
+    Returns:
+        str: the configured directory, or an empty string for numba's default
+            (next to the sources, or the user cache directory if they are read-only)
+    """
+    return config.CACHE_DIR
+
+
+def load_kernels() -> dict[str, Kernel]:
+    """Imports all modules that declare kernels.
+
+    Returns:
+        dict[str, Kernel]: the registered kernels
+    """
+    for module in KERNEL_MODULES:
+        importlib.import_module(module)
+    return KERNELS
+
+
+def cache_stats() -> tuple[int, int]:
+    """Counts the cache hits and misses of the kernels in this process.
+
+    Returns:
+        tuple[int, int]: signatures loaded from the cache and signatures compiled
+    """
+    hits, misses = 0, 0
+    for k in KERNELS.values():
+        stats = k.dispatcher.stats
+        hits += sum(stats.cache_hits.values())
+        misses += sum(stats.cache_misses.values())
+    return hits, misses
+
+
+def compile_kernels() -> list[CompileResult]:
+    """Compiles the explicit signatures of all kernels, loading them from the cache
+    if they were compiled before.
+
+    Returns:
+        list[CompileResult]: one entry per kernel signature
+    """
+    results = []
+    for k in load_kernels().values():
+        for signature in k.signatures:
+            args, _ = sigutils.normalize_signature(signature)
+            hits = sum(k.dispatcher.stats.cache_hits.values())
+            misses = sum(k.dispatcher.stats.cache_misses.values())
+            tik = time.perf_counter()
+            # normalized types, as the cache index uses the signature as given
+            k.dispatcher.compile(args)
+            seconds = time.perf_counter() - tik
+            cached = (
+                sum(k.dispatcher.stats.cache_hits.values()) > hits
+                or sum(k.dispatcher.stats.cache_misses.values()) == misses
+            )
+            results.append(CompileResult(k.name, signature, seconds, cached))
+    return results
+
+
+if os.environ.get(CACHE_ENV):
+    set_cache_dir(os.environ[CACHE_ENV])
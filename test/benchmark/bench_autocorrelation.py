@@ -0,0 +1,77 @@
+"""
+Scaling benchmark of the autocorrelation (-au).
+
+Compares the previous np.correlate implementation (O(N^2), only run up to
+--max_direct samples) with the FFT-based `autocorrelation`, with and without a
+bounded lag range (--max-lag). The last column normalizes the FFT runtime by
+N log2 N, which stays roughly constant for O(N log N) scaling.
+
+Usage:
+    python -m test.benchmark.bench_autocorrelation [--max_n 1e8] [--max_direct 1e5]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ftio.freq.autocorrelation import autocorrelation
+
+
+def signal(n: int, seed: int = 0) -> np.ndarray:
+    """Periodic bursts with noise, similar to a sampled bandwidth."""
+    rng = np.random.default_rng(seed)
+    return 1e9 * (np.arange(n) % 1000 < 200) + rng.uniform(0, 1e8, n)
+
+
+def direct(arr: np.ndarray) -> np.ndarray:
+    """Previous implementation with np.correlate."""
+    ndata = arr - np.mean(arr)
+    acorr = np.correlate(ndata, ndata, "full")[len(ndata) - 1 :]
+    return acorr / np.var(arr) / len(ndata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--max_n", type=float, default=1e7)
+    parser.add_argument("--max_direct", type=float, default=1e5)
+    parser.add_argument("--max_lag", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'samples':>10} {'np.correlate [s]':>17} {'fft [s]':>10} "
+        f"{'fft max-lag [s]':>16} {'fft [ns/(N log2 N)]':>20} max error"
+    )
+    n = 1000
+    while n <= args.max_n:
+        arr = signal(n)
+        t_direct, error = np.nan, np.nan
+        tik = time.perf_counter()
+        acorr = autocorrelation(arr)
+        t_fft = time.perf_counter() - tik
+        tik = time.perf_counter()
+        autocorrelation(arr, args.max_lag)
+        t_lag = time.perf_counter() - tik
+        if n <= args.max_direct:
+            tik = time.perf_counter()
+            ref = direct(arr)
+            t_direct = time.perf_counter() - tik
+            error = np.max(np.abs(acorr - ref))
+        print(
+            f"{n:>10.0e} {t_direct:>17.4f} {t_fft:>10.4f} {t_lag:>16.4f} "
+            f"{t_fft / (n * np.log2(n)) * 1e9:>20.3f} {error:.1e}"
+        )
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
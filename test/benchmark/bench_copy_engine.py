@@ -0,0 +1,117 @@
+"""
+Benchmark of the stage-out copy of a single large file.
+
+Copies a file of --size bytes with the previous fast_chunk_copy_file of posix_control
+(zero-filled destination, mmap of the source, and one open of the destination per chunk
+and thread), with cp, and with the copy engine (copy_file) using copy_file_range and
+its pread/pwrite fallback. The file is read once before so that all runs start from the
+page cache.
+
+Usage:
+    python -m test.benchmark.bench_copy_engine [--size 1e9] [--workers 4] [--dir /tmp]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import filecmp
+import math
+import mmap
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from ftio.api.gekkoFs.posix_control import UNSUPPORTED_ERRNO, copy_file
+
+
+def previous(src: str, dst: str, threads: int = 4) -> None:
+    """Previous fast_chunk_copy_file: zeros, mmap, and one open per chunk."""
+
+    def write_chunk(mmapped_file, start, end):
+        with open(dst, "r+b") as fdst:
+            fdst.seek(start)
+            fdst.write(mmapped_file[start:end])
+
+    with open(src, "rb") as fsrc:
+        fsrc.seek(0, os.SEEK_END)
+        file_size = fsrc.tell()
+    with open(src, "rb") as fsrc:
+        mmapped_file = mmap.mmap(fsrc.fileno(), 0, access=mmap.ACCESS_READ)
+    with open(dst, "wb") as fdst:
+        fdst.write(b"\0" * file_size)
+    chunk_size = math.ceil(file_size / threads)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [
+            executor.submit(
+                write_chunk,
+                mmapped_file,
+                i * chunk_size,
+                min((i + 1) * chunk_size, file_size),
+            )
+            for i in range(threads)
+        ]
+        for future in futures:
+            future.result()
+
+
+def unsupported(*args, **kwargs):
+    raise OSError(next(iter(UNSUPPORTED_ERRNO)), "disabled for the benchmark")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--size", type=float, default=1e9)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--dir", type=str, default=None, help="folder of the files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        src = os.path.join(tmp, "src")
+        dst = os.path.join(tmp, "dst")
+        block = os.urandom(1 << 20)
+        with open(src, "wb") as f:
+            for _ in range(int(args.size) >> 20):
+                f.write(block)
+        with open(src, "rb") as f:
+            while f.read(1 << 24):
+                pass
+        print(f"file: {os.path.getsize(src) / 1e9:.2f} GB in {tmp}")
+
+        def pwrite_only(src, dst):
+            with (
+                patch("os.copy_file_range", unsupported),
+                patch("os.sendfile", unsupported),
+            ):
+                return copy_file(src, dst, args.workers)
+
+        runs = [
+            ("previous (zeros + mmap)", lambda s, d: previous(s, d, args.workers)),
+            ("cp", lambda s, d: subprocess.run(["cp", s, d], check=True)),
+            ("copy_file", lambda s, d: copy_file(s, d, args.workers)),
+            ("copy_file (pread/pwrite)", pwrite_only),
+        ]
+        for name, func in runs:
+            tik = time.perf_counter()
+            method = func(src, dst)
+            seconds = time.perf_counter() - tik
+            assert filecmp.cmp(src, dst, shallow=False)
+            os.remove(dst)
+            suffix = f" [{method}]" if isinstance(method, str) else ""
+            print(
+                f"{name}: {seconds:.3f} s "
+                f"({os.path.getsize(src) / seconds / 1e9:.2f} GB/s){suffix}"
+            )
+
+
+if __name__ == "__main__":
+    main()
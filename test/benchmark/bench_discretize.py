@@ -0,0 +1,71 @@
+"""
+Benchmark of the discretization backends on synthetic step functions.
+
+Compares the reference Python loop with the fast (chunked searchsorted)
+backend of `ftio.freq.discretize` and checks that both yield identical samples.
+
+Usage:
+    python -m test.benchmark.bench_discretize [--max_samples 1e8] [--max_loop 1e6]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ftio.freq.discretize import _sample_fast, _sample_loop
+
+
+def step_function(n_samples: int, freq: float = 10.0, seed: int = 0):
+    """Random step function spanning n_samples at the sampling frequency freq."""
+    rng = np.random.default_rng(seed)
+    n_steps = max(2, n_samples // 50)
+    duration = n_samples / freq
+    t = np.sort(rng.uniform(0, duration, n_steps))
+    t[0], t[-1] = 0.0, duration
+    b = rng.uniform(0, 1e9, n_steps)
+    return b, t
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--max_samples", type=float, default=1e8)
+    parser.add_argument(
+        "--max_loop", type=float, default=1e6, help="skip the loop above this size"
+    )
+    args = parser.parse_args()
+
+    freq = 10.0
+    _sample_fast(*step_function(1000), freq, 100)  # warm up JIT/caches
+    print(f"{'samples':>12} {'loop [s]':>12} {'fast [s]':>12} {'speedup':>10} identical")
+    n = 1000
+    while n <= args.max_samples:
+        b, t = step_function(n, freq)
+        N = int(np.floor((t[-1] - t[0]) * freq))
+        tik = time.perf_counter()
+        b_fast = _sample_fast(b, t, freq, N)
+        t_fast = time.perf_counter() - tik
+        if n <= args.max_loop:
+            tik = time.perf_counter()
+            b_loop = _sample_loop(b, t, freq, N)
+            t_loop = time.perf_counter() - tik
+            same = str(np.array_equal(b_loop, b_fast))
+            print(
+                f"{N:>12} {t_loop:>12.4f} {t_fast:>12.4f} {t_loop / t_fast:>10.1f} {same}"
+            )
+        else:
+            print(f"{N:>12} {'-':>12} {t_fast:>12.4f} {'-':>10} -")
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
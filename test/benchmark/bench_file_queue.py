@@ -0,0 +1,97 @@
+"""
+Benchmark of the stage-out bookkeeping of posix_control.
+
+Runs the calls of one flush on --items checkpoint files: the checks and the put in
+flush_using_cp, the transition to copying in the worker, and mark_done, with the
+previous FileQueue (Manager list proxies) and the SQLite FileQueue.
+
+Usage:
+    python -m test.benchmark.bench_file_queue [--items 1000 10000 30000]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import time
+from multiprocessing import Manager
+
+from ftio.api.gekkoFs.file_queue import FileQueue
+
+
+class Previous:
+    """Previous FileQueue: Manager list proxies, the calls of a flush only."""
+
+    def __init__(self, m) -> None:
+        self._queue = m.list()
+        self._ignore = m.list()
+        self._lock = m.Lock()
+
+    def in_progress(self, item: str) -> bool:
+        with self._lock:
+            return item in self._queue
+
+    def is_ignored(self, item: str) -> bool:
+        with self._lock:
+            return item in [fname for _, fname in self._ignore]
+
+    def put(self, item: str) -> None:
+        with self._lock:
+            folder = item.rsplit("/", 1)[0] if "/" in item else ""
+            if folder not in self._queue and item not in self._queue:
+                self._queue.append(item)
+
+    def mark_done(self, item: str) -> None:
+        with self._lock:
+            if item in self._queue:
+                self._queue.remove(item)
+
+
+def flush_previous(queue: Previous, items: list[str]) -> None:
+    for item in items:
+        if not queue.in_progress(item) and not queue.is_ignored(item):
+            queue.put(item)
+    for item in items:
+        queue.mark_done(item)
+
+
+def flush_sqlite(queue: FileQueue, items: list[str]) -> None:
+    for item in items:
+        # is_done and is_ignored only stat items that are in their table
+        if not queue.is_ignored(None, item) and not queue.is_done(None, item):
+            queue.put(item)
+    for i, item in enumerate(items):
+        queue.mark_copying(item, float(i))
+        queue.mark_done(item)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10_000, 30_000])
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'previous [s]':>13} {'sqlite [s]':>11} {'speedup':>8}")
+    with Manager() as m:
+        for n in args.items:
+            items = [f"/gkfs/run/ckpt_{i}.h5" for i in range(n)]
+            tik = time.perf_counter()
+            flush_previous(Previous(m), items)
+            t_previous = time.perf_counter() - tik
+
+            queue = FileQueue()
+            tik = time.perf_counter()
+            flush_sqlite(queue, items)
+            t_sqlite = time.perf_counter() - tik
+            print(
+                f"{n:>8} {t_previous:>13.3f} {t_sqlite:>11.3f} {t_previous / t_sqlite:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark of the offline replay of the flush strategies (replay_flush).
+
+Replays synthetic streams of --phases write phases and reports the time of each step:
+the decoding of the requests, the predictions (ftio_gekko.run per batch), and the
+scheduling and simulation of all strategies, followed by the metrics of the strategies
+for the largest stream.
+
+Usage:
+    python -m test.benchmark.bench_flush_replay [--phases 20 100] [--ranks 4]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from ftio.api.gekkoFs.flush_scheduler import TRIGGER_LOGGER
+from ftio.api.gekkoFs.replay_flush import (
+    batches,
+    parse_args_replay,
+    predict,
+    print_results,
+    replay,
+    schedule,
+    simulate,
+    synthetic_stream,
+    write_requests,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--phases", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--ranks", type=int, default=4)
+    args = parser.parse_args()
+
+    replay_args, ftio_args = parse_args_replay([])
+    TRIGGER_LOGGER.setLevel(logging.ERROR)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # ftio_gekko.run writes bandwidth.json
+        os.chdir(tmp)
+        try:
+            print(
+                f"{'phases':>7} {'messages':>9} {'decode [s]':>11} {'predict [s]':>12} "
+                f"{'strategies [s]':>15}"
+            )
+            for phases in args.phases:
+                messages = synthetic_stream(ranks=args.ranks, phases=phases)
+                tik = time.perf_counter()
+                requests = write_requests(messages)
+                t_decode = time.perf_counter() - tik
+
+                tik = time.perf_counter()
+                predictions, _ = predict(batches(messages), ftio_args)
+                t_predict = time.perf_counter() - tik
+
+                t_app_end = float(requests.t_end[-1])
+                scheduler_args = argparse.Namespace(
+                    handle_new_prediction="cancel",
+                    job_time=1.2 * t_app_end,
+                    buffer_size=requests.size.sum() / 4,
+                )
+                tik = time.perf_counter()
+                for strategy in replay_args.strategies:
+                    scheduler_args.strategy = strategy
+                    flushes = schedule(predictions, scheduler_args, t_app_end)
+                    simulate(requests, flushes, 1e9, 4e9)
+                t_strategies = time.perf_counter() - tik
+                print(
+                    f"{phases:>7} {len(messages):>9} {t_decode:>11.3f} {t_predict:>12.3f} "
+                    f"{t_strategies:>15.4f}"
+                )
+            print()
+            print_results(replay(messages, replay_args, ftio_args))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark of the flush trigger of the data stager.
+
+Runs the trigger on a Manager queue (as in predictor_gekko_zmq) for --seconds and puts
+--predictions predictions whose flush is due 0.5 s after they are sent. Compares the
+previous trigger (strategy_avoid_interference of stage_data, polling the queue every
+0.01 s) with the FlushScheduler. Reports the CPU time of the trigger and the Manager
+process, and the delay of the flushes after their deadline. Also reports the time of
+the `du -sb` call that the previous buffer_size strategy made for each prediction, on a
+folder with --files files.
+
+Usage:
+    python -m test.benchmark.bench_flush_scheduler [--seconds 10] [--predictions 10] [--files 10000]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from multiprocessing import Manager
+
+import numpy as np
+
+from ftio.api.gekkoFs.flush_scheduler import FlushScheduler
+
+DELAY = 0.5
+
+
+def previous(sync_trigger, flush, stop: threading.Event) -> None:
+    """Previous polling loop of strategy_avoid_interference (handle_new_prediction='')."""
+    while not stop.is_set():
+        if not sync_trigger.empty():
+            latest_prediction = sync_trigger.get()
+            t = time.time() - latest_prediction["t_wait"]
+            target_time = latest_prediction["t_end"] + 1 / (latest_prediction["freq"] * 2)
+            remaining_time = target_time - (latest_prediction["t_flush"] + t)
+            if remaining_time > 0:
+                countdown = time.time() + remaining_time
+                while time.time() < countdown:
+                    time.sleep(0.01)
+                if latest_prediction["probability"] > 0.5:
+                    flush(latest_prediction, False)
+        time.sleep(0.01)
+
+
+def scheduler(sync_trigger, flush, stop: threading.Event) -> None:
+    args = argparse.Namespace(strategy="flush", handle_new_prediction="")
+    FlushScheduler(sync_trigger, args, flush).run()
+
+
+def cpu_time() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def measure(trigger, seconds: float, predictions: int) -> tuple[float, np.ndarray]:
+    delays = []
+    cpu = cpu_time()
+    m = Manager()
+    sync_trigger = m.Queue()
+    stop = threading.Event()
+
+    def flush(prediction: dict, wait: bool) -> None:
+        delays.append(time.time() - prediction["due"])
+
+    thread = threading.Thread(target=trigger, args=(sync_trigger, flush, stop))
+    thread.start()
+    for _ in range(predictions):
+        time.sleep(seconds / predictions)
+        now = time.time()
+        # the flush is due DELAY s after the prediction is sent
+        sync_trigger.put(
+            {
+                "t_wait": now,
+                "t_end": DELAY / 2,
+                "t_flush": 0.0,
+                "freq": 1 / DELAY,
+                "probability": 1.0,
+                "source": "",
+                "due": now + DELAY,
+            }
+        )
+    time.sleep(2 * DELAY)
+    stop.set()
+    sync_trigger.put(None)
+    thread.join()
+    m.shutdown()
+    return cpu_time() - cpu, np.array(delays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--predictions", type=int, default=10)
+    parser.add_argument("--files", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'trigger':>10} {'cpu [s]':>8} {'flushes':>8} {'delay mean/max [ms]':>20}")
+    for name, trigger in [("previous", previous), ("scheduler", scheduler)]:
+        cpu, delays = measure(trigger, args.seconds, args.predictions)
+        print(
+            f"{name:>10} {cpu:>8.3f} {len(delays):>8} "
+            f"{delays.mean() * 1e3:>9.2f}/{delays.max() * 1e3:<8.2f}"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.files):
+            with open(os.path.join(tmp, f"ckpt_{i}.h5"), "wb") as f:
+                f.write(b"x" * 4096)
+        tik = time.perf_counter()
+        subprocess.run(f"du -sb {tmp}/*", shell=True, capture_output=True, check=True)
+        print(f"du -sb on {args.files} files: {time.perf_counter() - tik:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of the app-level overlap of the GekkoFS ZMQ predictor.
+
+Fills the app series with --points time-ordered points, then adds batches of --batch
+requests (the overlap of a ZMQ message) that overlap the end of the series. Compares the
+previous merge (overlap_two_series over the whole app series, then replacing it) with
+the incremental fold of ftio_gekko (fold_series on the suffix after the batch start,
+written in place with SharedRingBuffer.update, and the copy of the series passed
+to the prediction). Both keep the merged series for the next batch.
+
+Usage:
+    python -m test.benchmark.bench_gekko_fold [--points 1e4 1e6 1e7] [--batch 1000] [--repeat 20]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ftio.api.gekkoFs.ftio_gekko import fold
+from ftio.multiprocessing.shared_ring_buffer import SharedRingBuffer
+from ftio.parse.bandwidth import overlap, overlap_two_series
+
+
+def make_batch(rng, t_0: float, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Overlap of n requests that start after t_0."""
+    t_s = t_0 + np.sort(rng.random(n)) * n
+    t_e = t_s + rng.random(n) * 10
+    b, t = overlap(rng.integers(1, 1000, n).astype(float), t_s, t_e)
+    return np.array(b), np.array(t)
+
+
+def previous(b_app, t_app, b, t) -> tuple[np.ndarray, np.ndarray]:
+    """Previous merge: the whole app series is overlapped with the batch."""
+    return overlap_two_series(b_app, t_app, b, t)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--points", type=float, nargs="+", default=[1e4, 1e6, 1e7])
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # compiles the kernels
+    b, t = make_batch(rng, 0, 10)
+    previous(b, t, b, t)
+    fold(b, t, b, t)
+
+    print(
+        f"{'points':>12} {'previous [ms]':>14} {'fold [ms]':>10} {'speedup':>8} "
+        f"{'previous len':>13} {'fold len':>10}"
+    )
+    for n in (int(x) for x in args.points):
+        t_app = np.arange(n, dtype=float)
+        b_app = rng.integers(1, 1000, n).astype(float)
+        # each batch overlaps the end of the series so far
+        batches = [
+            make_batch(rng, n - 5 + k * args.batch, args.batch)
+            for k in range(args.repeat)
+        ]
+
+        b_out, t_out = b_app, t_app
+        tik = time.perf_counter()
+        for b, t in batches:
+            b_out, t_out = previous(b_out, t_out, b, t)
+        t_previous = (time.perf_counter() - tik) / args.repeat
+        n_previous = len(t_out)
+        del b_out, t_out
+
+        buffer = SharedRingBuffer(capacity=n + args.repeat * 4 * args.batch)
+        buffer.append(b_app, t_app)
+        tik = time.perf_counter()
+        for b, t in batches:
+            buffer.update(lambda b_app, t_app, b=b, t=t: fold(b_app, t_app, b, t))
+            b_out, t_out = buffer.snapshot(copy=True)
+        t_fold = (time.perf_counter() - tik) / args.repeat
+        n_fold = len(t_out)
+        del b_out, t_out
+        buffer.close()
+        print(
+            f"{n:>12} {t_previous * 1e3:>14.3f} {t_fold * 1e3:>10.3f} "
+            f"{t_previous / t_fold:>8.1f} {n_previous:>13} {n_fold:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Startup benchmark of the CLI entry points.
+
+Imports each module in a fresh interpreter with `python -X importtime` and prints
+the wall time of the import together with the modules that have the largest
+cumulative import time.
+
+Usage:
+    python -m test.benchmark.bench_import_time [--top 15] [--repeat 3]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+
+MODULES = ["ftio.cli.ftio_core", "ftio.cli.predictor"]
+
+
+def import_time(module: str) -> tuple[float, list[tuple[int, str]]]:
+    """Imports a module in a new interpreter.
+
+    Args:
+        module (str): module to import
+
+    Returns:
+        tuple[float, list[tuple[int, str]]]: wall time in seconds and the
+            (cumulative time in us, module) pairs reported by -X importtime
+    """
+    tik = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - tik
+    entries = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        entries.append((int(cumulative), name.strip()))
+    return wall, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        wall = min(r[0] for r in runs)
+        print(f"{module}: {wall:.3f} s (best of {args.repeat}, incl. interpreter)")
+        for cumulative, name in sorted(runs[-1][1], reverse=True)[: args.top]:
+            print(f"  {cumulative / 1e3:>9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark of the decoding of MessagePack TMIO traces.
+
+Writes a synthetic trace with one write_sync object of --phases phase records and
+decodes it with the previous path (msgpack.Unpacker into nested lists and seven
+Python lists per object) and with the column decoder (`extract` and the streaming
+`read_stream` used by ftio). The previous path holds every phase as a Python list, so
+it is run on a separate trace of --baseline-phases records to stay within memory.
+
+Usage:
+    python -m test.benchmark.bench_msgpack_decode [--phases 10000000] [--baseline-phases 1000000]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import gc
+import os
+import struct
+import tempfile
+import time
+
+import msgpack
+import numpy as np
+
+from ftio.parse.msgpack_reader import convert_to_class, extract, get_type
+from ftio.parse.stream_reader import read_stream
+
+# phase record: [bytes (uint32), 7 float64 fields, n_op (fixint)]
+FIELDS = [(f"tag_{k}", "u1", f"field_{k}", ">f8") for k in range(7)]
+PHASE = np.dtype(
+    [("header", "u1"), ("tag_bytes", "u1"), ("bytes", ">u4")]
+    + [(name, dtype) for f in FIELDS for name, dtype in (f[:2], f[2:])]
+    + [("n_op", "u1")]
+)
+CHUNK = 1_000_000
+
+
+def write_trace(path: str, phases: int) -> None:
+    """Writes one write_sync object with the given number of phase records."""
+    metrics = ["write_sync", False, True, 8 * phases, 1, 1, phases, phases, 1, 1, 1, 1, 1]
+    rng = np.random.default_rng(0)
+    with open(path, "wb") as f:
+        f.write(
+            b"\x9e" + msgpack.packb(metrics)[1:] + b"\xdd" + struct.pack(">I", phases)
+        )
+        for start in range(0, phases, CHUNK):
+            n = min(CHUNK, phases - start)
+            records = np.empty(n, dtype=PHASE)
+            records["header"], records["tag_bytes"], records["n_op"] = 0x99, 0xCE, 1
+            records["bytes"] = 4096
+            t_s = start + np.arange(n) + rng.random(n)
+            fields = [t_s, t_s + 0.5, t_s + 0.5, rng.random(n), rng.random(n), 0, 0]
+            for k, value in enumerate(fields):
+                records[f"tag_{k}"] = 0xCB
+                records[f"field_{k}"] = value
+            f.write(records.tobytes())
+
+
+def previous(path: str) -> list[dict]:
+    """Previous decoding: nested lists from msgpack, then one list per field."""
+    unpacker = msgpack.Unpacker(max_buffer_size=0)
+    with open(path, "rb") as f:
+        unpacker.feed(f.read())
+    return [e for item in unpacker for e in convert_to_class(item, get_type(item))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--phases", type=int, default=10_000_000)
+    parser.add_argument("--baseline-phases", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.msgpack")
+        base = os.path.join(tmp, "baseline.msgpack")
+        write_trace(path, args.phases)
+        write_trace(base, args.baseline_phases)
+        print(f"trace: {args.phases} phases, {os.path.getsize(path) / 1e6:.0f} MB")
+
+        extract(base)  # compiles or loads the kernels
+        tik = time.perf_counter()
+        data = previous(base)
+        seconds = time.perf_counter() - tik
+        print(
+            f"previous (Unpacker + lists), {args.baseline_phases} phases: {seconds:.3f} s "
+            f"({args.baseline_phases / seconds / 1e6:.2f} M phases/s)"
+        )
+        del data
+        gc.collect()
+
+        for name, func in (("extract (columns)", extract), ("read_stream", read_stream)):
+            tik = time.perf_counter()
+            data = func(path)
+            seconds = time.perf_counter() - tik
+            t_s = data[0]["write_sync"]["bandwidth"]["t_rank_s"]
+            print(
+                f"{name}, {len(t_s)} phases: {seconds:.3f} s "
+                f"({args.phases / seconds / 1e6:.2f} M phases/s)"
+            )
+            del data, t_s
+            gc.collect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark of the rank-level overlap on synthetic requests.
+
+Compares the previous path (one `overlap` call per channel, each sorting the
+events again) with the fused `overlap_multi` kernel (sequential and parallel
+merge) for the sum and avr channels, and checks that the results are identical.
+
+Usage:
+    python -m test.benchmark.bench_overlap [--max_requests 1e7]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ftio.parse.bandwidth import overlap_core, overlap_multi
+
+
+def requests(n: int, seed: int = 0):
+    """n random requests with the sum and avr bandwidth."""
+    rng = np.random.default_rng(seed)
+    t_s = rng.uniform(0, n / 100, n)
+    t_e = t_s + rng.exponential(1.0, n)
+    b_sum = rng.uniform(0, 1e9, n)
+    return b_sum, b_sum / 8, t_s, t_e
+
+
+def per_channel(b_sum, b_avr, t_s, t_e):
+    """Previous path: each channel converts, sorts, and merges on its own."""
+    out = []
+    for b in (b_avr, b_sum):
+        t_s_arr, t_e_arr, b_arr = np.array(t_s), np.array(t_e), np.array(b)
+        id_s, id_e = np.argsort(t_s_arr), np.argsort(t_e_arr)
+        out.append(overlap_core(b_arr, t_s_arr, t_e_arr, id_s, id_e))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--max_requests", type=float, default=1e7)
+    args = parser.parse_args()
+
+    # warm up JIT/caches
+    small = requests(100)
+    per_channel(*small)
+    overlap_multi([small[1], small[0]], small[2], small[3], parallel=False)
+    overlap_multi([small[1], small[0]], small[2], small[3], parallel=True)
+
+    print(
+        f"{'requests':>12} {'per channel [s]':>16} {'fused [s]':>12} "
+        f"{'parallel [s]':>14} {'speedup':>10} identical"
+    )
+    n = 1000
+    while n <= args.max_requests:
+        b_sum, b_avr, t_s, t_e = requests(n)
+        tik = time.perf_counter()
+        ref = per_channel(b_sum, b_avr, t_s, t_e)
+        t_ref = time.perf_counter() - tik
+        tik = time.perf_counter()
+        fused = overlap_multi([b_avr, b_sum], t_s, t_e, parallel=False)
+        t_fused = time.perf_counter() - tik
+        tik = time.perf_counter()
+        par = overlap_multi([b_avr, b_sum], t_s, t_e, parallel=True)
+        t_par = time.perf_counter() - tik
+        identical = all(
+            np.array_equal(out[0][c], ref[c][0]) and np.array_equal(out[2], ref[c][1])
+            for out in (fused, par)
+            for c in range(2)
+        )
+        print(
+            f"{n:>12.0e} {t_ref:>16.4f} {t_fused:>12.4f} {t_par:>14.4f} "
+            f"{t_ref / min(t_fused, t_par):>10.1f} {identical}"
+        )
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
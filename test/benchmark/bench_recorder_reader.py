@@ -0,0 +1,104 @@
+"""
+Benchmark of the Recorder text-trace parser.
+
+Writes a synthetic Recorder folder (one text file per rank, a mix of read, write, and
+other calls) and extracts the read and write calls with the previous parser
+(readlines, substring filter, and slicing per line) and with the numba scan of
+recorder_reader with 1 and --jobs processes.
+
+Usage:
+    python -m test.benchmark.bench_recorder_reader [--ranks 1000] [--lines 10000] [--jobs 0]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from argparse import Namespace
+
+import numpy as np
+
+from ftio.parse.recorder_reader import (
+    extract_data,
+    extract_recorder,
+    parse_line,
+    parse_rank_file,
+)
+
+
+def write_folder(path: str, ranks: int, lines: int) -> None:
+    """Writes one rank file per rank, a third of the calls are not I/O."""
+    rng = np.random.default_rng(0)
+    for rank in range(ranks):
+        t_s = np.cumsum(rng.random(lines) * 1e-3)
+        t_e = t_s + rng.random(lines) * 1e-4
+        calls = np.array(["write", "read", "lseek"])[np.arange(lines) % 3]
+        with open(os.path.join(path, f"{rank}.txt"), "w") as f:
+            f.writelines(
+                f"{s:.6f} {e:.6f} 0 {c} ( 3 0x7ffd12 {4096 * (i % 7 + 1)} )\n"
+                for i, (s, e, c) in enumerate(zip(t_s, t_e, calls, strict=True))
+            )
+
+
+def previous(path: str) -> tuple[list, int]:
+    """Previous parser: readlines, substring filter, and slicing per line."""
+    data = []
+    rank = 0
+    for root, _, files in os.walk(path):
+        for file in sorted(files, key=len):
+            with open(os.path.join(root, file)) as f:
+                current_file = f.readlines()
+            data.extend([k for k in current_file if " write " in k or " read " in k])
+        rank = max([int(x.replace(".txt", "")) for x in files]) + 1
+        break
+    calls = []
+    for line in data:
+        t_start, t_end, b_part = parse_line(line)
+        b_part = b_part / (t_end - t_start) if t_end - t_start != 0 else 0
+        calls.append((t_start, t_end, b_part, "write" in line))
+    return calls, rank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--ranks", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--jobs", type=int, default=0, help="0 uses all cores")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_folder(tmp, args.ranks, args.lines)
+        size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        print(f"folder: {args.ranks} ranks x {args.lines} lines, {size / 1e6:.0f} MB")
+
+        tik = time.perf_counter()
+        calls, _ = previous(tmp)
+        print(f"previous: {len(calls)} calls in {time.perf_counter() - tik:.3f} s")
+        del calls
+
+        parse_rank_file(os.path.join(tmp, "0.txt"))  # compiles or loads the kernels
+        jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+        for n in sorted({1, jobs}):
+            tik = time.perf_counter()
+            data, ranks = extract_data(tmp, Namespace(jobs=n))
+            write, read = extract_recorder(data, ranks)
+            n_calls = len(write["bandwidth"]["t_rank_s"]) + len(
+                read["bandwidth"]["t_rank_s"]
+            )
+            print(
+                f"numba scan, {n} process(es): {n_calls} calls in "
+                f"{time.perf_counter() - tik:.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark of the app-level bandwidth history used by the predictor.
+
+Compares append + snapshot latency of the shared-memory ring buffer
+(`ftio.multiprocessing.shared_ring_buffer`) with the former Manager list proxies
+(`extend` followed by `np.array(proxy[:])`). The history is filled up to n points,
+and the latency of one further batch append + snapshot is measured.
+
+Usage:
+    python -m test.benchmark.bench_shared_ring_buffer [--sizes 1e4 1e6 1e7] [--batch 1000]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import time
+from multiprocessing import Manager
+
+import numpy as np
+
+from ftio.multiprocessing.shared_ring_buffer import SharedRingBuffer
+
+
+def bench_proxy(manager, n: int, batch: np.ndarray) -> float:
+    b_app, t_app = manager.list(), manager.list()
+    b_app.extend(np.zeros(n).tolist())
+    t_app.extend(np.zeros(n).tolist())
+    tik = time.perf_counter()
+    b_app.extend(batch)
+    t_app.extend(batch)
+    b = np.array(b_app[:])
+    t = np.array(t_app[:])
+    elapsed = time.perf_counter() - tik
+    assert len(b) == len(t) == n + len(batch)
+    return elapsed
+
+
+def bench_ring(n: int, batch: np.ndarray) -> float:
+    buffer = SharedRingBuffer(capacity=n + len(batch))
+    buffer.append(np.zeros(n), np.zeros(n))
+    tik = time.perf_counter()
+    buffer.append(batch, batch)
+    b, t = buffer.snapshot()
+    elapsed = time.perf_counter() - tik
+    assert len(b) == len(t) == n + len(batch)
+    del b, t
+    buffer.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1e4, 1e6, 1e7])
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    batch = np.random.default_rng(0).uniform(0, 1e9, args.batch).tolist()
+    print(f"{'points':>12} {'proxy [s]':>12} {'shm [s]':>12} {'speedup':>10}")
+    with Manager() as manager:
+        for n in (int(x) for x in args.sizes):
+            t_proxy = bench_proxy(manager, n, batch)
+            t_ring = bench_ring(n, batch)
+            print(f"{n:>12} {t_proxy:>12.5f} {t_ring:>12.6f} {t_proxy / t_ring:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Scaling benchmark of the sliding window correlation.
+
+Compares the per-window evaluation (exact=True, O(N·w), only run up to --max_direct
+samples) with the O(N) running-sum kernel of `sliding_correlation` for Pearson and
+the rank-based Spearman approximation.
+
+Usage:
+    python -m test.benchmark.bench_sliding_correlation [--max_n 1e7] [--window 1000]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ftio.analysis._correlation import sliding_correlation
+
+
+def signals(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """A cosine and noisy bursts with a large offset, similar to the DFT x DWT case."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    x = np.cos(2 * np.pi * t / 1000)
+    y = 1e9 + 1e8 * (t % 1000 < 500) + rng.uniform(0, 1e7, n)
+    return x, y
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--max_n", type=float, default=1e7)
+    parser.add_argument("--max_direct", type=float, default=1e4)
+    parser.add_argument("--window", type=int, default=1000)
+    args = parser.parse_args()
+
+    # compile the kernels
+    sliding_correlation(*signals(10 * args.window), args.window)
+
+    print(
+        f"{'samples':>10} {'per window [s]':>15} {'pearson [s]':>12} "
+        f"{'spearman [s]':>13} max error"
+    )
+    n = 10 * args.window
+    while n <= args.max_n:
+        x, y = signals(n)
+        t_direct, error = np.nan, np.nan
+        tik = time.perf_counter()
+        corrs = sliding_correlation(x, y, args.window)
+        t_pearson = time.perf_counter() - tik
+        tik = time.perf_counter()
+        sliding_correlation(x, y, args.window, method="spearman")
+        t_spearman = time.perf_counter() - tik
+        if n <= args.max_direct:
+            tik = time.perf_counter()
+            ref = sliding_correlation(x, y, args.window, exact=True)
+            t_direct = time.perf_counter() - tik
+            error = np.max(np.abs(corrs - ref))
+        print(
+            f"{n:>10.0e} {t_direct:>15.4f} {t_pearson:>12.4f} "
+            f"{t_spearman:>13.4f} {error:.1e}"
+        )
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Latency benchmark of the ZMQ ingestion of the predictor.
+
+Sends a burst of msgpack messages (one per rank) and measures the time until the
+batch is handed to the parser, for the previous receive loop (one poll of up to
+1000 ms per message, one bytes copy per message) and for ZmqIngest (batched drain
+with copy=False and a --window quiet time).
+
+Usage:
+    python -m test.benchmark.bench_zmq_ingest [--ranks 10000] [--size 4096] [--window 100]
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import threading
+import time
+
+import zmq
+import zmq.asyncio
+
+from ftio.prediction.zmq_ingest import ZmqIngest
+
+
+def previous(socket, poller) -> list[bytes]:
+    """Previous receive loop of processes_zmq.receive_messages."""
+    msgs = []
+    socks = dict(poller.poll(1000))
+    while socks:
+        if socks.get(socket) == zmq.POLLIN:
+            msgs.append(socket.recv(zmq.NOBLOCK))
+        socks = dict(poller.poll(1000))
+    return msgs
+
+
+def burst(sender, ranks: int, size: int) -> float:
+    """Sends the messages from a thread (the send blocks at the high-water mark)."""
+    msg = b"\x01" * size
+    tik = time.perf_counter()
+    threading.Thread(target=lambda: [sender.send(msg) for _ in range(ranks)]).start()
+    return tik
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--ranks", type=int, default=10_000)
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--window", type=float, default=100)
+    args = parser.parse_args()
+
+    # previous loop
+    context = zmq.Context()
+    socket = context.socket(zmq.PULL)
+    port = socket.bind_to_random_port("tcp://127.0.0.1")
+    sender = context.socket(zmq.PUSH)
+    sender.connect(f"tcp://127.0.0.1:{port}")
+    poller = zmq.Poller()
+    poller.register(socket, zmq.POLLIN)
+    time.sleep(0.2)
+    tik = burst(sender, args.ranks, args.size)
+    msgs = previous(socket, poller)
+    print(
+        f"previous loop: {len(msgs)} msgs, batch ready after "
+        f"{time.perf_counter() - tik:.3f} s"
+    )
+    sender.close(linger=0)
+    socket.close(linger=0)
+
+    # ZmqIngest
+    socket = zmq.asyncio.Context().socket(zmq.PULL)
+    port = socket.bind_to_random_port("tcp://127.0.0.1")
+    sender = context.socket(zmq.PUSH)
+    sender.connect(f"tcp://127.0.0.1:{port}")
+    ingest = ZmqIngest(socket, args.window)
+    time.sleep(0.2)
+    tik = burst(sender, args.ranks, args.size)
+    n, nbytes = 0, 0
+    while n < args.ranks:
+        batch, m = ingest.receive(timeout=5)
+        n, nbytes = n + m, nbytes + sum(len(b) for b in batch)
+    print(
+        f"ZmqIngest ({args.window:g} ms window): {n} msgs ({nbytes / 1e6:.1f} MB), "
+        f"batch ready after {time.perf_counter() - tik:.3f} s"
+    )
+    sender.close(linger=0)
+    ingest.close()
+
+
+if __name__ == "__main__":
+    main()
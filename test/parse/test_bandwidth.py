@@ -9,13 +9,25 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+import os
+import subprocess
+import sys
+from argparse import Namespace
+
 import numpy as np
 import pytest
 
 from ftio.parse.bandwidth import (
+    Bandwidth,
+    compact_series,
+    fold_series,
     merge_overlaps_safe,
     overlap,
+    overlap_core,
     overlap_core_safe,
+    overlap_multi,
+    overlap_positions,
+    overlap_scatter,
     overlap_two_series_safe,
 )
 
@@ -181,3 +193,125 @@ def test_merge_overlaps_safe_empty():
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_overlap_multi_matches_overlap_core(parallel):
+    rng = np.random.default_rng(0)
+    n = 2000
+    # integer times produce ties between start and end events
+    t_s = rng.integers(0, 500, n).astype(float)
+    t_e = t_s + rng.integers(1, 50, n)
+    b_sum = rng.uniform(0, 1e9, n)
+    b_avr = b_sum / 8
+    id_s = np.argsort(t_s)
+    id_e = np.argsort(t_e)
+
+    b_out, n_out, t_out = overlap_multi([b_avr, b_sum], t_s, t_e, parallel=parallel)
+
+    for channel, b in zip(b_out, [b_avr, b_sum], strict=True):
+        b_ref, t_ref = overlap_core(b, t_s, t_e, id_s, id_e)
+        np.testing.assert_array_equal(channel, b_ref)
+        np.testing.assert_array_equal(t_out, t_ref)
+    assert n_out[-1] == 0
+    assert n_out.max() <= n
+    assert np.all(n_out >= 0)
+
+
+def test_overlap_multi_concurrent_requests():
+    b_out, n_out, t_out = overlap_multi(
+        [[10.0, 20.0, 30.0]], [0.0, 2.0, 4.0], [10.0, 8.0, 6.0]
+    )
+    assert b_out[0].tolist() == [10.0, 30.0, 60.0, 30.0, 10.0, 0.0]
+    assert n_out.tolist() == [1, 2, 3, 2, 1, 0]
+    assert t_out.tolist() == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+
+def test_bandwidth_keeps_concurrent_requests():
+    t_s, t_e = [0.0, 2.0, 4.0], [10.0, 8.0, 6.0]
+    b = {
+        "b_rank_sum": [10.0, 20.0, 30.0],
+        "b_rank_avr": [5.0, 10.0, 15.0],
+        "t_rank_s": t_s,
+        "t_rank_e": t_e,
+        "b_ind": [1.0, 2.0, 3.0],
+        "t_ind_s": t_s,
+        "t_ind_e": t_e,
+    }
+    bandwidth = Bandwidth(b, "write_sync", Namespace(avr=True, sum=True, ind=True))
+    assert bandwidth.n_overlap.tolist() == [1, 2, 3, 2, 1, 0]
+    assert len(bandwidth.n_overlap) == len(bandwidth.t_overlap)
+    assert bandwidth.n_overlap_ind.tolist() == [1, 2, 3, 2, 1, 0]
+
+
+def test_overlap_scatter_fallback():
+    t_s = np.array([0.0, 2.0, 4.0, 4.0])
+    t_e = np.array([10.0, 8.0, 4.0, 6.0])
+    b = np.array([[10.0, 20.0, 30.0, 40.0]])
+    id_s = np.argsort(t_s)
+    id_e = np.argsort(t_e)
+    pos_s, pos_e = overlap_positions(t_s[id_s], t_e[id_e])
+    b_out, n_out, t_out = overlap_scatter(b, t_s, t_e, id_s, id_e, pos_s, pos_e)
+    b_ref, t_ref = overlap_core_safe(b[0], t_s, t_e, id_s, id_e)
+    assert b_out[0].tolist() == b_ref
+    assert t_out.tolist() == t_ref
+    assert n_out[-1] == 0
+
+
+def test_compact_series():
+    # the last point per time is kept, the residue is zero and equals the next level
+    b, t = compact_series(
+        np.array([1.0, 2.0, 2.0, 1e-12, 0.0, 4.0]),
+        np.array([0.0, 0.0, 1.0, 2.0, 3.0, 4.0]),
+    )
+    assert b.tolist() == [2.0, 0.0, 4.0]
+    assert t.tolist() == [0.0, 2.0, 4.0]
+
+
+def test_fold_series_matches_overlap():
+    rng = np.random.default_rng(0)
+    t_s = np.round(rng.random(500) * 50, 1)
+    t_e = t_s + np.round(rng.random(500) * 5, 1)
+    b = rng.integers(1, 10, 500).astype(float)
+    b_app, t_app = np.zeros(0), np.zeros(0)
+    for batch in np.array_split(np.argsort(t_s), 10):
+        b_batch, t_batch = overlap(b[batch], t_s[batch], t_e[batch])
+        start, b_new, t_new = fold_series(b_app, t_app, b_batch, t_batch)
+        # a batch in time order only changes the end of the series
+        assert start >= len(t_app) - 50
+        b_app = np.concatenate((b_app[:start], b_new))
+        t_app = np.concatenate((t_app[:start], t_new))
+    b_ref, t_ref = overlap(b, t_s, t_e)
+    b_ref, t_ref = compact_series(np.array(b_ref), np.array(t_ref))
+    np.testing.assert_array_equal(t_app, t_ref)
+    np.testing.assert_allclose(b_app, b_ref, atol=1e-9)
+
+
+FORK = """
+import multiprocessing as mp
+import numba
+import numpy as np
+from ftio.parse.bandwidth import overlap_multi
+
+t = np.arange(100.0)
+overlap_multi([t.copy()], t, t + 5, parallel=True)
+proc = mp.get_context("fork").Process(target=print)
+proc.start()
+proc.join()
+print(numba.threading_layer())
+"""
+
+
+def test_fork_after_parallel_overlap_exits():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = {**os.environ, "PYTHONPATH": root}
+    env.pop("NUMBA_THREADING_LAYER", None)
+    out = subprocess.run(
+        [sys.executable, "-c", FORK],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+        timeout=120,
+    )
+    assert out.stdout.split()[-1] == "workqueue"
@@ -0,0 +1,98 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import os
+import shutil
+
+import numpy as np
+
+from ftio.parse import cache
+from ftio.parse.args import parse_args
+from ftio.parse.extract import get_time_behavior_and_args
+
+"""
+Tests for ftio/parse/cache.py
+"""
+
+FILE = os.path.join(os.path.dirname(__file__), "../../examples/tmio/JSONL/8.jsonl")
+
+
+def test_cache_hit_matches_parse(tmp_path):
+    argv = ["ftio", FILE, "-e", "no", "--cache-dir", str(tmp_path)]
+    data, _ = get_time_behavior_and_args(argv)
+    assert len(os.listdir(tmp_path)) == 1
+    cached, args = get_time_behavior_and_args(argv)
+    assert isinstance(cached[0]["time"], np.memmap)
+    assert args.mode == "write_sync"
+    for run, cached_run in zip(data, cached, strict=True):
+        np.testing.assert_array_equal(run["time"], cached_run["time"])
+        np.testing.assert_array_equal(run["bandwidth"], cached_run["bandwidth"])
+        assert run["total_bytes"] == cached_run["total_bytes"]
+        assert run["ranks"] == cached_run["ranks"]
+
+
+def test_cache_key(tmp_path):
+    file = tmp_path / "8.jsonl"
+    shutil.copy(FILE, file)
+    args = parse_args(["ftio", str(file)])
+    key = cache.cache_key(args)
+    # the frequency and time window do not change the parsed data
+    assert cache.cache_key(parse_args(["ftio", str(file), "-f", "5", "-ts", "1"])) == key
+    assert cache.cache_key(parse_args(["ftio", str(file), "-m", "read_sync"])) != key
+    # modified trace
+    with open(file, "a") as f:
+        f.write("\n")
+    assert cache.cache_key(args) != key
+    assert cache.cache_key(parse_args(["ftio", str(tmp_path / "missing.jsonl")])) is None
+
+
+def test_no_cache(tmp_path):
+    argv = ["ftio", FILE, "-e", "no", "--cache-dir", str(tmp_path), "--no-cache"]
+    get_time_behavior_and_args(argv)
+    assert not os.listdir(tmp_path)
+    assert not cache.cache_enabled(parse_args(["predictor", FILE]), "predictor")
+
+
+def test_adjusted_args_restored(tmp_path):
+    args = parse_args(["ftio", FILE])
+    initial_args = parse_args(["ftio", FILE])
+    args.mode = "read_sync"
+    data = [
+        {"time": np.arange(3.0), "bandwidth": np.ones(3), "total_bytes": 3, "ranks": 1}
+    ]
+    cache.store(str(tmp_path), "key", data, args, initial_args)
+    restored = parse_args(["ftio", FILE, "-f", "5"])
+    loaded = cache.load(str(tmp_path), "key", restored)
+    assert restored.mode == "read_sync"
+    assert restored.freq == 5
+    np.testing.assert_array_equal(loaded[0]["time"], np.arange(3.0))
+    assert cache.load(str(tmp_path), "other", restored) is None
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    args = parse_args(["ftio", FILE, "--cache-size", "1e-9"])
+    initial_args = parse_args(["ftio", FILE])
+    data = [
+        {"time": np.arange(3.0), "bandwidth": np.ones(3), "total_bytes": 3, "ranks": 1}
+    ]
+    # an entry larger than the cache is not stored
+    cache.store(str(tmp_path), "large", data, args, initial_args)
+    assert not os.listdir(tmp_path)
+
+    args.cache_size = 1e9
+    for i, key in enumerate(("a", "b", "c")):
+        cache.store(str(tmp_path), key, data, args, initial_args)
+        os.utime(tmp_path / key, (i, i))
+    size = cache._entry_size(str(tmp_path / "a"))
+    # a hit marks the oldest entry as recently used
+    assert cache.load(str(tmp_path), "a", args) is not None
+    cache.prune(str(tmp_path), 2 * size)
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
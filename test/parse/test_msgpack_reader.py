@@ -0,0 +1,106 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import io
+import os
+
+import msgpack
+import numpy as np
+
+from ftio.parse.args import parse_args
+from ftio.parse.msgpack_reader import (
+    PHASE_FIELDS,
+    convert_to_class,
+    decode,
+    extract,
+    get_type,
+)
+from ftio.parse.simrun import Simrun
+from ftio.parse.stream_reader import read_stream
+
+"""
+Tests for ftio/parse/msgpack_reader.py (decoding of the phase records into columns)
+"""
+
+MSGPACK = os.path.join(
+    os.path.dirname(__file__), "../../examples/tmio/ior/parallel/384.msgpack"
+)
+# one value per MessagePack number format
+VALUES = [0, 127, 128, 65536, 2**40, 2**64 - 1, -1, -33, -129, -40000, -(2**62), 1.5]
+
+
+def _tmio_object(phases: list) -> list:
+    return ["write_async", True, True, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, phases]
+
+
+def _reference(buffer: bytes) -> list:
+    return [
+        entry
+        for item in msgpack.Unpacker(io.BytesIO(buffer))
+        for entry in convert_to_class(item, get_type(item))
+    ]
+
+
+def test_decode_number_formats():
+    phases = [[v] * 9 for v in VALUES] + [[None, 2.5], [1.0] * 12]
+    buffer = msgpack.packb(_tmio_object(phases))
+    items, end = decode(buffer)
+    assert end == len(buffer)
+    columns = items[0][-1]
+    assert items[0][:13] == _tmio_object([])[:13]
+    assert columns.shape == (PHASE_FIELDS, len(phases))
+    np.testing.assert_array_equal(columns[1, : len(VALUES)], np.array(VALUES, float))
+    np.testing.assert_array_equal(columns[:, -2], [np.nan, 2.5] + [np.nan] * 6)
+    np.testing.assert_array_equal(columns[:, -1], np.ones(PHASE_FIELDS))
+    single = msgpack.packb(_tmio_object([[0.1] * 9]), use_single_float=True)
+    assert decode(single)[0][0][-1][4, 0] == np.float32(0.1)
+
+
+def test_decode_matches_unpacker():
+    phases = [[1024, i, i + 0.5, i + 0.7, 2.0 * i, i, 3, 4, 1] for i in range(1000)]
+    buffer = msgpack.packb(_tmio_object(phases)) + msgpack.packb(["io_time"] + [1.5] * 18)
+    items, _ = decode(buffer)
+    assert items[1] == ["io_time"] + [1.5] * 18
+    decoded = [
+        entry for item in items for entry in convert_to_class(item, get_type(item))
+    ]
+    for new, old in zip(decoded, _reference(buffer), strict=True):
+        for mode in new:
+            bandwidth = new[mode].pop("bandwidth", {})
+            for field, value in old[mode].pop("bandwidth", {}).items():
+                np.testing.assert_array_equal(bandwidth[field], value)
+            assert new[mode] == old[mode]
+
+
+def test_decode_stops_at_incomplete_object():
+    first = msgpack.packb(_tmio_object([[1] * 9] * 100))
+    items, end = decode(first + first[:-3])
+    assert (len(items), end) == (1, len(first))
+    assert decode(b"\xc1") == ([], 0)
+
+
+def test_non_numeric_phases_fall_back_to_lists():
+    buffer = msgpack.packb(_tmio_object([[1, "a", 2]]))
+    assert decode(buffer)[0] == [_tmio_object([[1, "a", 2]])]
+
+
+def test_columns_reach_bandwidth_as_arrays():
+    args = parse_args(["ftio", MSGPACK])
+    with open(MSGPACK, "rb") as f:
+        reference = _reference(f.read())
+    for data in (extract(MSGPACK), read_stream(MSGPACK)):
+        bandwidth = Simrun(data, "msgpack", MSGPACK, args).write_sync.bandwidth
+        expected = Simrun(reference, "msgpack", MSGPACK, args).write_sync.bandwidth
+        for field in ["b_overlap_avr", "t_overlap", "b_rank_avr", "t_rank_s", "t_rank_e"]:
+            assert isinstance(getattr(bandwidth, field), np.ndarray)
+            np.testing.assert_allclose(
+                getattr(bandwidth, field), getattr(expected, field)
+            )
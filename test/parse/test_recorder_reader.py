@@ -0,0 +1,95 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import itertools
+from argparse import Namespace
+
+import numpy as np
+import pytest
+
+from ftio.parse.args import parse_args
+from ftio.parse.recorder_reader import extract, parse_line, parse_rank_file
+from ftio.parse.simrun import Simrun
+
+"""
+Tests for ftio/parse/recorder_reader.py
+"""
+
+LINES = [
+    "0.100000 0.200000 0 write ( 3 0x7ffd 4096 )",
+    "0.150000 0.160000 1 lseek ( 3 0 0 )",
+    "0.300000 0.500000 0 read ( 3 0x7ffd 1024 )",
+    "0.600000 0.600000 0 write ( 3 0x7ffd 10 )",
+    "0.700000 0.800000 0 MPI_File_write_at ( 0x1 0 0x7f 1024 MPI_BYTE )",
+]
+
+
+def _folder(tmp_path, ranks: int = 3):
+    folder = tmp_path / "trace_text"
+    folder.mkdir()
+    for rank in range(ranks):
+        (folder / f"{rank}.txt").write_text("\n".join(LINES) + "\n")
+    return str(folder)
+
+
+def test_scan_matches_line_parser(tmp_path):
+    # numbers the kernel converts exactly and formats converted by parse_line
+    times = ["0.5", "-3.5e-2", "12345678901234567", "1e30", "007.1", "1.", ".5", "nan"]
+    sizes = ["4096", "007", "+12", "99999999999999999999"]
+    calls = ["write", "read", "pwrite_x"]
+    lines = [
+        f"{t_s} {t_e} 0 {call} ( 3 0x7f {size} )"
+        for t_s, t_e, call, size in itertools.product(times, times[:3], calls, sizes)
+    ]
+    file = tmp_path / "0.txt"
+    file.write_text("\n".join(lines))
+    out = parse_rank_file(str(file))
+    expected = [
+        (*parse_line(line), "write" in line)
+        for line in lines
+        if " write " in line + "\n" or " read " in line + "\n"
+    ]
+    got = list(zip(out["t_s"], out["t_e"], out["bytes"], out["write"], strict=True))
+    np.testing.assert_array_equal(np.array(got, dtype=float), np.array(expected, float))
+
+
+def test_invalid_line_raises(tmp_path):
+    file = tmp_path / "0.txt"
+    file.write_text("0.1 0.2 0 write ( 3 0x7f abc )\n")
+    with pytest.raises(ValueError):
+        parse_rank_file(str(file))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_extract(tmp_path, jobs):
+    data, ranks = extract(_folder(tmp_path), Namespace(jobs=jobs, ind=False))
+    assert ranks == 3
+    assert data["io_time"] == {}
+    write = data["write_sync"]["bandwidth"]
+    read = data["read_sync"]["bandwidth"]
+    np.testing.assert_allclose(write["t_rank_s"], [0.1, 0.6] * 3)
+    np.testing.assert_allclose(write["b_rank_avr"], [4096 / 0.1, 0] * 3)
+    np.testing.assert_allclose(read["t_rank_e"], [0.5] * 3)
+    assert "b_ind" not in write
+
+
+def test_ind_overlap(tmp_path):
+    folder = _folder(tmp_path, ranks=2)
+    args = parse_args(["ftio", folder, "--ind"])
+    data, ranks = extract(folder, args)
+    np.testing.assert_array_equal(
+        data["write_sync"]["bandwidth"]["t_ind_s"],
+        data["write_sync"]["bandwidth"]["t_rank_s"],
+    )
+    bandwidth = Simrun(data, "recorder", str(ranks), args).write_sync.bandwidth
+    assert isinstance(bandwidth.b_overlap_ind, np.ndarray)
+    # the two ranks write concurrently
+    assert bandwidth.app_ind == pytest.approx(2 * 4096 / 0.1)
@@ -0,0 +1,134 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+
+from ftio.parse.args import parse_args
+from ftio.parse.msgpack_reader import extract
+from ftio.parse.simrun import Simrun
+from ftio.parse.stream_reader import FileTail, GrowableArray, read_stream
+
+"""
+Tests for ftio/parse/stream_reader.py
+"""
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "../../examples/tmio")
+JSONL = os.path.join(EXAMPLES, "JSONL/8.jsonl")
+MSGPACK = os.path.join(EXAMPLES, "ior/parallel/384.msgpack")
+
+
+def _record(t0: float, n: int = 3) -> dict:
+    t = [t0 + i for i in range(n)]
+    return {
+        "write_sync": {
+            "total_bytes": 10,
+            "max_bytes_per_rank": 5,
+            "number_of_ranks": 2,
+            "bandwidth": {
+                "arithmetic_mean": 2.0,
+                "median": 1.0,
+                "b_rank_avr": [1.0] * n,
+                "b_rank_sum": [2.0] * n,
+                "t_rank_s": t,
+                "t_rank_e": [x + 0.5 for x in t],
+            },
+        }
+    }
+
+
+def _assert_same_bandwidth(file, ext, old_data):
+    args = parse_args(["ftio", file])
+    expected = Simrun(old_data, ext, file, args).write_sync.bandwidth
+    streamed = Simrun(read_stream(file), ext, file, args).write_sync.bandwidth
+    for field in ["b_overlap_avr", "t_overlap", "b_rank_avr", "t_rank_s", "t_rank_e"]:
+        np.testing.assert_allclose(getattr(streamed, field), getattr(expected, field))
+
+
+def test_growable_array():
+    arr = GrowableArray(2)
+    for i in range(10):
+        arr.extend([i, i])
+    view = arr.array
+    arr.extend(np.arange(100))
+    assert len(arr) == 120
+    np.testing.assert_array_equal(view, np.repeat(np.arange(10), 2))
+
+
+def test_jsonl_matches_list_parsing():
+    with open(JSONL) as f:
+        old_data = [json.loads(line) for line in f if line.strip()]
+    _assert_same_bandwidth(JSONL, "jsonl", old_data)
+
+
+def test_msgpack_matches_list_parsing():
+    _assert_same_bandwidth(MSGPACK, "msgpack", extract(MSGPACK))
+
+
+def test_merge_rules(tmp_path):
+    file = tmp_path / "2.jsonl"
+    file.write_text("\n".join(json.dumps(_record(i * 3)) for i in range(3)) + "\n")
+    merged = read_stream(str(file))[0]["write_sync"]
+    assert merged["total_bytes"] == 30
+    assert merged["number_of_ranks"] == 2
+    assert merged["bandwidth"]["arithmetic_mean"] == 2.0
+    assert "median" not in merged["bandwidth"]
+    np.testing.assert_array_equal(merged["bandwidth"]["t_rank_s"], np.arange(9))
+
+
+def test_tail_reads_appended_records(tmp_path):
+    file = tmp_path / "2.jsonl"
+    file.write_text(json.dumps(_record(0)) + "\n")
+    tail = FileTail(str(file))
+    assert tail.read() == 1
+    offset = tail.offset
+
+    # incomplete line: only the complete record is read
+    line = json.dumps(_record(3))
+    with open(file, "a") as f:
+        f.write(line + "\n" + line[:20])
+    assert tail.read() == 1
+    assert tail.offset > offset
+    with open(file, "a") as f:
+        f.write(line[20:] + "\n")
+    assert tail.read() == 1
+    assert tail.read() == 0
+    bandwidth = tail.data()[0]["write_sync"]["bandwidth"]
+    np.testing.assert_array_equal(bandwidth["t_rank_s"], [0, 1, 2, 3, 4, 5, 3, 4, 5])
+
+    # the simrun does not change the records read so far
+    tail.to_simrun(parse_args(["ftio", str(file)]))
+    copy = pickle.loads(pickle.dumps(tail))
+    assert len(copy.data()[0]["write_sync"]["bandwidth"]["t_rank_s"]) == 9
+
+    # truncated file is read again
+    file.write_text(json.dumps(_record(10)) + "\n")
+    assert tail.read() == 1
+    bandwidth = tail.data()[0]["write_sync"]["bandwidth"]
+    assert bandwidth["t_rank_s"] == [10, 11, 12]
+
+
+def test_tail_msgpack(tmp_path):
+    file = tmp_path / "1.msgpack"
+    with open(MSGPACK, "rb") as f:
+        content = f.read()
+    # the first part ends inside a record
+    half = len(content) // 2
+    file.write_bytes(content[:half])
+    tail = FileTail(str(file), chunk_size=64)
+    n = tail.read()
+    with open(file, "ab") as f:
+        f.write(content[half:])
+    n += tail.read()
+    assert n == len(extract(MSGPACK))
@@ -13,6 +13,7 @@ import multiprocessing as mp
 
 import pytest
 
+from ftio.parse.args import parse_args
 from ftio.prediction.shared_resources import SharedResources
 
 mp.set_start_method("spawn", force=True)
@@ -62,5 +63,16 @@ def test_shared_resources_update():
     sr.shutdown()
 
 
+def test_shared_resources_app_max_capacity():
+    args = parse_args(["predictor", "file.jsonl", "--app_max_capacity", "4"])
+    sr = SharedResources(app_max_capacity=args.app_max_capacity)
+
+    sr.app_buffer.append(range(6), range(6))
+    b, _ = sr.app_buffer.snapshot()
+    assert list(b) == [2, 3, 4, 5]
+
+    sr.shutdown()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,164 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import multiprocessing as mp
+import pickle
+
+import numpy as np
+import pytest
+
+from ftio.freq.helper import append_messages
+from ftio.multiprocessing.shared_ring_buffer import SharedRingBuffer
+from ftio.prediction.shared_resources import SharedResources
+
+"""
+Tests for class ftio/multiprocessing/shared_ring_buffer.py
+"""
+
+
+def _append_in_child(buffer, start):
+    buffer.append(np.arange(start, start + 100), np.arange(start, start + 100) * 10)
+
+
+def test_append_and_snapshot():
+    buffer = SharedRingBuffer(capacity=4)
+    buffer.append([1, 2, 3], [10, 20, 30])
+    b, t = buffer.snapshot()
+    np.testing.assert_array_equal(b, [1, 2, 3])
+    np.testing.assert_array_equal(t, [10, 20, 30])
+    assert not b.flags.writeable
+    # grows beyond the initial capacity
+    buffer.append(np.arange(4, 10), np.arange(40, 100, 10))
+    b, _ = buffer.snapshot()
+    np.testing.assert_array_equal(b, np.arange(1, 10))
+    assert buffer.capacity >= 9
+    np.testing.assert_array_equal(buffer.snapshot(2)[0], [8, 9])
+    buffer.close()
+
+
+def test_eviction():
+    buffer = SharedRingBuffer(capacity=4, max_capacity=4)
+    buffer.append(range(7), range(7))
+    np.testing.assert_array_equal(buffer.snapshot()[0], [3, 4, 5, 6])
+    buffer.append([7, 8], [7, 8])
+    b, t = buffer.snapshot()
+    # the mirrored layout keeps the wrapped window contiguous
+    np.testing.assert_array_equal(b, [5, 6, 7, 8])
+    assert np.shares_memory(b, buffer._data)
+    assert len(buffer) == 4 and buffer.total_appended == 9
+    buffer.close()
+
+
+def test_discard_drops_oldest_items():
+    buffer = SharedRingBuffer(capacity=4)
+    buffer.append(range(4), range(4))
+    buffer.discard(3)
+    np.testing.assert_array_equal(buffer.snapshot()[0], [3])
+    # the discarded items no longer count towards the capacity
+    buffer.append([4, 5, 6], [4, 5, 6])
+    assert buffer.capacity == 4
+    np.testing.assert_array_equal(buffer.snapshot()[0], [3, 4, 5, 6])
+    buffer.discard(10)
+    assert len(buffer) == 0 and buffer.total_appended == 7
+    buffer.close()
+
+
+def test_growth_in_other_process():
+    buffer = SharedRingBuffer(capacity=8)
+    buffer.append([0.5], [0.5])
+    ctx = mp.get_context("spawn")
+    proc = ctx.Process(target=_append_in_child, args=(buffer, 1))
+    proc.start()
+    proc.join()
+    assert proc.exitcode == 0
+    b, t = buffer.snapshot()
+    assert len(b) == 101
+    np.testing.assert_array_equal(t[1:], np.arange(1, 101) * 10)
+    reader = pickle.loads(pickle.dumps(buffer))
+    np.testing.assert_array_equal(reader.snapshot()[0], b)
+    reader.close()
+    buffer.close()
+
+
+def test_update_replaces_newest_items():
+    buffer = SharedRingBuffer(capacity=4)
+    buffer.append([1, 2, 3], [10, 20, 30])
+
+    def replace(b, t):
+        assert not b.flags.writeable
+        return 1, (np.array([5, 6, 7, 8]), np.array([50, 60, 70, 80]))
+
+    buffer.update(replace)
+    b, t = buffer.snapshot()
+    np.testing.assert_array_equal(b, [1, 5, 6, 7, 8])
+    np.testing.assert_array_equal(t, [10, 50, 60, 70, 80])
+    del b, t
+    buffer.close()
+    # with eviction, only the newest items are kept
+    buffer = SharedRingBuffer(capacity=4, max_capacity=4)
+    buffer.append(range(6), range(6))
+    buffer.update(lambda b, t: (3, (np.array([9.0, 9.5]), np.array([9.0, 9.5]))))
+    # [2, 3, 4, 5] -> [2, 3, 4, 9, 9.5], the oldest item is evicted
+    np.testing.assert_array_equal(buffer.snapshot()[0], [3, 4, 9, 9.5])
+    buffer.close()
+
+
+def _rewrite_in_child(buffer, kept, size, rounds):
+    for version in range(1, rounds + 1):
+        values = np.full(size, float(version))
+        buffer.update(lambda b, t, v=values: (kept, (v, v)))
+
+
+def test_snapshot_during_update_in_other_process():
+    kept, size = 10, 200_000
+    buffer = SharedRingBuffer(capacity=kept + size)
+    initial = np.concatenate((np.arange(kept), np.zeros(size)))
+    buffer.append(initial, initial)
+    ctx = mp.get_context("spawn")
+    proc = ctx.Process(target=_rewrite_in_child, args=(buffer, kept, size, 200))
+    proc.start()
+    snapshots = 0
+    while proc.is_alive() or snapshots == 0:
+        b, t = buffer.snapshot(copy=True)
+        # never a cut-off series or a half rewritten suffix
+        assert len(b) == kept + size
+        np.testing.assert_array_equal(b[:kept], np.arange(kept))
+        assert b[kept] == b[-1] and np.array_equal(b, t)
+        snapshots += 1
+    proc.join()
+    assert proc.exitcode == 0
+    assert buffer.snapshot()[0][-1] == 200
+    buffer.close()
+
+
+def test_append_messages_uses_buffer():
+    sr = SharedResources(app_capacity=4)
+    data = [{"bandwidth": np.array([1.0, 2.0]), "time": np.array([0.0, 1.0])}]
+    append_messages(data, sr)
+    data = [{"bandwidth": np.array([3.0, 4.0, 5.0]), "time": np.array([2.0, 3.0, 4.0])}]
+    data = append_messages(data, sr)
+    np.testing.assert_array_equal(data[0]["bandwidth"], [1, 2, 3, 4, 5])
+    np.testing.assert_array_equal(data[0]["time"], [0, 1, 2, 3, 4])
+    sr.shutdown()
+
+
+def test_append_messages_survives_eviction():
+    sr = SharedResources(app_capacity=4, app_max_capacity=4)
+    data = [{"bandwidth": np.arange(4.0), "time": np.arange(4.0)}]
+    data = append_messages(data, sr)
+    # another prediction evicts the items while this one still uses them
+    sr.app_buffer.append(np.full(4, -1.0), np.full(4, -1.0))
+    np.testing.assert_array_equal(data[0]["bandwidth"], [0, 1, 2, 3])
+    sr.shutdown()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import threading
+import time
+
+import pytest
+
+import ftio.prediction.monitor as pm
+from ftio.prediction.watcher import FileWatcher
+
+"""
+Tests for ftio/prediction/watcher.py and the monitor functions using it
+"""
+
+BACKENDS = ["auto", "poll"]
+
+
+def _append(path, data: bytes, delay: float = 0.0):
+    time.sleep(delay)
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_reports_appended_range(tmp_path, backend):
+    path = tmp_path / "trace.jsonl"
+    path.write_bytes(b"0123456789")
+    with FileWatcher([str(path)], backend=backend) as w:
+        assert w.wait(timeout=0.2) == []
+        _append(path, b"abcde")
+        changes = w.wait(timeout=2)
+    assert len(changes) == 1
+    assert (changes[0].start, changes[0].end, changes[0].truncated) == (10, 15, False)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_coalesces_bursts(tmp_path, backend):
+    path = tmp_path / "trace.jsonl"
+    path.write_bytes(b"")
+    with FileWatcher([str(path)], backend=backend, debounce=0.3) as w:
+        writer = threading.Thread(
+            target=lambda: [_append(path, b"x" * 10, 0.05) for _ in range(5)]
+        )
+        writer.start()
+        changes = w.wait(timeout=2)
+        writer.join()
+    assert len(changes) == 1
+    assert (changes[0].start, changes[0].end) == (0, 50)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_truncation_and_other_files(tmp_path, backend):
+    path = tmp_path / "trace.jsonl"
+    other = tmp_path / "other.jsonl"
+    path.write_bytes(b"0123456789")
+    with FileWatcher([str(path)], backend=backend) as w:
+        other.write_bytes(b"ignored")
+        assert w.wait(timeout=0.3) == []
+        path.write_bytes(b"abc")
+        changes = w.wait(timeout=2)
+    assert (changes[0].start, changes[0].end, changes[0].truncated) == (0, 3, True)
+
+
+def test_monitor_stat_returns_on_change(tmp_path):
+    path = str(tmp_path / "trace.jsonl")
+    _append(path, b"first\n")
+    stamp, _ = pm.monitor_stat(path, "", [])
+    writer = threading.Thread(target=_append, args=(path, b"second\n", 0.2))
+    writer.start()
+    tik = time.time()
+    new_stamp, _ = pm.monitor_stat(path, stamp, [])
+    writer.join()
+    assert new_stamp != stamp
+    assert time.time() - tik < pm.WAIT_TIMEOUT + 1
+
+
+def test_monitor_list_waits_for_n_buffers(tmp_path):
+    paths = [str(tmp_path / f"rank_{i}.msgpack") for i in range(50)]
+    for path in paths:
+        _append(path, b"\x00")
+    stamps, _ = pm.monitor_list(paths, 2)
+    stamps = dict(stamps)
+    writer = threading.Thread(
+        target=lambda: [_append(p, b"\x01", 0.1) for p in (paths[3], paths[42])]
+    )
+    writer.start()
+    new_stamps, _ = pm.monitor_list(paths, 2, dict(stamps), [])
+    writer.join()
+    changed = [p for p in paths if new_stamps[p] != stamps[p]]
+    assert changed == [paths[3], paths[42]]
@@ -0,0 +1,141 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+from ftio.prediction.worker_pool import PredictionWorkerPool
+
+"""
+Tests for class ftio/prediction/worker_pool.py
+"""
+
+ARGS = ["ftio", "-e", "no"]
+
+
+def _slow_prediction(shared_resources, args, msgs):
+    time.sleep(0.2)
+
+
+def _failing_prediction(shared_resources, args, msgs):
+    raise RuntimeError("boom")
+
+
+def _wait(pool, n, timeout=60):
+    tik = time.time()
+    while pool.completed < n and time.time() - tik < timeout:
+        pool.poll()
+        time.sleep(0.05)
+
+
+def test_unknown_backpressure():
+    with pytest.raises(ValueError):
+        PredictionWorkerPool(_slow_prediction, None, ARGS, backpressure="unknown")
+
+
+def test_all_batches_processed():
+    pool = PredictionWorkerPool(_slow_prediction, None, ARGS, workers=2, queue_depth=8)
+    for i in range(4):
+        pool.submit([i])
+    _wait(pool, 4)
+    pool.shutdown(timeout=10)
+    assert pool.completed == 4
+    assert pool.dropped == 0 and pool.coalesced == 0
+    assert len(pool.warmup) == 2
+    assert all(len(pool.latency[stage]) == 4 for stage in pool.latency)
+    assert "4 predictions" in pool.stats()
+
+
+def test_coalesce_when_full():
+    pool = PredictionWorkerPool(
+        _slow_prediction, None, ARGS, workers=1, queue_depth=1, backpressure="coalesce"
+    )
+    for i in range(5):
+        pool.submit([i])
+    pool.shutdown(timeout=30)
+    assert pool.coalesced > 0
+    assert pool.dropped == 0
+    assert pool.completed + pool.coalesced == 5
+
+
+def test_drop_when_full():
+    pool = PredictionWorkerPool(
+        _slow_prediction, None, ARGS, workers=1, queue_depth=1, backpressure="drop"
+    )
+    for i in range(5):
+        pool.submit([i])
+    pool.shutdown(timeout=30)
+    assert pool.dropped > 0
+    assert pool.completed + pool.dropped == 5
+
+
+def test_failed_prediction_is_reported():
+    pool = PredictionWorkerPool(_failing_prediction, None, ARGS, workers=1)
+    pool.submit([0])
+    pool.shutdown(timeout=30)
+    assert pool.completed == 1
+
+
+def _stuck_prediction(shared_resources, args, msgs):
+    time.sleep(600)
+
+
+def test_shutdown_terminates_stuck_workers():
+    pool = PredictionWorkerPool(
+        _stuck_prediction, None, ARGS, workers=1, queue_depth=1, backpressure="drop"
+    )
+    for i in range(3):
+        pool.submit([i])
+    tik = time.time()
+    pool.shutdown(timeout=1)
+    assert time.time() - tik < 30
+    assert not any(proc.is_alive() for proc in pool.procs)
+
+
+def _exiting_prediction(shared_resources, args, msgs):
+    sys.exit()
+
+
+def test_exit_in_prediction_keeps_worker():
+    pool = PredictionWorkerPool(
+        _exiting_prediction, None, ARGS, workers=1, queue_depth=1, backpressure="block"
+    )
+    pid = pool.procs[0].pid
+    for i in range(3):
+        pool.submit([i])
+    _wait(pool, 3)
+    assert pool.completed == 3
+    assert pool.procs[0].pid == pid and pool.procs[0].is_alive()
+    pool.shutdown(timeout=10)
+    assert pool.restarted == 0
+
+
+def _killed_prediction(shared_resources, args, msgs):
+    os._exit(1)
+
+
+def test_dead_workers_are_restarted():
+    pool = PredictionWorkerPool(
+        _killed_prediction, None, ARGS, workers=1, queue_depth=1, backpressure="block"
+    )
+    # without restarts, the blocking submit would wait forever once the worker died
+    for i in range(3):
+        pool.submit([i])
+    tik = time.time()
+    while pool.restarted < 2 and time.time() - tik < 60:
+        pool.poll()
+        time.sleep(0.05)
+    assert pool.restarted >= 2
+    pool.shutdown(timeout=10)
+    assert not any(proc.is_alive() for proc in pool.procs)
@@ -0,0 +1,122 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import threading
+import time
+
+import msgpack
+import pytest
+import zmq
+import zmq.asyncio
+
+from ftio.parse.args import parse_args
+from ftio.parse.zmq_reader import extract
+from ftio.prediction.processes_zmq import receive_messages
+from ftio.prediction.zmq_ingest import ZmqIngest, join_frames
+
+"""
+Tests for ftio/prediction/zmq_ingest.py and the ZMQ receive functions
+"""
+
+
+@pytest.fixture
+def ingest_and_sender():
+    def make(window):
+        socket = zmq.asyncio.Context().socket(zmq.PULL)
+        port = socket.bind_to_random_port("tcp://127.0.0.1")
+        sender = zmq.Context().socket(zmq.PUSH)
+        sender.connect(f"tcp://127.0.0.1:{port}")
+        made.append((ZmqIngest(socket, window), sender))
+        return made[-1]
+
+    made = []
+    yield make
+    for ingest, sender in made:
+        ingest.close()
+        sender.close(linger=0)
+
+
+def _send(sender, msgs, delay=0.0):
+    time.sleep(delay)
+    for msg in msgs:
+        sender.send(msg)
+
+
+def test_join_frames():
+    assert join_frames([b"ab", bytearray(b"c"), memoryview(b"de")]) == b"abcde"
+    assert join_frames([]) == b""
+
+
+def test_batch_is_one_contiguous_buffer(ingest_and_sender):
+    ingest, sender = ingest_and_sender(100)
+    msgs = [msgpack.packb({"rank": i, "b": [i] * 10}) for i in range(1000)]
+    _send(sender, msgs)
+    batch, n = ingest.receive(timeout=5)
+    while n < len(msgs):
+        more, m = ingest.receive(timeout=5)
+        batch, n = [batch[0] + more[0]], n + m
+    assert len(batch) == 1
+    assert batch[0] == b"".join(msgs)
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(batch[0])
+    assert [x["rank"] for x in unpacker] == list(range(1000))
+
+
+def test_window_closes_batch(ingest_and_sender):
+    ingest, sender = ingest_and_sender(50)
+    writer = threading.Thread(target=_send, args=(sender, [b"\xc0"], 0.4))
+    sender.send(b"\x01")
+    writer.start()
+    tik = time.time()
+    first, n_first = ingest.receive(timeout=5)
+    latency = time.time() - tik
+    second, n_second = ingest.receive(timeout=5)
+    writer.join()
+    assert (first, n_first) == ([bytearray(b"\x01")], 1)
+    assert (second, n_second) == ([bytearray(b"\xc0")], 1)
+    assert latency < 0.3
+
+
+def test_timeout(ingest_and_sender):
+    ingest, _ = ingest_and_sender(50)
+    assert ingest.receive(timeout=0.1) == ([], 0)
+
+
+def test_receive_messages_drains_all():
+    context = zmq.Context()
+    socket = context.socket(zmq.PULL)
+    port = socket.bind_to_random_port("tcp://127.0.0.1")
+    sender = context.socket(zmq.PUSH)
+    sender.connect(f"tcp://127.0.0.1:{port}")
+    poller = zmq.Poller()
+    poller.register(socket, zmq.POLLIN)
+    _send(sender, [bytes([i]) for i in range(100)])
+    msgs, ranks = receive_messages(socket, poller, window=100)
+    assert ranks == 100
+    assert msgs == [bytes([i]) for i in range(100)]
+    sender.close(linger=0)
+    socket.close(linger=0)
+
+
+def test_direct_extract_uses_last_message():
+    args = parse_args(["--zmq"], "ftio")
+    msgs = [
+        msgpack.packb({"b": [i], "ts": [i], "te": [i + 1], "ranks": i}) for i in (1, 2)
+    ]
+    data, ranks = extract(b"".join(msgs), args)
+    assert ranks == 2
+    assert data[args.mode]["bandwidth"]["b_rank_avr"] == [2]
+
+
+def test_direct_extract_empty_batch():
+    args = parse_args(["--zmq"], "ftio")
+    with pytest.raises(ValueError, match="no msgpack message"):
+        extract(b"", args)
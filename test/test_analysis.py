@@ -238,6 +238,32 @@ class TestCorrelation:
         assert len(corrs) == 4
         assert np.allclose(corrs, 1.0)
 
+    @pytest.mark.parametrize("window_size", [2, 7, 50])
+    def test_sliding_correlation_matches_exact(self, window_size):
+        """Test the O(N) sliding correlation against the per-window evaluation."""
+        rng = np.random.default_rng(window_size)
+        x = 1e6 + rng.normal(size=500)
+        y = 0.5 * x + rng.normal(size=500)
+        x[100:150] = 3.0  # constant part
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = sliding_correlation(x, y, window_size, exact=True)
+        corrs = sliding_correlation(x, y, window_size)
+
+        assert len(corrs) == len(expected)
+        assert np.allclose(corrs, np.nan_to_num(expected), atol=1e-8)
+
+    def test_sliding_correlation_spearman_monotonic(self):
+        """Test that the rank-based approximation detects monotonic relations."""
+        x = np.linspace(0, 5, 100)
+        y = np.exp(x)
+
+        pearson = sliding_correlation(x, y, 80)
+        spearman = sliding_correlation(x, y, 80, method="spearman")
+
+        assert np.all(pearson < 1 - 1e-3)
+        assert np.allclose(spearman, 1.0)
+
 
 class TestExtractCorrelationRanges:
     """Tests for extract_correlation_ranges function."""
@@ -450,6 +476,23 @@ class TestAnomalyDetection:
 
         assert isinstance(dominant_index, list)
 
+    @pytest.mark.parametrize("method", ["z-score", "peak", "dbscan", "lof"])
+    def test_outlier_detection_half_spectrum(
+        self, mock_args, periodic_signal_data, method
+    ):
+        """Test that the rfft half spectrum gives the same result as the full spectrum."""
+        amp, freq_arr = periodic_signal_data
+        mock_args.outlier = method
+        n = len(amp)
+
+        full_index, full_conf, _ = outlier_detection(amp, freq_arr, mock_args)
+        half_index, half_conf, _ = outlier_detection(
+            amp[: n // 2 + 1], freq_arr[: n // 2 + 1], mock_args, n
+        )
+
+        assert list(full_index) == list(half_index)
+        np.testing.assert_allclose(full_conf, half_conf)
+
     def test_outlier_detection_unsupported_method(self, mock_args, periodic_signal_data):
         """Test outlier_detection with unsupported method raises error."""
         amp, freq_arr = periodic_signal_data
@@ -682,6 +725,37 @@ class TestPeriodicityAnalysis:
 
         assert result is not None
 
+    @pytest.mark.parametrize("start_time,phi", [(0.0, 0.0), (12.3, -2.0), (0.4, 2.5)])
+    def test_period_segments(self, start_time, phi):
+        """Test that the periods cover the signal and are one period long."""
+        from ftio.analysis.periodicity_analysis import period_segments
+
+        index, begin, end = period_segments(0.5, 10.0, 95, phi, start_time)
+
+        assert begin[0] == 0
+        assert end[-1] == 95
+        assert np.all(np.diff(index) == 1)
+        assert np.all(end[1:-1] - begin[1:-1] == 20)
+        assert np.all(begin[1:] == end[:-1])
+
+    def test_segment_correlations_match_correlation(self):
+        """Test the segment reduction against one correlation call per period."""
+        from ftio.analysis.periodicity_analysis import segment_correlations
+
+        rng = np.random.default_rng(0)
+        x = np.cos(np.arange(200) / 3)
+        y = 1e9 + rng.normal(size=200)
+        y[50:90] = 1e9  # constant periods
+        begin = np.array([0, 7, 30, 60, 120, 199])
+        end = np.array([7, 30, 60, 120, 199, 200])
+
+        corrs = segment_correlations(x, y, begin, end)
+        expected = [correlation(x[b:e], y[b:e]) for b, e in zip(begin, end, strict=True)]
+
+        assert np.allclose(corrs, expected, atol=1e-9)
+        assert corrs[3] != 0
+        assert corrs[-1] == 0
+
 
 class TestCorrelationPlotAndRanges:
     """Additional tests for _correlation.py to improve coverage."""
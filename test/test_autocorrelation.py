@@ -0,0 +1,36 @@
+"""
+Tests for the FFT-based autocorrelation.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import numpy as np
+import pytest
+
+from ftio.freq.autocorrelation import autocorrelation
+
+
+def _direct(arr):
+    ndata = arr - np.mean(arr)
+    acorr = np.correlate(ndata, ndata, "full")[len(ndata) - 1 :]
+    return acorr / np.var(arr) / len(ndata)
+
+
+@pytest.mark.parametrize("n", [2, 7, 100, 1001])
+def test_autocorrelation_matches_direct(n):
+    rng = np.random.default_rng(n)
+    arr = 5 * (np.arange(n) % 10 < 3) + rng.uniform(0, 1, n)
+    reference = _direct(arr)
+    np.testing.assert_allclose(autocorrelation(arr), reference, atol=1e-12)
+    np.testing.assert_allclose(autocorrelation(arr, 5), reference[:6], atol=1e-12)
+    spectrum = np.fft.rfft(arr, 2 * n)
+    np.testing.assert_allclose(
+        autocorrelation(arr, None, spectrum), reference, atol=1e-12
+    )
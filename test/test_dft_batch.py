@@ -0,0 +1,100 @@
+"""
+Tests for the batch DFT workflow.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import numpy as np
+import pytest
+
+from ftio.cli.ftio_core import core
+from ftio.freq._dft_batch import batch_supported, ftio_dft_batch
+from ftio.parse.args import parse_args
+from ftio.prediction.tasks import ftio_metric_batch, ftio_metric_task_save
+
+
+def _signals(n_signals=12, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(0, 100, 0.5)
+    signals = []
+    for k in range(n_signals):
+        period = rng.uniform(2, 20)
+        b = (np.sin(2 * np.pi * t / period) > 0.3) * rng.uniform(1, 10)
+        signals.append(b + rng.normal(0, 0.1 * (k % 3), len(t)))
+    # not periodic
+    signals.append(rng.normal(size=len(t)))
+    return np.array(signals), t
+
+
+def _assert_same(prediction, reference):
+    np.testing.assert_allclose(prediction.dominant_freq, reference.dominant_freq)
+    np.testing.assert_allclose(prediction.conf, reference.conf, rtol=1e-9)
+    np.testing.assert_allclose(prediction.amp, reference.amp, rtol=1e-9)
+    assert prediction.freq == reference.freq
+    assert prediction.n_samples == reference.n_samples
+    assert prediction.t_start == reference.t_start
+    assert prediction.t_end == reference.t_end
+    for key, value in reference.top_freqs.items():
+        np.testing.assert_allclose(prediction.top_freqs[key], value, rtol=1e-7, atol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["-e", "no"],
+        ["-e", "no", "-n", "5"],
+        ["-e", "no", "--no-psd"],
+        ["-e", "no", "-f", "3"],
+        ["-e", "no", "-o", "peak"],
+    ],
+)
+def test_batch_matches_core(argv):
+    signals, t = _signals()
+    predictions = ftio_dft_batch(parse_args(argv, "ftio"), signals, t)
+    assert len(predictions) == len(signals)
+    for b, prediction in zip(signals, predictions, strict=True):
+        data = {"bandwidth": b, "time": t, "total_bytes": 0, "ranks": 1}
+        reference, _ = core(data, parse_args(argv, "ftio"))
+        _assert_same(prediction, reference)
+
+
+def test_batch_pairs_with_different_time_bases():
+    signals, t = _signals(4)
+    pairs = [(b, t + 3 * i) for i, b in enumerate(signals)]
+    pairs.append((np.array([1.0]), np.array([0.0])))
+    args = parse_args(["-e", "no"], "ftio")
+    predictions = ftio_dft_batch(args, pairs)
+    assert predictions[-1] is None
+    for (b, time_b), prediction in zip(pairs[:-1], predictions[:-1], strict=True):
+        data = {"bandwidth": b, "time": time_b, "total_bytes": 0, "ranks": 1}
+        reference, _ = core(data, parse_args(["-e", "no"], "ftio"))
+        _assert_same(prediction, reference)
+
+
+def test_metric_batch_matches_task():
+    signals, t = _signals(5)
+    metrics = {f"metric_{i}": np.array([b, t]) for i, b in enumerate(signals)}
+    argv = ["-e", "no", "-n", "3"]
+    data = ftio_metric_batch(metrics, argv, ranks=4)
+    expected = []
+    for metric, arrays in metrics.items():
+        ftio_metric_task_save(expected, metric, arrays, argv, 4)
+    assert [d["metric"] for d in data] == [d["metric"] for d in expected]
+    for d, e in zip(data, expected, strict=True):
+        assert d["ranks"] == e["ranks"]
+        assert len(d["wave_names"]) == len(e["wave_names"])
+        np.testing.assert_allclose(d["top_freq"]["freq"], e["top_freq"]["freq"])
+        np.testing.assert_allclose(d["dominant_freq"], e["dominant_freq"])
+
+
+def test_batch_supported():
+    assert batch_supported(parse_args(["-e", "no"], "ftio"))
+    assert not batch_supported(parse_args(["-e", "no", "-au"], "ftio"))
+    assert not batch_supported(parse_args(["-e", "no", "-o", "dbscan"], "ftio"))
@@ -0,0 +1,61 @@
+"""
+Tests for the discretization backends.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import numpy as np
+import pytest
+
+from ftio.freq.discretize import _sample_fast, _sample_loop, sample_data
+from ftio.parse.args import parse_args
+
+
+def _step_function(n_steps, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.cumsum(rng.uniform(0.01, 1.0, n_steps))
+    b = rng.uniform(0, 1e9, n_steps)
+    return b, t
+
+
+@pytest.mark.parametrize("freq", [0.7, 10, 123.4])
+def test_fast_matches_loop(freq):
+    b, t = _step_function(200)
+    N = int(np.floor((t[-1] - t[0]) * freq))
+    np.testing.assert_array_equal(
+        _sample_fast(b, t, freq, N), _sample_loop(b, t, freq, N)
+    )
+
+
+def test_fast_matches_loop_across_chunks():
+    b, t = _step_function(50, seed=1)
+    N = int(np.floor((t[-1] - t[0]) * 20))
+    np.testing.assert_array_equal(
+        _sample_fast(b, t, 20, N, chunk_size=7), _sample_loop(b, t, 20, N)
+    )
+
+
+def test_fast_matches_loop_duplicates_and_unsorted():
+    t = np.array([0.0, 1.0, 1.0, 2.0, 1.5, 3.0, 4.0])
+    b = np.arange(len(t), dtype=float)
+    N = 40
+    np.testing.assert_array_equal(_sample_fast(b, t, 10, N), _sample_loop(b, t, 10, N))
+
+
+def test_sample_data_backends_and_buffer():
+    b, t = _step_function(100, seed=2)
+    args = parse_args(["-e", "no", "-f", "5", "--discretization", "loop"], "ftio")
+    b_loop, f_loop = sample_data(b, t, args)
+    args.discretization = "fast"
+    out = np.empty(len(b_loop) + 3)
+    b_fast, f_fast = sample_data(b, t, args, out=out)
+    assert f_loop == f_fast
+    np.testing.assert_array_equal(b_fast, b_loop)
+    assert np.shares_memory(b_fast, out)
@@ -0,0 +1,72 @@
+"""
+Tests for the compiled DTW engine.
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import numpy as np
+import pytest
+
+from ftio.freq.dtw import (
+    band_width,
+    component_signals,
+    dtw_batch,
+    dtw_components,
+    dtw_distance,
+)
+
+
+def _full_matrix(s1, s2, window=-1):
+    """Reference DTW with the full cost matrix."""
+    n, m = len(s1), len(s2)
+    window = max(n, m) if window < 0 else window
+    cost = np.full((n + 1, m + 1), np.inf)
+    cost[0, 0] = 0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            if abs(i - j) > window:
+                continue
+            cost[i, j] = abs(s1[i - 1] - s2[j - 1]) + min(
+                cost[i - 1, j], cost[i, j - 1], cost[i - 1, j - 1]
+            )
+    return cost[-1, -1]
+
+
+@pytest.mark.parametrize("n,m", [(1, 1), (20, 20), (30, 17), (9, 40)])
+@pytest.mark.parametrize("window", [None, 0.1, 0.3])
+def test_dtw_matches_full_matrix(n, m, window):
+    rng = np.random.default_rng(n * m)
+    s1, s2 = rng.normal(size=n), rng.normal(size=m)
+    expected = _full_matrix(s1, s2, band_width(n, m, window))
+    assert dtw_distance(s1, s2, window) == pytest.approx(expected)
+    assert dtw_distance(s2, s1, window) == pytest.approx(expected)
+
+
+def test_dtw_batch_matches_single():
+    rng = np.random.default_rng(0)
+    candidates, reference = rng.normal(size=(5, 64)), rng.normal(size=50)
+    result = dtw_batch(candidates, reference, np.arange(5), window=0.2)
+    expected = [dtw_distance(c, reference, 0.2) for c in candidates]
+    np.testing.assert_allclose(result.distances, expected)
+    assert result.best == int(np.argmin(expected))
+    assert result.window == band_width(64, 50, 0.2)
+
+
+def test_dtw_components():
+    n, fs = 200, 10
+    t = np.arange(n) / fs
+    signal = 3 * np.cos(2 * np.pi * 0.5 * t + 0.2) + 0.5 * np.cos(2 * np.pi * 2 * t)
+    X = np.fft.rfft(signal)
+    freqs = fs * np.arange(len(X)) / n
+    top = np.argsort(-abs(X))[:2]
+    waves = component_signals(freqs[top], abs(X[top]), np.angle(X[top]), n, t, fs)
+    np.testing.assert_allclose(waves.sum(axis=0), signal, atol=1e-9)
+    result = dtw_components(freqs[top], abs(X[top]), np.angle(X[top]), n, t, fs, 0.1)
+    assert result.freqs[result.best] == pytest.approx(0.5)
@@ -0,0 +1,109 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import multiprocessing as mp
+import os
+from unittest.mock import patch
+
+from ftio.api.gekkoFs.file_queue import FileQueue
+
+"""
+Tests for ftio/api/gekkoFs/file_queue.py
+"""
+
+MTIME = "ftio.api.gekkoFs.file_queue.get_modification_time"
+
+
+def _put_all(queue: FileQueue, items: list, results) -> None:
+    results.put(sum(queue.put(item) for item in items))
+
+
+def _put_and_exit(path: str) -> None:
+    queue = FileQueue(path)
+    queue.put("/mnt/run/a.h5")
+    queue.put("/mnt/run/b.h5")
+    queue.mark_copying("/mnt/run/b.h5", 1.0)
+    queue.put("/mnt/run/c.h5")
+    queue.mark_copying("/mnt/run/c.h5", 2.0)
+    queue.mark_done("/mnt/run/c.h5")
+
+
+def test_put_and_transitions():
+    queue = FileQueue()
+    assert queue.put("/mnt/run")
+    assert not queue.put("/mnt/run")
+    # the folder is already queued
+    assert not queue.put("/mnt/run/a.h5")
+    assert queue.put("/mnt/other/a.h5")
+    assert len(queue) == 2 and queue.in_progress("/mnt/run")
+    assert queue.get_next() == "/mnt/run"
+    assert not queue.mark_copying("/mnt/run")  # already copying
+    assert queue.mark_copying("/mnt/other/a.h5", 5.0)
+    queue.mark_done("/mnt/other/a.h5")
+    queue.mark_failed("/mnt/other/a.h5")  # done stays done
+    queue.mark_failed("/mnt/run")
+    assert len(queue) == 0 and queue.get_next() is None
+    assert "queue size=0" in str(queue)
+    with patch(MTIME, return_value=5.0):
+        assert queue.is_done(None, "/mnt/other/a.h5")
+        assert not queue.is_done(None, "/mnt/run")
+    with patch(MTIME, return_value=6.0):
+        assert not queue.is_done(None, "/mnt/other/a.h5")
+    # a finished item can be queued again
+    assert queue.put("/mnt/other/a.h5")
+    with patch(MTIME, return_value=5.0):
+        assert not queue.is_done(None, "/mnt/other/a.h5")
+    queue._remove(os.getpid())
+    assert not os.path.exists(queue.path)
+
+
+def test_ignore():
+    queue = FileQueue()
+    with patch(MTIME, return_value=3.0):
+        assert not queue.is_ignored(None, "/mnt/a.h5")
+        queue.put_ignore(None, "/mnt/a.h5")
+        assert queue.is_ignored(None, "/mnt/a.h5")
+    with patch(MTIME, return_value=4.0):
+        assert not queue.is_ignored(None, "/mnt/a.h5")
+
+
+def test_processes_claim_each_item_once():
+    queue = FileQueue()
+    queue.put("/mnt/x.h5")  # creates the file before the fork
+    items = [f"/mnt/{i}.h5" for i in range(500)]
+    ctx = mp.get_context("fork")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_put_all, args=(queue, items, results)) for _ in range(4)]
+    for proc in procs:
+        proc.start()
+    claimed = sum(results.get(timeout=60) for _ in procs)
+    for proc in procs:
+        proc.join()
+    assert claimed == len(items)
+    assert len(queue) == len(items) + 1
+
+
+def test_resume_after_interruption(tmp_path):
+    path = str(tmp_path / "queue.sqlite")
+    proc = mp.get_context("spawn").Process(target=_put_and_exit, args=(path,))
+    proc.start()
+    proc.join()
+    assert proc.exitcode == 0
+    queue = FileQueue()
+    queue.open(path)
+    # the items of the exited process are released, the copied one stays done
+    assert len(queue) == 0
+    assert queue.put("/mnt/run/a.h5") and queue.put("/mnt/run/b.h5")
+    with patch(MTIME, return_value=2.0):
+        assert queue.is_done(None, "/mnt/run/c.h5")
+    # items of running processes are kept
+    queue.open(path)
+    assert len(queue) == 2
@@ -0,0 +1,189 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ftio.api.gekkoFs.flush_scheduler import FlushScheduler
+
+"""
+Tests for ftio/api/gekkoFs/flush_scheduler.py
+"""
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _args(strategy: str = "flush", handle_new_prediction: str = "cancel", **kwargs):
+    return argparse.Namespace(
+        strategy=strategy, handle_new_prediction=handle_new_prediction, **kwargs
+    )
+
+
+def _prediction(
+    t_wait: float,
+    t_end: float = 10.0,
+    freq: float = 0.1,
+    probability: float = 1.0,
+    **kwargs,
+) -> dict:
+    # flushed from gekko at t_end, the target is 5 s (half a period) later
+    return {
+        "t_wait": t_wait,
+        "t_start": 0.0,
+        "t_end": t_end,
+        "t_flush": t_end,
+        "freq": freq,
+        "conf": 1.0,
+        "probability": probability,
+        "total_bytes": 0,
+        "bytes": 0,
+        "source": "#0",
+        **kwargs,
+    }
+
+
+def _scheduler(args: argparse.Namespace) -> tuple[FlushScheduler, Clock, list]:
+    clock = Clock()
+    flushes = []
+    scheduler = FlushScheduler(
+        queue.Queue(), args, lambda p, wait: flushes.append((p, wait)), clock
+    )
+    return scheduler, clock, flushes
+
+
+def test_flush_fires_at_deadline():
+    scheduler, clock, flushes = _scheduler(_args())
+    assert scheduler.timeout() is None
+    scheduler.on_prediction(_prediction(clock.now))
+    assert scheduler.timeout() == pytest.approx(5.0)
+    clock.now += 4.9
+    scheduler.fire_due()
+    assert not flushes
+    clock.now += 0.1
+    scheduler.fire_due()
+    assert len(flushes) == 1 and not flushes[0][1]
+    # low probability and no frequency do not flush
+    scheduler.on_prediction(_prediction(clock.now, probability=0.5))
+    scheduler.on_prediction(_prediction(clock.now, freq=np.nan))
+    clock.now += 5
+    scheduler.fire_due()
+    assert len(flushes) == 1 and not scheduler.timers
+
+
+def test_cancel_drops_new_predictions():
+    scheduler, clock, flushes = _scheduler(_args(handle_new_prediction="cancel"))
+    first = _prediction(clock.now)
+    scheduler.on_prediction(first)
+    scheduler.on_prediction(_prediction(clock.now, t_end=12.0))
+    assert scheduler.cancel_counter == 1 and len(scheduler.timers) == 1
+    clock.now += 5
+    scheduler.fire_due()
+    assert flushes == [(first, False)] and scheduler.cancel_counter == 0
+
+
+def test_skip_replaces_pending_flush_once():
+    scheduler, clock, flushes = _scheduler(_args(handle_new_prediction="skip"))
+    scheduler.on_prediction(_prediction(clock.now))
+    second = _prediction(clock.now, t_end=12.0, t_flush=10.0)
+    scheduler.on_prediction(second)
+    assert scheduler.skipped == 1 and scheduler.timeout() == pytest.approx(7.0)
+    # the next prediction waits until the pending flush is done
+    third = _prediction(clock.now + 7, t_end=19.0)
+    scheduler.on_prediction(third)
+    assert len(scheduler.timers) == 1
+    clock.now += 7
+    scheduler.fire_due()
+    assert flushes == [(second, False)] and scheduler.skipped == 0
+    assert scheduler.timeout() == pytest.approx(5.0)
+
+
+def test_all_predictions_without_handling():
+    scheduler, clock, flushes = _scheduler(_args(handle_new_prediction=""))
+    scheduler.on_prediction(_prediction(clock.now))
+    scheduler.on_prediction(_prediction(clock.now, t_end=11.0))
+    clock.now += 6
+    scheduler.fire_due()
+    assert [p["t_end"] for p, _ in flushes] == [10.0, 11.0]
+
+
+def test_not_in_time_flushes_third_time():
+    scheduler, clock, flushes = _scheduler(_args())
+    late = _prediction(clock.now - 6)
+    for _ in range(3):
+        scheduler.on_prediction(late)
+    assert flushes == [(late, True)] and not scheduler.timers
+
+
+def test_job_end():
+    scheduler, clock, flushes = _scheduler(_args("job_end", job_time=100))
+    # 0.8 * 100 - (10 + 15) = 55 s left, the next phase fits
+    scheduler.on_prediction(_prediction(clock.now))
+    assert scheduler.timeout() == pytest.approx(55.0)
+    # a newer prediction replaces the pending flush
+    clock.now += 20
+    scheduler.on_prediction(_prediction(clock.now, t_end=30.0))
+    assert len(scheduler.timers) == 1 and scheduler.timeout() == pytest.approx(15.0)
+    clock.now += 15
+    scheduler.fire_due()
+    assert len(flushes) == 1
+    scheduler.on_prediction(_prediction(clock.now, t_end=60.0))
+    assert len(flushes) == 2 and not scheduler.timers
+
+
+def test_buffer_size_tracks_occupancy():
+    scheduler, clock, flushes = _scheduler(_args("buffer_size", buffer_size=1000))
+    # one phase in the window
+    phase = {"t_end": 10.0, "freq": 0.1, "total_bytes": 400}
+    scheduler.on_prediction(_prediction(clock.now, bytes=300, **phase))
+    scheduler.on_prediction(_prediction(clock.now, bytes=200, freq=np.nan))
+    assert scheduler.occupancy == 500 and not flushes
+    scheduler.on_prediction(_prediction(clock.now, bytes=200, **phase))
+    assert len(flushes) == 1 and scheduler.occupancy == 0
+    scheduler.on_prediction(_prediction(clock.now, bytes=300, **phase))
+    assert len(flushes) == 1 and scheduler.occupancy == 300
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        _scheduler(_args("sometimes"))
+
+
+def test_run_blocks_until_due():
+    sync_trigger = queue.Queue()
+    fired = []
+    scheduler = FlushScheduler(
+        sync_trigger, _args(), lambda p, wait: fired.append(time.time())
+    )
+    thread = threading.Thread(target=scheduler.run)
+    cpu = time.process_time()
+    thread.start()
+    time.sleep(0.2)
+    # idle without pending flushes
+    assert time.process_time() - cpu < 0.05
+    # due in 0.3 s
+    sync_trigger.put(_prediction(time.time(), t_end=0.2, freq=5.0, t_flush=0.0))
+    due = time.time() + 0.3
+    time.sleep(0.5)
+    sync_trigger.put(None)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert len(fired) == 1 and due <= fired[0] < due + 0.05
@@ -0,0 +1,58 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+"""
+Tests that the CLI entry points do not import optional heavy modules at startup
+"""
+
+HEAVY = ["matplotlib", "plotly", "sklearn", "kneed", "darshan", "torch", "zmq"]
+# generous budget in seconds, override with FTIO_IMPORT_BUDGET on slow machines
+BUDGET = float(os.environ.get("FTIO_IMPORT_BUDGET", 5))
+
+
+def _import(module: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "tik = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(json.dumps({'time': time.perf_counter() - tik, "
+        "'modules': list(sys.modules)}))"
+    )
+    root = os.path.join(os.path.dirname(__file__), "..")
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": os.path.abspath(root)},
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", ["ftio.cli.ftio_core", "ftio.cli.predictor"])
+def test_no_heavy_imports(module):
+    result = _import(module)
+    loaded = [m for m in HEAVY if m in result["modules"]]
+    assert loaded == []
+    assert result["time"] < BUDGET
+
+
+def test_cli_package_is_lazy():
+    result = _import("ftio.cli")
+    assert "ftio.cli.ftio_core" not in result["modules"]
@@ -0,0 +1,170 @@
+"""
+Tests for the incremental DFT engine used by the online predictor (--incremental).
+
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from ftio.cli import ftio_core
+from ftio.freq._incremental_dft import IncrementalDFT, update_incremental_dft
+from ftio.freq.discretize import _sample_fast
+from ftio.multiprocessing.shared_ring_buffer import SharedRingBuffer
+from ftio.parse.args import parse_args
+from ftio.prediction.shared_resources import SharedResources
+
+
+def _steps(n_steps=300, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.cumsum(rng.uniform(0.05, 0.5, n_steps))
+    b = rng.uniform(0, 1e6, n_steps)
+    return b, t
+
+
+def test_batches_match_complete_discretization():
+    b, t = _steps()
+    engine = IncrementalDFT(freq=10)
+    for chunk in np.array_split(np.arange(len(t)), 7):
+        engine.append(b[chunk], t[chunk])
+    N = int(np.floor((t[-1] - t[0]) * 10))
+    expected = _sample_fast(b, t, 10, N)
+    assert engine.n >= N - 1
+    np.testing.assert_array_equal(engine.b_sampled[: N - 1], expected[: N - 1])
+    np.testing.assert_allclose(engine.spectrum(), np.fft.rfft(engine.b_sampled))
+
+
+def test_repeated_data_is_ignored():
+    b, t = _steps(seed=1)
+    engine = IncrementalDFT(freq=10)
+    engine.append(b[:100], t[:100])
+    n = engine.n
+    # a file that was read again from the beginning only adds the new part
+    engine.append(b[:150], t[:150])
+    reference = IncrementalDFT(freq=10)
+    reference.append(b[:150], t[:150])
+    assert engine.n > n
+    np.testing.assert_array_equal(engine.b_sampled, reference.b_sampled)
+
+
+def test_sliding_window_spectrum():
+    b, t = _steps(n_steps=1000, seed=2)
+    engine = IncrementalDFT(freq=10)
+    engine.append(b[:500], t[:500])
+    engine.set_window(engine.t0 + 20)
+    engine.spectrum()
+    # slide the window by a few samples while keeping its length
+    length = engine.n - engine.start
+    engine.append(b[500:502], t[500:502])
+    engine.start = engine.n - length
+    np.testing.assert_allclose(
+        engine.spectrum(), np.fft.rfft(engine.b_sampled), rtol=1e-9, atol=1e-3
+    )
+    assert engine._slides == 1
+
+
+def test_window_and_pickle():
+    b, t = _steps(seed=3)
+    args = parse_args(["-e", "no", "--incremental", "-ts", "10"], "predictor")
+    engine = update_incremental_dft(None, b, t, args)
+    assert engine.t_start >= 10
+    assert engine.t_start - 10 < 1 / engine.freq
+    args.ts = 0
+    engine = pickle.loads(pickle.dumps(engine))
+    engine = update_incremental_dft(engine, b, t, args)
+    # the samples before the previous window were dropped
+    assert engine.start == engine.first > 0
+    assert engine.total_bytes > 0
+
+
+def test_shared_buffers_only_pickle_the_state():
+    b, t = _steps(n_steps=1000, seed=4)
+    args = parse_args(["-e", "no", "--incremental", "-ts", "20"], "predictor")
+    samples, spectra = SharedRingBuffer(columns=1), SharedRingBuffer(columns=2)
+    try:
+        reference = update_incremental_dft(None, b[:500], t[:500], args)
+        engine = update_incremental_dft(None, b[:500], t[:500], args, samples, spectra)
+        engine.spectrum()
+        state = pickle.dumps(engine)
+        assert len(state) < 2048
+        # slide the window by a few samples while keeping its length
+        length = engine.n - engine.start
+        engine = update_incremental_dft(
+            pickle.loads(state), b[500:502], t[500:502], args, samples, spectra
+        )
+        reference = update_incremental_dft(reference, b[500:502], t[500:502], args)
+        engine.start = reference.start = engine.n - length
+        np.testing.assert_array_equal(engine.b_sampled, reference.b_sampled)
+        np.testing.assert_allclose(
+            engine.spectrum(), np.fft.rfft(engine.b_sampled), rtol=1e-9, atol=1e-3
+        )
+        # the spectrum of the previous window was taken from the shared buffer
+        assert engine._slides == 1
+    finally:
+        samples.close()
+        spectra.close()
+
+
+def test_window_is_bounded_and_compacted():
+    b, t = _steps(n_steps=2000, seed=5)
+    args = parse_args(
+        ["-e", "no", "--incremental", "--incremental_max_samples", "500"], "predictor"
+    )
+    samples, spectra = SharedRingBuffer(columns=1, capacity=64), SharedRingBuffer(2)
+    try:
+        engine = local = None
+        for chunk in np.array_split(np.arange(len(t)), 40):
+            # only the scalar state is passed between predictions
+            engine = pickle.loads(pickle.dumps(engine))
+            engine = update_incremental_dft(
+                engine, b[chunk], t[chunk], args, samples, spectra
+            )
+            local = update_incremental_dft(local, b[chunk], t[chunk], args)
+            engine.spectrum()
+            local.spectrum()
+            assert engine.n - engine.start <= 500
+            assert len(samples) <= 1000 and len(local._local) <= 2048
+        np.testing.assert_array_equal(engine.b_sampled, local.b_sampled)
+        np.testing.assert_allclose(
+            engine.spectrum(), np.fft.rfft(engine.b_sampled), rtol=1e-9, atol=1e-3
+        )
+        assert engine.first > 0 and len(engine.b_sampled) == 500
+    finally:
+        samples.close()
+        spectra.close()
+
+
+@pytest.mark.parametrize(
+    "options", [[], ["--filter_type", "highpass", "--filter_cutoff", "1"]]
+)
+def test_predictor_matches_non_incremental(options):
+    file = os.path.join(os.path.dirname(__file__), "../examples/tmio/JSONL/8.jsonl")
+    predictions = {}
+    for incremental in ([], ["--incremental"]):
+        shared_resources = SharedResources()
+        try:
+            # the second prediction reuses the state of the first one
+            for _ in range(2):
+                prediction, _ = ftio_core.main(
+                    ["predictor", file, "-e", "no", *options, *incremental],
+                    None,
+                    shared_resources,
+                )
+        finally:
+            shared_resources.shutdown()
+        predictions[bool(incremental)] = prediction[-1]
+    # the engine samples the last step once more, so the bins differ slightly
+    assert abs(predictions[True].n_samples - predictions[False].n_samples) <= 1
+    assert predictions[True].dominant_freq[0] == pytest.approx(
+        predictions[False].dominant_freq[0], rel=0.01
+    )
@@ -0,0 +1,100 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from numba.core import sigutils
+
+import ftio.prediction.online_analysis as oa
+from ftio.util.jit_cache import KERNEL_MODULES, load_kernels
+
+"""
+Tests for ftio/util/jit_cache.py (numba kernel registry, cache directory, warmup)
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+KERNEL_SOURCE = """
+from ftio.util.jit_cache import kernel
+
+
+@kernel("(float64[::1],)")
+def total(a):
+    s = 0.0
+    for x in a:
+        s += x
+    return s
+"""
+
+RUN = """
+import json, sys
+import numpy as np
+import my_kernels
+import ftio.util.jit_cache as jc
+
+# only warm up the test kernel
+jc.KERNEL_MODULES = ("my_kernels",)
+results = jc.compile_kernels() if sys.argv[1] == "warmup" else []
+my_kernels.total(np.ones(3))
+hits = sum(jc.KERNELS["my_kernels.total"].dispatcher.stats.cache_hits.values())
+print(json.dumps({"cached": [r.cached for r in results], "hits": hits, "dir": jc.cache_dir()}))
+"""
+
+
+def _run(tmp_path, mode: str) -> dict:
+    env = {
+        **os.environ,
+        "PYTHONPATH": f"{tmp_path}{os.pathsep}{ROOT}",
+        "FTIO_CACHE_DIR": str(tmp_path / "cache"),
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", RUN, mode],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+        cwd=tmp_path,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_all_kernels_have_signatures():
+    kernels = load_kernels()
+    modules = {name.rsplit(".", 1)[0] for name in kernels}
+    assert modules == set(KERNEL_MODULES)
+    for k in kernels.values():
+        assert k.signatures, k.name
+        for signature in k.signatures:
+            args, _ = sigutils.normalize_signature(signature)
+            assert len(args) == k.dispatcher.py_func.__code__.co_argcount
+
+
+def test_warmup_fills_cache_dir(tmp_path):
+    (tmp_path / "my_kernels.py").write_text(KERNEL_SOURCE)
+    cold = _run(tmp_path, "warmup")
+    assert cold["cached"] == [False]
+    assert cold["dir"] == str(tmp_path / "cache")
+    assert any((tmp_path / "cache").iterdir())
+    # a new process loads the signature compiled by the warmup
+    warm = _run(tmp_path, "call")
+    assert warm["hits"] == 1
+    assert _run(tmp_path, "warmup")["cached"] == [True]
+
+
+def test_first_prediction_text(monkeypatch):
+    monkeypatch.setattr(oa, "cache_stats", lambda: (3, 2))
+    assert "cold compile (2 kernels compiled, 1 loaded" in oa.first_prediction_text(
+        1.0, (2, 0)
+    )
+    assert "warm (3 kernels loaded" in oa.first_prediction_text(1.0, (0, 2))
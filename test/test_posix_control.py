@@ -0,0 +1,162 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+import errno
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ftio.api.gekkoFs import posix_control
+from ftio.api.gekkoFs.posix_control import (
+    copy_file,
+    copy_file_and_unlink,
+    copy_item,
+    copy_range_call,
+    flush_using_copy_range,
+    move_files_os,
+    preallocate,
+)
+
+"""
+Tests for the copy engine of ftio/api/gekkoFs/posix_control.py
+"""
+
+CHUNK = 4096
+
+
+def _unsupported(*args, **kwargs):
+    raise OSError(errno.EXDEV, "unsupported")
+
+
+def _write(path, size: int) -> bytes:
+    data = os.urandom(size)
+    path.write_bytes(data)
+    path.chmod(0o640)
+    return data
+
+
+@pytest.mark.parametrize("size", [0, 100, CHUNK, 10 * CHUNK + 7])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_copy_file(tmp_path, size, workers):
+    data = _write(tmp_path / "src", size)
+    method = copy_file(
+        str(tmp_path / "src"), str(tmp_path / "dst"), workers, chunk_size=CHUNK
+    )
+    assert method == "copy_file_range"
+    assert (tmp_path / "dst").read_bytes() == data
+    assert (tmp_path / "dst").stat().st_mode & 0o777 == 0o640
+
+
+def test_copy_file_fallbacks(tmp_path):
+    data = _write(tmp_path / "src", 10 * CHUNK + 7)
+    (tmp_path / "dst").write_bytes(b"x" * 20 * CHUNK)  # truncated by the copy
+    with patch("os.copy_file_range", _unsupported):
+        assert copy_file(str(tmp_path / "src"), str(tmp_path / "dst")) == "sendfile"
+        assert (tmp_path / "dst").read_bytes() == data
+        with patch("os.sendfile", _unsupported):
+            method = copy_file(
+                str(tmp_path / "src"), str(tmp_path / "dst"), 4, chunk_size=CHUNK
+            )
+    assert method == "pwrite"
+    assert (tmp_path / "dst").read_bytes() == data
+
+
+def test_copy_file_falls_back_on_bad_fd(tmp_path):
+    data = _write(tmp_path / "src", 10 * CHUNK + 7)
+
+    def bad_fd(*args, **kwargs):
+        raise OSError(errno.EBADF, "bad file descriptor")
+
+    with patch("os.copy_file_range", bad_fd), patch("os.sendfile", bad_fd):
+        method = copy_file(
+            str(tmp_path / "src"), str(tmp_path / "dst"), 4, chunk_size=CHUNK
+        )
+    assert method == "pwrite"
+    assert (tmp_path / "dst").read_bytes() == data
+
+
+def test_copy_file_raises_other_errors(tmp_path):
+    _write(tmp_path / "src", 100)
+
+    def no_space(*args, **kwargs):
+        raise OSError(errno.ENOSPC, "no space")
+
+    with patch("os.copy_file_range", no_space), pytest.raises(OSError):
+        copy_file(str(tmp_path / "src"), str(tmp_path / "dst"))
+
+
+def test_preallocate_without_fallocate(tmp_path):
+    with open(tmp_path / "dst", "wb") as f:
+        preallocate(f.fileno(), 3 * CHUNK)
+        assert os.fstat(f.fileno()).st_size == 3 * CHUNK
+        with patch.object(posix_control, "_fallocate", lambda: None):
+            preallocate(f.fileno(), CHUNK)
+        assert os.fstat(f.fileno()).st_size == CHUNK
+
+
+def test_copy_item_folder(tmp_path):
+    (tmp_path / "src" / "a" / "b").mkdir(parents=True)
+    files = {
+        "f0.h5": _write(tmp_path / "src" / "f0.h5", 10),
+        "a/f1.h5": _write(tmp_path / "src" / "a" / "f1.h5", CHUNK + 1),
+        "a/b/f2.h5": _write(tmp_path / "src" / "a" / "b" / "f2.h5", 0),
+    }
+    (tmp_path / "src" / "link.h5").symlink_to(tmp_path / "src" / "f0.h5")
+    copy_item(str(tmp_path / "src"), str(tmp_path / "out" / "src"))
+    for name, data in files.items():
+        assert (tmp_path / "out" / "src" / name).read_bytes() == data
+    link = tmp_path / "out" / "src" / "link.h5"
+    assert not link.is_symlink() and link.read_bytes() == files["f0.h5"]
+
+
+def test_copy_range_call_moves_file(tmp_path):
+    args = argparse.Namespace(
+        stage_out_path=str(tmp_path / "stage-out"),
+        gkfs_mntdir=str(tmp_path / "mnt"),
+        ld_preload="",
+        host_file="",
+        flush_log="",
+        node=None,
+    )
+    (tmp_path / "mnt" / "run").mkdir(parents=True)
+    data = _write(tmp_path / "mnt" / "run" / "data.h5", 3 * CHUNK)
+    copy_file_and_unlink(args, str(tmp_path / "mnt" / "run"), "post_app", copy_range_call)
+    assert (tmp_path / "stage-out" / "run" / "data.h5").read_bytes() == data
+    assert not (tmp_path / "mnt" / "run" / "data.h5").exists()
+
+
+def test_move_files_os_copy_range(tmp_path):
+    args = argparse.Namespace(
+        stage_out_path=str(tmp_path / "stage-out"),
+        gkfs_mntdir=str(tmp_path / "mnt"),
+        ld_preload="",
+        parallel_move_threads=1,
+        debug=False,
+        flush_call="copy_range",
+    )
+    with (
+        patch.object(posix_control, "get_files", return_value=[]),
+        patch.object(posix_control, "get_items_to_submit", return_value=["a.h5"]),
+        patch.object(posix_control, "preloaded_call", return_value=""),
+        patch.object(posix_control, "flush_using_cp") as mock_cp,
+    ):
+        move_files_os(args, triggered_by="post_app")
+        flush_using_copy_range(args, ["b.h5"], 0)
+    assert mock_cp.call_args_list[0][0] == (
+        args,
+        ["a.h5"],
+        0,
+        "post_app",
+        copy_range_call,
+    )
+    assert mock_cp.call_args_list[1][0] == (args, ["b.h5"], 0, "ftio", copy_range_call)
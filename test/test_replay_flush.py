@@ -0,0 +1,122 @@
+"""
+Author: Ahmad Tarraf
+Copyright (c) 2024-2026 TU Darmstadt, Germany
+Version: 0.0.9
+Date: Oct 2026
+
+Licensed under the BSD 3-Clause License.
+For more information, see the LICENSE file in the project root:
+https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
+"""
+
+import argparse
+
+import numpy as np
+import pytest
+
+from ftio.api.gekkoFs.replay_flush import (
+    Requests,
+    batches,
+    parse_args_replay,
+    recorded_stream,
+    replay,
+    schedule,
+    simulate,
+    synthetic_stream,
+    write_requests,
+)
+
+"""
+Tests for ftio/api/gekkoFs/replay_flush.py
+"""
+
+
+def _requests(t_start: list, t_end: list, size: list) -> Requests:
+    return Requests(np.array(t_start), np.array(t_end), np.array(size, dtype=float))
+
+
+def test_synthetic_stream_and_batches():
+    messages = synthetic_stream(ranks=2, phases=3, period=10, phase_time=2, requests=4)
+    assert [t for t, _ in messages] == [1, 1, 2, 2, 11, 11, 12, 12, 21, 21, 22, 22]
+    requests = write_requests(messages)
+    assert len(requests.size) == 2 * 3 * 4 and np.sum(requests.size) == 6e9
+    assert np.all(np.diff(requests.t_end) >= 0)
+    np.testing.assert_allclose(requests.t_end[-1], 22.0)
+    # one batch per phase, complete after the quiet window
+    assert [(t, len(msgs)) for t, msgs in batches(messages, 1.0)] == [
+        (3, 4),
+        (13, 4),
+        (23, 4),
+    ]
+
+
+def test_recorded_stream(tmp_path):
+    messages = synthetic_stream(ranks=2, phases=2)
+    for i, (_, msg) in enumerate(reversed(messages)):
+        (tmp_path / f"write_{i}.msgpack").write_bytes(msg)
+    recorded = recorded_stream(str(tmp_path / "write_*.msgpack"))
+    assert [t for t, _ in recorded] == [t for t, _ in messages]
+    assert sorted(recorded) == sorted(messages)
+
+
+def test_simulate_post_app_only():
+    requests = _requests([0, 10], [2, 12], [4e9, 4e9])
+    metrics = simulate(requests, [], pfs_bandwidth=1e9, bb_bandwidth=4e9)
+    assert metrics["interference"] == 0 and metrics["delay"] == 0
+    assert metrics["peak_occupancy"] == 8e9
+    assert metrics["drain_time"] == pytest.approx(8.0)
+    # 4 GB wait 18 s, 4 GB wait 8 s
+    assert metrics["latency"] == pytest.approx(13.0)
+    assert metrics["max_latency"] == pytest.approx(18.0)
+
+
+def test_simulate_flushes():
+    requests = _requests([0, 10], [2, 12], [4e9, 4e9])
+    # the flush at 7 s overlaps the second phase from 10 to 11 s
+    metrics = simulate(requests, [7.0, 8.0], pfs_bandwidth=1e9, bb_bandwidth=2.5e9)
+    assert metrics["interference"] == pytest.approx(1.0)
+    # 2 GB/s writes and 1 GB/s flush exceed the burst buffer by 0.5 GB/s for 1 s
+    assert metrics["delay"] == pytest.approx(0.5 / 2.5)
+    assert metrics["latency"] == pytest.approx((9.0 + 4.0) / 2)
+    assert metrics["peak_occupancy"] == pytest.approx(4e9)
+    assert metrics["drain_time"] == pytest.approx(4.0)
+
+
+def test_schedule_uses_stream_time():
+    prediction = {
+        "t_wait": 3.0,
+        "t_start": 0.0,
+        "t_end": 2.0,
+        "t_flush": 3.0,
+        "freq": 0.1,
+        "conf": 1.0,
+        "probability": 1.0,
+        "total_bytes": 0,
+        "bytes": 0,
+        "source": "#0",
+    }
+    args = argparse.Namespace(strategy="flush", handle_new_prediction="cancel")
+    # due at 7 s, the second prediction is canceled
+    predictions = [prediction, {**prediction, "t_wait": 5.0, "t_flush": 5.0}]
+    assert schedule(predictions, args, 30.0) == [7.0]
+    assert schedule(predictions, args, 6.0) == []
+
+
+def test_replay_is_deterministic(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # ftio_gekko.run writes bandwidth.json
+    args, ftio_args = parse_args_replay(["--phases", "6", "--", "-f", "10"])
+    assert ftio_args[:2] == ["-f", "10"]
+    messages = synthetic_stream(phases=args.phases)
+    first = replay(messages, args, ftio_args)
+    second = replay(messages, args, ftio_args)
+    assert [r.strategy for r in first] == ["post_app", "flush", "job_end", "buffer_size"]
+    for a, b in zip(first, second, strict=True):
+        assert (a.flushes, a.latency, a.peak_occupancy) == (
+            b.flushes,
+            b.latency,
+            b.peak_occupancy,
+        )
+    post_app, flush = first[0], first[1]
+    assert post_app.flushes == 0 and post_app.peak_occupancy == 24e9
+    assert flush.flushes > 0 and flush.peak_occupancy < post_app.peak_occupancy
+    assert flush.overhead > 0
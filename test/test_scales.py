@@ -11,6 +11,7 @@ For more information, see the LICENSE file in the project root:
 https://github.com/tuda-parallel/FTIO/blob/main/LICENSE
 """
 
+import json
 import os
 
 import pandas as pd
@@ -140,3 +141,55 @@ def test_extract_fields():
     assert len(time_b) > 0
     assert isinstance(ranks, int)
     assert isinstance(total_bytes, int)
+
+
+def test_parallel_load(tmp_path):
+    """
+    Test that loading a folder with several processes yields the same runs in the same order.
+    """
+    file = os.path.join(os.path.dirname(__file__), "../examples/tmio/JSONL/8.jsonl")
+    for sub, ranks in [("a", 8), ("a", 16), ("b", 32), ("b", 64)]:
+        os.makedirs(tmp_path / sub, exist_ok=True)
+        with open(file) as src, open(tmp_path / sub / f"{ranks}.jsonl", "w") as dst:
+            dst.write(src.read())
+
+    sequential = Scales(["ioplot", str(tmp_path), "-j", "1"])
+    parallel = Scales(["ioplot", str(tmp_path), "-j", "2"])
+
+    assert parallel.n == sequential.n == 4
+    assert parallel.names == sequential.names
+    assert [s.name for s in parallel.s] == [s.name for s in sequential.s]
+    for df_seq, df_par in zip(
+        sequential.get_io_mode("write_sync"),
+        parallel.get_io_mode("write_sync"),
+        strict=True,
+    ):
+        pd.testing.assert_frame_equal(df_seq, df_par)
+    for run_seq, run_par in zip(sequential.s, parallel.s, strict=True):
+        assert list(run_par.__dict__) == list(run_seq.__dict__)
+        bw_seq, bw_par = run_seq.write_sync.bandwidth, run_par.write_sync.bandwidth
+        for key, value in bw_seq.__dict__.items():
+            # the arrays of the parsers are passed on as they are
+            assert type(getattr(bw_par, key)) is type(value), key
+
+
+def test_parallel_load_with_adjusted_args(tmp_path):
+    """
+    Test that a mode adjusted by an earlier file applies to the later files with several
+    processes as well.
+    """
+    file = os.path.join(os.path.dirname(__file__), "../examples/custom/JSON/custom.json")
+    with open(file) as f:
+        data = json.load(f)["write_sync"]
+    # the first file has no write_sync, so the parser switches the mode to read_sync
+    with open(tmp_path / "1.json", "w") as f:
+        json.dump({"read_sync": data}, f)
+    with open(tmp_path / "2.json", "w") as f:
+        json.dump({"read_sync": {**data, "total_bytes": 1}, "write_sync": data}, f)
+
+    runs = {}
+    for jobs in ("1", "2"):
+        scales = Scales(["ftio", str(tmp_path), "-e", "no", "-j", jobs])
+        assert scales.args.mode == "read_sync"
+        runs[jobs] = [run.read_sync.total_bytes for run in scales.s]
+    assert runs["2"] == runs["1"] == [data["total_bytes"], 1]